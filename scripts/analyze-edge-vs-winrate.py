@@ -6,11 +6,15 @@ Tests if our probability model is well-calibrated:
 - If not, model needs recalibration
 """
 
-import json
+import sys
 from pathlib import Path
 from collections import defaultdict
 
-TRADE_LOG = Path(__file__).parent / "kalshi-trades-v2.jsonl"
+sys.path.insert(0, str(Path(__file__).parent))
+from trade_log import TradeLog, SOURCES as LOG_SOURCES  # noqa: E402
+
+TRADE_LOG = LOG_SOURCES["v2"]
+SOURCES = ["v2"]
 
 
 def main():
@@ -29,59 +33,31 @@ def main():
         (0.50, 1.00, "50%+"),
     ]
     
-    by_bucket = defaultdict(lambda: {"won": 0, "lost": 0, "pending": 0, "edges": []})
-    all_trades = []
-    
-    with open(TRADE_LOG) as f:
-        for line in f:
-            try:
-                entry = json.loads(line.strip())
-                if entry.get("type") != "trade":
-                    continue
-                
-                edge = entry.get("edge", entry.get("edge_with_bonus", 0))
-                status = entry.get("result_status", "pending")
-                
-                # Find bucket
-                bucket_name = None
-                for low, high, name in buckets:
-                    if low <= edge < high:
-                        bucket_name = name
-                        break
-                
-                if not bucket_name:
-                    continue
-                
-                by_bucket[bucket_name]["edges"].append(edge)
-                if status == "won":
-                    by_bucket[bucket_name]["won"] += 1
-                elif status == "lost":
-                    by_bucket[bucket_name]["lost"] += 1
-                else:
-                    by_bucket[bucket_name]["pending"] += 1
-                
-                if status in ("won", "lost"):
-                    all_trades.append({
-                        "edge": edge,
-                        "won": status == "won"
-                    })
-            except:
-                continue
-    
+    log = TradeLog()
+    log.refresh()
+    bounds = [low for low, _, _ in buckets] + [buckets[-1][1]]
+    names = {low: name for low, _, name in buckets}
+
+    by_bucket = defaultdict(lambda: {"won": 0, "lost": 0, "pending": 0, "avg_edge": 0.0})
+    for row in log.group_by("edge", sources=SOURCES, bounds=bounds):
+        by_bucket[names[row["key"]]] = {"won": row["won"], "lost": row["lost"],
+                                        "pending": row["pending"], "avg_edge": row["avg_edge"] or 0.0}
+    overall = log.summary(sources=SOURCES, where="edge >= ? AND edge < ?", params=(bounds[0], bounds[-1]))
+
     print("📊 Edge vs Win Rate Correlation Analysis")
     print("=" * 60)
     print()
     
-    if not all_trades:
+    if not overall["settled"]:
         print("No settled trades found in v2 log.")
         print("(Need settled trades for edge correlation analysis)")
         return
     
-    total_won = sum(1 for t in all_trades if t["won"])
-    total_lost = len(all_trades) - total_won
-    overall_wr = total_won / len(all_trades) * 100 if all_trades else 0
-    
-    print(f"Total settled trades: {len(all_trades)}")
+    total_won = overall["won"]
+    total_lost = overall["lost"]
+    overall_wr = total_won / overall["settled"] * 100
+
+    print(f"Total settled trades: {overall['settled']}")
     print(f"Overall win rate: {overall_wr:.1f}% ({total_won}W / {total_lost}L)")
     print()
     
@@ -99,7 +75,7 @@ def main():
             continue
         
         wr = data["won"] / settled * 100
-        avg_edge = sum(data["edges"]) / len(data["edges"]) * 100 if data["edges"] else 0
+        avg_edge = data["avg_edge"] * 100
         
         bar_len = int(wr / 2)
         bar = "█" * bar_len
@@ -121,7 +97,7 @@ def main():
         settled = data["won"] + data["lost"]
         if settled >= 3:  # Need at least 3 trades for meaningful stat
             wr = data["won"] / settled
-            avg_edge = sum(data["edges"]) / len(data["edges"]) if data["edges"] else 0
+            avg_edge = data["avg_edge"]
             bucket_stats.append((avg_edge, wr, name, settled))
     
     if len(bucket_stats) >= 2:
@@ -6,88 +6,34 @@ Helps identify optimal trading windows.
 Usage: python3 analyze-trades-by-hour.py
 """
 
-import json
-from datetime import datetime
-from collections import defaultdict
+import sys
 from pathlib import Path
 
-TRADE_LOG = Path(__file__).parent / "kalshi-trades.jsonl"
+sys.path.insert(0, str(Path(__file__).parent))
+from trade_log import TradeLog  # noqa: E402
 
-def load_trades():
-    """Load all trades from log file."""
-    trades = []
-    if not TRADE_LOG.exists():
-        print(f"❌ Trade log not found: {TRADE_LOG}")
-        return trades
-    
-    with open(TRADE_LOG, 'r') as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                trade = json.loads(line)
-                trades.append(trade)
-            except json.JSONDecodeError:
-                continue
-    return trades
+SOURCES = ["legacy"]  # scripts/kalshi-trades.jsonl
 
-def analyze_by_hour(trades):
-    """Analyze trades grouped by hour."""
-    # Group trades by hour
-    hourly_stats = defaultdict(lambda: {
-        'total': 0,
-        'won': 0,
-        'lost': 0,
-        'pending': 0,
-        'pnl': 0.0,
-        'yes_count': 0,
-        'no_count': 0
-    })
-    
-    for trade in trades:
-        # Parse timestamp
-        ts = trade.get('timestamp', trade.get('time', ''))
-        if not ts:
-            continue
-        
-        try:
-            # Handle different timestamp formats
-            if 'T' in ts:
-                dt = datetime.fromisoformat(ts.replace('Z', '+00:00'))
-            else:
-                dt = datetime.strptime(ts, '%Y-%m-%d %H:%M:%S')
-        except:
+
+def analyze_by_hour(log: TradeLog) -> dict:
+    """Per-hour trade counts, results, PnL ($) and YES/NO split from the shared trade index."""
+    hourly_stats = {}
+    for row in log.group_by("hour", sources=SOURCES):
+        if row["key"] is None:
             continue
-        
-        hour = dt.hour
-        stats = hourly_stats[hour]
-        stats['total'] += 1
-        
-        # Count YES/NO
-        side = trade.get('side', 'no').lower()
-        if side == 'yes':
-            stats['yes_count'] += 1
-        else:
-            stats['no_count'] += 1
-        
-        # Track result
-        result = trade.get('result_status', 'pending').lower()
-        if result == 'won':
-            stats['won'] += 1
-            # Calculate profit
-            price = trade.get('price', trade.get('avg_price', 50))
-            contracts = trade.get('contracts', trade.get('count', 1))
-            profit = (100 - price) * contracts / 100  # Convert cents to dollars
-            stats['pnl'] += profit
-        elif result == 'lost':
-            stats['lost'] += 1
-            # Calculate loss
-            price = trade.get('price', trade.get('avg_price', 50))
-            contracts = trade.get('contracts', trade.get('count', 1))
-            loss = price * contracts / 100
-            stats['pnl'] -= loss
-    
+        hourly_stats[row["key"]] = {
+            'total': row['total'],
+            'won': row['won'],
+            'lost': row['lost'],
+            'pending': row['pending'],
+            'pnl': row['pnl_cents'] / 100,
+            'yes_count': 0,
+            'no_count': row['total'],
+        }
+    for row in log.group_by("hour", sources=SOURCES, where="side = 'yes'"):
+        if row["key"] in hourly_stats:
+            hourly_stats[row["key"]]['yes_count'] = row['total']
+            hourly_stats[row["key"]]['no_count'] -= row['total']
     return hourly_stats
 
 def print_report(hourly_stats):
@@ -171,14 +117,16 @@ def print_report(hourly_stats):
     print()
 
 def main():
-    trades = load_trades()
-    if not trades:
+    log = TradeLog()
+    log.refresh()
+    total = log.summary(sources=SOURCES)["total"]
+    if not total:
         print("No trades to analyze.")
         return
-    
-    print(f"Loaded {len(trades)} trades")
-    
-    hourly_stats = analyze_by_hour(trades)
+
+    print(f"Loaded {total} trades")
+
+    hourly_stats = analyze_by_hour(log)
     print_report(hourly_stats)
 
 if __name__ == "__main__":
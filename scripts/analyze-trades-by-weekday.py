@@ -7,82 +7,25 @@ or lower liquidity (worse fills).
 Usage: python3 analyze-trades-by-weekday.py
 """
 
-import json
-from datetime import datetime
-from collections import defaultdict
-import os
+import sys
+from pathlib import Path
 
-TRADE_LOG = os.path.expanduser("~/Projects/Onde/scripts/kalshi-trades-v2.jsonl")
-TRADE_LOG_V1 = os.path.expanduser("~/Projects/Onde/scripts/kalshi-trades.jsonl")
+sys.path.insert(0, str(Path(__file__).parent))
+from trade_log import TradeLog, WEEKDAYS  # noqa: E402
 
-def load_trades():
-    """Load trades from v2 log (or v1 fallback)."""
-    trades = []
-    
-    # Try v2 first
-    if os.path.exists(TRADE_LOG):
-        with open(TRADE_LOG, 'r') as f:
-            for line in f:
-                try:
-                    trades.append(json.loads(line.strip()))
-                except:
-                    continue
-    
-    # Fallback to v1 if no v2 trades
-    if not trades and os.path.exists(TRADE_LOG_V1):
-        with open(TRADE_LOG_V1, 'r') as f:
-            for line in f:
-                try:
-                    trades.append(json.loads(line.strip()))
-                except:
-                    continue
-    
-    return trades
 
-def analyze_by_weekday(trades):
-    """Group trades by day of week and calculate stats."""
-    DAYS = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-    
-    stats = {day: {'trades': 0, 'wins': 0, 'pnl': 0} for day in DAYS}
-    
-    for trade in trades:
-        # Get trade timestamp
-        ts = trade.get('timestamp') or trade.get('time')
-        if not ts:
-            continue
-            
-        try:
-            if isinstance(ts, str):
-                dt = datetime.fromisoformat(ts.replace('Z', '+00:00'))
-            else:
-                dt = datetime.fromtimestamp(ts)
-            
-            day_name = DAYS[dt.weekday()]
-        except:
+def pick_sources(log: TradeLog) -> list:
+    """v2 log, or v1 if v2 has no trades yet."""
+    return ["v2"] if log.summary(sources=["v2"])["total"] else ["legacy"]
+
+
+def analyze_by_weekday(log: TradeLog, sources: list) -> dict:
+    """Group trades by day of week and calculate stats (PnL in cents)."""
+    stats = {day: {'trades': 0, 'wins': 0, 'pnl': 0} for day in WEEKDAYS}
+    for row in log.group_by("weekday", sources=sources):
+        if row["key"] is None:
             continue
-        
-        # Count trade
-        stats[day_name]['trades'] += 1
-        
-        # Check result
-        result = trade.get('result_status', trade.get('result', ''))
-        if result == 'won':
-            stats[day_name]['wins'] += 1
-        
-        # Calculate PnL
-        price = trade.get('price', trade.get('avg_price', 50))
-        contracts = trade.get('contracts', trade.get('quantity', 1))
-        side = trade.get('side', 'no')
-        
-        if result == 'won':
-            pnl = (100 - price) * contracts if side.lower() == 'no' else (100 - price) * contracts
-        elif result == 'lost':
-            pnl = -price * contracts
-        else:
-            pnl = 0
-        
-        stats[day_name]['pnl'] += pnl
-    
+        stats[WEEKDAYS[row["key"]]] = {'trades': row['total'], 'wins': row['won'], 'pnl': row['pnl_cents']}
     return stats
 
 def print_report(stats):
@@ -157,8 +100,10 @@ def print_report(stats):
         print(f"  • Consider reducing activity or size on {worst_day}s")
 
 if __name__ == '__main__':
-    trades = load_trades()
-    print(f"Loaded {len(trades)} trades")
-    
-    stats = analyze_by_weekday(trades)
+    log = TradeLog()
+    log.refresh()
+    sources = pick_sources(log)
+    print(f"Loaded {log.summary(sources=sources)['total']} trades")
+
+    stats = analyze_by_weekday(log, sources)
     print_report(stats)
@@ -4,29 +4,25 @@ Kalshi Win Rate Analysis by Asset (BTC vs ETH)
 Compares performance between different crypto assets.
 """
 
-import json
-from datetime import datetime, timezone
+import sys
 from pathlib import Path
 from collections import defaultdict
 
-TRADES_LOG = Path(__file__).parent / "kalshi-trades.jsonl"
+sys.path.insert(0, str(Path(__file__).parent))
+from trade_log import TradeLog  # noqa: E402
 
-def get_asset_from_ticker(ticker: str) -> str:
-    """Extract asset type from ticker name."""
-    if "KXETHD" in ticker:
-        return "ETH"
-    elif "KXBTCD" in ticker:
-        return "BTC"
-    else:
-        return "OTHER"
+SOURCES = ["legacy"]  # scripts/kalshi-trades.jsonl
 
 def analyze_by_asset():
     """Analyze win rates separately for each asset."""
     
-    if not TRADES_LOG.exists():
-        print("❌ Trades log not found")
+    log = TradeLog()
+    log.refresh()
+    executed = "order_status = 'executed'"
+    if not log.summary(sources=SOURCES, where=executed)["total"]:
+        print("❌ No executed trades found")
         return None
-    
+
     # Stats per asset
     stats = defaultdict(lambda: {
         "won": 0,
@@ -39,52 +35,18 @@ def analyze_by_asset():
         "yes_won": 0,
         "no_won": 0
     })
-    
-    with open(TRADES_LOG) as f:
-        for line in f:
-            try:
-                entry = json.loads(line.strip())
-                if entry.get('type') != 'trade':
-                    continue
-                if entry.get('order_status') != 'executed':
-                    continue
-                
-                ticker = entry.get('ticker', '')
-                asset = get_asset_from_ticker(ticker)
-                side = entry.get('side', 'unknown')
-                result = entry.get('result_status', 'pending')
-                cost = entry.get('cost_cents', 0)
-                contracts = entry.get('contracts', 1)
-                price = entry.get('price_cents', 0)
-                
-                # Track by side
-                if side == 'yes':
-                    stats[asset]['yes_count'] += 1
-                else:
-                    stats[asset]['no_count'] += 1
-                
-                # Track results
-                if result == 'won':
-                    stats[asset]['won'] += 1
-                    # PnL for winning: (100 - price) * contracts
-                    pnl = (100 - price) * contracts
-                    stats[asset]['total_pnl'] += pnl
-                    if side == 'yes':
-                        stats[asset]['yes_won'] += 1
-                    else:
-                        stats[asset]['no_won'] += 1
-                elif result == 'lost':
-                    stats[asset]['lost'] += 1
-                    # PnL for losing: -cost
-                    stats[asset]['total_pnl'] -= cost
-                else:
-                    stats[asset]['pending'] += 1
-                
-                stats[asset]['total_cost'] += cost
-                
-            except json.JSONDecodeError:
-                continue
-    
+
+    for row in log.group_by("asset", sources=SOURCES, where=executed):
+        stats[row["key"]].update(won=row["won"], lost=row["lost"], pending=row["pending"],
+                                 total_cost=row["cost_cents"], total_pnl=row["pnl_cents"])
+    for row in log.query(
+            "SELECT asset, CASE side WHEN 'yes' THEN 'yes' ELSE 'no' END AS side, "
+            "COUNT(*) AS n, SUM(result = 'won') AS won FROM trades "
+            f"WHERE kind = 'trade' AND source IN ({', '.join('?' * len(SOURCES))}) AND {executed} "
+            "GROUP BY 1, 2", SOURCES):
+        stats[row["asset"]][f"{row['side']}_count"] = row["n"]
+        stats[row["asset"]][f"{row['side']}_won"] = row["won"]
+
     # Print results
     print("📊 Win Rate Analysis by Asset")
     print("=" * 60)
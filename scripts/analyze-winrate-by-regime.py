@@ -8,11 +8,13 @@ Groups trades by regime and compares win rates, PnL, and ROI.
 Usage: python scripts/analyze-winrate-by-regime.py [--file PATH]
 """
 
-import json
 import argparse
+import sys
 from pathlib import Path
 from collections import defaultdict
-from datetime import datetime
+
+sys.path.insert(0, str(Path(__file__).parent))
+from trade_log import load_entries  # noqa: E402
 
 # Default trade log (v2 has regime data)
 DEFAULT_TRADE_LOG = Path(__file__).parent / "kalshi-trades-v2.jsonl"
@@ -20,23 +22,10 @@ FALLBACK_TRADE_LOG = Path(__file__).parent / "kalshi-trades.jsonl"
 
 
 def load_trades(file_path: Path) -> list:
-    """Load trades from JSONL file."""
-    trades = []
+    """Trade entries from a JSONL log (via the shared trade-log index)."""
     if not file_path.exists():
-        return trades
-    
-    with open(file_path, "r") as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                entry = json.loads(line)
-                if entry.get("type") == "trade":
-                    trades.append(entry)
-            except json.JSONDecodeError:
-                continue
-    return trades
+        return []
+    return load_entries(file_path)
 
 
 def analyze_by_regime(trades: list) -> dict:
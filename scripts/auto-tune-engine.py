@@ -9,6 +9,11 @@ Feedback loop:
 4. Adjust autotrader parameters automatically
 5. Save tuning report for dashboard
 
+When a fresh Pareto front from `kalshi-backtest.py --search` exists
+(data/backtests/pareto-kalshi-backtest.json), the min_edge recommendation
+comes from the best-PnL point on that front instead of the edge-bucket
+heuristic.
+
 Runs every 30 min via cron. Zero human intervention.
 """
 
@@ -21,6 +26,9 @@ from pathlib import Path
 from collections import defaultdict
 import statistics
 
+sys.path.insert(0, str(Path(__file__).parent))
+from param_search import load_front  # noqa: E402
+
 # Paths
 BASE_DIR = Path(__file__).parent.parent
 TRADES_FILE = BASE_DIR / "scripts" / "kalshi-trades-dryrun.jsonl"
@@ -30,6 +38,22 @@ TUNE_REPORT = BASE_DIR / "data" / "trading" / "tune-report.json"
 TUNE_HISTORY = BASE_DIR / "data" / "trading" / "tune-history.jsonl"
 PAPER_STATE = BASE_DIR / "data" / "trading" / "paper-trade-state.json"
 
+# Backtest Pareto front (PnL / max drawdown / trades) used for min_edge tuning
+PARETO_SOURCE = "kalshi-backtest"
+PARETO_MAX_AGE_HOURS = 48
+PARETO_MIN_TRADES = 20
+PARETO_MAX_DD_PCT = 25.0
+
+def choose_pareto_point(front):
+    """Best-PnL front point with enough trades and a tolerable drawdown (None if none qualifies)."""
+    if not front:
+        return None
+    eligible = [p for p in front.get("front", [])
+                if p.get("trades", 0) >= PARETO_MIN_TRADES and p.get("max_dd_pct", 0) <= PARETO_MAX_DD_PCT]
+    if not eligible:
+        return None
+    return max(eligible, key=lambda p: (p.get("pnl_cents", 0), -p.get("max_dd_pct", 0)))
+
 def load_trades(filepath):
     """Load trades from JSONL file."""
     trades = []
@@ -176,8 +200,8 @@ def analyze_trades(trades):
     
     return analysis
 
-def generate_recommendations(analysis):
-    """Generate parameter tuning recommendations based on analysis."""
+def generate_recommendations(analysis, pareto_point=None):
+    """Generate parameter tuning recommendations based on analysis (and the backtest front, if any)."""
     recs = []
     
     total = analysis.get("total_trades", 0)
@@ -256,9 +280,19 @@ def generate_recommendations(analysis):
                 "details": cal,
             })
     
-    # Edge analysis
+    # Edge threshold: prefer the backtest Pareto front over the bucket heuristic
     edge_stats = analysis.get("edge_stats", {})
-    if edge_stats:
+    if pareto_point:
+        min_edge = pareto_point["params"].get("min_edge")
+        recs.append({
+            "type": "pareto_front",
+            "message": (f"Backtest front: min_edge={min_edge} → PnL {pareto_point['pnl_cents']}¢, "
+                        f"max DD {pareto_point['max_dd_pct']}%, {pareto_point['trades']} trades."),
+            "action": "raise_min_edge_global",
+            "suggested": min_edge,
+            "params": pareto_point["params"],
+        })
+    elif edge_stats:
         # Check if we're taking too-low-edge trades
         by_bucket = analysis.get("by_edge_bucket", {})
         low_edge = by_bucket.get("0-5%", {})
@@ -410,7 +444,8 @@ def main():
               f"stdev={edge_stats['stdev']:.1%}, range=[{edge_stats['min']:.1%}, {edge_stats['max']:.1%}]")
     
     # Generate recommendations
-    recs = generate_recommendations(analysis)
+    pareto_point = choose_pareto_point(load_front(PARETO_SOURCE, max_age_hours=PARETO_MAX_AGE_HOURS))
+    recs = generate_recommendations(analysis, pareto_point)
     
     print(f"\n💡 Recommendations ({len(recs)}):")
     for r in recs:
@@ -433,6 +468,7 @@ def main():
         "timestamp": datetime.now(timezone.utc).isoformat(),
         "analysis": analysis,
         "recommendations": recs,
+        "pareto_point": pareto_point,
         "changes_applied": changes,
         "auto_tune_active": auto_apply,
         "trades_until_auto": max(0, min_trades_for_auto - len(all_trades)),
@@ -19,9 +19,13 @@ import json
 import os
 import subprocess
 import sys
-from datetime import datetime, timezone, timedelta
+import time
+from datetime import datetime, timezone
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).parent))
+from trade_log import TradeLog  # noqa: E402
+
 # Paths
 SCRIPT_DIR = Path(__file__).parent
 TRADES_FILE_V2 = SCRIPT_DIR / "kalshi-trades-v2.jsonl"
@@ -35,35 +39,6 @@ TELEGRAM_BOT_TOKEN = os.environ.get("TELEGRAM_BOT_TOKEN", "")
 TELEGRAM_CHAT_ID = os.environ.get("TELEGRAM_CHAT_ID", "")
 
 
-def load_jsonl(filepath: Path, hours_back: int = None) -> list:
-    """Load JSONL file, optionally filtering by time."""
-    if not filepath.exists():
-        return []
-    
-    trades = []
-    cutoff = None
-    if hours_back:
-        cutoff = datetime.now(timezone.utc) - timedelta(hours=hours_back)
-    
-    with open(filepath, 'r') as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                trade = json.loads(line)
-                if cutoff:
-                    ts = trade.get("timestamp", "")
-                    if ts:
-                        trade_time = datetime.fromisoformat(ts.replace("Z", "+00:00"))
-                        if trade_time < cutoff:
-                            continue
-                trades.append(trade)
-            except json.JSONDecodeError:
-                continue
-    return trades
-
-
 def check_autotrader_status() -> tuple[bool, int]:
     """Check if autotrader is running. Returns (running, pid)."""
     try:
@@ -79,43 +54,19 @@ def check_autotrader_status() -> tuple[bool, int]:
     return False, 0
 
 
-def get_24h_stats(trades: list) -> dict:
+def get_24h_stats(log: TradeLog, sources: list) -> dict:
     """Calculate 24h rolling stats."""
-    now = datetime.now(timezone.utc)
-    cutoff_24h = now - timedelta(hours=24)
-    cutoff_1h = now - timedelta(hours=1)
-    
-    trades_24h = []
-    trades_1h = []
-    
-    for trade in trades:
-        ts = trade.get("timestamp", "")
-        if not ts:
-            continue
-        try:
-            trade_time = datetime.fromisoformat(ts.replace("Z", "+00:00"))
-            if trade_time >= cutoff_24h:
-                trades_24h.append(trade)
-            if trade_time >= cutoff_1h:
-                trades_1h.append(trade)
-        except Exception:
-            continue
-    
-    # Calculate stats
-    wins_24h = sum(1 for t in trades_24h if t.get("result") == "win")
-    losses_24h = sum(1 for t in trades_24h if t.get("result") == "loss")
-    pnl_24h = sum(float(t.get("pnl", 0)) for t in trades_24h if t.get("pnl"))
-    
-    total_settled_24h = wins_24h + losses_24h
-    win_rate_24h = (wins_24h / total_settled_24h * 100) if total_settled_24h > 0 else 0
-    
+    now = time.time()
+    day = log.summary(sources=sources, since=now - 86400)
+    hour = log.summary(sources=sources, since=now - 3600)
+
     return {
-        "trades_24h": len(trades_24h),
-        "trades_1h": len(trades_1h),
-        "wins_24h": wins_24h,
-        "losses_24h": losses_24h,
-        "win_rate_24h": win_rate_24h,
-        "pnl_24h": pnl_24h,
+        "trades_24h": day["total"],
+        "trades_1h": hour["total"],
+        "wins_24h": day["won"],
+        "losses_24h": day["lost"],
+        "win_rate_24h": day["win_rate"] * 100 if day["win_rate"] is not None else 0,
+        "pnl_24h": day["pnl_cents"] / 100,
     }
 
 
@@ -289,11 +240,12 @@ def main():
     # Gather data
     running, pid = check_autotrader_status()
     
-    # Load all trades (v2 preferred, fallback to v1)
-    trades_file = TRADES_FILE_V2 if TRADES_FILE_V2.exists() else TRADES_FILE_V1
-    trades = load_jsonl(trades_file)
-    
-    stats = get_24h_stats(trades)
+    # Incremental refresh of the shared trade index (v2 preferred, fallback to v1)
+    log = TradeLog()
+    log.refresh()
+    sources = ["v2"] if TRADES_FILE_V2.exists() else ["legacy"]
+
+    stats = get_24h_stats(log, sources)
     portfolio = get_portfolio_value()
     alerts = get_pending_alerts()
     
@@ -0,0 +1,384 @@
+#!/usr/bin/env python3
+"""
+Backtest Engine
+Vectorized replay of kalshi-backtest.py for many parameter sets at once.
+
+The settled trades are converted once into column arrays (price, side,
+outcome, edge, probabilities, strike / spot / expiry, momentum, regime,
+asset). Filters are evaluated as a (param sets x trades) boolean mask with
+NumPy broadcasting, including the fat-tail probability recalculation. The
+bankroll replay is inherently sequential (position size depends on the
+bankroll and the streak), so it steps through the trades once while every
+"lane" - one parameter set, or one bootstrap resample - advances together
+as a vector. Bootstrap resamples are index matrices into the same arrays.
+
+Mirrors should_include_trade / simulate_position_size / run_backtest in
+kalshi-backtest.py (the scalar reference, still used for the full report).
+
+Usage:
+    from backtest_engine import TradeArrays, evaluate, bootstrap, grid
+
+    arrays = TradeArrays.from_trades(trades)          # Trade dataclasses from kalshi-backtest.py
+    rows = evaluate(arrays, [params_a, params_b])     # [{"trades", "win_rate", "pnl_cents", ...}, ...]
+    rows = evaluate(arrays, grid(DEFAULT_PARAMS, {"min_edge": [...], "kelly_fraction": [...]}),
+                    workers=4)                        # process pool over chunks of parameter sets
+    mc = bootstrap(arrays, params, n=10000, seed=1)   # {"win_rate": {"mean", "p5", ...}, ...}
+    search_objective(arrays, param_sets, fraction=1/3) # param_search evaluate callable
+"""
+
+import itertools
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+
+HOURLY_VOL = {"btc": 0.005, "eth": 0.007, "sol": 0.012}
+DEFAULT_HOURLY_VOL = 0.005
+ASSET_MAX_EDGE = {"btc": 0.20, "eth": 0.20, "sol": 0.20, "weather": 0.15, "other": 0.15}
+DEFAULT_ASSET_MAX_EDGE = 0.15
+BASE_FAT_TAIL = 1.4  # trades were logged with this multiplier; others trigger a recalculation
+TRADES_PER_YEAR = 5 * 365
+
+# Regime codes for the sizing multiplier table
+REGIMES = {"choppy": 1, "trending_bullish": 2, "trending_bearish": 2, "sideways": 3}
+
+PCTS = (5, 25, 50, 75, 95)
+
+
+@dataclass
+class TradeArrays:
+    """Settled trades as column arrays (chronological order)."""
+    assets: list          # asset names; `asset` holds indices into this list
+    asset: np.ndarray
+    is_yes: np.ndarray
+    is_no: np.ndarray
+    win: np.ndarray
+    price: np.ndarray
+    edge: np.ndarray
+    our_prob: np.ndarray
+    market_prob: np.ndarray
+    strike: np.ndarray
+    spot: np.ndarray
+    minutes: np.ndarray
+    momentum_dir: np.ndarray
+    momentum_str: np.ndarray
+    regime: np.ndarray
+    pending: int = 0
+
+    @classmethod
+    def from_trades(cls, trades) -> "TradeArrays":
+        settled = [t for t in trades if t.result_status in ("win", "loss")]
+        assets = sorted({t.asset for t in settled})
+        index = {a: i for i, a in enumerate(assets)}
+
+        def col(attr, dtype=np.float64):
+            return np.array([getattr(t, attr) for t in settled], dtype=dtype).reshape(-1)
+
+        return cls(
+            assets=assets,
+            asset=np.array([index[t.asset] for t in settled], dtype=np.int64).reshape(-1),
+            is_yes=np.array([t.side == "yes" for t in settled], dtype=bool).reshape(-1),
+            is_no=np.array([t.side == "no" for t in settled], dtype=bool).reshape(-1),
+            win=np.array([t.result_status == "win" for t in settled], dtype=bool).reshape(-1),
+            price=col("price_cents"),
+            edge=col("edge"),
+            our_prob=col("our_prob"),
+            market_prob=col("market_prob"),
+            strike=col("strike"),
+            spot=col("current_price"),
+            minutes=col("minutes_to_expiry"),
+            momentum_dir=col("momentum_dir"),
+            momentum_str=col("momentum_str"),
+            regime=np.array([REGIMES.get(t.regime, 0) for t in settled], dtype=np.int64).reshape(-1),
+            pending=len(trades) - len(settled),
+        )
+
+    def __len__(self):
+        return len(self.win)
+
+    def head(self, fraction: float) -> "TradeArrays":
+        """The oldest `fraction` of the settled trades (successive-halving data slices)."""
+        if fraction >= 1.0:
+            return self
+        k = max(1, int(round(len(self) * fraction)))
+        return TradeArrays(assets=self.assets, pending=0, **{
+            f: getattr(self, f)[:k] for f in self.__dataclass_fields__ if f not in ("assets", "pending")})
+
+
+def grid(base: dict, ranges: dict, derive=None) -> list:
+    """Cartesian product of `ranges` applied over `base`; `derive(params)` fixes coupled keys."""
+    names = list(ranges)
+    out = []
+    for values in itertools.product(*(ranges[n] for n in names)):
+        params = dict(base)
+        params.update(zip(names, values))
+        if derive:
+            derive(params)
+        out.append(params)
+    return out
+
+
+# ── parameter columns ──
+
+def _column(param_sets, key, default) -> np.ndarray:
+    return np.array([float(p.get(key, default)) for p in param_sets])
+
+
+def _per_asset(param_sets, assets, key, fallback_key, default) -> np.ndarray:
+    """(P, A) of params[f"{asset}_{key}"] falling back to params[fallback_key]."""
+    return np.array([[float(p.get(f"{a}_{key}", p.get(fallback_key, default))) for a in assets]
+                     for p in param_sets]).reshape(len(param_sets), len(assets))
+
+
+def _norm_cdf(x: np.ndarray) -> np.ndarray:
+    """Abramowitz & Stegun approximation (same as kalshi-backtest.norm_cdf)."""
+    a1, a2, a3, a4, a5 = 0.254829592, -0.284496736, 1.421413741, -1.453152027, 1.061405429
+    sign = np.where(x >= 0, 1.0, -1.0)
+    x = np.abs(x)
+    t = 1.0 / (1.0 + 0.3275911 * x)
+    y = 1.0 - (((((a5 * t + a4) * t) + a3) * t + a2) * t + a1) * t * np.exp(-x * x / 2)
+    return 0.5 * (1.0 + sign * y)
+
+
+def probabilities(arrays: TradeArrays, param_sets) -> tuple:
+    """(prob, edge) as (P, N): recalculated where fat_tail_multiplier differs from the logged one."""
+    fat_tail = _column(param_sets, "fat_tail_multiplier", BASE_FAT_TAIL)[:, None]
+    vol = np.array([HOURLY_VOL.get(a, DEFAULT_HOURLY_VOL) for a in arrays.assets])[arrays.asset] \
+        if len(arrays) else np.zeros(0)
+    weather = np.array([a == "weather" for a in arrays.assets], dtype=bool)[arrays.asset] \
+        if len(arrays) else np.zeros(0, dtype=bool)
+    eligible = ~weather & ~np.isnan(arrays.strike) & ~np.isnan(arrays.spot) & (arrays.minutes > 0)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        sigma = vol * np.sqrt(np.where(eligible, arrays.minutes, 0) / 60.0) * fat_tail
+        positive = (arrays.strike > 0) & (arrays.spot > 0)
+        log_ratio = np.log(np.where(positive, arrays.spot / np.where(positive, arrays.strike, 1), 1.0))
+        d2 = log_ratio / np.where(sigma > 0, sigma, 1.0) - sigma / 2
+        above = np.clip(_norm_cdf(d2), 0.01, 0.99)
+    side_prob = np.where(arrays.is_yes, above, 1.0 - above)
+    # sigma <= 0 (non-positive multiplier) short-circuits to a hard 0/1, before the strike check
+    degenerate = np.where(arrays.spot > arrays.strike, 1.0, 0.0)
+    recalc = np.where(sigma > 0, np.where(positive, side_prob, arrays.our_prob), degenerate)
+    recalc = np.where(eligible, recalc, arrays.our_prob)
+
+    implied = np.where(arrays.is_yes, arrays.market_prob,
+                       np.where(arrays.market_prob < 1, 1.0 - arrays.market_prob, 0.0))
+    # run_backtest() recalculates whenever the key isn't exactly the logged multiplier
+    changed = np.array([p.get("fat_tail_multiplier") != BASE_FAT_TAIL for p in param_sets])[:, None]
+    prob = np.where(changed, recalc, arrays.our_prob)
+    edge = np.where(changed, recalc - implied, arrays.edge)
+    return prob, edge
+
+
+def include_mask(arrays: TradeArrays, param_sets, recalc: bool = True) -> np.ndarray:
+    """(P, N) should_include_trade() for every parameter set and trade."""
+    P = len(param_sets)
+    if recalc:
+        prob, edge = probabilities(arrays, param_sets)
+    else:
+        prob = np.broadcast_to(arrays.our_prob, (P, len(arrays)))
+        edge = np.broadcast_to(arrays.edge, (P, len(arrays)))
+    a = arrays.asset
+    min_edge = _column(param_sets, "min_edge", 0.04)[:, None]
+
+    ok = edge >= _per_asset(param_sets, arrays.assets, "min_edge", "min_edge", 0.04)[:, a]
+    asset_cap = np.array([ASSET_MAX_EDGE.get(x, DEFAULT_ASSET_MAX_EDGE) for x in arrays.assets])[a] \
+        if len(arrays) else np.zeros(0)
+    ok &= edge <= np.minimum(_column(param_sets, "max_edge", 0.20)[:, None], asset_cap)
+    ok &= ~(arrays.minutes < _column(param_sets, "min_time_to_expiry_minutes", 45)[:, None])
+
+    use_momentum = _column(param_sets, "use_momentum_filter", True)[:, None] > 0
+    thr = _column(param_sets, "momentum_conflict_threshold", 0.3)[:, None]
+    strong = arrays.momentum_str > thr
+    conflict = (arrays.is_yes & (arrays.momentum_dir < -thr) & strong) | \
+               (arrays.is_no & (arrays.momentum_dir > thr) & strong)
+    ok &= ~(use_momentum & conflict)
+
+    use_kelly = _column(param_sets, "use_kelly_check", True)[:, None] > 0
+    price = arrays.price
+    valid = (price > 0) & (price < 100) & (prob > 0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        b = (100 - price) / np.where(price > 0, price, 1)
+        kelly = np.where(valid, (b * prob - (1 - prob)) / np.where(b != 0, b, 1), 0.0)
+    ok &= ~(use_kelly & ~(kelly > 0))
+
+    use_regime = _column(param_sets, "use_regime_filter", True)[:, None] > 0
+    ok &= ~(use_regime & (arrays.regime == REGIMES["choppy"]) & (edge < min_edge * 1.5))
+    return ok
+
+
+# ── replay ──
+
+def replay(arrays: TradeArrays, param_sets, include: np.ndarray, rows=None, order=None,
+           initial_bankroll_cents: int = 10000) -> dict:
+    """
+    Sequential bankroll replay for L lanes at once.
+
+    `include` is (P, N). Lane i uses parameter row rows[i] (default: lane i)
+    and visits trades order[i, :] (default: chronological). Returns {metric: (L,) array}.
+    """
+    P = len(param_sets)
+    rows = np.arange(P) if rows is None else np.asarray(rows)
+    L = len(rows)
+    steps = len(arrays) if order is None else order.shape[1]
+    assets = arrays.assets
+
+    kelly = _per_asset(param_sets, assets, "kelly", "kelly_fraction", 0.05)[rows]
+    max_pos = _per_asset(param_sets, assets, "max_position_pct", "max_position_pct", 0.03)[rows]
+    regime_mult = np.stack([np.ones(P),
+                            _column(param_sets, "regime_choppy_multiplier", 0.5),
+                            _column(param_sets, "regime_trending_multiplier", 1.0),
+                            _column(param_sets, "regime_sideways_multiplier", 0.75)], axis=1)[rows]
+    tilt_threshold = _column(param_sets, "streak_tilt_threshold", 3)[rows]
+    tilt_reduction = _column(param_sets, "streak_tilt_reduction", 0.7)[rows]
+
+    lanes = np.arange(L)
+    bank = np.full(L, float(initial_bankroll_cents))
+    peak = bank.copy()
+    max_dd = np.zeros(L)
+    streak = np.zeros(L)
+    n = np.zeros(L)
+    wins = np.zeros(L)
+    cost_sum = np.zeros(L)
+    gross_win = np.zeros(L)
+    gross_loss = np.zeros(L)
+    sum_sq = np.zeros(L)
+    best = np.full(L, -np.inf)
+    worst = np.full(L, np.inf)
+
+    for j in range(steps):
+        cols = np.full(L, j) if order is None else order[:, j]
+        ok = include[rows, cols]
+        a = arrays.asset[cols]
+        price = arrays.price[cols]
+        won = arrays.win[cols]
+
+        streak_mult = np.where(np.abs(streak) >= tilt_threshold, tilt_reduction, 1.0)
+        eff = np.minimum(kelly[lanes, a] * regime_mult[lanes, arrays.regime[cols]] * streak_mult,
+                         max_pos[lanes, a])
+        bet = np.maximum(5.0, np.floor(bank * eff))
+        contracts = np.where(price > 0, np.maximum(1.0, np.floor(bet / np.where(price > 0, price, 1))), 1.0)
+        cost = contracts * price
+        ok = ok & (cost > 0) & (cost <= bank)
+
+        pnl = np.where(ok, np.where(won, 100 * contracts - cost, -cost), 0.0)
+        bank += pnl
+        n += ok
+        wins += ok & won
+        cost_sum += np.where(ok, cost, 0.0)
+        gross_win += np.where(ok & won, pnl, 0.0)
+        gross_loss += np.where(ok & ~won, -pnl, 0.0)
+        sum_sq += pnl * pnl
+        best = np.where(ok, np.maximum(best, pnl), best)
+        worst = np.where(ok, np.minimum(worst, pnl), worst)
+        streak = np.where(ok, np.where(won, np.maximum(streak, 0) + 1, np.minimum(streak, 0) - 1), streak)
+        np.maximum(peak, bank, out=peak)
+        np.maximum(max_dd, peak - bank, out=max_dd)
+
+    profit = bank - initial_bankroll_cents
+    losses = n - wins
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = profit / n
+        var = (sum_sq - n * mean * mean) / (n - 1)
+        std = np.sqrt(np.maximum(var, 0))
+        # Running sums leave rounding noise where statistics.stdev() would give exactly 0
+        flat = std <= 1e-9 * np.maximum(1.0, np.abs(mean))
+        sharpe = np.where((n > 1) & ~flat, mean / std * math.sqrt(TRADES_PER_YEAR), 0.0)
+        return {
+            "trades": n.astype(np.int64),
+            "wins": wins.astype(np.int64),
+            "losses": losses.astype(np.int64),
+            "cost_cents": cost_sum,
+            "pnl_cents": profit,
+            "win_rate": np.where(n > 0, wins / n, 0.0),
+            "expectation": np.where(n > 0, mean, 0.0),
+            "roi_pct": np.where(cost_sum > 0, profit / cost_sum * 100, 0.0),
+            "sharpe": sharpe,
+            "max_dd_cents": max_dd,
+            "max_dd_pct": np.where(peak > 0, max_dd / peak * 100, 0.0),
+            "profit_factor": np.where(gross_loss > 0, gross_win / gross_loss, 0.0),
+            "best_trade_cents": np.where(n > 0, best, 0.0),
+            "worst_trade_cents": np.where(n > 0, worst, 0.0),
+        }
+
+
+def summarize(metrics: dict) -> list:
+    """Per-lane metric arrays -> rows shaped like run_parameter_sweep() summaries."""
+    out = []
+    for i in range(len(metrics["trades"])):
+        out.append({
+            "trades": int(metrics["trades"][i]),
+            "win_rate": round(float(metrics["win_rate"][i]), 4),
+            "pnl_cents": int(metrics["pnl_cents"][i]),
+            "roi_pct": round(float(metrics["roi_pct"][i]), 2),
+            "sharpe": round(float(metrics["sharpe"][i]), 3),
+            "max_dd_pct": round(float(metrics["max_dd_pct"][i]), 2),
+            "profit_factor": round(float(metrics["profit_factor"][i]), 3),
+            "expectation": round(float(metrics["expectation"][i]), 2),
+        })
+    return out
+
+
+def _evaluate_chunk(arrays: TradeArrays, param_sets, initial_bankroll_cents) -> list:
+    include = include_mask(arrays, param_sets)
+    return summarize(replay(arrays, param_sets, include, initial_bankroll_cents=initial_bankroll_cents))
+
+
+def evaluate(arrays: TradeArrays, param_sets, initial_bankroll_cents: int = 10000,
+             workers: int = None, chunk: int = 256) -> list:
+    """Sweep summaries for every parameter set; `workers` > 1 splits chunks across processes."""
+    param_sets = list(param_sets)
+    if not param_sets:
+        return []
+    chunks = [param_sets[i:i + chunk] for i in range(0, len(param_sets), chunk)]
+    if workers is None:
+        workers = 1
+    elif workers <= 0:
+        workers = os.cpu_count() or 1
+    if workers == 1 or len(chunks) == 1:
+        return [row for c in chunks for row in _evaluate_chunk(arrays, c, initial_bankroll_cents)]
+    with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as pool:
+        parts = pool.map(_evaluate_chunk, [arrays] * len(chunks), chunks,
+                         [initial_bankroll_cents] * len(chunks))
+        return [row for part in parts for row in part]
+
+
+def search_objective(arrays: TradeArrays, param_sets, fraction: float = 1.0) -> list:
+    """param_search.ParamSearch evaluate callable: summaries on the oldest `fraction` of trades."""
+    return _evaluate_chunk(arrays.head(fraction), list(param_sets), 10000)
+
+
+def bootstrap(arrays: TradeArrays, params: dict, n: int = 1000, seed: int = None,
+              initial_bankroll_cents: int = 10000, batch: int = 2000) -> dict:
+    """
+    Monte Carlo bootstrap: resample the included settled trades with
+    replacement (index matrix, one row per simulation) and replay each
+    sample. Same output as kalshi-backtest.monte_carlo_bootstrap().
+    """
+    base = np.flatnonzero(include_mask(arrays, [params], recalc=False)[0])
+    if len(base) < 10:
+        return {"n_trades": int(len(base))}
+    include = include_mask(arrays, [params])
+    rng = np.random.default_rng(seed)
+    collected = {"win_rate": [], "pnl_cents": [], "sharpe": []}
+    for start in range(0, n, batch):
+        size = min(batch, n - start)
+        order = base[rng.integers(0, len(base), size=(size, len(base)))]
+        m = replay(arrays, [params], include, rows=np.zeros(size, dtype=np.int64), order=order,
+                   initial_bankroll_cents=initial_bankroll_cents)
+        for key in collected:
+            collected[key].append(m[key])
+
+    def dist(values):
+        s = np.sort(np.concatenate(values))
+        return {"mean": float(s.mean()), **{f"p{p}": float(s[int(len(s) * p / 100)]) for p in PCTS}}
+
+    return {
+        "n_simulations": n,
+        "n_trades": int(len(base)),
+        "win_rate": dist(collected["win_rate"]),
+        "pnl_cents": dist(collected["pnl_cents"]),
+        "sharpe_ratio": dist(collected["sharpe"]),
+    }
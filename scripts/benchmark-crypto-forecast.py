@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Crypto Forecast Benchmark - scalar _heuristic_crypto vs the NumPy batch forecaster.
+
+Builds N synthetic BTC/ETH strike markets, prices them with the unified
+trader's per-market model and with crypto_batch_forecast, and reports
+timings plus the largest probability difference between the two.
+
+Usage:
+    python3 scripts/benchmark-crypto-forecast.py
+    python3 scripts/benchmark-crypto-forecast.py --markets 20000
+    python3 scripts/benchmark-crypto-forecast.py --json
+"""
+
+import argparse
+import importlib.util
+import json
+import math
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, SCRIPT_DIR)
+import crypto_batch_forecast  # noqa: E402
+
+
+def load_trader():
+    """Import kalshi-autotrader-unified.py (paper use only; a throwaway key satisfies its startup check)."""
+    key_file = os.path.join(SCRIPT_DIR, '..', '.kalshi-private-key.pem')
+    if not os.path.exists(key_file) and not os.environ.get("KALSHI_PRIVATE_KEY"):
+        from cryptography.hazmat.primitives import serialization
+        from cryptography.hazmat.primitives.asymmetric import rsa
+        key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        os.environ["KALSHI_PRIVATE_KEY"] = key.private_bytes(
+            serialization.Encoding.PEM, serialization.PrivateFormat.TraditionalOpenSSL,
+            serialization.NoEncryption()).decode()
+    spec = importlib.util.spec_from_file_location(
+        "autotrader_unified", os.path.join(SCRIPT_DIR, "kalshi-autotrader-unified.py"))
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+def build_markets(at, n: int, seed: int = 7) -> tuple:
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    spots = {"BTC": 90000.0, "ETH": 3300.0}
+    markets = []
+    for i in range(n):
+        asset = "BTC" if i % 3 else "ETH"
+        strike = round(spots[asset] * rng.uniform(0.9, 1.1), -1 if asset == "ETH" else 2)
+        hours = rng.uniform(0.5, 72)
+        yes = rng.randint(3, 97)
+        markets.append(at.MarketInfo(
+            ticker=f"KX{asset}D-BENCH-T{i}", title=f"{asset} price on {now:%b %d}",
+            subtitle=f"${strike:,.0f} or above", category="crypto",
+            yes_price=yes, no_price=100 - yes, volume=rng.randint(0, 50000), open_interest=0,
+            expiry=(now + timedelta(hours=hours)).isoformat(), status="open", result=""))
+    closes = {a: [s * (1 + 0.004 * math.sin(k / 3)) for k in range(48)] for a, s in spots.items()}
+    context = {
+        "crypto_prices": {"btc": spots["BTC"], "eth": spots["ETH"]},
+        "ohlc": {a.lower(): [[0, 0, 0, 0, c] for c in cs] for a, cs in closes.items()},
+        "momentum": {"btc": {"composite_direction": 0.3}, "eth": {"composite_direction": -0.1}},
+        "sentiment": {"value": 62},
+        "news_sentiment": {"edge_adjustment": 0.01},
+    }
+    return markets, context
+
+
+def run_benchmark(n: int) -> dict:
+    at = load_trader()
+    markets, context = build_markets(at, n)
+    default_vol = {"btc": at.BTC_HOURLY_VOL, "eth": at.ETH_HOURLY_VOL}
+
+    start = time.perf_counter()
+    scalar = [at._heuristic_crypto(m, context)[0] for m in markets]
+    scalar_s = time.perf_counter() - start
+
+    crypto_batch_forecast.parse_strike.cache_clear()
+    crypto_batch_forecast.parse_expiry.cache_clear()
+    start = time.perf_counter()
+    cold = crypto_batch_forecast.batch_crypto_forecast(markets, context, default_vol=default_vol)
+    cold_s = time.perf_counter() - start
+
+    # Next cycle: same markets, parse caches warm
+    start = time.perf_counter()
+    crypto_batch_forecast.batch_crypto_forecast(markets, context, default_vol=default_vol)
+    warm_s = time.perf_counter() - start
+
+    max_diff = max(abs(a - b) for a, b in zip(scalar, cold["prob"].tolist())) if markets else 0.0
+    return {
+        "markets": n,
+        "scalar_ms": round(scalar_s * 1000, 2),
+        "batch_cold_ms": round(cold_s * 1000, 2),
+        "batch_warm_ms": round(warm_s * 1000, 2),
+        "speedup_cold": round(scalar_s / cold_s, 1) if cold_s else 0,
+        "speedup_warm": round(scalar_s / warm_s, 1) if warm_s else 0,
+        "max_prob_diff": max_diff,
+        "priced": int(cold["valid"].sum()),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark scalar vs batch crypto forecaster")
+    parser.add_argument("--markets", type=int, default=5000, help="Synthetic markets (default: 5000)")
+    parser.add_argument("--json", action="store_true", help="Print raw JSON result")
+    args = parser.parse_args()
+
+    result = run_benchmark(args.markets)
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return
+
+    print(f"🧮 Crypto forecast benchmark ({result['markets']:,} markets, {result['priced']:,} priced)")
+    print("-" * 60)
+    print(f"  scalar      {result['scalar_ms']:>10.2f} ms")
+    print(f"  batch cold  {result['batch_cold_ms']:>10.2f} ms  ({result['speedup_cold']}x)")
+    print(f"  batch warm  {result['batch_warm_ms']:>10.2f} ms  ({result['speedup_warm']}x)")
+    print("-" * 60)
+    print(f"  Max |p_scalar - p_batch|: {result['max_prob_diff']:.2e}")
+
+
+if __name__ == "__main__":
+    main()
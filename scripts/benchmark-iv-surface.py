@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+IV Surface Benchmark - per-market scalar bisection vs the vectorized solver.
+
+Builds synthetic BTC/ETH/SOL strike ladders (several expiries each, a
+smile in vol), prices them with the trader's log-normal model, then
+recovers implied vol with:
+  - the former one-market-at-a-time 50-step bisection (reference),
+  - iv_surface.implied_vol over all strikes at once,
+  - IVSurface.from_markets (solve + smile / term-structure fit).
+Reports timings and the worst relative IV error against the true vols.
+
+Usage:
+    python3 scripts/benchmark-iv-surface.py
+    python3 scripts/benchmark-iv-surface.py --strikes 200 --expiries 8
+    python3 scripts/benchmark-iv-surface.py --json
+"""
+
+import argparse
+import json
+import math
+import os
+import sys
+import time
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from crypto_batch_forecast import norm_cdf  # noqa: E402
+from iv_surface import IVSurface, implied_vol  # noqa: E402
+
+SPOT = {"btc": 90000.0, "eth": 3300.0, "sol": 140.0}
+BASE_VOL = {"btc": 0.004, "eth": 0.006, "sol": 0.008}
+
+
+def make_ladders(strikes: int, expiries: int, now: float) -> dict:
+    asset, strike, hours, vol = [], [], [], []
+    for a, spot in SPOT.items():
+        for e in range(expiries):
+            h = 1.0 + 3.0 * e
+            k = spot * np.exp(np.linspace(-2.5, 2.5, strikes) * BASE_VOL[a] * math.sqrt(h))
+            m = np.log(k / spot) / math.sqrt(h)
+            asset += [a] * strikes
+            strike.append(k)
+            hours.append(np.full(strikes, h))
+            vol.append(BASE_VOL[a] * (1 + 2000 * m * m) * (1 + 0.02 * e))
+    strike, hours, vol = np.concatenate(strike), np.concatenate(hours), np.concatenate(vol)
+    spot = np.array([SPOT[a] for a in asset])
+    s = vol * np.sqrt(hours)
+    prob = norm_cdf(np.log(spot / strike) / s - s / 2)
+    return {"asset": asset, "strike": strike, "hours": hours, "vol": vol, "spot": spot, "prob": prob}
+
+
+def scalar_bisection(spot: float, strike: float, hours: float, prob: float):
+    """The former per-market loop: 50 halvings of [0.0001, 0.20] hourly vol."""
+    def model(vol):
+        s = vol * math.sqrt(hours)
+        return float(norm_cdf(np.array(math.log(spot / strike) / s - s / 2)))
+
+    lo, hi = 0.0001, 0.20
+    for _ in range(50):
+        mid = (lo + hi) / 2
+        # Low-vol branch: raising vol moves the price toward 0.5
+        if (model(mid) > prob) == (strike > spot):
+            hi = mid
+        else:
+            lo = mid
+    return (lo + hi) / 2
+
+
+def run_benchmark(strikes: int, expiries: int) -> dict:
+    now = time.time()
+    data = make_ladders(strikes, expiries, now)
+    n = len(data["asset"])
+    ref_vol = np.array([BASE_VOL[a] for a in data["asset"]])
+
+    start = time.perf_counter()
+    scalar = np.array([scalar_bisection(*args) for args in
+                       zip(data["spot"], data["strike"], data["hours"], data["prob"])])
+    scalar_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    iv = implied_vol(data["spot"], data["strike"], data["hours"], data["prob"], ref_vol=ref_vol)
+    vector_s = time.perf_counter() - start
+
+    markets = [SimpleNamespace(
+        ticker=f"KX{a.upper()}D-E{h:g}-T{k:.2f}", title="", subtitle=f"${k:,.2f} or above",
+        yes_price=p * 100, expiry=datetime.fromtimestamp(now + h * 3600, timezone.utc).isoformat())
+        for a, k, h, p in zip(data["asset"], data["strike"], data["hours"], data["prob"])]
+    start = time.perf_counter()
+    surface = IVSurface.from_markets(markets, SPOT, now=now, ref_vol=BASE_VOL)
+    surface_s = time.perf_counter() - start
+
+    ok = np.isfinite(iv)
+    # The old loop only searched the low-vol root; compare it where that root is the only one
+    mono = (data["prob"] >= 0.05) & (data["prob"] <= 0.95) & (data["strike"] < data["spot"])
+    return {
+        "strikes": n,
+        "scalar_ms": round(scalar_s * 1000, 2),
+        "vectorized_ms": round(vector_s * 1000, 2),
+        "surface_ms": round(surface_s * 1000, 2),
+        "speedup": round(scalar_s / vector_s, 1) if vector_s else 0,
+        "solved": int(ok.sum()),
+        "surface_points": surface.solved,
+        "max_rel_error_vectorized": float(np.max(np.abs(iv[ok] - data["vol"][ok]) / data["vol"][ok])),
+        "max_rel_error_scalar": float(np.max(np.abs(scalar[mono] - data["vol"][mono]) / data["vol"][mono])),
+        "atm_btc": [round(float(v), 6) for v in surface.atm("btc", [1, 4, 12])],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark scalar vs vectorized implied-vol solving")
+    parser.add_argument("--strikes", type=int, default=100, help="Strikes per expiry (default: 100)")
+    parser.add_argument("--expiries", type=int, default=8, help="Expiries per asset (default: 8)")
+    parser.add_argument("--json", action="store_true", help="Print raw JSON result")
+    args = parser.parse_args()
+
+    result = run_benchmark(args.strikes, args.expiries)
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return
+
+    print(f"📐 IV surface benchmark ({result['strikes']:,} strikes, 3 assets x {args.expiries} expiries)")
+    print("-" * 60)
+    print(f"  scalar bisection  {result['scalar_ms']:>10.2f} ms  max rel err {result['max_rel_error_scalar']:.2e}")
+    print(f"  vectorized        {result['vectorized_ms']:>10.2f} ms  max rel err "
+          f"{result['max_rel_error_vectorized']:.2e}  ({result['speedup']}x, {result['solved']} solved)")
+    print(f"  surface build     {result['surface_ms']:>10.2f} ms  ({result['surface_points']} points in [5%, 95%])")
+    print(f"  BTC ATM 1h/4h/12h {', '.join(f'{v * 100:.3f}%' for v in result['atm_btc'])}")
+
+
+if __name__ == "__main__":
+    main()
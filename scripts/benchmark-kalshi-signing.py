@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Kalshi Signing Benchmark - per-request signing overhead, legacy vs cached signer.
+
+Legacy: every sign_request() re-parses the PEM (what all traders did before).
+Cached: kalshi_signing.get_signer() parses once and reuses the key object.
+
+Usage:
+    python3 scripts/benchmark-kalshi-signing.py
+    python3 scripts/benchmark-kalshi-signing.py --requests 2000
+    python3 scripts/benchmark-kalshi-signing.py --json
+"""
+
+import argparse
+import base64
+import json
+import os
+import sys
+import time
+
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import padding, rsa
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import kalshi_signing  # noqa: E402
+
+SAMPLE_PATHS = [
+    ("GET", "/trade-api/v2/markets"),
+    ("GET", "/trade-api/v2/portfolio/balance"),
+    ("GET", "/trade-api/v2/portfolio/positions"),
+    ("POST", "/trade-api/v2/portfolio/orders"),
+]
+
+
+def load_or_generate_key() -> str:
+    """Use the real key if present, otherwise a throwaway 2048-bit RSA key."""
+    key_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '.kalshi-private-key.pem')
+    if os.path.exists(key_file):
+        with open(key_file) as f:
+            return f.read().strip()
+    if os.environ.get("KALSHI_PRIVATE_KEY"):
+        return os.environ["KALSHI_PRIVATE_KEY"]
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    return key.private_bytes(serialization.Encoding.PEM,
+                             serialization.PrivateFormat.TraditionalOpenSSL,
+                             serialization.NoEncryption()).decode()
+
+
+def legacy_sign(pem: str, method: str, path: str, timestamp: str) -> str:
+    """The pre-kalshi_signing implementation, kept here for comparison."""
+    private_key = serialization.load_pem_private_key(pem.encode(), password=None)
+    message = f"{timestamp}{method}{path}".encode('utf-8')
+    signature = private_key.sign(
+        message,
+        padding.PSS(mgf=padding.MGF1(hashes.SHA256()), salt_length=padding.PSS.MAX_LENGTH),
+        hashes.SHA256()
+    )
+    return base64.b64encode(signature).decode('utf-8')
+
+
+def time_signing(sign_fn, n: int) -> dict:
+    start = time.perf_counter()
+    for i in range(n):
+        method, path = SAMPLE_PATHS[i % len(SAMPLE_PATHS)]
+        sign_fn(method, path, str(1700000000000 + i))
+    elapsed = time.perf_counter() - start
+    return {
+        "requests": n,
+        "total_ms": round(elapsed * 1000, 1),
+        "per_request_ms": round(elapsed / n * 1000, 3),
+        "signatures_per_sec": round(n / elapsed, 1),
+    }
+
+
+def run_benchmark(n: int) -> dict:
+    pem = load_or_generate_key()
+    parses_before = kalshi_signing.PEM_PARSE_COUNT
+
+    legacy = time_signing(lambda m, p, t: legacy_sign(pem, m, p, t), n)
+    cached = time_signing(lambda m, p, t: kalshi_signing.get_signer(pem).sign(m, p, t), n)
+    cached["pem_parses"] = kalshi_signing.PEM_PARSE_COUNT - parses_before
+    legacy["pem_parses"] = n
+
+    saved = legacy["per_request_ms"] - cached["per_request_ms"]
+    return {
+        "legacy": legacy,
+        "cached": cached,
+        "saved_per_request_ms": round(saved, 3),
+        "speedup": round(legacy["per_request_ms"] / cached["per_request_ms"], 2)
+                   if cached["per_request_ms"] else 0,
+        # A scan + settlement pass is a few hundred signed calls
+        "saved_per_500_calls_ms": round(saved * 500, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Kalshi request signing")
+    parser.add_argument("--requests", type=int, default=500, help="Signatures per variant (default: 500)")
+    parser.add_argument("--json", action="store_true", help="Print raw JSON result")
+    args = parser.parse_args()
+
+    result = run_benchmark(args.requests)
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return
+
+    print(f"🔐 Kalshi signing benchmark ({args.requests} requests each)")
+    print("-" * 60)
+    for name in ("legacy", "cached"):
+        r = result[name]
+        print(f"  {name:<7} {r['per_request_ms']:>8.3f} ms/req  {r['signatures_per_sec']:>9.1f} sig/s  "
+              f"PEM parses: {r['pem_parses']}")
+    print("-" * 60)
+    print(f"  Speedup: {result['speedup']}x  |  saved {result['saved_per_request_ms']:.3f} ms/req "
+          f"(~{result['saved_per_500_calls_ms']:.0f} ms per 500-call cycle)")
+
+
+if __name__ == "__main__":
+    main()
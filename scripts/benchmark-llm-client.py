@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+LLM Client Benchmark - per-query coordinator subprocess vs the resident client.
+
+Starts an in-process mock Ollama server (instant canned responses, so only
+transport overhead is measured), then times N queries with:
+  - the former path: `python local-agent-coordinator.py --query ... --json`
+    spawned per call (what local_llm.delegate used to do),
+  - llm_client.generate over the pooled keep-alive connection,
+  - llm_client.stream (time to first token),
+  - llm_client.agenerate with asyncio.gather.
+
+Usage:
+    python3 scripts/benchmark-llm-client.py
+    python3 scripts/benchmark-llm-client.py --queries 50 --subprocess-queries 5
+    python3 scripts/benchmark-llm-client.py --json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from llm_client import LocalLLMClient  # noqa: E402
+
+COORDINATOR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "local-agent-coordinator.py")
+TOKENS = ["def", " add", "(a,", " b):", " return", " a", " +", " b"]
+
+
+class MockOllama(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like Ollama
+    disable_nagle_algorithm = True  # headers and body go out as separate writes
+
+    def do_GET(self):
+        self._send(json.dumps({"models": [{"name": "mock:1b"}]}).encode())
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        if body.get("stream"):
+            lines = [{"response": t, "done": False} for t in TOKENS]
+            lines.append({"response": "", "done": True, "eval_count": len(TOKENS)})
+            self._send(b"".join(json.dumps(line).encode() + b"\n" for line in lines), "application/x-ndjson")
+        else:
+            self._send(json.dumps({"response": "".join(TOKENS), "done": True,
+                                   "eval_count": len(TOKENS)}).encode())
+
+    def _send(self, data: bytes, ctype: str = "application/json"):
+        self.send_response(200)
+        self.send_header("Content-Type", ctype)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+def _ms(samples: list) -> dict:
+    return {"mean_ms": round(statistics.mean(samples) * 1000, 3),
+            "p50_ms": round(statistics.median(samples) * 1000, 3)}
+
+
+def run_benchmark(queries: int, subprocess_queries: int) -> dict:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), MockOllama)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host = f"http://127.0.0.1:{server.server_port}"
+    try:
+        env = dict(os.environ, OLLAMA_HOST=host)
+        spawned = []
+        for _ in range(subprocess_queries):
+            start = time.perf_counter()
+            subprocess.run([sys.executable, COORDINATOR, "--task", "quick", "--query", "def add", "--json"],
+                           capture_output=True, text=True, env=env, check=True)
+            spawned.append(time.perf_counter() - start)
+
+        client = LocalLLMClient(host)
+        client.generate("warm up", task="quick")
+        resident = []
+        for _ in range(queries):
+            start = time.perf_counter()
+            assert client.generate("def add", task="quick")["success"]
+            resident.append(time.perf_counter() - start)
+
+        first_token = []
+        for _ in range(queries):
+            start = time.perf_counter()
+            tokens = client.stream("def add", task="quick")
+            next(tokens)
+            first_token.append(time.perf_counter() - start)
+            list(tokens)
+
+        async def fan_out():
+            return await asyncio.gather(*(client.agenerate("def add", task="quick") for _ in range(queries)))
+
+        start = time.perf_counter()
+        results = asyncio.run(fan_out())
+        async_s = time.perf_counter() - start
+    finally:
+        server.shutdown()
+
+    sub, res = _ms(spawned), _ms(resident)
+    return {
+        "queries": queries,
+        "subprocess": sub,
+        "resident": res,
+        "stream_first_token": _ms(first_token),
+        "async_gather_total_ms": round(async_s * 1000, 2),
+        "async_ok": sum(r["success"] for r in results),
+        "speedup": round(sub["mean_ms"] / res["mean_ms"], 1) if res["mean_ms"] else 0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark subprocess vs resident local LLM client overhead")
+    parser.add_argument("--queries", type=int, default=200, help="Resident-client queries (default: 200)")
+    parser.add_argument("--subprocess-queries", type=int, default=10,
+                        help="Coordinator subprocess queries (default: 10)")
+    parser.add_argument("--json", action="store_true", help="Print raw JSON result")
+    args = parser.parse_args()
+
+    result = run_benchmark(args.queries, args.subprocess_queries)
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return
+
+    print(f"🤖 Local LLM client overhead (mock Ollama, {result['queries']} queries)")
+    print("-" * 60)
+    print(f"  subprocess per call  mean {result['subprocess']['mean_ms']:>9.2f} ms  "
+          f"p50 {result['subprocess']['p50_ms']:.2f} ms")
+    print(f"  resident client      mean {result['resident']['mean_ms']:>9.2f} ms  "
+          f"p50 {result['resident']['p50_ms']:.2f} ms  ({result['speedup']}x)")
+    print(f"  stream first token   mean {result['stream_first_token']['mean_ms']:>9.2f} ms")
+    print(f"  asyncio.gather       {result['async_gather_total_ms']:.2f} ms total "
+          f"({result['async_ok']}/{result['queries']} ok)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Market Table Benchmark - MarketInfo objects vs the columnar MarketTable.
+
+Builds N synthetic raw Kalshi markets and compares, for the unified
+trader's scanner hot path:
+  - memory per market (tracemalloc) for a list of MarketInfo vs a MarketTable
+  - filter + score + rank time: filter_markets / score_market / sort vs
+    filter_mask / scores / top_k
+
+Usage:
+    python3 scripts/benchmark-market-table.py
+    python3 scripts/benchmark-market-table.py --markets 50000 --top 20
+    python3 scripts/benchmark-market-table.py --json
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, SCRIPT_DIR)
+from crypto_batch_forecast import parse_expiry  # noqa: E402
+from market_table import MarketTable  # noqa: E402
+
+
+def load_trader():
+    """Import kalshi-autotrader-unified.py (paper use only; a throwaway key satisfies its startup check)."""
+    key_file = os.path.join(SCRIPT_DIR, '..', '.kalshi-private-key.pem')
+    if not os.path.exists(key_file) and not os.environ.get("KALSHI_PRIVATE_KEY"):
+        from cryptography.hazmat.primitives import serialization
+        from cryptography.hazmat.primitives.asymmetric import rsa
+        key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        os.environ["KALSHI_PRIVATE_KEY"] = key.private_bytes(
+            serialization.Encoding.PEM, serialization.PrivateFormat.TraditionalOpenSSL,
+            serialization.NoEncryption()).decode()
+    spec = importlib.util.spec_from_file_location(
+        "autotrader_unified", os.path.join(SCRIPT_DIR, "kalshi-autotrader-unified.py"))
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+def build_raw(n: int, seed: int = 11) -> list:
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    return [{
+        "ticker": f"KXBENCH-{i}", "title": f"Benchmark market {i}", "subtitle": "",
+        "category": rng.choice(["crypto", "sports", "economics", "weather"]),
+        "yes_bid": rng.randint(1, 99), "yes_ask": 0, "last_price": rng.randint(1, 99),
+        "volume": rng.choice([0, 50, 250, 1200, 8000, 150000]),
+        "open_interest": rng.randint(0, 20000),
+        "close_time": (now + timedelta(days=rng.uniform(0, 45))).isoformat(),
+        "status": rng.choice(["open", "open", "active", "closed"]), "result": "",
+    } for i in range(n)]
+
+
+def measure(build) -> tuple:
+    """(object, bytes allocated while building it)."""
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    obj = build()
+    size = tracemalloc.get_traced_memory()[0] - base
+    tracemalloc.stop()
+    return obj, size
+
+
+def run_benchmark(n: int, top: int) -> dict:
+    at = load_trader()
+    raw = build_raw(n)
+    fields = [at.market_fields(r) for r in raw]
+
+    markets, objects_bytes = measure(lambda: [at.MarketInfo(*f) for f in fields])
+
+    # The expiry parse cache persists across scan cycles; measure the table itself
+    for f in fields:
+        parse_expiry(f[8])
+
+    def build_table():
+        table = MarketTable()
+        for f in fields:
+            table.append(*f)
+        return table
+    table, table_bytes = measure(build_table)
+
+    start = time.perf_counter()
+    passed = at.filter_markets(markets)
+    ranked = sorted(((m, at.score_market(m)) for m in passed), key=lambda x: x[1], reverse=True)[:top]
+    scalar_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    keep = table.filter_mask(
+        min_volume=at.MIN_VOLUME, min_liquidity=at.MIN_LIQUIDITY,
+        min_dte=at.MIN_DAYS_TO_EXPIRY, max_dte=at.MAX_DAYS_TO_EXPIRY,
+        min_price=at.MIN_PRICE_CENTS, max_price=at.MAX_PRICE_CENTS)
+    candidates = table.take(keep.nonzero()[0])
+    best = candidates.rows(MarketTable.top_k(top, candidates.scores()))
+    vector_s = time.perf_counter() - start
+
+    return {
+        "markets": n,
+        "filtered": len(passed),
+        "object_bytes_per_market": round(objects_bytes / n, 1) if n else 0,
+        "table_bytes_per_market": round(table_bytes / n, 1) if n else 0,
+        "scalar_ms": round(scalar_s * 1000, 2),
+        "vector_ms": round(vector_s * 1000, 2),
+        "speedup": round(scalar_s / vector_s, 1) if vector_s else 0,
+        "same_top": [m.ticker for m, _ in ranked] == [m.ticker for m in best],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark MarketInfo objects vs MarketTable")
+    parser.add_argument("--markets", type=int, default=20000, help="Synthetic markets (default: 20000)")
+    parser.add_argument("--top", type=int, default=20, help="Top-K to rank (default: 20)")
+    parser.add_argument("--json", action="store_true", help="Print raw JSON result")
+    args = parser.parse_args()
+
+    result = run_benchmark(args.markets, args.top)
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return
+
+    print(f"📊 Market table benchmark ({result['markets']:,} markets, {result['filtered']:,} pass filter)")
+    print("-" * 60)
+    print(f"  memory  MarketInfo  {result['object_bytes_per_market']:>8.1f} B/market")
+    print(f"          MarketTable {result['table_bytes_per_market']:>8.1f} B/market")
+    print(f"  filter+score+rank scalar {result['scalar_ms']:>8.2f} ms")
+    print(f"                    vector {result['vector_ms']:>8.2f} ms  ({result['speedup']}x)")
+    print("-" * 60)
+    print(f"  Same top-{args.top}: {'yes' if result['same_top'] else 'NO'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Memory Search Benchmark - BM25 vs hybrid (BM25 + embeddings) over memory/.
+
+Builds a throwaway index of the memory/ notes, embeds every chunk, then
+derives queries from a random sample of chunks and checks whether each
+mode ranks the source chunk in the top k:
+  - keyword:    4 words taken from the chunk,
+  - typo:       the same words with one letter dropped from each (exact
+                token matching misses these),
+  - paraphrase: the chunk rewritten by a local model (--paraphrase, needs
+                Ollama).
+Reports recall@k per query set plus indexing, embedding and per-query
+latency (LRU disabled, so every query hits SQLite / NumPy).
+
+Embedder: Ollama (MEMORY_EMBED_MODEL) when it is reachable and the model
+is installed, else a hashed character-trigram embedder that needs no
+model. The latter only measures the vector / fusion machinery and
+lexical-fuzzy recall, not semantic recall.
+
+Usage:
+    python3 scripts/benchmark-memory-search.py
+    python3 scripts/benchmark-memory-search.py --queries 200 --k 5 --embedder hashing
+    python3 scripts/benchmark-memory-search.py --paraphrase --json
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import statistics
+import sys
+import tempfile
+import time
+import zlib
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from llm_client import get_client  # noqa: E402
+from memory_search import WORKSPACE, MemoryIndex  # noqa: E402
+from memory_vectors import EMBED_MODEL, OllamaEmbedder  # noqa: E402
+
+WORD = re.compile(r"[^\W\d_]{5,}", re.UNICODE)
+
+
+class HashingEmbedder:
+    """Character trigrams hashed into `dim` buckets (no model needed)."""
+
+    model = "hashing-trigram"
+    batch_size = 256
+
+    def __init__(self, dim: int = 384):
+        self.dim = dim
+
+    def __call__(self, texts: list) -> np.ndarray:
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for i, text in enumerate(texts):
+            text = f" {text.lower()} "
+            for j in range(len(text) - 2):
+                out[i, zlib.crc32(text[j:j + 3].encode()) % self.dim] += 1
+        return out
+
+
+def pick_embedder(kind: str):
+    if kind == "hashing":
+        return HashingEmbedder()
+    client = get_client()
+    installed = [m.split(":")[0] for m in client.list_models()]
+    if EMBED_MODEL.split(":")[0] in installed:
+        return OllamaEmbedder()
+    if kind == "ollama":
+        sys.exit(f"❌ Ollama embedding model {EMBED_MODEL} not available")
+    return HashingEmbedder()
+
+
+def _ms(samples: list) -> dict:
+    ordered = sorted(samples)
+    return {"mean_ms": round(statistics.mean(samples) * 1000, 3),
+            "p50_ms": round(statistics.median(samples) * 1000, 3),
+            "p95_ms": round(ordered[int(0.95 * (len(ordered) - 1))] * 1000, 3)}
+
+
+def make_queries(index: MemoryIndex, n: int, rng: random.Random, paraphrase: bool) -> dict:
+    rows = index._conn.execute(
+        "SELECT c.id, c.hash, f.content FROM chunks c JOIN memory_fts f ON f.rowid = c.id").fetchall()
+    sample = rng.sample([r for r in rows if len(set(WORD.findall(r[2]))) >= 8], n)
+    sets = {"keyword": [], "typo": []}
+    if paraphrase:
+        sets["paraphrase"] = []
+    for chunk_id, chunk_hash, content in sample:
+        words = rng.sample(sorted(set(WORD.findall(content))), 4)
+        sets["keyword"].append((" ".join(words), chunk_hash))
+        typos = []
+        for w in words:
+            cut = rng.randrange(1, len(w) - 1)
+            typos.append(w[:cut] + w[cut + 1:])
+        sets["typo"].append((" ".join(typos), chunk_hash))
+        if paraphrase:
+            result = get_client().generate(
+                "Rewrite this note as one short search question, using different words. "
+                f"Reply with the question only.\n\n{content[:1500]}", task="quick", timeout=60)
+            if result["success"]:
+                sets["paraphrase"].append((result["response"].strip(), chunk_hash))
+    return sets
+
+
+def run_benchmark(root: Path, queries: int, k: int, embedder_kind: str, paraphrase: bool, seed: int) -> dict:
+    embedder = pick_embedder(embedder_kind)
+    with tempfile.TemporaryDirectory() as tmp:
+        index = MemoryIndex(Path(tmp) / "bench.db", root=root, globs=("memory/**/*.md",),
+                            cache_size=0, embedder=embedder)
+        start = time.perf_counter()
+        built = index.refresh()
+        index_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        index.refresh()
+        noop_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        synced = index.vectors.sync()
+        embed_s = time.perf_counter() - start
+        start = time.perf_counter()
+        index.vectors.sync()
+        resync_ms = (time.perf_counter() - start) * 1000
+
+        hash_of = dict(index._conn.execute("SELECT id, hash FROM chunks"))
+        sets = make_queries(index, queries, random.Random(seed), paraphrase)
+        recall, latency = {}, {"bm25": [], "hybrid": [], "embed_query": [], "nearest": []}
+        for name, items in sets.items():
+            hits = {"bm25": 0, "hybrid": 0}
+            for query, chunk_hash in items:
+                for mode in hits:
+                    start = time.perf_counter()
+                    results = index.search(query, k, hybrid=(mode == "hybrid"))
+                    latency[mode].append(time.perf_counter() - start)
+                    hits[mode] += any(hash_of.get(r["id"]) == chunk_hash for r in results)
+                start = time.perf_counter()
+                vector = index.vectors.embed_query(query)
+                latency["embed_query"].append(time.perf_counter() - start)
+                start = time.perf_counter()
+                index.vectors.nearest(vector, k)
+                latency["nearest"].append(time.perf_counter() - start)
+            recall[name] = {mode: round(h / len(items), 3) for mode, h in hits.items()} if items else {}
+        vector_stats = index.vectors.stats()
+        index.close()
+
+    return {
+        "root": str(root),
+        "files": built["files"],
+        "chunks": built["chunks"],
+        "embedder": vector_stats["model"],
+        "dim": vector_stats["dim"],
+        "vectors": synced["vectors"],
+        "vector_file_mb": vector_stats["file_mb"],
+        "index_ms": round(index_ms, 1),
+        "noop_refresh_ms": round(noop_ms, 2),
+        "embed_sec": round(embed_s, 2),
+        "embed_chunks_per_sec": round(synced["embedded"] / embed_s, 1) if embed_s > 0 else 0,
+        "noop_resync_ms": round(resync_ms, 2),
+        "k": k,
+        "queries": {name: len(items) for name, items in sets.items()},
+        "recall_at_k": recall,
+        "latency": {mode: _ms(samples) for mode, samples in latency.items() if samples},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark BM25 vs hybrid memory search (latency + recall)")
+    parser.add_argument("--root", type=Path, default=WORKSPACE, help="Workspace containing memory/")
+    parser.add_argument("--queries", type=int, default=100, help="Chunks sampled as query sources (default: 100)")
+    parser.add_argument("--k", type=int, default=10, help="Recall cutoff (default: 10)")
+    parser.add_argument("--embedder", choices=["auto", "ollama", "hashing"], default="auto")
+    parser.add_argument("--paraphrase", action="store_true", help="Also build model-paraphrased queries (Ollama)")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--json", action="store_true", help="Print raw JSON result")
+    args = parser.parse_args()
+
+    result = run_benchmark(args.root, args.queries, args.k, args.embedder, args.paraphrase, args.seed)
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return
+
+    print(f"🔎 Memory search: {result['files']} files, {result['chunks']} chunks, "
+          f"embedder {result['embedder']} ({result['dim']}-d, {result['vector_file_mb']} MB float16)")
+    print("-" * 66)
+    print(f"  full index      {result['index_ms']:>9.1f} ms     no-op refresh {result['noop_refresh_ms']:.2f} ms")
+    print(f"  embed chunks    {result['embed_sec']:>9.2f} s      ({result['embed_chunks_per_sec']} chunks/s, "
+          f"no-op resync {result['noop_resync_ms']:.2f} ms)")
+    print(f"\n  recall@{result['k']:<3}       bm25   hybrid")
+    for name, r in result["recall_at_k"].items():
+        if r:
+            print(f"  {name:<12} ({result['queries'][name]:>3})  {r['bm25']:.3f}   {r['hybrid']:.3f}")
+    print("\n  latency          mean ms    p50 ms    p95 ms")
+    for mode, lat in result["latency"].items():
+        print(f"  {mode:<14} {lat['mean_ms']:>9.3f} {lat['p50_ms']:>9.3f} {lat['p95_ms']:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -31,13 +31,13 @@ Example in heartbeat/cron:
 
 import os
 import sys
-import requests
 import subprocess
 from datetime import datetime
 from typing import Optional, Dict, Any, Tuple
 
 # Add scripts to path for imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from llm_client import get_client  # noqa: E402
 
 # Config
 OLLAMA_URL = os.environ.get("OLLAMA_URL", "http://127.0.0.1:11434")
@@ -51,13 +51,14 @@ TIMEOUT_FAST = 30
 TIMEOUT_CODING = 120
 
 
+def _client():
+    """Resident pooled client for OLLAMA_URL (shared with local_llm and the pipelines)."""
+    return get_client(OLLAMA_URL)
+
+
 def is_available() -> bool:
     """Quick check if Ollama is responding."""
-    try:
-        r = requests.get(f"{OLLAMA_URL}/", timeout=PING_TIMEOUT)
-        return r.status_code == 200
-    except:
-        return False
+    return _client().ping(timeout=PING_TIMEOUT)
 
 
 def _ensure_ollama_running() -> bool:
@@ -97,23 +98,11 @@ def ask(prompt: str, model: str = "llama3.2:3b", timeout: int = TIMEOUT_FAST) ->
         _log_error("ask", "Ollama not available")
         return None
     
-    try:
-        r = requests.post(
-            f"{OLLAMA_URL}/api/generate",
-            json={"model": model, "prompt": prompt, "stream": False},
-            timeout=timeout
-        )
-        if r.status_code == 200:
-            return r.json().get("response", "")
-        else:
-            _log_error("ask", f"HTTP {r.status_code}")
-            return None
-    except requests.Timeout:
-        _log_error("ask", f"Timeout after {timeout}s")
-        return None
-    except Exception as e:
-        _log_error("ask", str(e))
-        return None
+    result = _client().generate(prompt, model=model, timeout=timeout)
+    if result["success"]:
+        return result["response"]
+    _log_error("ask", result["error"])
+    return None
 
 
 def ask_code(prompt: str, model: str = "deepseek-coder:6.7b", timeout: int = TIMEOUT_CODING) -> Optional[str]:
@@ -173,32 +162,19 @@ def health_check() -> Dict[str, Any]:
         return status
     
     # Check available models
-    try:
-        r = requests.get(f"{OLLAMA_URL}/api/tags", timeout=5)
-        if r.status_code == 200:
-            models = r.json().get("models", [])
-            status["models"] = [m.get("name") for m in models]
-    except:
-        pass
+    status["models"] = _client().list_models()
     
     # Quick latency test
-    try:
-        import time
-        start = time.time()
-        r = requests.post(
-            f"{OLLAMA_URL}/api/generate",
-            json={"model": "llama3.2:3b", "prompt": "Say OK", "stream": False},
-            timeout=30
-        )
-        latency = (time.time() - start) * 1000
-        
-        if r.status_code == 200 and "ok" in r.json().get("response", "").lower():
-            status["healthy"] = True
-            status["latency_ms"] = round(latency, 1)
-        else:
-            status["error"] = f"Unexpected response: {r.status_code}"
-    except Exception as e:
-        status["error"] = str(e)
+    import time
+    start = time.time()
+    result = _client().generate("Say OK", model="llama3.2:3b", timeout=30)
+    latency = (time.time() - start) * 1000
+    
+    if result["success"] and "ok" in result["response"].lower():
+        status["healthy"] = True
+        status["latency_ms"] = round(latency, 1)
+    else:
+        status["error"] = result.get("error") or f"Unexpected response: {result['response'][:40]!r}"
     
     # Log if unhealthy
     if not status["healthy"] and status["error"]:
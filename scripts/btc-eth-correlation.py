@@ -18,12 +18,18 @@ from pathlib import Path
 import urllib.request
 import urllib.error
 from typing import Optional
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent))
+import indicators  # noqa: E402
+from ohlc_store import OHLCFetcher, OHLCStore  # noqa: E402
 
 # Configuration
 PROJECT_ROOT = Path(__file__).parent.parent
 DATA_DIR = PROJECT_ROOT / "data" / "trading"
 OUTPUT_FILE = DATA_DIR / "asset-correlation.json"
 CACHE_FILE = DATA_DIR / "price-history-cache.json"
+OHLC_STORE_DIR = PROJECT_ROOT / "data" / "ohlc" / "store"
 HISTORY_FILE = DATA_DIR / "correlation-history.jsonl"  # T723 - track over time
 ALERT_FILE = PROJECT_ROOT / "scripts" / "kalshi-correlation-change.alert"  # T724
 
@@ -92,9 +98,32 @@ def get_historical_prices_binance(days: int = 7) -> Optional[dict]:
     return result
 
 
+def get_historical_prices_store(days: int = 7) -> Optional[dict]:
+    """
+    Hourly closes from the shared local OHLC store.
+    Only candles newer than the last stored one are downloaded.
+    """
+    result = {"btc": [], "eth": [], "source": "ohlc-store"}
+    try:
+        fetcher = OHLCFetcher(OHLCStore(OHLC_STORE_DIR))
+        for key in ("btc", "eth"):
+            candles = fetcher.load(key, "1h", time.time() - days * 86400)
+            if not len(candles):
+                return None
+            result[key] = list(zip(candles[:, 0].tolist(), candles[:, 4].tolist()))
+    except Exception as e:
+        print(f"⚠️ OHLC store unavailable: {e}")
+        return None
+    return result
+
+
 def get_historical_prices(days: int = 7) -> Optional[dict]:
-    """Try Binance first, fall back to CoinGecko."""
-    
+    """Local OHLC store first, then the JSON cache, Binance and CoinGecko."""
+
+    data = get_historical_prices_store(days)
+    if data:
+        return data
+
     # Check cache first
     if CACHE_FILE.exists():
         try:
@@ -187,25 +216,7 @@ def calculate_correlation(btc_prices: list, eth_prices: list) -> float:
     if len(btc_returns) < 2:
         return 0.0
     
-    # Pearson correlation
-    n = len(btc_returns)
-    
-    mean_btc = sum(btc_returns) / n
-    mean_eth = sum(eth_returns) / n
-    
-    # Covariance
-    cov = sum((btc_returns[i] - mean_btc) * (eth_returns[i] - mean_eth) 
-              for i in range(n)) / n
-    
-    # Standard deviations
-    std_btc = (sum((r - mean_btc) ** 2 for r in btc_returns) / n) ** 0.5
-    std_eth = (sum((r - mean_eth) ** 2 for r in eth_returns) / n) ** 0.5
-    
-    if std_btc == 0 or std_eth == 0:
-        return 0.0
-    
-    correlation = cov / (std_btc * std_eth)
-    return max(-1.0, min(1.0, correlation))  # Clamp to [-1, 1]
+    return indicators.correlation(btc_returns, eth_returns)
 
 
 def get_correlation_adjustment(correlation: float) -> dict:
@@ -1,9 +1,12 @@
 #!/usr/bin/env python3
 """
-Cache historical OHLC data from CoinGecko.
-Reduces API calls and enables faster backtesting.
+Cache historical OHLC data in the local candle store (scripts/ohlc_store.py).
+Only candles newer (or older) than what is already stored are downloaded;
+1h candles come from Binance and 4h candles are rolled up from them.
+data/ohlc/{btc,eth}-ohlc.json is re-exported (4h) for older readers only
+when new candles arrive.
 
-Usage: python cache-ohlc-data.py [--days N]
+Usage: python cache-ohlc-data.py [--days N] [--force]
 
 Cron: Run daily at 00:30 UTC
 0 30 * * * cd /Users/mattia/Projects/Onde && python scripts/cache-ohlc-data.py >> scripts/ohlc-cache.log 2>&1
@@ -18,8 +21,12 @@ from pathlib import Path
 import urllib.request
 import urllib.error
 
+sys.path.insert(0, str(Path(__file__).parent))
+from ohlc_store import OHLCFetcher, OHLCStore, as_rows  # noqa: E402
+
 # Config
 CACHE_DIR = Path(__file__).parent.parent / "data" / "ohlc"
+STORE_DIR = CACHE_DIR / "store"
 ASSETS = {
     "bitcoin": "BTC",
     "ethereum": "ETH"
@@ -112,22 +119,34 @@ def main():
     
     print(f"=== OHLC Cache Update - {datetime.now(timezone.utc).isoformat()} ===")
     print(f"Caching {days} days of data")
-    
+
+    fetcher = OHLCFetcher(OHLCStore(STORE_DIR))
+    start = time.time() - days * 86400
+
     for coin_id, symbol in ASSETS.items():
         print(f"\n{symbol}:")
-        
-        if not force and not is_cache_stale(symbol):
-            print("  Cache is fresh, skipping")
+        asset = symbol.lower()
+
+        added = {res: fetcher.ensure(asset, res, start) for res in ("1h", "4h")}
+        candles = fetcher.store.read(asset, "4h", start)
+        print(f"  Store: +{added['1h']} 1h / +{added['4h']} 4h candles, {len(candles)} 4h on disk")
+
+        if len(candles):
+            if added["4h"] or force or is_cache_stale(symbol):
+                save_cache(symbol, as_rows(candles))
+            else:
+                print("  JSON export is current, skipping")
             continue
-        
+
+        # Store sources unavailable: fall back to a full CoinGecko download
         print(f"  Fetching {days} days from CoinGecko...")
         data = fetch_ohlc(coin_id, days)
-        
+
         if data:
             save_cache(symbol, data)
         else:
             print(f"  ERROR: No data received")
-        
+
         time.sleep(API_DELAY)  # Rate limit between assets
     
     print(f"\n✅ Cache update complete")
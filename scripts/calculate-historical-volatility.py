@@ -9,10 +9,13 @@ Output: data/ohlc/volatility-stats.json
 
 import json
 import os
-import math
+import sys
 from datetime import datetime, timezone
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).parent))
+from indicators import CandleSeries, RollingVol, hourly_vol  # noqa: E402
+
 # Project paths
 PROJECT_ROOT = Path(__file__).parent.parent
 OHLC_DIR = PROJECT_ROOT / "data" / "ohlc"
@@ -34,26 +37,6 @@ def load_ohlc(symbol: str) -> dict | None:
     with open(filepath, 'r') as f:
         return json.load(f)
 
-def calculate_log_returns(candles: list) -> list:
-    """Calculate log returns from candle close prices."""
-    returns = []
-    for i in range(1, len(candles)):
-        prev_close = candles[i-1]["close"]
-        curr_close = candles[i]["close"]
-        if prev_close > 0:
-            log_return = math.log(curr_close / prev_close)
-            returns.append(log_return)
-    return returns
-
-def calculate_volatility(returns: list) -> float:
-    """Calculate standard deviation of returns."""
-    if len(returns) < 2:
-        return 0.0
-    
-    mean = sum(returns) / len(returns)
-    variance = sum((r - mean) ** 2 for r in returns) / (len(returns) - 1)
-    return math.sqrt(variance)
-
 def convert_4h_to_hourly_vol(vol_4h: float) -> float:
     """
     Convert 4-hour volatility to hourly.
@@ -74,11 +57,18 @@ def analyze_symbol(symbol: str, periods: dict) -> dict | None:
     # Each candle is 4 hours
     candles_per_day = 6  # 24h / 4h
     
+    # One streaming pass: a sample-std RollingVol per period window
+    series = CandleSeries(candles, indicators={
+        name: RollingVol(window=days * candles_per_day - 1, ddof=1) for name, days in periods.items()})
+    week = CandleSeries(candles[-7 * candles_per_day:])
+    
     results = {
         "symbol": symbol,
         "model_assumption_hourly": MODEL_ASSUMPTIONS.get(symbol, 0),
         "total_candles": total_candles,
         "cache_updated": data.get("updated_at"),
+        # Same definition the trader's dynamic vol uses (7d window, actual candle spacing)
+        "current_hourly_vol": round(hourly_vol(week), 6),
         "periods": {},
     }
     
@@ -95,9 +85,9 @@ def analyze_symbol(symbol: str, periods: dict) -> dict | None:
         # Get most recent candles for this period
         recent_candles = candles[-candles_needed:]
         
-        # Calculate returns and volatility
-        returns = calculate_log_returns(recent_candles)
-        vol_4h = calculate_volatility(returns)
+        # Volatility of the window's log returns
+        vol_ind = series.indicators[period_name]
+        vol_4h = vol_ind.value
         vol_hourly = convert_4h_to_hourly_vol(vol_4h)
         
         # Compare to model assumption
@@ -113,7 +103,7 @@ def analyze_symbol(symbol: str, periods: dict) -> dict | None:
         results["periods"][period_name] = {
             "days": days,
             "candles_used": len(recent_candles),
-            "returns_count": len(returns),
+            "returns_count": vol_ind.count,
             "vol_4h": round(vol_4h * 100, 4),  # As percentage
             "vol_hourly": round(vol_hourly * 100, 4),  # As percentage
             "vol_hourly_decimal": round(vol_hourly, 6),
@@ -8,63 +8,23 @@ Usage: python3 compute-winrate-trend.py [--days 30] [--source v2]
 
 import json
 import argparse
+import sys
 from pathlib import Path
 from datetime import datetime, timedelta
-from collections import defaultdict
 
+sys.path.insert(0, str(Path(__file__).parent))
+from trade_log import TradeLog  # noqa: E402
 
-def load_trades(trades_file: Path) -> list:
-    """Load trades from JSONL file."""
-    trades = []
-    if not trades_file.exists():
-        return trades
-    
-    with open(trades_file) as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                trade = json.loads(line)
-                trades.append(trade)
-            except json.JSONDecodeError:
-                continue
-    return trades
+
+def load_daily(log: TradeLog, sources: list) -> dict:
+    """date -> won / lost / pending / pnl_cents from the shared trade index."""
+    return {row["key"]: {"won": row["won"], "lost": row["lost"], "pending": row["pending"],
+                         "pnl_cents": row["pnl_cents"]}
+            for row in log.group_by("date", sources=sources) if row["key"]}
 
 
-def compute_daily_stats(trades: list, days: int = 30) -> list:
+def compute_daily_stats(daily_trades: dict, days: int = 30) -> list:
     """Compute daily win rate stats."""
-    # Group trades by date
-    daily_trades = defaultdict(lambda: {"won": 0, "lost": 0, "pending": 0, "pnl_cents": 0})
-    
-    for trade in trades:
-        # Get trade date
-        ts = trade.get("timestamp") or trade.get("time")
-        if not ts:
-            continue
-        
-        try:
-            if isinstance(ts, (int, float)):
-                trade_date = datetime.fromtimestamp(ts).strftime("%Y-%m-%d")
-            else:
-                trade_date = ts[:10]  # YYYY-MM-DD
-        except:
-            continue
-        
-        # Get result
-        result = trade.get("result_status", "pending")
-        price = trade.get("price", 50)
-        contracts = trade.get("contracts", 1)
-        
-        if result == "won":
-            daily_trades[trade_date]["won"] += 1
-            daily_trades[trade_date]["pnl_cents"] += (100 - price) * contracts
-        elif result == "lost":
-            daily_trades[trade_date]["lost"] += 1
-            daily_trades[trade_date]["pnl_cents"] -= price * contracts
-        else:
-            daily_trades[trade_date]["pending"] += 1
-    
     # Build output for last N days
     result = []
     end_date = datetime.now()
@@ -118,19 +78,19 @@ def main():
     scripts_dir = Path(__file__).parent
     
     # Load trades based on source
-    trades = []
+    log = TradeLog()
+    log.refresh()
+    sources = []
     if args.source in ["v1", "both"]:
-        v1_trades = load_trades(scripts_dir / "kalshi-trades.jsonl")
-        trades.extend(v1_trades)
-        print(f"📥 Loaded {len(v1_trades)} v1 trades")
-    
+        sources.append("legacy")
+        print(f"📥 Loaded {log.summary(sources=['legacy'])['total']} v1 trades")
+
     if args.source in ["v2", "both"]:
-        v2_trades = load_trades(scripts_dir / "kalshi-trades-v2.jsonl")
-        trades.extend(v2_trades)
-        print(f"📥 Loaded {len(v2_trades)} v2 trades")
-    
+        sources.append("v2")
+        print(f"📥 Loaded {log.summary(sources=['v2'])['total']} v2 trades")
+
     # Compute stats
-    daily_stats = compute_daily_stats(trades, args.days)
+    daily_stats = compute_daily_stats(load_daily(log, sources), args.days)
     
     # Summary
     total_trades = sum(d["trades"] for d in daily_stats)
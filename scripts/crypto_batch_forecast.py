@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Batch Crypto Forecaster
+NumPy version of the unified trader's `_heuristic_crypto` log-normal model,
+scoring every crypto strike market in one pass instead of one at a time.
+
+Per cycle:
+  - strike text and expiry strings are parsed once and cached (lru_cache)
+  - realized hourly vol is read once per asset from the shared indicator
+    series (not recomputed per market)
+  - d2, the normal CDF and the momentum / sentiment / news adjustments are
+    evaluated as array ops over all markets
+  - with an implied-vol surface in the context (iv_surface.py), vols are
+    blended with its smile / term-structure IV, as in the scalar path
+
+Probabilities match the scalar path (same CDF approximation and clamps).
+
+Usage:
+    from crypto_batch_forecast import batch_crypto_forecast
+
+    result = batch_crypto_forecast(markets, context,
+                                   default_vol={"btc": 0.0096, "eth": 0.0118})
+    result["prob"], result["valid"], result["edge"]   # numpy arrays aligned with markets
+"""
+
+import time
+from datetime import datetime
+from functools import lru_cache
+
+import numpy as np
+
+from indicators import CandleSeries, series_for
+
+PROB_FLOOR = 0.05
+PROB_CAP = 0.95
+DEFAULT_MINUTES_LEFT = 60
+
+# Abramowitz & Stegun 7.1.26 (same constants as the scalar norm_cdf)
+_A1, _A2, _A3, _A4, _A5 = 0.254829592, -0.284496736, 1.421413741, -1.453152027, 1.061405429
+_P = 0.3275911
+
+
+def norm_cdf(x: np.ndarray) -> np.ndarray:
+    """Vectorized normal CDF approximation."""
+    sign = np.where(x >= 0, 1.0, -1.0)
+    ax = np.abs(x)
+    t = 1.0 / (1.0 + _P * ax)
+    y = 1.0 - (((((_A5 * t + _A4) * t) + _A3) * t + _A2) * t + _A1) * t * np.exp(-ax * ax / 2)
+    return 0.5 * (1.0 + sign * y)
+
+
+def _parse_strike_text(text: str):
+    if "$" not in text:
+        return None
+    try:
+        return float(text.split("$")[1].split(" ")[0].replace(",", ""))
+    except Exception:
+        return None
+
+
+@lru_cache(maxsize=65536)
+def parse_strike(subtitle: str, title: str) -> float:
+    """Strike from "$88,750 or above"-style text (subtitle first); NaN if none."""
+    for text in (subtitle.lower(), title.lower()):
+        if "$" in text:
+            strike = _parse_strike_text(text)
+            if strike is not None:
+                return strike
+    return float("nan")
+
+
+@lru_cache(maxsize=65536)
+def parse_expiry(expiry: str) -> float:
+    """ISO expiry -> epoch seconds; NaN if unparseable."""
+    try:
+        dt = datetime.fromisoformat(expiry.replace('Z', '+00:00'))
+    except Exception:
+        return float("nan")
+    # Naive timestamps can't be compared to UTC now in the scalar path either
+    return dt.timestamp() if dt.tzinfo is not None else float("nan")
+
+
+def asset_of(ticker: str) -> str:
+    ticker = ticker.upper()
+    return "btc" if "BTC" in ticker else ("eth" if "ETH" in ticker else "sol")
+
+
+def realized_hourly_vol(ohlc: list, default_vol: float, key: str = None) -> float:
+    """
+    Std-dev of the last 24 hourly log returns, clamped to [0.5x, 2.5x] default.
+    With `key`, reads the shared indicator series (same value the scalar path sees).
+    """
+    if not ohlc or len(ohlc) < 10:
+        return default_vol
+    rv = series_for(key, ohlc).indicators["rv24"] if key else CandleSeries(ohlc[-24:]).indicators["rv24"]
+    if not rv.count:
+        return default_vol
+    return max(default_vol * 0.5, min(default_vol * 2.5, rv.value))
+
+
+def batch_crypto_forecast(markets: list, context: dict = None, default_vol: dict = None,
+                          fat_tail_multiplier: float = 1.0, now: float = None,
+                          iv_prior_weight: float = 0.0) -> dict:
+    """
+    Score crypto strike markets in one vectorized pass.
+
+    With context["iv_surface"] (iv_surface.IVSurface) and iv_prior_weight > 0,
+    each market's vol is blended with the surface's IV at its strike / expiry.
+
+    Returns numpy arrays aligned with `markets`: prob (P(YES), market prob
+    where the model can't run), valid (model applied), edge (|prob - market|),
+    plus strike, sigma, hours and distance_pct for logging.
+    """
+    context = context or {}
+    default_vol = default_vol or {}
+    now = time.time() if now is None else now
+    n = len(markets)
+
+    market_prob = np.fromiter((m.yes_price / 100.0 for m in markets), dtype=float, count=n)
+    strikes = np.fromiter((parse_strike(m.subtitle or "", m.title) for m in markets), dtype=float, count=n)
+    expiry_ts = np.fromiter((parse_expiry(m.expiry) for m in markets), dtype=float, count=n)
+    assets = [asset_of(m.ticker) for m in markets]
+
+    # One price / vol / momentum value per asset, broadcast to its markets
+    prices = context.get("crypto_prices", {}) or {}
+    ohlc = context.get("ohlc", {}) or {}
+    momentum = context.get("momentum", {}) or {}
+    asset_names = sorted(set(assets))
+    idx = np.array([asset_names.index(a) for a in assets], dtype=int) if n else np.zeros(0, dtype=int)
+    spot_by_asset = np.array([prices.get(a, 0) or 0 for a in asset_names], dtype=float)
+    vol_by_asset = np.array([realized_hourly_vol(ohlc.get(a, []), default_vol.get(a, 0.005), key=a)
+                             for a in asset_names], dtype=float)
+    mom_by_asset = np.array([(momentum.get(a, {}) or {}).get("composite_direction", 0) or 0
+                             for a in asset_names], dtype=float)
+    spot, hourly_vol, mom_dir = spot_by_asset[idx], vol_by_asset[idx], mom_by_asset[idx]
+
+    minutes_left = np.where(np.isnan(expiry_ts), DEFAULT_MINUTES_LEFT,
+                            np.maximum(1.0, (expiry_ts - now) / 60.0))
+    hours = minutes_left / 60.0
+    surface = context.get("iv_surface")
+    if surface is not None and iv_prior_weight > 0:
+        for k, a in enumerate(asset_names):
+            sel = idx == k
+            hourly_vol[sel] = surface.prior(a, strikes[sel], hours[sel], hourly_vol[sel], iv_prior_weight)
+    sigma = hourly_vol * np.sqrt(hours) * fat_tail_multiplier
+    valid = (spot > 0) & (strikes > 0) & (sigma > 0)  # NaN strike compares False
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        d2 = np.log(spot / strikes) / sigma - sigma / 2
+    prob = np.clip(norm_cdf(np.where(valid, d2, 0.0)), PROB_FLOOR, PROB_CAP)
+    prob = np.clip(prob + mom_dir * 0.03, PROB_FLOOR, PROB_CAP)
+    prob = prob + ((context.get("sentiment", {}) or {}).get("value", 50) - 50) / 1500
+    news = context.get("news_sentiment")
+    if news and news.get("edge_adjustment"):
+        prob = np.clip(prob + news["edge_adjustment"] * 0.5, PROB_FLOOR, PROB_CAP)
+    prob = np.clip(prob, PROB_FLOOR, PROB_CAP)
+    prob = np.where(valid, prob, market_prob)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        distance_pct = np.where(valid, np.abs(spot - strikes) / spot * 100, np.nan)
+
+    return {
+        "prob": prob,
+        "valid": valid,
+        "edge": np.abs(prob - market_prob),
+        "market_prob": market_prob,
+        "strike": strikes,
+        "sigma": sigma,
+        "hours": hours,
+        "distance_pct": distance_pct,
+        "hourly_vol": dict(zip(asset_names, vol_by_asset.tolist())),
+    }
@@ -13,11 +13,14 @@ import json
 import os
 import sys
 import time
-import requests
 from pathlib import Path
 from datetime import datetime, timezone, timedelta
 from typing import Optional, Dict, Any
 
+# Pooled keep-alive HTTP transport shared with the traders
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import http_pool
+
 # File paths
 DRYRUN_TRADES_FILE = Path(__file__).parent / "kalshi-trades-dryrun.jsonl"
 DRYRUN_PORTFOLIO_FILE = Path(__file__).parent.parent / "data" / "trading" / "dryrun-portfolio.json"
@@ -116,7 +119,7 @@ def get_historical_price(asset: str, timestamp: datetime) -> Optional[float]:
     }
     
     try:
-        resp = requests.get(url, params=params, timeout=10)
+        resp = http_pool.get(url, params=params, timeout=10)
         if resp.status_code == 200:
             data = resp.json()
             if data.get('Response') == 'Success' and data.get('Data', {}).get('Data'):
@@ -133,7 +136,7 @@ def get_historical_price(asset: str, timestamp: datetime) -> Optional[float]:
         to_ts = ts + 3600
         url = f"https://api.coingecko.com/api/v3/coins/{symbol.lower()}/market_chart/range"
         params = {'vs_currency': 'usd', 'from': from_ts, 'to': to_ts}
-        resp = requests.get(url, params=params, timeout=10)
+        resp = http_pool.get(url, params=params, timeout=10)
         if resp.status_code == 200:
             data = resp.json()
             prices = data.get('prices', [])
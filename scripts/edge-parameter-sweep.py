@@ -7,16 +7,22 @@ to find the optimal edge cutoff for maximizing win rate and PnL.
 
 Usage:
   python3 scripts/edge-parameter-sweep.py [--output FILE]
+  python3 scripts/edge-parameter-sweep.py --search grid [--workers N]   # joint min/max edge x asset class
 
 Task: T356
 """
 
 import json
 import os
+import sys
 from datetime import datetime, timezone
+from functools import partial
 from pathlib import Path
 from collections import defaultdict
 
+sys.path.insert(0, str(Path(__file__).parent))
+from param_search import ParamSearch, fingerprint, format_front  # noqa: E402
+
 # Config
 SCRIPT_DIR = Path(__file__).parent
 PROJECT_DIR = SCRIPT_DIR.parent
@@ -28,6 +34,13 @@ DEFAULT_OUTPUT = OUTPUT_DIR / "edge-sweep.json"
 # Edge thresholds to test
 EDGE_THRESHOLDS = [0.05, 0.08, 0.10, 0.12, 0.15, 0.20, 0.25, 0.30]
 
+# Joint search space for --search
+SEARCH_SPACE = {
+    "min_edge": EDGE_THRESHOLDS,
+    "max_edge": [0.20, 0.30, 0.50, 1.0],
+    "asset_class": ["all", "crypto", "weather"],
+}
+
 
 def load_trades(log_path: Path) -> list:
     """Load trades from JSONL file"""
@@ -51,9 +64,10 @@ def load_trades(log_path: Path) -> list:
     return trades
 
 
-def calculate_stats(trades: list, min_edge: float) -> dict:
-    """Calculate stats for trades filtered by min_edge threshold"""
-    filtered = [t for t in trades if t.get("edge", 0) >= min_edge]
+def calculate_stats(trades: list, min_edge: float, max_edge: float = None) -> dict:
+    """Calculate stats for trades filtered by min_edge (and optional max_edge) threshold"""
+    filtered = [t for t in trades if t.get("edge", 0) >= min_edge
+                and (max_edge is None or t.get("edge", 0) <= max_edge)]
     
     if not filtered:
         return {
@@ -63,6 +77,7 @@ def calculate_stats(trades: list, min_edge: float) -> dict:
             "losses": 0,
             "win_rate": 0.0,
             "pnl_cents": 0,
+            "max_drawdown_cents": 0,
             "avg_edge": 0.0,
             "avg_cost": 0.0,
             "roi": 0.0
@@ -74,6 +89,8 @@ def calculate_stats(trades: list, min_edge: float) -> dict:
     
     # Calculate PnL
     pnl_cents = 0
+    peak_pnl = 0
+    max_drawdown = 0
     total_cost = 0
     edges = []
     
@@ -94,6 +111,8 @@ def calculate_stats(trades: list, min_edge: float) -> dict:
         else:
             # Loss: lose cost
             pnl_cents -= cost
+        peak_pnl = max(peak_pnl, pnl_cents)
+        max_drawdown = max(max_drawdown, peak_pnl - pnl_cents)
     
     win_rate = (wins / total * 100) if total > 0 else 0
     avg_edge = (sum(edges) / len(edges) * 100) if edges else 0
@@ -109,6 +128,7 @@ def calculate_stats(trades: list, min_edge: float) -> dict:
         "win_rate": round(win_rate, 2),
         "pnl_cents": pnl_cents,
         "pnl_dollars": round(pnl_cents / 100, 2),
+        "max_drawdown_cents": max_drawdown,
         "avg_edge_pct": round(avg_edge, 2),
         "avg_cost_cents": round(avg_cost, 2),
         "roi_pct": round(roi, 2)
@@ -126,6 +146,39 @@ def analyze_by_asset_class(trades: list, min_edge: float) -> dict:
     }
 
 
+def select_asset_class(trades: list, asset_class: str) -> list:
+    if asset_class == "crypto":
+        return [t for t in trades if t.get("asset") in ("BTC", "ETH", "crypto")]
+    if asset_class == "weather":
+        return [t for t in trades if t.get("asset") == "weather"]
+    return trades
+
+
+def evaluate_points(trades: list, param_sets: list, fraction: float = 1.0) -> list:
+    """param_search evaluate callable: stats on the oldest `fraction` of trades."""
+    if fraction < 1.0:
+        trades = trades[:max(1, int(round(len(trades) * fraction)))]
+    rows = []
+    for params in param_sets:
+        stats = calculate_stats(select_asset_class(trades, params["asset_class"]),
+                                params["min_edge"], params["max_edge"])
+        stats["trades"] = stats["total_trades"]
+        rows.append(stats)
+    return rows
+
+
+def run_search(trades: list, strategy: str = "grid", workers: int = None) -> list:
+    """Joint min_edge x max_edge x asset class search; saves data/backtests/pareto-edge-parameter-sweep.json."""
+    search = ParamSearch("edge-parameter-sweep", SEARCH_SPACE, partial(evaluate_points, trades),
+                         data_key=fingerprint(trades), workers=workers)
+    rows = search.grid() if strategy == "grid" else search.halving()
+    front = search.save_front(rows, strategy)
+    print(f"\n🏁 Pareto front (PnL / max drawdown / trades), {search.evaluated} evaluated, "
+          f"{search.cached} cached:")
+    print(format_front(front))
+    return front
+
+
 def find_optimal_threshold(results: list) -> dict:
     """Find the optimal MIN_EDGE threshold based on different criteria"""
     # Filter out zero-trade results
@@ -176,6 +229,9 @@ def main():
     parser.add_argument("--output", "-o", type=Path, default=DEFAULT_OUTPUT,
                        help="Output file path")
     parser.add_argument("--v1", action="store_true", help="Use v1 trade log instead of v2")
+    parser.add_argument("--search", choices=["grid", "halving"],
+                        help="Also run a joint search and save its Pareto front")
+    parser.add_argument("--workers", type=int, help="Processes for --search (0 = all cores; default 1)")
     args = parser.parse_args()
     
     # Load trades
@@ -232,6 +288,8 @@ def main():
                 print(f"  {asset.upper():>8}: {stats['total_trades']} trades, "
                       f"{stats['win_rate']}% WR, ${stats['pnl_dollars']:.2f} PnL")
     
+    pareto = run_search(trades, args.search, args.workers) if args.search else None
+    
     # Save results
     OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
     
@@ -244,6 +302,8 @@ def main():
         "optimal": optimal,
         "asset_breakdown": analyze_by_asset_class(trades, optimal.get("balanced_recommendation", {}).get("min_edge", 0.10))
     }
+    if pareto is not None:
+        output["pareto_front"] = pareto
     
     with open(args.output, 'w') as f:
         json.dump(output, f, indent=2)
@@ -4,6 +4,8 @@ Extract Implied Volatility from Kalshi Binary Option Prices
 
 Reverse-engineers implied volatility from Kalshi market prices using a 
 log-normal model. Compares to realized volatility to find potential mispricings.
+All strikes of a ladder are solved in one vectorized pass (scripts/iv_surface.py,
+the same model and solver the autotrader's IV prior uses).
 
 High IV vs Low Realized = Overpriced options (sell premium via NO bets)
 Low IV vs High Realized = Underpriced options (buy premium via YES bets)
@@ -15,20 +17,18 @@ import os
 import sys
 import json
 import math
+import time
 import argparse
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
 
 # Add scripts dir for imports
 sys.path.insert(0, str(Path(__file__).parent))
+from indicators import realized_vol  # noqa: E402
+from ohlc_store import OHLCFetcher, OHLCStore  # noqa: E402
+from iv_surface import implied_vol  # noqa: E402
 
-# We'll use scipy for optimization if available, else use binary search
-try:
-    from scipy.optimize import brentq
-    HAS_SCIPY = True
-except ImportError:
-    HAS_SCIPY = False
-
+import numpy as np
 import requests
 
 # ============== CONFIG ==============
@@ -72,24 +72,6 @@ def get_crypto_prices():
             return {"BTC": 100000, "ETH": 3000}  # Final fallback
 
 
-def log_normal_prob(current_price, strike, vol, time_hours, side="above"):
-    """
-    Calculate probability of price being above/below strike.
-    Uses log-normal model.
-    """
-    if time_hours <= 0:
-        return 1.0 if current_price > strike else 0.0
-    
-    sigma_t = vol * math.sqrt(time_hours)
-    if sigma_t <= 0:
-        return 0.5
-    
-    d = math.log(current_price / strike) / sigma_t
-    prob_above = 0.5 * (1 + math.erf(d / math.sqrt(2)))
-    
-    return prob_above if side == "above" else (1 - prob_above)
-
-
 def implied_vol_from_price(current_price, strike, time_hours, market_prob, side="above"):
     """
     Reverse-engineer implied volatility from market price.
@@ -98,32 +80,10 @@ def implied_vol_from_price(current_price, strike, time_hours, market_prob, side=
     """
     if time_hours <= 0 or market_prob <= 0 or market_prob >= 1:
         return None
-    
-    # Binary search for implied vol
-    def objective(vol):
-        model_prob = log_normal_prob(current_price, strike, vol, time_hours, side)
-        return model_prob - market_prob
-    
-    # Try to find IV between 0.1% and 20% hourly
-    try:
-        if HAS_SCIPY:
-            iv = brentq(objective, 0.0001, 0.20, xtol=1e-6)
-        else:
-            # Simple binary search
-            low, high = 0.0001, 0.20
-            for _ in range(50):
-                mid = (low + high) / 2
-                diff = objective(mid)
-                if abs(diff) < 1e-6:
-                    break
-                if diff > 0:
-                    high = mid
-                else:
-                    low = mid
-            iv = (low + high) / 2
-        return iv
-    except (ValueError, RuntimeError):
-        return None
+    prob_above = market_prob if side == "above" else 1 - market_prob
+    iv = float(implied_vol(current_price, strike, time_hours, prob_above,
+                           ref_vol=ASSUMED_HOURLY_VOL.get("BTC")))
+    return iv if math.isfinite(iv) else None
 
 
 def fetch_markets(asset="BTC"):
@@ -167,8 +127,20 @@ def fetch_markets(asset="BTC"):
         return []
 
 
+OHLC_STORE_DIR = Path(__file__).parent.parent / "data" / "ohlc" / "store"
+
+
 def calculate_realized_vol(asset="BTC", hours=24):
-    """Calculate realized volatility from cached OHLC data."""
+    """Calculate realized hourly volatility from the local OHLC store (JSON cache fallback)."""
+    try:
+        # hours + 1 closes -> hours returns; only the missing tail is downloaded
+        candles = OHLCFetcher(OHLCStore(OHLC_STORE_DIR)).load(
+            asset.lower(), "1h", time.time() - (hours + 2) * 3600)[-(hours + 1):]
+        if len(candles) >= 3:
+            return realized_vol(candles[:, 4], ddof=1)
+    except Exception as e:
+        print(f"⚠️ OHLC store unavailable for {asset}: {e}")
+
     cache_file = Path(__file__).parent.parent / "data" / "ohlc" / f"{asset.lower()}-ohlc.json"
     
     if not cache_file.exists():
@@ -222,7 +194,7 @@ def analyze_implied_vol(asset="BTC"):
     print(f"   Assumed vol: {ASSUMED_HOURLY_VOL[asset]*100:.3f}%/hour")
     print(f"   Active markets: {len(markets)}")
     
-    results = []
+    rows = []
     for m in markets:
         strike = m["strike"]
         if strike <= 0:
@@ -241,13 +213,18 @@ def analyze_implied_vol(asset="BTC"):
         # Skip extreme prices
         if market_yes_prob <= 0.05 or market_yes_prob >= 0.95:
             continue
-        
-        # Extract implied vol
-        iv = implied_vol_from_price(
-            current_price, strike, time_hours, market_yes_prob, side="above"
-        )
-        
-        if iv is None:
+        rows.append((m, strike, time_hours, market_yes_prob))
+    if not rows:
+        return []
+
+    # Extract implied vol for the whole ladder at once
+    _, strikes, hours, probs = zip(*rows)
+    ivs = implied_vol(current_price, np.array(strikes, dtype=float), np.array(hours), np.array(probs),
+                      ref_vol=ASSUMED_HOURLY_VOL[asset])
+
+    results = []
+    for (m, strike, time_hours, market_yes_prob), iv in zip(rows, ivs.tolist()):
+        if not math.isfinite(iv):
             continue
         
         # Calculate edge signal
@@ -321,7 +298,6 @@ def main():
     args = parser.parse_args()
     
     print(f"=== Kalshi Implied Volatility Analysis - {datetime.now(timezone.utc).isoformat()} ===")
-    print(f"Using scipy: {HAS_SCIPY}")
     
     all_results = []
     
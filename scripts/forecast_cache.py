@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Forecast Cache
+Content-addressed cache for LLM forecast/critique results.
+
+Entries are keyed by ticker + a quantized fingerprint of the market state
+(price bucket, time-to-expiry bucket, regime, news hash, ...), so a market
+whose inputs haven't meaningfully moved reuses the previous answer instead
+of paying for another LLM round-trip. Entries expire after a TTL and the
+least recently used ones are evicted past `max_entries`. The cache is
+persisted as JSON so it survives restarts between cycles.
+
+Usage:
+    from forecast_cache import ForecastCache, fingerprint
+
+    cache = ForecastCache(PROJECT_ROOT / "data" / "trading" / "kalshi-forecast-cache.json")
+    key = f"{ticker}:{fingerprint(price_bucket, tte_bucket, regime, news)}"
+    hit = cache.get(key)            # dict or None
+    cache.put(key, {"forecast": {...}, "critic": {...}})
+    cache.save()
+    print(cache.stats())            # hits, misses, hit_rate, evictions, size
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+
+def fingerprint(*parts) -> str:
+    """Stable short hash of JSON-serializable parts."""
+    raw = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+
+class ForecastCache:
+    """Thread-safe TTL + LRU cache of JSON-serializable values."""
+
+    def __init__(self, path: Path = None, ttl_sec: float = 1800, max_entries: int = 2000):
+        self.path = Path(path) if path else None
+        self.ttl_sec = ttl_sec
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (stored_at, value), oldest use first
+        self.reset_stats()
+        self._load()
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+
+    def _load(self):
+        if not self.path or not self.path.exists():
+            return
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+            now = time.time()
+            for key, stored_at, value in data.get("entries", []):
+                if now - stored_at < self.ttl_sec:
+                    self._entries[key] = (stored_at, value)
+        except Exception:
+            self._entries.clear()
+
+    def save(self):
+        """Persist live entries (atomic replace)."""
+        if not self.path:
+            return
+        now = time.time()
+        with self._lock:
+            entries = [[k, ts, v] for k, (ts, v) in self._entries.items() if now - ts < self.ttl_sec]
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        with open(tmp, "w") as f:
+            json.dump({"saved_at": now, "entries": entries}, f)
+        os.replace(tmp, self.path)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key: str):
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+            stored_at, value = item
+            if time.time() - stored_at >= self.ttl_sec:
+                del self._entries[key]
+                self.expired += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: str, value):
+        with self._lock:
+            self._entries[key] = (time.time(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "expired": self.expired,
+            "evictions": self.evictions,
+            "size": len(self._entries),
+        }
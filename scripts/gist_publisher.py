@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Gist Publisher
+Shared publishing path for every script that pushes dashboard JSON to a
+GitHub Gist (stats, paper stats, agent status, tasks, alerts, paper state).
+
+Producers drop their files into an outbox (data/gist-outbox/<gist_id>/),
+then flush it. A flush takes an exclusive file lock, hashes every queued
+file against the last content actually published, and sends only the
+changed files in a single PATCH per gist through the pooled keep-alive
+session (scripts/http_pool.py) - no `gh` subprocess per push and no file
+contents on argv. Producers that arrive while another flush is running
+wait for the lock and then find their files already sent, so a burst of
+cron jobs collapses into one API call per gist.
+
+The GitHub token comes from GITHUB_TOKEN / GH_TOKEN, else `gh auth token`
+(run once per process). GIST_API_URL points the publisher at another API
+base, e.g. a local mock endpoint in tests.
+
+Usage:
+    import gist_publisher
+
+    gist_publisher.publish(gist_id, {"onde-trading-stats.json": stats_json})
+    gist_publisher.enqueue(gist_id, {"a.json": a})      # queue only
+    gist_publisher.flush()                               # one PATCH per gist
+    gist_publisher.fetch(gist_id, "onde-trading-stats.json")
+
+    python3 scripts/gist_publisher.py --flush            # send anything still queued
+    python3 scripts/gist_publisher.py --status
+"""
+
+import fcntl
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+import http_pool  # noqa: E402
+
+PROJECT_ROOT = Path(__file__).parent.parent
+DEFAULT_OUTBOX = PROJECT_ROOT / "data" / "gist-outbox"
+API_URL = os.environ.get("GIST_API_URL", "https://api.github.com")
+COALESCE_SEC = float(os.environ.get("GIST_COALESCE_SEC", "0"))  # extra wait to gather a burst
+MAX_RETRIES = 3
+TIMEOUT_SEC = 30
+
+
+def _sha(content: str) -> str:
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def _write_atomic(path: Path, data: str):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp, "w") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def github_token() -> str:
+    """GITHUB_TOKEN / GH_TOKEN, else the gh CLI's token (None if neither is available)."""
+    token = os.environ.get("GITHUB_TOKEN") or os.environ.get("GH_TOKEN")
+    if token:
+        return token
+    try:
+        result = subprocess.run(["gh", "auth", "token"], capture_output=True, text=True, timeout=10)
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    if result.returncode != 0:
+        return None
+    return result.stdout.strip() or None
+
+
+class GistPublisher:
+    """Outbox + content-hash diff + one pooled PATCH per gist."""
+
+    def __init__(self, outbox: Path = None, api_url: str = None, token: str = None):
+        self.outbox = Path(outbox) if outbox else DEFAULT_OUTBOX
+        self.api_url = (api_url or API_URL).rstrip("/")
+        self._token = token
+        self._state_path = self.outbox / "published.json"
+        self._lock = threading.Lock()
+        self.requests = 0
+
+    @property
+    def token(self) -> str:
+        if self._token is None:
+            self._token = github_token() or ""
+        return self._token
+
+    def _headers(self) -> dict:
+        headers = {"Accept": "application/vnd.github+json"}
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        return headers
+
+    def _request(self, method: str, path: str, **kwargs):
+        self.requests += 1
+        return http_pool.request(method, f"{self.api_url}{path}", headers=self._headers(),
+                                 timeout=TIMEOUT_SEC, retries=MAX_RETRIES, **kwargs)
+
+    # ── published-hash state ──
+
+    def _load_state(self) -> dict:
+        try:
+            with open(self._state_path) as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    @contextmanager
+    def _locked_state(self):
+        """Exclusive (thread + process) access to the outbox; yields the mutable state dict."""
+        self.outbox.mkdir(parents=True, exist_ok=True)
+        with self._lock, open(self.outbox / ".lock", "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                state = self._load_state()
+                yield state
+                _write_atomic(self._state_path, json.dumps(state, indent=2))
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    # ── producers ──
+
+    def enqueue(self, gist_id: str, files: dict):
+        """Queue {filename: content} for the next flush; a newer content replaces a queued one."""
+        for filename, content in files.items():
+            if "/" in filename or filename.startswith("."):
+                raise ValueError(f"invalid gist filename {filename!r}")
+            _write_atomic(self.outbox / gist_id / filename, content)
+
+    def publish(self, gist_id: str, files: dict) -> dict:
+        """Queue `files` and flush. Returns the flush result for `gist_id`."""
+        self.enqueue(gist_id, files)
+        if COALESCE_SEC:
+            time.sleep(COALESCE_SEC)
+        return self.flush([gist_id])[gist_id]
+
+    # ── flush ──
+
+    def _queued(self, gist_id: str) -> dict:
+        folder = self.outbox / gist_id
+        queued = {}
+        if folder.is_dir():
+            for path in sorted(folder.iterdir()):
+                if path.is_file() and not path.name.startswith("."):
+                    queued[path.name] = path.read_text()
+        return queued
+
+    def _flush_gist(self, gist_id: str, published: dict) -> dict:
+        queued = self._queued(gist_id)
+        hashes = {name: _sha(content) for name, content in queued.items()}
+        changed = [name for name in queued if published.get(name) != hashes[name]]
+        result = {"ok": True, "sent": changed, "unchanged": [n for n in queued if n not in changed]}
+        if changed:
+            body = {"files": {name: {"content": queued[name]} for name in changed}}
+            try:
+                resp = self._request("PATCH", f"/gists/{gist_id}", json=body)
+                result["status"] = resp.status_code
+                result["ok"] = resp.status_code == 200
+                if not result["ok"]:
+                    result["error"] = resp.text[:200]
+            except Exception as e:
+                result["ok"] = False
+                result["error"] = str(e)
+            if not result["ok"]:
+                return result
+            published.update({name: hashes[name] for name in changed})
+        for name in queued:
+            path = self.outbox / gist_id / name
+            # Keep a file a producer replaced while we were sending; it goes out next flush
+            try:
+                if _sha(path.read_text()) == hashes[name]:
+                    path.unlink()
+            except FileNotFoundError:
+                pass
+        return result
+
+    def flush(self, gist_ids=None) -> dict:
+        """Send every queued change, one PATCH per gist. Returns {gist_id: result}."""
+        results = {}
+        with self._locked_state() as state:
+            if gist_ids is None:
+                gist_ids = sorted(p.name for p in self.outbox.iterdir() if p.is_dir())
+            for gist_id in gist_ids:
+                results[gist_id] = self._flush_gist(gist_id, state.setdefault(gist_id, {}))
+        return results
+
+    # ── reads / create ──
+
+    def fetch(self, gist_id: str, filename: str) -> str:
+        """Current content of one gist file (None if missing or unreachable)."""
+        try:
+            resp = self._request("GET", f"/gists/{gist_id}")
+            if resp.status_code != 200:
+                return None
+            info = resp.json().get("files", {}).get(filename)
+            if not info:
+                return None
+            if info.get("truncated") and info.get("raw_url"):
+                raw = http_pool.get(info["raw_url"], headers=self._headers(), timeout=TIMEOUT_SEC)
+                return raw.text if raw.status_code == 200 else None
+            return info.get("content")
+        except Exception:
+            return None
+
+    def create(self, files: dict, description: str = "", public: bool = True) -> str:
+        """Create a gist; returns its id (None on failure) and records the files as published."""
+        body = {"description": description, "public": public,
+                "files": {name: {"content": content} for name, content in files.items()}}
+        try:
+            resp = self._request("POST", "/gists", json=body)
+        except Exception:
+            return None
+        if resp.status_code != 201:
+            return None
+        gist_id = resp.json().get("id")
+        with self._locked_state() as state:
+            state[gist_id] = {name: _sha(content) for name, content in files.items()}
+        return gist_id
+
+    def status(self) -> dict:
+        """{gist_id: {"queued": [...], "published": n}}."""
+        state = self._load_state()
+        ids = set(state)
+        if self.outbox.is_dir():
+            ids |= {p.name for p in self.outbox.iterdir() if p.is_dir()}
+        return {g: {"queued": list(self._queued(g)), "published": len(state.get(g, {}))} for g in sorted(ids)}
+
+
+# Module-level default publisher (lazy)
+_publisher = None
+
+
+def get_publisher() -> GistPublisher:
+    global _publisher
+    if _publisher is None:
+        _publisher = GistPublisher()
+    return _publisher
+
+
+def publish(gist_id: str, files: dict) -> dict:
+    return get_publisher().publish(gist_id, files)
+
+
+def enqueue(gist_id: str, files: dict):
+    get_publisher().enqueue(gist_id, files)
+
+
+def flush(gist_ids=None) -> dict:
+    return get_publisher().flush(gist_ids)
+
+
+def fetch(gist_id: str, filename: str) -> str:
+    return get_publisher().fetch(gist_id, filename)
+
+
+def create(files: dict, description: str = "", public: bool = True) -> str:
+    return get_publisher().create(files, description, public)
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Flush queued gist files (one PATCH per gist)")
+    parser.add_argument("--flush", action="store_true", help="Send queued changes")
+    parser.add_argument("--status", action="store_true", help="Show queued / published files")
+    args = parser.parse_args()
+
+    if args.flush:
+        for gist_id, result in flush().items():
+            mark = "✅" if result["ok"] else "❌"
+            print(f"{mark} {gist_id}: sent {len(result['sent'])}, unchanged {len(result['unchanged'])}"
+                  + (f" ({result['error']})" if result.get("error") else ""))
+    else:
+        print(json.dumps(get_publisher().status(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
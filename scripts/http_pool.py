@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Pooled HTTP Transport
+Shared keep-alive transport for the Kalshi traders and settlement trackers.
+
+One `requests.Session` per host (scheme://netloc), each with its own
+connection pool, so repeated calls to Kalshi / CoinGecko / Binance reuse an
+open TCP+TLS connection instead of handshaking on every request.
+
+Also provides jittered exponential backoff, a token-bucket rate limiter and
+fixed-bucket latency histograms (bounded memory, replaces the old
+per-endpoint list slicing).
+
+Usage:
+    import http_pool
+
+    resp = http_pool.get("https://api.coingecko.com/api/v3/ping", timeout=5)
+    resp = http_pool.post(url, headers=headers, json=body, timeout=10)
+    time.sleep(http_pool.backoff_delay(attempt))
+
+    http_pool.record_latency("markets_search", 183.2)
+    print(http_pool.get_latency_stats())
+
+Config (env):
+    HTTP_POOL_CONNECTIONS   pools kept per session (default 4)
+    HTTP_POOL_MAXSIZE       max connections per host pool (default 16)
+"""
+
+import os
+import random
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict, deque
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+POOL_CONNECTIONS = int(os.environ.get("HTTP_POOL_CONNECTIONS", "4"))
+POOL_MAXSIZE = int(os.environ.get("HTTP_POOL_MAXSIZE", "16"))
+
+BACKOFF_BASE_SEC = 1.0
+BACKOFF_CAP_SEC = 30.0
+
+# Status codes worth retrying (server-side / throttling)
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+_SESSIONS = {}
+_SESSIONS_LOCK = threading.Lock()
+_HOST_REQUESTS = defaultdict(int)
+_HOST_REQUESTS_LOCK = threading.Lock()
+
+
+# ============================================================================
+# SESSIONS
+# ============================================================================
+
+def _host_key(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def configure(pool_connections: int = None, pool_maxsize: int = None):
+    """Change pool sizing. Existing sessions are closed and rebuilt lazily."""
+    global POOL_CONNECTIONS, POOL_MAXSIZE
+    if pool_connections is not None:
+        POOL_CONNECTIONS = pool_connections
+    if pool_maxsize is not None:
+        POOL_MAXSIZE = pool_maxsize
+    close_all()
+
+
+def get_session(url: str) -> requests.Session:
+    """Return the pooled keep-alive session for the host of `url`."""
+    key = _host_key(url)
+    session = _SESSIONS.get(key)
+    if session is not None:
+        return session
+    with _SESSIONS_LOCK:
+        session = _SESSIONS.get(key)
+        if session is None:
+            session = requests.Session()
+            # Retries are handled by callers (Kalshi needs a fresh signature per attempt)
+            adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS,
+                                  pool_maxsize=POOL_MAXSIZE, max_retries=0)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _SESSIONS[key] = session
+    return session
+
+
+def close_all():
+    """Close every pooled session (e.g. on shutdown)."""
+    with _SESSIONS_LOCK:
+        for session in _SESSIONS.values():
+            session.close()
+        _SESSIONS.clear()
+
+
+def backoff_delay(attempt: int, base: float = BACKOFF_BASE_SEC, cap: float = BACKOFF_CAP_SEC) -> float:
+    """Exponential backoff with equal jitter: half fixed, half random."""
+    ceiling = min(cap, base * (2 ** attempt))
+    return ceiling / 2 + random.uniform(0, ceiling / 2)
+
+
+def request(method: str, url: str, retries: int = 0, **kwargs) -> requests.Response:
+    """
+    Send a request through the host's pooled session.
+
+    With retries > 0, timeouts, connection errors and RETRY_STATUS responses
+    are retried with jittered backoff; the last response/exception wins.
+    """
+    session = get_session(url)
+    key = _host_key(url)
+    for attempt in range(retries + 1):
+        with _HOST_REQUESTS_LOCK:
+            _HOST_REQUESTS[key] += 1
+        try:
+            resp = session.request(method, url, **kwargs)
+        except (requests.exceptions.Timeout, requests.exceptions.ConnectionError):
+            if attempt >= retries:
+                raise
+            time.sleep(backoff_delay(attempt))
+            continue
+        if resp.status_code in RETRY_STATUS and attempt < retries:
+            time.sleep(backoff_delay(attempt))
+            continue
+        return resp
+
+
+def get(url: str, **kwargs) -> requests.Response:
+    return request("GET", url, **kwargs)
+
+
+def post(url: str, **kwargs) -> requests.Response:
+    return request("POST", url, **kwargs)
+
+
+def delete(url: str, **kwargs) -> requests.Response:
+    return request("DELETE", url, **kwargs)
+
+
+class TokenBucket:
+    """
+    Thread-safe token-bucket rate limiter.
+
+    `rate` tokens are added per second up to `capacity`; acquire() blocks
+    until enough tokens are available and returns the seconds it waited.
+    """
+
+    def __init__(self, rate: float, capacity: float = None):
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self.waited_sec = 0.0
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill(time.monotonic())
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    self.waited_sec += waited
+                    return waited
+                shortfall = (tokens - self._tokens) / self.rate
+            time.sleep(shortfall)
+            waited += shortfall
+
+
+def get_pool_stats() -> dict:
+    """Requests sent per host and configured pool sizes."""
+    with _HOST_REQUESTS_LOCK:
+        hosts = dict(_HOST_REQUESTS)
+    return {
+        "pool_connections": POOL_CONNECTIONS,
+        "pool_maxsize": POOL_MAXSIZE,
+        "hosts": hosts,
+    }
+
+
+# ============================================================================
+# LATENCY HISTOGRAMS
+# ============================================================================
+
+LATENCY_BUCKETS_MS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class LatencyHistogram:
+    """
+    Fixed-bucket latency histogram plus a bounded window of recent samples.
+
+    Iterating yields the recent (timestamp, latency_ms) samples, so code that
+    used to walk the old per-endpoint lists keeps working. Thread-safe:
+    the scanner and settlement pools record into the same histograms.
+    """
+
+    def __init__(self, window: int = 50):
+        self.counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)  # last bucket = overflow
+        self.total = 0
+        self.sum_ms = 0.0
+        self.max_ms = 0.0
+        self.recent = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, latency_ms: float, timestamp: float = None):
+        bucket = bisect_left(LATENCY_BUCKETS_MS, latency_ms)
+        sample = (timestamp if timestamp is not None else time.time(), latency_ms)
+        with self._lock:
+            self.counts[bucket] += 1
+            self.total += 1
+            self.sum_ms += latency_ms
+            self.max_ms = max(self.max_ms, latency_ms)
+            self.recent.append(sample)
+
+    def __len__(self):
+        return len(self.recent)
+
+    def __iter__(self):
+        with self._lock:
+            return iter(list(self.recent))
+
+    def recent_avg(self) -> float:
+        with self._lock:
+            samples = [lat for _, lat in self.recent]
+        return sum(samples) / len(samples) if samples else 0.0
+
+    def percentile(self, pct: float) -> float:
+        """Bucket upper bound containing the pct-th percentile (all-time)."""
+        with self._lock:
+            counts, total, max_ms = list(self.counts), self.total, self.max_ms
+        return self._percentile(counts, total, max_ms, pct)
+
+    @staticmethod
+    def _percentile(counts: list, total: int, max_ms: float, pct: float) -> float:
+        if not total:
+            return 0.0
+        rank = pct / 100.0 * total
+        seen = 0
+        for i, count in enumerate(counts):
+            seen += count
+            if seen >= rank:
+                return float(LATENCY_BUCKETS_MS[i]) if i < len(LATENCY_BUCKETS_MS) else max_ms
+        return max_ms
+
+    def to_dict(self) -> dict:
+        labels = [f"le_{b}" for b in LATENCY_BUCKETS_MS] + ["inf"]
+        with self._lock:
+            counts, total, sum_ms, max_ms = list(self.counts), self.total, self.sum_ms, self.max_ms
+            recent = [lat for _, lat in self.recent]
+        return {
+            "count": total,
+            "avg_ms": round(sum_ms / total, 1) if total else 0.0,
+            "recent_avg_ms": round(sum(recent) / len(recent), 1) if recent else 0.0,
+            "p50_ms": self._percentile(counts, total, max_ms, 50),
+            "p95_ms": self._percentile(counts, total, max_ms, 95),
+            "max_ms": round(max_ms, 1),
+            "buckets": dict(zip(labels, counts)),
+        }
+
+
+class LatencyRegistry(dict):
+    """endpoint -> LatencyHistogram, created on first access."""
+
+    def __init__(self, window: int = 50):
+        super().__init__()
+        self.window = window
+
+    def __missing__(self, endpoint):
+        # setdefault keeps concurrent first-touches from racing
+        return self.setdefault(endpoint, LatencyHistogram(self.window))
+
+    def record(self, endpoint: str, latency_ms: float):
+        self[endpoint].record(latency_ms)
+
+    def stats(self) -> dict:
+        return {endpoint: hist.to_dict() for endpoint, hist in self.items()}
+
+
+# Default registry for scripts that don't keep their own
+LATENCY = LatencyRegistry()
+
+
+def record_latency(endpoint: str, latency_ms: float):
+    LATENCY.record(endpoint, latency_ms)
+
+
+def get_latency_stats() -> dict:
+    return LATENCY.stats()
@@ -0,0 +1,521 @@
+#!/usr/bin/env python3
+"""
+Technical Indicators
+One streaming indicator library for the traders and the crypto cron jobs
+(momentum regime, historical volatility, BTC/ETH correlation), so they all
+compute momentum, volatility and regime inputs the same way.
+
+A CandleSeries keeps OHLC in growable NumPy arrays. Every indicator attached
+to it is updated in O(1) per appended candle:
+  - EWMAVol            RiskMetrics EWMA of log returns (lambda 0.94)
+  - RollingVol         std-dev of the last N log returns (running sums)
+  - ATR                mean true range over the last N candles
+  - ADX                Wilder-smoothed ADX, plus +DI/-DI over the last N moves
+  - RangeMean          mean (high - low) / low over the last N candles
+  - RollingCorrelation Pearson correlation of two return streams
+
+`series_for(key, rows)` keeps one series per key across calls and only
+appends candles newer than the last one it has, so a trader cycle pays for
+new candles instead of re-walking history (and every market priced in that
+cycle reads the same values).
+
+Usage:
+    from indicators import CandleSeries, series_for, multi_timeframe_momentum, hourly_vol
+
+    series = series_for("btc", ohlc_rows)      # [[ts, o, h, l, c], ...] or dicts
+    series.value("rv24")                       # realized vol, last 24 closes
+    series.value("adx14"), series.indicators["adx14"].plus_di
+    multi_timeframe_momentum(series.close)     # 1h / 4h / 24h composite
+    hourly_vol(series)                         # per-candle vol scaled to 1 hour
+"""
+
+import math
+from collections import deque
+
+import numpy as np
+
+EWMA_LAMBDA = 0.94
+MOMENTUM_TIMEFRAMES = {"1h": 1, "4h": 4, "24h": 24}
+MOMENTUM_WEIGHTS = {"1h": 0.5, "4h": 0.3, "24h": 0.2}
+MOMENTUM_FLAT_BAND = 0.002    # |pct change| below this = no direction
+MOMENTUM_FULL_STRENGTH = 0.03  # 3% move = strength 1.0
+RESUM_EVERY = 1000  # rebuild running sums from the window this often (bounds float drift)
+
+
+# ── streaming indicators ──
+
+class _RollingSum:
+    """Sum of the last `window` values (all values if window is None)."""
+
+    __slots__ = ("window", "values", "total", "_since_resum")
+
+    def __init__(self, window: int = None):
+        self.window = window
+        self.values = deque()
+        self.total = 0.0
+        self._since_resum = 0
+
+    def push(self, x: float):
+        self.values.append(x)
+        self.total += x
+        if self.window is not None and len(self.values) > self.window:
+            self.total -= self.values.popleft()
+        self._since_resum += 1
+        if self._since_resum >= RESUM_EVERY and self.window is not None:
+            self.total = math.fsum(self.values)
+            self._since_resum = 0
+
+    def __len__(self):
+        return len(self.values)
+
+
+class EWMAVol:
+    """EWMA volatility of log returns, seeded with the first squared return."""
+
+    def __init__(self, lam: float = EWMA_LAMBDA):
+        self.lam = lam
+        self.var = None
+        self.count = 0
+
+    def update(self, candle, prev):
+        if prev is None:
+            return
+        r = math.log(candle[4] / prev[4])
+        self.var = r * r if self.var is None else self.lam * self.var + (1 - self.lam) * r * r
+        self.count += 1
+
+    @property
+    def value(self) -> float:
+        return math.sqrt(self.var) if self.var is not None else 0.0
+
+
+class RollingVol:
+    """Std-dev of the last `window` log returns (population by default)."""
+
+    def __init__(self, window: int = None, ddof: int = 0):
+        self.ddof = ddof
+        self._sum = _RollingSum(window)
+        self._sumsq = _RollingSum(window)
+
+    def update(self, candle, prev):
+        if prev is None:
+            return
+        r = math.log(candle[4] / prev[4])
+        self._sum.push(r)
+        self._sumsq.push(r * r)
+
+    @property
+    def count(self) -> int:
+        return len(self._sum)
+
+    @property
+    def value(self) -> float:
+        n = len(self._sum)
+        if n - self.ddof <= 0:
+            return 0.0
+        var = (self._sumsq.total - self._sum.total ** 2 / n) / (n - self.ddof)
+        return math.sqrt(max(0.0, var))
+
+
+def _true_range(candle, prev) -> float:
+    high, low, prev_close = candle[2], candle[3], prev[4]
+    return max(high - low, abs(high - prev_close), abs(low - prev_close))
+
+
+class ATR:
+    """Average true range: mean of the last `period` true ranges."""
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self._tr = _RollingSum(period)
+
+    def update(self, candle, prev):
+        if prev is not None:
+            self._tr.push(_true_range(candle, prev))
+
+    @property
+    def value(self) -> float:
+        # Same warm-up as before: needs period + 1 candles
+        return self._tr.total / self.period if len(self._tr) >= self.period else 0.0
+
+
+class ADX:
+    """
+    Wilder-smoothed Average Directional Index.
+
+    `value` is the ADX; `plus_di` / `minus_di` are the directional indicators
+    over the last `period` moves (plain sums, as the momentum regime score
+    uses them for directional consistency).
+    """
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self._tr = _RollingSum(period)
+        self._plus = _RollingSum(period)
+        self._minus = _RollingSum(period)
+        self._moves = 0
+        self._atr = self._pdm = self._mdm = 0.0  # Wilder-smoothed sums
+        self._dx_seed = []
+        self.adx = None
+
+    def update(self, candle, prev):
+        if prev is None:
+            return
+        tr = _true_range(candle, prev)
+        up, down = candle[2] - prev[2], prev[3] - candle[3]
+        pdm = up if up > down and up > 0 else 0.0
+        mdm = down if down > up and down > 0 else 0.0
+        self._tr.push(tr)
+        self._plus.push(pdm)
+        self._minus.push(mdm)
+
+        p = self.period
+        self._moves += 1
+        if self._moves <= p:
+            self._atr += tr
+            self._pdm += pdm
+            self._mdm += mdm
+            if self._moves < p:
+                return
+        else:
+            self._atr += tr - self._atr / p
+            self._pdm += pdm - self._pdm / p
+            self._mdm += mdm - self._mdm / p
+
+        dx = self._dx(self._pdm, self._mdm, self._atr)
+        if self.adx is None:
+            self._dx_seed.append(dx)
+            if len(self._dx_seed) == p:
+                self.adx = sum(self._dx_seed) / p
+        else:
+            self.adx = (self.adx * (p - 1) + dx) / p
+
+    @staticmethod
+    def _dx(pdm: float, mdm: float, tr: float) -> float:
+        if tr <= 0:
+            return 0.0
+        plus, minus = pdm / tr * 100, mdm / tr * 100
+        return abs(plus - minus) / (plus + minus) * 100 if plus + minus else 0.0
+
+    @property
+    def plus_di(self) -> float:
+        if len(self._tr) < self.period or self._tr.total <= 0:
+            return 0.0
+        return self._plus.total / self._tr.total * 100
+
+    @property
+    def minus_di(self) -> float:
+        if len(self._tr) < self.period or self._tr.total <= 0:
+            return 0.0
+        return self._minus.total / self._tr.total * 100
+
+    @property
+    def value(self) -> float:
+        return self.adx if self.adx is not None else 0.0
+
+
+class RangeMean:
+    """Mean of (high - low) / low over the last `window` candles with a positive low."""
+
+    def __init__(self, window: int = 24):
+        self.window = window
+        self._ranges = deque()
+        self._total = 0.0
+        self._valid = 0
+
+    def update(self, candle, prev):
+        low = candle[3]
+        r = (candle[2] - low) / low if low > 0 else None
+        self._ranges.append(r)
+        if r is not None:
+            self._total += r
+            self._valid += 1
+        if len(self._ranges) > self.window:
+            old = self._ranges.popleft()
+            if old is not None:
+                self._total -= old
+                self._valid -= 1
+
+    @property
+    def value(self) -> float:
+        return self._total / self._valid if self._valid else 0.0
+
+
+class RollingCorrelation:
+    """Pearson correlation of paired observations over the last `window` pairs."""
+
+    def __init__(self, window: int = None):
+        self._x, self._y = _RollingSum(window), _RollingSum(window)
+        self._xx, self._yy, self._xy = _RollingSum(window), _RollingSum(window), _RollingSum(window)
+
+    def update(self, x: float, y: float):
+        self._x.push(x)
+        self._y.push(y)
+        self._xx.push(x * x)
+        self._yy.push(y * y)
+        self._xy.push(x * y)
+
+    @property
+    def count(self) -> int:
+        return len(self._x)
+
+    @property
+    def value(self) -> float:
+        n = len(self._x)
+        if n < 2:
+            return 0.0
+        sx, sy = self._x.total, self._y.total
+        cov = self._xy.total - sx * sy / n
+        vx = self._xx.total - sx * sx / n
+        vy = self._yy.total - sy * sy / n
+        if vx <= 0 or vy <= 0:
+            return 0.0
+        return max(-1.0, min(1.0, cov / math.sqrt(vx * vy)))
+
+
+def default_indicators() -> dict:
+    """The standard set every series tracks."""
+    return {
+        "ewma": EWMAVol(),
+        "rv24": RollingVol(window=23),   # last 24 closes
+        "atr14": ATR(14),
+        "adx14": ADX(14),
+        "range24": RangeMean(24),
+    }
+
+
+# ── candle store ──
+
+def _normalize_row(row):
+    """[ts, o, h, l, c] list or {"timestamp", "open", ...} dict -> float tuple (ts in seconds), or None."""
+    try:
+        if isinstance(row, dict):
+            ts, o, h, l, c = (row.get("timestamp") or 0, row.get("open") or 0, row.get("high") or 0,
+                              row.get("low") or 0, row.get("close") or 0)
+        else:
+            if not row or len(row) < 5:
+                return None
+            ts, o, h, l, c = (v or 0 for v in row[:5])
+        ts, c = float(ts), float(c)
+    except (TypeError, ValueError):
+        return None
+    if c <= 0:
+        return None
+    if ts > 1e11:  # milliseconds
+        ts /= 1000.0
+    return ts, float(o), float(h), float(l), c
+
+
+class CandleSeries:
+    """
+    NumPy OHLC arrays with indicators updated on every append. With `maxlen`
+    the arrays keep only the newest candles (indicators keep their own state).
+    """
+
+    def __init__(self, rows=None, indicators: dict = None, maxlen: int = None, capacity: int = 256):
+        self.maxlen = maxlen
+        self._data = np.zeros((5, max(16, capacity, 2 * (maxlen or 0))), dtype=float)
+        self._start = 0
+        self._n = 0
+        self.indicators = default_indicators() if indicators is None else dict(indicators)
+        if rows:
+            self.extend(rows)
+
+    def __len__(self):
+        return self._n
+
+    def _col(self, i):
+        return self._data[i, self._start:self._start + self._n]  # view, no copy
+
+    ts = property(lambda self: self._col(0))
+    open = property(lambda self: self._col(1))
+    high = property(lambda self: self._col(2))
+    low = property(lambda self: self._col(3))
+    close = property(lambda self: self._col(4))
+
+    @property
+    def last_ts(self):
+        return float(self._data[0, self._start + self._n - 1]) if self._n else None
+
+    def candle(self, i: int) -> tuple:
+        return tuple(self._data[:, self._start + (i if i >= 0 else self._n + i)].tolist())
+
+    def append(self, row) -> bool:
+        """Add one candle (list or dict row); rows without a positive close are ignored."""
+        candle = _normalize_row(row)
+        if candle is None:
+            return False
+        prev = self.candle(-1) if self._n else None
+        if self.maxlen and self._n >= self.maxlen:
+            self._start += self._n - self.maxlen + 1
+            self._n = self.maxlen - 1
+        end = self._start + self._n
+        if end == self._data.shape[1]:
+            if self._start:  # slide the window back to the front (amortized O(1))
+                self._data[:, :self._n] = self._data[:, self._start:end]
+                self._start = 0
+            else:
+                grown = np.zeros((5, self._n * 2), dtype=float)
+                grown[:, :self._n] = self._data
+                self._data = grown
+        self._data[:, self._start + self._n] = candle
+        self._n += 1
+        for ind in self.indicators.values():
+            ind.update(candle, prev)
+        return True
+
+    def extend(self, rows) -> int:
+        return sum(1 for row in rows if self.append(row))
+
+    def attach(self, name: str, indicator):
+        """Add an indicator and replay the existing candles through it."""
+        prev = None
+        for i in range(self._n):
+            candle = self.candle(i)
+            indicator.update(candle, prev)
+            prev = candle
+        self.indicators[name] = indicator
+        return indicator
+
+    def value(self, name: str) -> float:
+        return self.indicators[name].value
+
+    def interval_sec(self) -> float:
+        """Average spacing between candles (0 if unknown)."""
+        if self._n < 2:
+            return 0.0
+        ts = self.ts
+        return max(0.0, (ts[-1] - ts[0]) / (self._n - 1))
+
+
+_registry = {}  # key -> [series, rows object, rows length]
+
+
+def series_for(key: str, rows) -> CandleSeries:
+    """
+    The CandleSeries for `key`, brought up to date with `rows`.
+
+    Passing the same rows object again is O(1). Rows that continue the
+    series (newer timestamps) are appended and the series keeps a window of
+    len(rows) candles; anything else (a different source, rewritten
+    history, rows without timestamps) rebuilds it.
+    """
+    entry = _registry.get(key)
+    if entry is not None and entry[1] is rows and entry[2] == len(rows):
+        return entry[0]
+    series = entry[0] if entry is not None else None
+    if series is not None and len(series) and rows:
+        last_ts = series.last_ts
+        first, newest = _normalize_row(rows[0]), _normalize_row(rows[-1])
+        if first and newest and first[0] < newest[0] and first[0] <= last_ts <= newest[0]:
+            k = len(rows) - 1
+            while k > 0:
+                row = _normalize_row(rows[k])
+                if row is not None and row[0] <= last_ts:
+                    break
+                k -= 1
+            row = _normalize_row(rows[k])
+            # Continue only if our last candle is exactly the one in `rows` (not a since-updated bar)
+            if row is not None and row[0] == last_ts and row[4] == series.close[-1]:
+                series.maxlen = max(2, len(rows))
+                series.extend(rows[k + 1:])
+                _registry[key] = [series, rows, len(rows)]
+                return series
+    series = CandleSeries(rows, maxlen=max(2, len(rows)))
+    _registry[key] = [series, rows, len(rows)]
+    return series
+
+
+def reset_registry():
+    _registry.clear()
+
+
+# ── derived measures ──
+
+def hourly_vol(series: CandleSeries) -> float:
+    """
+    Std-dev of all log returns in the series, scaled from the candle
+    interval to one hour. This is the "current vol" the traders' dynamic
+    volatility and the historical-volatility report both use.
+    """
+    close = series.close
+    if len(close) < 2:
+        return 0.0
+    returns = np.diff(np.log(close))
+    candle_hours = series.interval_sec() / 3600 or 1.0
+    return float(np.std(returns)) / math.sqrt(max(1.0, candle_hours))
+
+
+def realized_vol(closes, ddof: int = 0) -> float:
+    """Std-dev of log returns over a close-price array (vectorized, one shot)."""
+    closes = np.asarray(closes, dtype=float)
+    closes = closes[closes > 0]
+    if len(closes) - 1 - ddof <= 0:
+        return 0.0
+    return float(np.std(np.diff(np.log(closes)), ddof=ddof))
+
+
+def correlation(x, y) -> float:
+    """Pearson correlation of two equal-length sequences (0 if degenerate)."""
+    rc = RollingCorrelation()
+    for a, b in zip(x, y):
+        rc.update(a, b)
+    return rc.value
+
+
+def timeframe_momentum(closes, timeframe: str) -> dict:
+    """Direction / strength / pct change of the close vs `timeframe` candles back."""
+    result = {"direction": 0, "strength": 0, "pct_change": 0}
+    if closes is None or len(closes) < 4:
+        return result
+    n = min(MOMENTUM_TIMEFRAMES.get(timeframe, 4), len(closes))
+    current, old = closes[-1], closes[-n]
+    if not current or not old:
+        return result
+    pct_change = float((current - old) / old)
+    result["pct_change"] = pct_change
+    result["direction"] = 1 if pct_change > MOMENTUM_FLAT_BAND else (-1 if pct_change < -MOMENTUM_FLAT_BAND else 0)
+    result["strength"] = min(1.0, abs(pct_change) / MOMENTUM_FULL_STRENGTH)
+    return result
+
+
+def multi_timeframe_momentum(closes) -> dict:
+    """Weighted 1h / 4h / 24h momentum with an all-timeframes-agree flag."""
+    result = {"timeframes": {}, "composite_direction": 0, "composite_strength": 0, "alignment": False}
+    if closes is None or not len(closes):
+        return result
+    comp_dir = comp_str = 0
+    for tf, weight in MOMENTUM_WEIGHTS.items():
+        mom = timeframe_momentum(closes, tf)
+        result["timeframes"][tf] = mom
+        comp_dir += mom["direction"] * weight
+        comp_str += mom["strength"] * weight
+    result["composite_direction"] = comp_dir
+    result["composite_strength"] = comp_str
+    dirs = [result["timeframes"][tf]["direction"] for tf in MOMENTUM_WEIGHTS]
+    result["alignment"] = all(d > 0 for d in dirs) or all(d < 0 for d in dirs)
+    return result
+
+
+def volatility_class(avg_range: float) -> str:
+    return ("very_low" if avg_range < 0.003 else "low" if avg_range < 0.005 else
+            "normal" if avg_range < 0.01 else "high" if avg_range < 0.02 else "very_high")
+
+
+def regime_features(series: CandleSeries, lookback: int = None) -> dict:
+    """
+    Price change over 4 candles and over the `lookback` window (default: the
+    whole series), plus the candle-range volatility class, for regime detection.
+    """
+    close = series.close
+    current = float(close[-1])
+    lookback = min(lookback or len(close), len(close))
+    price_4h = float(close[-4]) if len(close) >= 4 else current
+    price_24h = float(close[-lookback]) if len(close) >= 24 else current
+    avg_range = series.value("range24") if "range24" in series.indicators else 0.0
+    return {
+        "change_4h": (current - price_4h) / price_4h if price_4h else 0,
+        "change_24h": (current - price_24h) / price_24h if price_24h else 0,
+        "avg_range": avg_range,
+        "volatility": volatility_class(avg_range),
+    }
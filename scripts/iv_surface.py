@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Implied-Vol Surface
+Market-implied hourly volatility for every strike and expiry of the
+BTC / ETH / SOL "above / below $X" ladders, solved in one vectorized pass.
+
+The model is the unified trader's own crypto heuristic:
+
+    P(above) = norm_cdf(ln(S/K) / s - s / 2),   s = vol * sqrt(hours) * fat_tail_multiplier
+
+so an implied vol plugged back into `_heuristic_crypto` reproduces the
+market price. For a strike below spot P falls monotonically in s; for a
+strike above spot it rises up to s = sqrt(2 ln(K/S)) and falls after, so
+near the money both roots are solved and the one nearer a reference vol
+kept. Every market is inverted at once by bisection on log s (SOLVE_STEPS
+array steps, no per-market loop or scipy): a few thousand strikes in
+milliseconds.
+
+The solved points are smoothed into a surface:
+  - smile: per (asset, expiry), a quadratic in standardised moneyness
+    ln(K/S)/sqrt(hours), clamped to the observed moneyness and IV range;
+  - term structure: between expiries, total variance iv^2 * hours is
+    interpolated linearly in hours (flat outside the listed expiries).
+
+The trader builds one surface per cycle (context["iv_surface"]) and blends
+`lookup` into the realized vol as a market-implied prior (`prior`), in both
+the scalar heuristic and the batch forecaster. Because the prior comes from
+the smoothed smile, a strike priced off its own ladder still shows an edge.
+
+Usage:
+    from iv_surface import IVSurface, implied_vol
+
+    iv = implied_vol(spot, strikes, hours, yes_probs)       # arrays in, NaN where no root
+    surface = IVSurface.from_markets(crypto_markets, {"btc": 90500, "eth": 3300})
+    surface.lookup("btc", 91000, hours=6)                   # smile + term-structure vol
+    surface.atm("eth", [1, 6, 24])                          # ATM term structure
+    surface.prior("btc", strikes, hours, realized, weight=0.5)
+"""
+
+import time
+
+import numpy as np
+
+from crypto_batch_forecast import asset_of, norm_cdf, parse_expiry, parse_strike
+
+MIN_PROB = 0.05      # same cut as extract-implied-vol.py: IV is unstable at the tails
+MAX_PROB = 0.95
+SIGMA_MIN = 1e-5     # bracket on total sigma s = vol * sqrt(hours)
+SIGMA_MAX = 3.0
+VOL_MAX = 0.20       # hourly; higher "roots" are artefacts (extract-implied-vol.py's old bracket)
+SOLVE_STEPS = 40     # bisection halvings on log s (bracket ratio 3e5 -> ~1e-11 relative)
+REF_VOL = 0.005      # hourly; picks the near-the-money root (extract-implied-vol.py's BTC assumption)
+
+
+def _bisect(x: np.ndarray, p: np.ndarray, lo: np.ndarray, hi: np.ndarray, rising) -> np.ndarray:
+    """Root of norm_cdf(x / s - s / 2) == p in [lo, hi] where the model is monotone; NaN if none."""
+    def model(s):
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            return norm_cdf(x / s - s / 2)
+
+    p_lo, p_hi = model(lo), model(hi)
+    ok = (p >= np.minimum(p_lo, p_hi)) & (p <= np.maximum(p_lo, p_hi))
+    for _ in range(SOLVE_STEPS):
+        mid = np.sqrt(lo * hi)
+        # Rising branch: model too high -> sigma too big. Falling branch: the reverse.
+        shrink = (model(mid) > p) == rising
+        hi = np.where(shrink, mid, hi)
+        lo = np.where(shrink, lo, mid)
+    return np.where(ok, np.sqrt(lo * hi), np.nan)
+
+
+def implied_sigma(log_moneyness, prob, ref_sigma=np.nan, max_sigma=SIGMA_MAX) -> np.ndarray:
+    """
+    Total sigma s with norm_cdf(x / s - s / 2) == prob for x = ln(S/K); NaN where no root.
+
+    For a strike below spot the model falls monotonically in s. For a strike
+    above spot it rises up to s* = sqrt(2 ln(K/S)) and falls after, so near
+    the money a price has two roots; the one closer to ref_sigma (in log
+    terms) is returned, the low-vol root when ref_sigma is NaN. Roots above
+    max_sigma are not searched.
+    """
+    x, p, ref, top = np.broadcast_arrays(np.asarray(log_moneyness, dtype=float), np.asarray(prob, dtype=float),
+                                         np.asarray(ref_sigma, dtype=float), np.asarray(max_sigma, dtype=float))
+    top = np.clip(np.nan_to_num(top, nan=SIGMA_MAX), SIGMA_MIN, SIGMA_MAX)
+    valid = np.isfinite(x) & np.isfinite(p) & (p > 0) & (p < 1)
+    x, p = np.where(valid, x, 0.0), np.where(valid, p, 0.5)
+    rising = x < 0
+    peak = np.clip(np.sqrt(np.maximum(-2.0 * x, 0.0)), SIGMA_MIN, top)
+    lo = np.full(x.shape, SIGMA_MIN)
+    low = _bisect(x, p, lo, np.where(rising, peak, top), rising)
+    high = _bisect(x, p, np.where(rising, peak, SIGMA_MIN), top, False)
+    high = np.where(rising, high, np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        prefer_high = np.abs(np.log(high / ref)) < np.abs(np.log(low / ref))
+    out = np.where(np.isnan(low) | prefer_high, high, low)
+    return np.where(valid, out, np.nan)
+
+
+def implied_vol(spot, strike, hours, prob, fat_tail_multiplier: float = 1.0, ref_vol=REF_VOL) -> np.ndarray:
+    """
+    Hourly vol (the heuristic's `hourly_vol` input) implied by P(above strike) = prob.
+    ref_vol picks between the two near-the-money roots (see implied_sigma).
+    """
+    spot, strike, hours = (np.asarray(a, dtype=float) for a in (spot, strike, hours))
+    scale = np.sqrt(hours) * fat_tail_multiplier
+    with np.errstate(divide="ignore", invalid="ignore"):
+        x = np.log(spot / strike)
+        return implied_sigma(x, prob, np.asarray(ref_vol, dtype=float) * scale, VOL_MAX * scale) / scale
+
+
+def parse_direction(subtitle: str, title: str) -> int:
+    """+1 for "$X or above" markets, -1 for "or below", 0 for ranges / anything else."""
+    for text in ((subtitle or "").lower(), (title or "").lower()):
+        if "or above" in text or "or higher" in text:
+            return 1
+        if "or below" in text or "or lower" in text:
+            return -1
+    return 0
+
+
+class IVSurface:
+    """Solved IV points plus a per-asset smile / term-structure lookup."""
+
+    def __init__(self, asset, strike, hours, expiry, prob, spot: dict, fat_tail_multiplier: float = 1.0,
+                 built_at: float = None, ref_vol: dict = None):
+        self.spot = {a: float(v) for a, v in (spot or {}).items() if v}
+        self.fat_tail_multiplier = fat_tail_multiplier
+        self.built_at = time.time() if built_at is None else built_at
+        asset = np.asarray(asset, dtype=object)
+        strike, hours, expiry, prob = (np.asarray(a, dtype=float) for a in (strike, hours, expiry, prob))
+        spot_arr = np.array([self.spot.get(a, np.nan) for a in asset], dtype=float)
+        ref = np.array([(ref_vol or {}).get(a, REF_VOL) for a in asset], dtype=float)
+
+        start = time.perf_counter()
+        iv = implied_vol(spot_arr, strike, hours, prob, fat_tail_multiplier, ref)
+        self.solve_ms = (time.perf_counter() - start) * 1000
+        ok = np.isfinite(iv) & (iv > 0)
+        self.points = {"asset": asset[ok], "strike": strike[ok], "hours": hours[ok],
+                       "expiry": expiry[ok], "prob": prob[ok], "iv": iv[ok]}
+        self.solved, self.unsolved = int(ok.sum()), int((~ok).sum())
+        with np.errstate(divide="ignore", invalid="ignore"):
+            self.points["moneyness"] = np.log(self.points["strike"] / spot_arr[ok]) / np.sqrt(self.points["hours"])
+        self._fit()
+
+    @classmethod
+    def from_markets(cls, markets: list, spot: dict, now: float = None,
+                     fat_tail_multiplier: float = 1.0, ref_vol: dict = None) -> "IVSurface":
+        """
+        Surface from MarketInfo-like markets (ticker, title, subtitle, yes_price,
+        expiry). ref_vol: {asset: hourly vol} used to pick near-the-money roots.
+        """
+        now = time.time() if now is None else now
+        rows = []
+        for m in markets:
+            direction = parse_direction(m.subtitle, m.title)
+            if not direction:
+                continue
+            yes = m.yes_price / 100.0
+            if not MIN_PROB <= yes <= MAX_PROB:
+                continue
+            rows.append((asset_of(m.ticker), parse_strike(m.subtitle or "", m.title),
+                         parse_expiry(m.expiry), yes if direction > 0 else 1.0 - yes))
+        if not rows:
+            return cls([], [], [], [], [], spot, fat_tail_multiplier, now, ref_vol)
+        asset, strike, expiry, prob = zip(*rows)
+        expiry = np.array(expiry, dtype=float)
+        hours = np.maximum(1.0 / 60, (expiry - now) / 3600.0)  # NaN expiry stays NaN -> unsolved
+        return cls(asset, strike, hours, expiry, prob, spot, fat_tail_multiplier, now, ref_vol)
+
+    # ── smile / term structure ──
+
+    def _fit(self):
+        """Per (asset, expiry): quadratic smile coefficients, moneyness and IV bounds."""
+        self.smiles = {}
+        p = self.points
+        for a in sorted(set(p["asset"].tolist())):
+            rows = []
+            in_asset = p["asset"] == a
+            for e in np.unique(p["expiry"][in_asset]):
+                sel = in_asset & (p["expiry"] == e)
+                m, v = p["moneyness"][sel], p["iv"][sel]
+                if len(v) >= 3 and np.ptp(m) > 1e-9:
+                    coef = np.linalg.lstsq(np.column_stack([np.ones_like(m), m, m * m]), v, rcond=None)[0]
+                else:
+                    coef = np.array([v.mean(), 0.0, 0.0])
+                rows.append((float(np.median(p["hours"][sel])), coef, m.min(), m.max(), v.min(), v.max()))
+            rows.sort(key=lambda r: r[0])
+            self.smiles[a] = {
+                "hours": np.array([r[0] for r in rows]),
+                "coef": np.array([r[1] for r in rows]),
+                "m_range": np.array([(r[2], r[3]) for r in rows]),
+                "iv_range": np.array([(r[4], r[5]) for r in rows]),
+            }
+
+    def lookup(self, asset: str, strike, hours):
+        """Hourly IV at (strike, hours) from the smoothed surface; NaN without data for `asset`."""
+        s = self.smiles.get(asset)
+        spot = self.spot.get(asset)
+        strike, hours = np.broadcast_arrays(np.asarray(strike, dtype=float), np.asarray(hours, dtype=float))
+        scalar = strike.ndim == 0
+        strike, hours = np.atleast_1d(strike), np.atleast_1d(hours)
+        if s is None or not spot:
+            out = np.full(strike.shape, np.nan)
+            return float(out[0]) if scalar else out
+        with np.errstate(divide="ignore", invalid="ignore"):
+            m = np.log(strike / spot) / np.sqrt(hours)
+        # (G expiries, Q queries): evaluate every smile inside its observed range
+        mg = np.clip(m[None, :], s["m_range"][:, :1], s["m_range"][:, 1:])
+        c = s["coef"]
+        v = c[:, :1] + c[:, 1:2] * mg + c[:, 2:3] * mg * mg
+        v = np.clip(v, s["iv_range"][:, :1], s["iv_range"][:, 1:])
+        out = self._interpolate(s["hours"], v, hours)
+        out[~np.isfinite(m)] = np.nan
+        return float(out[0]) if scalar else out
+
+    @staticmethod
+    def _interpolate(grid: np.ndarray, v: np.ndarray, hours: np.ndarray) -> np.ndarray:
+        """Linear in total variance between listed expiries, flat outside them."""
+        cols = np.arange(len(hours))
+        if len(grid) == 1:
+            return v[0].copy()
+        j = np.clip(np.searchsorted(grid, hours), 1, len(grid) - 1)
+        h0, h1 = grid[j - 1], grid[j]
+        w0, w1 = v[j - 1, cols] ** 2 * h0, v[j, cols] ** 2 * h1
+        t = np.clip((hours - h0) / (h1 - h0), 0.0, 1.0)
+        total = w0 + t * (w1 - w0)
+        h = np.clip(hours, grid[0], grid[-1])
+        return np.sqrt(total / h)
+
+    def atm(self, asset: str, hours):
+        """At-the-money term structure."""
+        return self.lookup(asset, self.spot.get(asset, np.nan), hours)
+
+    def prior(self, asset: str, strike, hours, vol, weight: float):
+        """weight * surface IV + (1 - weight) * vol, keeping `vol` where the surface has no data."""
+        iv = np.asarray(self.lookup(asset, strike, hours), dtype=float)
+        vol = np.asarray(vol, dtype=float)
+        out = np.where(np.isfinite(iv), weight * iv + (1 - weight) * vol, vol)
+        return float(out) if out.ndim == 0 else out
+
+    def summary(self) -> dict:
+        return {
+            "solved": self.solved,
+            "unsolved": self.unsolved,
+            "solve_ms": round(self.solve_ms, 3),
+            "assets": {a: {"expiries": len(s["hours"]),
+                           "atm_iv_1h": round(float(self.atm(a, 1.0)), 6) if self.spot.get(a) else None}
+                       for a, s in self.smiles.items()},
+        }
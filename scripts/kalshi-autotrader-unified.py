@@ -31,10 +31,13 @@ import time
 import math
 import re
 import argparse
-import base64
 import signal
 import logging
+import queue
+import threading
 import traceback
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
 from dataclasses import dataclass, field, asdict
@@ -42,8 +45,14 @@ from typing import Optional
 from collections import defaultdict
 
 import requests
-from cryptography.hazmat.primitives import hashes, serialization
-from cryptography.hazmat.primitives.asymmetric import padding
+
+# Shared Kalshi signer (PEM parsed once per process) + pooled HTTP transport
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from kalshi_signing import cycle_signing_stats, get_signer, get_signing_stats
+import http_pool
+from market_store import MarketStore, expiry_to_ts
+from settlement_journal import SettlementJournal, trade_outcome
+from forecast_cache import ForecastCache, fingerprint
 
 # ============================================================================
 # STRUCTURED LOGGING (JSON)
@@ -246,6 +255,8 @@ MAX_EXPOSURE_PER_CATEGORY_PCT = 0.30   # 30% of portfolio in one category
 MAX_CONCURRENT_POSITIONS = 15          # Hard cap on open positions
 DAILY_LOSS_CAP_PCT = 0.10              # 10% of portfolio as daily loss cap
 MAX_DAILY_TRADES = 50                  # Circuit breaker on trade count
+PORTFOLIO_MAX_DEPLOY_PCT = 0.50        # Max share of balance committed by one cycle's joint allocation
+                                       # (fractional Kelly also caps it at portfolio_kelly.MAX_TOTAL * KELLY_FRACTION)
 
 # Peak balance tracking file
 PEAK_BALANCE_FILE = Path(__file__).parent / "kalshi-peak-balance.json"
@@ -277,23 +288,48 @@ def save_peak_balance(balance: float):
             pass
 
 
+def check_portfolio_limits(balance: float, positions: list, daily_pnl: dict) -> tuple:
+    """
+    Account-level gates that don't depend on the trade itself (position count,
+    daily loss, daily trade count). Returns (allowed: bool, reason: str).
+    """
+    # 1. Max concurrent positions
+    if len(positions) >= MAX_CONCURRENT_POSITIONS:
+        return False, f"Max concurrent positions ({MAX_CONCURRENT_POSITIONS}) reached"
+
+    # 2. Dynamic daily loss cap (% of portfolio)
+    dynamic_loss_cap = int(balance * DAILY_LOSS_CAP_PCT * 100)
+    effective_cap = max(DAILY_LOSS_LIMIT_CENTS, dynamic_loss_cap)
+    net_pnl = daily_pnl.get("net_pnl_cents", 0)
+    if net_pnl < -effective_cap:
+        return False, (f"Daily loss ${abs(net_pnl)/100:.2f} exceeds dynamic cap "
+                       f"${effective_cap/100:.2f}")
+
+    # 3. Max daily trade count
+    trades_today = daily_pnl.get("trades_today", 0)
+    if trades_today >= MAX_DAILY_TRADES:
+        return False, f"Max daily trades ({MAX_DAILY_TRADES}) reached"
+
+    return True, "OK"
+
+
 def check_position_risk_limits(market, decision, balance: float,
                                 positions: list, daily_pnl: dict) -> tuple:
     """
     Comprehensive risk check before placing a trade.
     Returns (allowed: bool, reason: str).
     """
-    # 1. Max concurrent positions
-    if len(positions) >= MAX_CONCURRENT_POSITIONS:
-        return False, f"Max concurrent positions ({MAX_CONCURRENT_POSITIONS}) reached"
+    allowed, reason = check_portfolio_limits(balance, positions, daily_pnl)
+    if not allowed:
+        return allowed, reason
 
-    # 2. Per-market exposure check
+    # 1. Per-market exposure check
     cost_cents = decision.contracts * decision.price_cents
     if cost_cents > MAX_EXPOSURE_PER_MARKET_CENTS:
         return False, (f"Per-market exposure ${cost_cents/100:.2f} exceeds "
                        f"${MAX_EXPOSURE_PER_MARKET_CENTS/100:.2f} limit")
 
-    # 3. Check existing exposure on same market
+    # 2. Check existing exposure on same market
     existing_exposure = 0
     for pos in positions:
         if pos.get("ticker") == market.ticker:
@@ -302,7 +338,7 @@ def check_position_risk_limits(market, decision, balance: float,
         return False, (f"Combined exposure on {market.ticker} would be "
                        f"${(existing_exposure + cost_cents)/100:.2f}")
 
-    # 4. Category concentration check
+    # 3. Category concentration check
     category = market.category or "unknown"
     cat_exposure = 0
     for pos in positions:
@@ -316,19 +352,6 @@ def check_position_risk_limits(market, decision, balance: float,
             return False, (f"Category concentration {cat_pct:.0%} exceeds "
                            f"{MAX_EXPOSURE_PER_CATEGORY_PCT:.0%}")
 
-    # 5. Dynamic daily loss cap (% of portfolio)
-    dynamic_loss_cap = int(balance * DAILY_LOSS_CAP_PCT * 100)
-    effective_cap = max(DAILY_LOSS_LIMIT_CENTS, dynamic_loss_cap)
-    net_pnl = daily_pnl.get("net_pnl_cents", 0)
-    if net_pnl < -effective_cap:
-        return False, (f"Daily loss ${abs(net_pnl)/100:.2f} exceeds dynamic cap "
-                       f"${effective_cap/100:.2f}")
-
-    # 6. Max daily trade count
-    trades_today = daily_pnl.get("trades_today", 0)
-    if trades_today >= MAX_DAILY_TRADES:
-        return False, f"Max daily trades ({MAX_DAILY_TRADES}) reached"
-
     return True, "OK"
 
 # ============================================================================
@@ -378,6 +401,49 @@ except Exception:
     def is_market_holiday(check_date=None):
         return False, None
 
+# Vectorized crypto forecaster (needs numpy)
+try:
+    from crypto_batch_forecast import batch_crypto_forecast
+    BATCH_FORECAST_AVAILABLE = True
+except ImportError:
+    BATCH_FORECAST_AVAILABLE = False
+
+# Shared streaming indicators over NumPy candle series (needs numpy)
+try:
+    from indicators import (CandleSeries, series_for, timeframe_momentum,
+                            multi_timeframe_momentum, regime_features)
+    INDICATORS_AVAILABLE = True
+except ImportError:
+    INDICATORS_AVAILABLE = False
+
+# Local append-only OHLC store with gap-filling fetcher (needs numpy)
+try:
+    from ohlc_store import OHLCFetcher, OHLCStore, ASSET_FOR_COIN, as_rows
+    OHLC_STORE_AVAILABLE = True
+except ImportError:
+    OHLC_STORE_AVAILABLE = False
+
+# Columnar market table for vectorized scan filter / ranking (needs numpy)
+try:
+    from market_table import MarketTable
+    MARKET_TABLE_AVAILABLE = True
+except ImportError:
+    MARKET_TABLE_AVAILABLE = False
+
+# Implied-vol surface over the crypto strike ladders (needs numpy)
+try:
+    from iv_surface import IVSurface
+    IV_SURFACE_AVAILABLE = True
+except ImportError:
+    IV_SURFACE_AVAILABLE = False
+
+# Joint Kelly sizing across a cycle's correlated candidates (needs numpy)
+try:
+    import portfolio_kelly
+    PORTFOLIO_KELLY_AVAILABLE = True
+except ImportError:
+    PORTFOLIO_KELLY_AVAILABLE = False
+
 # ============================================================================
 # CONFIGURATION
 # ============================================================================
@@ -412,6 +478,7 @@ PARLAY_BASE_EDGE_CAP = 0.35       # 35% base cap for parlays (2 legs)
 PARLAY_MAX_EDGE_CAP = 0.40        # 40% hard ceiling for parlays (any leg count)
 PARLAY_LEG_SCALE_FACTOR = 0.02    # +2% per additional leg beyond 2
 MAX_POSITION_PCT = 0.05    # Max 5% of portfolio per position
+MIN_CONTRACT_MAX_PCT = 0.10  # A single contract is still bought when it costs at most 10% of portfolio
 KELLY_FRACTION = 0.15      # Aggressive in paper mode for data collection
 MIN_BET_CENTS = 5
 MAX_BET_CENTS = 500
@@ -443,6 +510,27 @@ WEATHER_MIN_FORECAST_STRIKE_GAP = 2.0
 WEATHER_MAX_MARKET_CONVICTION = 0.85
 WEATHER_MIN_OUR_PROB = 0.05
 
+# ── Scanner concurrency / Kalshi request budget ──
+# Kalshi Basic tier allows 20 reads/s and 10 writes/s; stay at half the read budget
+KALSHI_RATE_LIMIT_PER_SEC = float(os.getenv("KALSHI_RATE_LIMIT_PER_SEC", "10"))
+KALSHI_RATE_BURST = 10
+SCAN_CONCURRENCY = int(os.getenv("SCAN_CONCURRENCY", "4"))
+SCAN_MAX_PAGES = 20
+# Ask Kalshi only for markets closing inside the scan window (smaller payload);
+# falls back to the unfiltered query if the API rejects the filter
+SCAN_CLOSE_TS_FILTER = True
+
+# ── Forecast/critique pipeline ──
+LLM_CONCURRENCY = int(os.getenv("LLM_CONCURRENCY", "4"))
+# Max LLM tokens per cycle (0 = unlimited); markets past the budget are skipped
+LLM_CYCLE_TOKEN_BUDGET = int(os.getenv("LLM_CYCLE_TOKEN_BUDGET", "200000"))
+
+# ── LLM forecast cache (reuse answers while the market state hasn't moved) ──
+FORECAST_CACHE_TTL_SEC = int(os.getenv("FORECAST_CACHE_TTL_SEC", "1800"))
+FORECAST_CACHE_MAX_ENTRIES = 2000
+FORECAST_CACHE_PRICE_BUCKET = 3                          # ¢ per YES-price bucket
+FORECAST_CACHE_TTE_BUCKETS_H = (1, 6, 24, 72, 168, 720)  # time-to-expiry bucket edges (hours)
+
 # ── Sports event tickers to scan (from v3) ──
 SPORTS_EVENT_TICKERS = [
     "KXCBBSPREAD", "KXCBBTOTAL", "KXCBBML",
@@ -460,12 +548,19 @@ SPORTS_EVENT_TICKERS = [
 BTC_HOURLY_VOL = 0.003
 ETH_HOURLY_VOL = 0.004
 CRYPTO_FAT_TAIL_MULTIPLIER = 1.0  # Disabled after v2 disaster analysis
+IV_PRIOR_WEIGHT = 0.5  # Weight of the cycle's market-implied vol (IV surface) vs realized vol
+# Crypto markets outside the top-N that the batch forecaster promotes into analysis
+BATCH_PROMOTE_MAX = 5
 
 # ── Logging paths ──
 PROJECT_ROOT = Path(__file__).parent.parent
 TRADE_LOG_FILE = PROJECT_ROOT / "data" / "trading" / "kalshi-unified-trades.jsonl"
 CYCLE_LOG_FILE = PROJECT_ROOT / "data" / "trading" / "kalshi-unified-cycles.jsonl"
 SKIP_LOG_FILE  = PROJECT_ROOT / "data" / "trading" / "kalshi-unified-skips.jsonl"
+MARKET_STORE_FILE = PROJECT_ROOT / "data" / "trading" / "kalshi-markets.db"
+SETTLEMENT_JOURNAL_FILE = PROJECT_ROOT / "data" / "trading" / "kalshi-unified-settlements.jsonl"
+FORECAST_CACHE_FILE = PROJECT_ROOT / "data" / "trading" / "kalshi-forecast-cache.json"
+OHLC_STORE_DIR = PROJECT_ROOT / "data" / "ohlc" / "store"
 # Also write to legacy location for compatibility
 LEGACY_TRADE_LOG = Path(__file__).parent / "kalshi-trades.jsonl"
 
@@ -474,8 +569,9 @@ CIRCUIT_BREAKER_STATE_FILE = Path(__file__).parent / "kalshi-circuit-breaker.jso
 DAILY_LOSS_PAUSE_FILE = Path(__file__).parent / "kalshi-daily-pause.json"
 
 # ── Latency tracking (from v2) ──
-API_LATENCY_LOG = defaultdict(list)
+# endpoint -> bucketed histogram + last LATENCY_PROFILE_WINDOW samples
 LATENCY_PROFILE_WINDOW = 50
+API_LATENCY_LOG = http_pool.LatencyRegistry(window=LATENCY_PROFILE_WINDOW)
 
 # ── Rate limit tracking (from v2) ──
 API_RATE_LIMITS = {
@@ -483,6 +579,24 @@ API_RATE_LIMITS = {
     "coingecko": {"calls_per_hour": 0, "limit": 30},
 }
 API_RATE_WINDOW_START = time.time()
+KALSHI_RATE_LIMITER = http_pool.TokenBucket(KALSHI_RATE_LIMIT_PER_SEC, KALSHI_RATE_BURST)
+
+# ── Last scan stats (wall clock, pages) for the cycle log ──
+LAST_SCAN_STATS = {}
+
+# ── Persistent market snapshot (opened lazily, see get_market_store) ──
+_market_store = None
+
+# ── Settlement resolution ──
+SETTLEMENT_BATCH_SIZE = 100            # tickers per bulk /markets?tickers= lookup
+SETTLEMENT_RECHECK_SEC = 600           # unexpired pending tickers: re-query at most every 10min
+SETTLEMENT_COMPACT_INTERVAL_SEC = 3600 # fold the journal into the trade log at most hourly
+_settlement_journal = None
+_SETTLEMENT_LAST_CHECK = {}            # ticker -> last lookup that came back unsettled
+_LAST_TRADE_LOG_COMPACT = time.time()
+
+_forecast_cache = None
+_ohlc_fetcher = None
 
 # ── External API cache (from v2) ──
 EXT_API_CACHE = {}
@@ -619,21 +733,35 @@ class TradeDecision:
     reason: str
     forecast: Optional[ForecastResult] = None
     critic: Optional[CriticResult] = None
+    prob: float = 0.0         # our win probability for the side bought
+
+@dataclass
+class MarketAnalysis:
+    forecast: Optional[ForecastResult] = None
+    critic: Optional[CriticResult] = None  # None = stopped at the quick-edge gate
+    quick_edge: float = 0.0
+    forecast_s: float = 0.0
+    critic_s: float = 0.0
+    skipped: str = ""                      # e.g. "token_budget"
+    cache_hit: bool = False
 
 # ============================================================================
 # LATENCY & RATE LIMIT TRACKING (from v2)
 # ============================================================================
 
 def record_api_latency(endpoint: str, latency_ms: float):
-    API_LATENCY_LOG[endpoint].append((time.time(), latency_ms))
-    if len(API_LATENCY_LOG[endpoint]) > LATENCY_PROFILE_WINDOW:
-        API_LATENCY_LOG[endpoint] = API_LATENCY_LOG[endpoint][-LATENCY_PROFILE_WINDOW:]
+    API_LATENCY_LOG.record(endpoint, latency_ms)
 
 def get_avg_latency(endpoint: str) -> float:
-    entries = API_LATENCY_LOG.get(endpoint, [])
-    if not entries:
+    hist = API_LATENCY_LOG.get(endpoint)
+    if not hist:
         return 0
-    return sum(lat for _, lat in entries) / len(entries)
+    return hist.recent_avg()
+
+def get_latency_summary() -> dict:
+    """Compact per-endpoint histogram summary for the cycle log."""
+    return {ep: {k: v for k, v in hist.to_dict().items() if k != "buckets"}
+            for ep, hist in API_LATENCY_LOG.items()}
 
 def record_api_call(source: str):
     global API_RATE_WINDOW_START
@@ -661,14 +789,7 @@ def set_cached_response(cache_key: str, data):
 # ============================================================================
 
 def sign_request(method: str, path: str, timestamp: str) -> str:
-    private_key = serialization.load_pem_private_key(PRIVATE_KEY.encode(), password=None)
-    message = f"{timestamp}{method}{path}".encode('utf-8')
-    signature = private_key.sign(
-        message,
-        padding.PSS(mgf=padding.MGF1(hashes.SHA256()), salt_length=padding.PSS.MAX_LENGTH),
-        hashes.SHA256()
-    )
-    return base64.b64encode(signature).decode('utf-8')
+    return get_signer(PRIVATE_KEY).sign(method, path, timestamp)
 
 
 def kalshi_api(method: str, path: str, body: dict = None, max_retries: int = 3) -> dict:
@@ -682,6 +803,7 @@ def kalshi_api(method: str, path: str, body: dict = None, max_retries: int = 3)
 
     total_start = time.time()
     for attempt in range(max_retries):
+        KALSHI_RATE_LIMITER.acquire()
         timestamp = str(int(datetime.now(timezone.utc).timestamp() * 1000))
         signature = sign_request(method, path.split('?')[0], timestamp)
         headers = {
@@ -692,15 +814,15 @@ def kalshi_api(method: str, path: str, body: dict = None, max_retries: int = 3)
         }
         try:
             if method == "GET":
-                resp = requests.get(url, headers=headers, timeout=15)
+                resp = http_pool.get(url, headers=headers, timeout=15)
             elif method == "POST":
-                resp = requests.post(url, headers=headers, json=body, timeout=10)
+                resp = http_pool.post(url, headers=headers, json=body, timeout=10)
             else:
                 return {"error": f"Unknown method {method}"}
 
             if resp.status_code >= 500:
                 if attempt < max_retries - 1:
-                    time.sleep(2 ** attempt)
+                    time.sleep(http_pool.backoff_delay(attempt))
                     continue
                 return {"error": f"Server error {resp.status_code}"}
 
@@ -711,12 +833,12 @@ def kalshi_api(method: str, path: str, body: dict = None, max_retries: int = 3)
 
         except requests.exceptions.Timeout:
             if attempt < max_retries - 1:
-                time.sleep(2 ** attempt)
+                time.sleep(http_pool.backoff_delay(attempt))
                 continue
             return {"error": "Timeout"}
         except requests.exceptions.ConnectionError:
             if attempt < max_retries - 1:
-                time.sleep(2 ** attempt)
+                time.sleep(http_pool.backoff_delay(attempt))
                 continue
             return {"error": "Connection error"}
         except Exception as e:
@@ -767,7 +889,7 @@ def get_crypto_prices() -> Optional[dict]:
 
     # Try CoinGecko first
     try:
-        resp = requests.get(
+        resp = http_pool.get(
             "https://api.coingecko.com/api/v3/simple/price?ids=bitcoin,ethereum&vs_currencies=usd",
             timeout=5)
         record_api_call("coingecko")
@@ -780,8 +902,8 @@ def get_crypto_prices() -> Optional[dict]:
 
     # Fallback: Binance
     try:
-        btc_resp = requests.get("https://api.binance.com/api/v3/ticker/price?symbol=BTCUSDT", timeout=5)
-        eth_resp = requests.get("https://api.binance.com/api/v3/ticker/price?symbol=ETHUSDT", timeout=5)
+        btc_resp = http_pool.get("https://api.binance.com/api/v3/ticker/price?symbol=BTCUSDT", timeout=5)
+        eth_resp = http_pool.get("https://api.binance.com/api/v3/ticker/price?symbol=ETHUSDT", timeout=5)
         result = {"btc": float(btc_resp.json()["price"]), "eth": float(eth_resp.json()["price"])}
         set_cached_response("crypto_prices", result)
         return result
@@ -791,7 +913,7 @@ def get_crypto_prices() -> Optional[dict]:
 
 def get_fear_greed_index() -> dict:
     try:
-        resp = requests.get("https://api.alternative.me/fng/?limit=1", timeout=5)
+        resp = http_pool.get("https://api.alternative.me/fng/?limit=1", timeout=5)
         data = resp.json()
         return {"value": int(data["data"][0]["value"]),
                 "classification": data["data"][0]["value_classification"]}
@@ -799,13 +921,32 @@ def get_fear_greed_index() -> dict:
         return {"value": 50, "classification": "Neutral"}
 
 
+def get_ohlc_fetcher() -> "OHLCFetcher":
+    """Open the shared local candle store on first use."""
+    global _ohlc_fetcher
+    if _ohlc_fetcher is None or _ohlc_fetcher.store.root != Path(OHLC_STORE_DIR):
+        _ohlc_fetcher = OHLCFetcher(OHLCStore(OHLC_STORE_DIR))
+    return _ohlc_fetcher
+
+
 def get_crypto_ohlc(coin_id: str = "bitcoin", days: int = 7) -> list:
-    """Get OHLC data from CoinGecko (or cache)."""
+    """Get 4h OHLC data from the local candle store (or cache / CoinGecko)."""
     cache_key = f"ohlc_{coin_id}_{days}"
     cached = get_cached_response(cache_key)
     if cached:
         return cached
 
+    # Local store: only candles newer than the last stored one hit the network
+    if OHLC_STORE_AVAILABLE and coin_id in ASSET_FOR_COIN:
+        try:
+            candles = get_ohlc_fetcher().load(ASSET_FOR_COIN[coin_id], "4h", time.time() - days * 86400)
+            if len(candles):
+                ohlc = as_rows(candles)
+                set_cached_response(cache_key, ohlc)
+                return ohlc
+        except Exception:
+            pass
+
     # Try local cache file first (from v2's OHLC caching)
     cache_dir = PROJECT_ROOT / "data" / "ohlc"
     cache_file = cache_dir / f"{coin_id[:3]}-ohlc.json"
@@ -828,7 +969,7 @@ def get_crypto_ohlc(coin_id: str = "bitcoin", days: int = 7) -> list:
 
     # Fetch from CoinGecko
     try:
-        resp = requests.get(
+        resp = http_pool.get(
             f"https://api.coingecko.com/api/v3/coins/{coin_id}/ohlc?vs_currency=usd&days={days}",
             timeout=10)
         record_api_call("coingecko")
@@ -845,8 +986,20 @@ def get_crypto_ohlc(coin_id: str = "bitcoin", days: int = 7) -> list:
 # MOMENTUM & REGIME DETECTION (from v2)
 # ============================================================================
 
+def candle_series(ohlc_data, key: str = None):
+    """
+    OHLC rows as an indicators.CandleSeries. With `key` the series is kept
+    across cycles and only new candles are folded in (see series_for).
+    """
+    if isinstance(ohlc_data, CandleSeries):
+        return ohlc_data
+    return series_for(key, ohlc_data) if key else CandleSeries(ohlc_data)
+
+
 def calculate_momentum(ohlc_data: list, timeframe: str) -> dict:
     """Calculate momentum for a single timeframe."""
+    if INDICATORS_AVAILABLE:
+        return timeframe_momentum(candle_series(ohlc_data or []).close, timeframe)
     result = {"direction": 0, "strength": 0, "pct_change": 0}
     if not ohlc_data or len(ohlc_data) < 4:
         return result
@@ -870,6 +1023,8 @@ def calculate_momentum(ohlc_data: list, timeframe: str) -> dict:
 
 def get_multi_timeframe_momentum(ohlc_data: list) -> dict:
     """Get momentum across 1h, 4h, 24h timeframes."""
+    if INDICATORS_AVAILABLE:
+        return multi_timeframe_momentum(candle_series(ohlc_data or []).close)
     result = {"timeframes": {}, "composite_direction": 0, "composite_strength": 0, "alignment": False}
     if not ohlc_data:
         return result
@@ -899,23 +1054,31 @@ def detect_market_regime(ohlc_data: list, momentum: dict) -> dict:
     if not ohlc_data or len(ohlc_data) < 24:
         return result
 
-    current_price = ohlc_data[-1][4]
-    if not current_price:
-        return result
-
-    price_4h = ohlc_data[-4][4] if len(ohlc_data) >= 4 else current_price
-    price_24h = ohlc_data[0][4] if len(ohlc_data) >= 24 else current_price
-    change_4h = (current_price - price_4h) / price_4h if price_4h else 0
-    change_24h = (current_price - price_24h) / price_24h if price_24h else 0
-
-    # Volatility from candle ranges
-    ranges = []
-    for c in ohlc_data[-24:]:
-        if c and len(c) >= 4 and c[3] > 0:
-            ranges.append((c[2] - c[3]) / c[3])
-    avg_range = sum(ranges) / len(ranges) if ranges else 0
-    vol_class = ("very_low" if avg_range < 0.003 else "low" if avg_range < 0.005 else
-                 "normal" if avg_range < 0.01 else "high" if avg_range < 0.02 else "very_high")
+    if INDICATORS_AVAILABLE:
+        series = candle_series(ohlc_data)
+        if len(series) < 24:
+            return result
+        features = regime_features(series)
+        change_4h, change_24h = features["change_4h"], features["change_24h"]
+        vol_class = features["volatility"]
+    else:
+        current_price = ohlc_data[-1][4]
+        if not current_price:
+            return result
+
+        price_4h = ohlc_data[-4][4] if len(ohlc_data) >= 4 else current_price
+        price_24h = ohlc_data[0][4] if len(ohlc_data) >= 24 else current_price
+        change_4h = (current_price - price_4h) / price_4h if price_4h else 0
+        change_24h = (current_price - price_24h) / price_24h if price_24h else 0
+
+        # Volatility from candle ranges
+        ranges = []
+        for c in ohlc_data[-24:]:
+            if c and len(c) >= 4 and c[3] > 0:
+                ranges.append((c[2] - c[3]) / c[3])
+        avg_range = sum(ranges) / len(ranges) if ranges else 0
+        vol_class = ("very_low" if avg_range < 0.003 else "low" if avg_range < 0.005 else
+                     "normal" if avg_range < 0.01 else "high" if avg_range < 0.02 else "very_high")
     result["volatility"] = vol_class
 
     mom_dir = momentum.get("composite_direction", 0)
@@ -968,7 +1131,7 @@ def call_claude(system_prompt: str, user_prompt: str, max_tokens: int = 2000) ->
             body = {"model": LLM_CONFIG["model"], "max_tokens": max_tokens,
                     "system": system_prompt,
                     "messages": [{"role": "user", "content": user_prompt}]}
-            resp = requests.post(LLM_CONFIG["base_url"], headers=LLM_CONFIG["headers"], json=body, timeout=60)
+            resp = http_pool.post(LLM_CONFIG["base_url"], headers=LLM_CONFIG["headers"], json=body, timeout=60)
             if resp.status_code != 200:
                 return {"error": f"API {resp.status_code}: {resp.text[:300]}", "content": "", "tokens_used": 0}
             data = resp.json()
@@ -980,7 +1143,7 @@ def call_claude(system_prompt: str, user_prompt: str, max_tokens: int = 2000) ->
             body = {"model": LLM_CONFIG["model"], "max_tokens": max_tokens,
                     "messages": [{"role": "system", "content": system_prompt},
                                  {"role": "user", "content": user_prompt}]}
-            resp = requests.post(LLM_CONFIG["base_url"], headers=LLM_CONFIG["headers"], json=body, timeout=60)
+            resp = http_pool.post(LLM_CONFIG["base_url"], headers=LLM_CONFIG["headers"], json=body, timeout=60)
             if resp.status_code != 200:
                 return {"error": f"API {resp.status_code}: {resp.text[:300]}", "content": "", "tokens_used": 0}
             data = resp.json()
@@ -1342,18 +1505,28 @@ def _heuristic_crypto(market: MarketInfo, context: dict = None) -> tuple:
     ohlc_data = (context or {}).get("ohlc", {}).get(asset, [])
     if ohlc_data and len(ohlc_data) >= 10:
         try:
-            closes = [c[4] for c in ohlc_data[-24:] if c and len(c) >= 5 and c[4] and c[4] > 0]
-            if len(closes) >= 2:
-                log_returns = [math.log(closes[i] / closes[i - 1]) for i in range(1, len(closes))]
-                mean_r = sum(log_returns) / len(log_returns)
-                rv = math.sqrt(sum((r - mean_r) ** 2 for r in log_returns) / len(log_returns))
-                default_vol = hourly_vol
-                hourly_vol = max(default_vol * 0.5, min(default_vol * 2.5, rv))
+            if INDICATORS_AVAILABLE:
+                # Shared per-asset series: O(1) per market once the cycle's candles are folded in
+                rv = series_for(asset, ohlc_data).indicators["rv24"]
+                if rv.count:
+                    hourly_vol = max(hourly_vol * 0.5, min(hourly_vol * 2.5, rv.value))
+            else:
+                closes = [c[4] for c in ohlc_data[-24:] if c and len(c) >= 5 and c[4] and c[4] > 0]
+                if len(closes) >= 2:
+                    log_returns = [math.log(closes[i] / closes[i - 1]) for i in range(1, len(closes))]
+                    mean_r = sum(log_returns) / len(log_returns)
+                    rv = math.sqrt(sum((r - mean_r) ** 2 for r in log_returns) / len(log_returns))
+                    default_vol = hourly_vol
+                    hourly_vol = max(default_vol * 0.5, min(default_vol * 2.5, rv))
         except Exception:
             pass
 
     # Log-normal probability model (from v2)
     T = minutes_left / 60.0
+    # Market-implied prior: blend in the cycle's IV surface (smile + term structure)
+    surface = (context or {}).get("iv_surface")
+    if surface is not None:
+        hourly_vol = surface.prior(asset, strike, T, hourly_vol, IV_PRIOR_WEIGHT)
     sigma = hourly_vol * math.sqrt(T) * CRYPTO_FAT_TAIL_MULTIPLIER
     if sigma <= 0 or current_price <= 0 or strike <= 0:
         return market_prob, "low", ["Invalid model params"], ["Bad data"]
@@ -1407,6 +1580,22 @@ def _heuristic_crypto(market: MarketInfo, context: dict = None) -> tuple:
     return prob_above, confidence, reasoning_parts, key_factors
 
 
+def score_crypto_universe(markets: list, context: dict = None) -> dict:
+    """
+    Batch-forecast every crypto strike market in one NumPy pass.
+    Returns {ticker: (prob, edge)} for markets the model could price.
+    """
+    crypto = [m for m in markets if classify_market_type(m) == "crypto"]
+    if not BATCH_FORECAST_AVAILABLE or not crypto:
+        return {}
+    result = batch_crypto_forecast(crypto, context,
+                                   default_vol={"btc": BTC_HOURLY_VOL, "eth": ETH_HOURLY_VOL},
+                                   fat_tail_multiplier=CRYPTO_FAT_TAIL_MULTIPLIER,
+                                   iv_prior_weight=IV_PRIOR_WEIGHT)
+    return {m.ticker: (float(p), float(e))
+            for m, p, e, ok in zip(crypto, result["prob"], result["edge"], result["valid"]) if ok}
+
+
 def _heuristic_combo(market: MarketInfo, sport: str) -> tuple:
     """Combo/parlay heuristic from v3."""
     market_prob = market.market_prob
@@ -1615,7 +1804,7 @@ def make_trade_decision(market: MarketInfo, forecast: ForecastResult, critic: Cr
         contracts = effective_max // cost_per
 
     # Ensure at least 1 contract if affordable
-    if contracts <= 0 and cost_per <= int(balance * 0.10 * 100) and cost_per >= MIN_BET_CENTS:
+    if contracts <= 0 and cost_per <= int(balance * MIN_CONTRACT_MAX_PCT * 100) and cost_per >= MIN_BET_CENTS:
         contracts = 1
     if contracts <= 0:
         return TradeDecision(action="SKIP", edge=edge, kelly_size=kelly_frac, contracts=0,
@@ -1624,33 +1813,147 @@ def make_trade_decision(market: MarketInfo, forecast: ForecastResult, critic: Cr
     return TradeDecision(action=action, edge=edge, kelly_size=kelly_frac, contracts=contracts,
                         price_cents=side_price,
                         reason=f"Edge={edge:.1%}, Kelly={kelly_frac:.3f}, prob={final_prob:.1%} vs mkt={market_prob:.1%}",
-                        forecast=forecast, critic=critic)
+                        forecast=forecast, critic=critic,
+                        prob=final_prob if action == "BUY_YES" else 1 - final_prob)
+
+
+def _resized(decision: TradeDecision, contracts: int, fraction: float, reason: str) -> TradeDecision:
+    return TradeDecision(action=decision.action if contracts > 0 else "SKIP", edge=decision.edge,
+                         kelly_size=fraction, contracts=contracts, price_cents=decision.price_cents,
+                         reason=reason, forecast=decision.forecast, critic=decision.critic,
+                         prob=decision.prob)
+
+
+def allocate_portfolio(candidates: list, balance: float, positions: list, slots: int) -> tuple:
+    """
+    Size a cycle's candidate trades jointly instead of one at a time.
+
+    candidates: [(market, decision)] BUY decisions in rank order. Strikes on one
+    event and BTC/ETH markets share Kelly capacity (portfolio_kelly), and the
+    max-bet, position %, per-market exposure, category concentration and
+    open-slot limits are constraints of the allocation rather than a pass/fail
+    check after sizing. Returns ([(market, decision)], stats) in the same order;
+    a decision with action SKIP got no allocation and its reason says why.
+    Without numpy, falls back to per-trade sizing + check_position_risk_limits.
+    """
+    bankroll = int(balance * 100)
+    stats = {"candidates": len(candidates), "sized": 0, "joint_pct": 0.0, "independent_pct": 0.0,
+             "cap_pct": PORTFOLIO_MAX_DEPLOY_PCT * 100, "ms": 0.0}
+    if not candidates or bankroll <= 0 or slots <= 0:
+        return [(m, _resized(d, 0, 0.0, "Portfolio: no capacity")) for m, d in candidates], stats
+
+    if not PORTFOLIO_KELLY_AVAILABLE:
+        sized, held = [], list(positions)
+        for market, decision in candidates:
+            ok, reason = check_position_risk_limits(market, decision, balance, held, {})
+            if ok and slots > 0:
+                held.append({"ticker": market.ticker,
+                             "market_exposure": decision.contracts * decision.price_cents})
+                slots -= 1
+                sized.append((market, decision))
+            else:
+                sized.append((market, _resized(decision, 0, 0.0, f"Risk limit: {reason if not ok else 'no slots'}")))
+        stats["sized"] = sum(1 for _, d in sized if d.contracts > 0)
+        return sized, stats
+
+    exposure, cat_exposure = defaultdict(int), defaultdict(int)
+    for pos in positions:
+        ticker = pos.get("ticker", "")
+        exposure[ticker] += abs(pos.get("market_exposure", 0))
+        cat_exposure[portfolio_kelly.group_key(ticker)] += abs(pos.get("market_exposure", 0))
+
+    bets = []
+    for market, decision in candidates:
+        room = min(MAX_BET_CENTS, bankroll * MAX_POSITION_PCT,
+                   MAX_EXPOSURE_PER_MARKET_CENTS - exposure[market.ticker])
+        bets.append(portfolio_kelly.Bet(
+            key=market.ticker, prob=decision.prob, price_cents=decision.price_cents,
+            side="yes" if decision.action == "BUY_YES" else "no",
+            event=portfolio_kelly.event_key(market.ticker), asset=portfolio_kelly.asset_of(market.ticker),
+            group=portfolio_kelly.group_key(market.ticker), cap=max(0.0, room / bankroll)))
+    group_caps = {b.group: max(0.0, MAX_EXPOSURE_PER_CATEGORY_PCT - cat_exposure[b.group] / bankroll)
+                  for b in bets}
+    result = portfolio_kelly.allocate(bets, group_caps, budget=PORTFOLIO_MAX_DEPLOY_PCT,
+                                      kelly_fraction=KELLY_FRACTION, max_bets=slots)
+    contracts = portfolio_kelly.contracts_for(result.fractions, bets, bankroll)
+
+    # Ensure at least 1 contract for an allocated bet when it fits every cap (as the per-trade sizer does)
+    group_left = {g: cap * bankroll for g, cap in group_caps.items()}
+    budget_left = result.budget * bankroll
+    for b, n in zip(bets, contracts):
+        group_left[b.group] -= n * b.price_cents
+        budget_left -= n * b.price_cents
+    for i, b in enumerate(bets):
+        cost = b.price_cents
+        if (contracts[i] == 0 and result.fractions[i] > 0 and MIN_BET_CENTS <= cost <= b.cap * bankroll
+                and cost <= min(group_left[b.group], budget_left, balance * MIN_CONTRACT_MAX_PCT * 100)):
+            contracts[i] = 1
+            group_left[b.group] -= cost
+            budget_left -= cost
+
+    sized = []
+    for (market, decision), b, f, n in zip(candidates, bets, result.fractions, contracts):
+        if n > 0:
+            reason = f"{decision.reason}, joint Kelly={f:.3f} (alone {decision.kelly_size:.3f})"
+        elif f > 0:
+            reason = f"Portfolio: allocation {f:.2%} < 1 contract"
+        else:
+            reason = "Portfolio: no joint Kelly allocation (correlated with better bets or capped)"
+        sized.append((market, _resized(decision, n, float(f), reason)))
+    stats.update({
+        "sized": sum(1 for n in contracts if n > 0),
+        "joint_pct": round(result.total * 100, 2),
+        "cap_pct": round(result.budget * 100, 2),
+        "independent_pct": round(float(sum(d.kelly_size for _, d in candidates)) * 100, 2),
+        "growth": round(result.growth, 6),
+        "ms": round(result.ms, 2),
+    })
+    return sized, stats
 
 
 # ============================================================================
 # MARKET SCANNER (from v3 + v2 weather)
 # ============================================================================
 
-def parse_market(raw: dict) -> Optional[MarketInfo]:
-    try:
-        ticker = raw.get("ticker", "")
+def get_market_store() -> MarketStore:
+    """Open the persistent market snapshot on first use."""
+    global _market_store
+    if _market_store is None or _market_store.db_path != Path(MARKET_STORE_FILE):
+        _market_store = MarketStore(MARKET_STORE_FILE)
+    return _market_store
+
+
+def market_fields(raw: dict, static: dict = None) -> tuple:
+    """
+    Raw API market -> MarketInfo field values (positional, MarketInfo order).
+    `static` (from the market store) skips re-deriving title/subtitle/category;
+    the expiry always comes from the live payload (Kalshi can move close times).
+    """
+    ticker = raw.get("ticker", "")
+    if static:
+        title, subtitle, category = static["title"], static["subtitle"], static["category"]
+    else:
         title = raw.get("title", "") or raw.get("event_title", "")
         subtitle = raw.get("subtitle", "") or raw.get("yes_sub_title", "")
         category = raw.get("category", "") or raw.get("series_ticker", "")
-        yes_price = raw.get("yes_bid", 0) or raw.get("last_price", 50)
-        no_price = 100 - yes_price if yes_price else 50
-        yes_ask = raw.get("yes_ask") or yes_price
-        yes_bid = raw.get("yes_bid") or yes_price
-        volume = raw.get("volume", 0) or 0
-        oi = raw.get("open_interest", 0) or 0
-        expiry = raw.get("close_time", "") or raw.get("expiration_time", "")
-        status = raw.get("status", "")
-        result = raw.get("result", "") or ""
-        last_price = raw.get("last_price", 0) or 0
-        return MarketInfo(ticker=ticker, title=title, subtitle=subtitle, category=category,
-                         yes_price=yes_price, no_price=no_price, volume=volume, open_interest=oi,
-                         expiry=expiry, status=status, result=result, yes_bid=yes_bid,
-                         yes_ask=yes_ask, last_price=last_price)
+    expiry = raw.get("close_time", "") or raw.get("expiration_time", "") or (static or {}).get("expiry", "")
+    yes_price = raw.get("yes_bid", 0) or raw.get("last_price", 50)
+    no_price = 100 - yes_price if yes_price else 50
+    yes_ask = raw.get("yes_ask") or yes_price
+    yes_bid = raw.get("yes_bid") or yes_price
+    volume = raw.get("volume", 0) or 0
+    oi = raw.get("open_interest", 0) or 0
+    status = raw.get("status", "")
+    result = raw.get("result", "") or ""
+    last_price = raw.get("last_price", 0) or 0
+    return (ticker, title, subtitle, category, yes_price, no_price, volume, oi,
+            expiry, status, result, yes_bid, yes_ask, last_price)
+
+
+def parse_market(raw: dict, static: dict = None) -> Optional[MarketInfo]:
+    """Parse a raw market. `static` (from the market store) skips re-deriving title/subtitle/category."""
+    try:
+        return MarketInfo(*market_fields(raw, static))
     except Exception:
         return None
 
@@ -1692,56 +1995,169 @@ def score_market(market: MarketInfo) -> float:
     return score
 
 
+def rank_markets(markets: list, k: int) -> tuple:
+    """
+    Score markets and pick the best k.
+
+    Returns (top, rest): top is [(market, score)] best first, rest holds the
+    remaining (market, score) pairs in scan order. Uses the vectorized
+    MarketTable pass when numpy is available, score_market otherwise.
+    """
+    if not MARKET_TABLE_AVAILABLE or not markets:
+        scored = sorted(((m, score_market(m)) for m in markets), key=lambda x: x[1], reverse=True)
+        return scored[:k], scored[k:]
+    table = getattr(markets[0], "table", None)
+    if table is None or len(table) != len(markets) or any(
+            getattr(m, "table", None) is not table or m.index != i for i, m in enumerate(markets)):
+        table = MarketTable.from_markets(markets)
+    scores = table.scores()
+    top = MarketTable.top_k(k, scores).tolist()
+    in_top = set(top)
+    scores = scores.tolist()
+    return ([(markets[i], scores[i]) for i in top],
+            [(m, scores[i]) for i, m in enumerate(markets) if i not in in_top])
+
+
 def scan_all_markets() -> list:
-    """Scan all open Kalshi markets with pagination + sports tickers."""
+    """
+    Scan all open Kalshi markets with pagination + sports tickers.
+
+    The cursor walk and every sports series query run concurrently (bounded by
+    SCAN_CONCURRENCY, throttled by KALSHI_RATE_LIMITER). Pages are parsed into
+    a columnar MarketTable as they arrive, overlapping parsing with I/O, and
+    filtered in one vectorized pass once the last page is in (per-market
+    filter_markets without numpy). Returned markets are light MarketTable
+    row views.
+    """
+    scan_start = time.time()
+    wait_start = KALSHI_RATE_LIMITER.waited_sec  # the limiter's total runs from process start
     all_markets = []
+    filtered = []
     seen = set()
-    cursor = None
+    found = {"general": 0, "sports": 0}
+    parse_errors = 0
+    pages = queue.Queue()
+    page_counts = {"general": 0, "sports": 0}
+    general_complete = False
+    store = get_market_store()
+    table = MarketTable() if MARKET_TABLE_AVAILABLE else None
+
+    base_path = "/trade-api/v2/markets?limit=200"
+    walk_max_ts = None  # the general walk only covers markets closing by this time
+    if SCAN_CLOSE_TS_FILTER:
+        walk_max_ts = int(scan_start + MAX_DAYS_TO_EXPIRY * 86400)
+        base_path += f"&max_close_ts={walk_max_ts}"
+
+    def walk_general():
+        nonlocal general_complete, base_path, walk_max_ts
+        cursor = None
+        try:
+            for page in range(SCAN_MAX_PAGES):
+                path = base_path
+                if cursor:
+                    path += f"&cursor={cursor}"
+                result = kalshi_api("GET", path)
+                if "error" in result and page == 0 and base_path != "/trade-api/v2/markets?limit=200":
+                    base_path = "/trade-api/v2/markets?limit=200"
+                    walk_max_ts = None
+                    result = kalshi_api("GET", base_path)
+                if "error" in result:
+                    break
+                raw = result.get("markets", [])
+                if not raw:
+                    general_complete = True
+                    break
+                pages.put(("general", raw))
+                next_cursor = result.get("cursor")
+                if not next_cursor or next_cursor == cursor:
+                    general_complete = True
+                    break
+                cursor = next_cursor
+        finally:
+            pages.put(("done", None))
+
+    def fetch_series(series_ticker):
+        try:
+            path = f"/trade-api/v2/markets?limit=200&series_ticker={series_ticker}&status=open"
+            result = kalshi_api("GET", path)
+            if "error" not in result:
+                pages.put(("sports", result.get("markets", [])))
+        finally:
+            pages.put(("done", None))
 
     log.info("📡 Scanning Kalshi markets...", extra={"component": "scanner"})
-    for page in range(20):
-        path = f"/trade-api/v2/markets?limit=200"
-        if cursor:
-            path += f"&cursor={cursor}"
-        result = kalshi_api("GET", path)
-        if "error" in result:
-            break
-        raw = result.get("markets", [])
-        if not raw:
-            break
-        for r in raw:
-            m = parse_market(r)
-            if m and m.ticker not in seen:
-                all_markets.append(m)
-                seen.add(m.ticker)
-        next_cursor = result.get("cursor")
-        if not next_cursor or next_cursor == cursor:
-            break
-        cursor = next_cursor
-        time.sleep(0.3)
-
-    log.info(f"   General: {len(all_markets)} markets")
-
-    # Sports event tickers
-    sports_found = 0
-    for et in SPORTS_EVENT_TICKERS:
-        path = f"/trade-api/v2/markets?limit=200&series_ticker={et}&status=open"
-        result = kalshi_api("GET", path)
-        if "error" not in result:
-            for r in result.get("markets", []):
-                m = parse_market(r)
-                if m and m.ticker not in seen:
-                    all_markets.append(m)
-                    seen.add(m.ticker)
-                    sports_found += 1
-        time.sleep(0.2)
-    if sports_found:
-        log.info(f"   Sports: +{sports_found} additional markets")
-
-    # Filter
-    filtered = filter_markets(all_markets)
-    log.info(f"   Filtered: {len(filtered)}/{len(all_markets)} pass criteria",
-             extra={"component": "scanner"})
+    with ThreadPoolExecutor(max_workers=max(1, SCAN_CONCURRENCY)) as pool:
+        pool.submit(walk_general)
+        for et in SPORTS_EVENT_TICKERS:
+            pool.submit(fetch_series, et)
+        pending = 1 + len(SPORTS_EVENT_TICKERS)
+
+        # Consume pages as they land — parsing overlaps with I/O
+        while pending:
+            source, raw = pages.get()
+            if source == "done":
+                pending -= 1
+                continue
+            page_counts[source] += 1
+            for r in raw:
+                ticker = r.get("ticker", "")
+                if ticker in seen:
+                    continue
+                try:
+                    fields = market_fields(r, store.get_static(ticker))
+                    if table is not None:
+                        table.append(*fields)
+                    else:
+                        all_markets.append(MarketInfo(*fields))
+                except (KeyError, TypeError, ValueError):
+                    parse_errors += 1
+                    continue
+                seen.add(ticker)
+                found[source] += 1
+
+    if table is not None:
+        keep = table.filter_mask(
+            min_volume=MIN_VOLUME, min_liquidity=MIN_LIQUIDITY,
+            min_dte=MIN_DAYS_TO_EXPIRY, max_dte=MAX_DAYS_TO_EXPIRY,
+            min_price=MIN_PRICE_CENTS, max_price=MAX_PRICE_CENTS)
+        filtered = table.take(keep.nonzero()[0]).rows()
+        all_markets = table.rows()
+    else:
+        filtered = filter_markets(all_markets)
+
+    # Only the general walk covers the whole open universe (up to max_close_ts);
+    # if it was cut short, don't infer closures from absence
+    try:
+        delta = store.sync(all_markets, full_universe=general_complete, universe_max_ts=walk_max_ts)
+    except Exception as e:
+        delta = {"new": 0, "updated": 0, "closed": 0}
+        log.warning(f"⚠️ Market store sync failed: {e}", extra={"component": "scanner"})
+        record_error("market_store", str(e))
+
+    scan_wall = time.time() - scan_start
+    LAST_SCAN_STATS.clear()
+    LAST_SCAN_STATS.update({
+        "scan_wall_s": round(scan_wall, 2),
+        "general_pages": page_counts["general"],
+        "series_queried": len(SPORTS_EVENT_TICKERS),
+        "raw_markets": len(all_markets),
+        "filtered_markets": len(filtered),
+        "table_kb": round(table.nbytes() / 1024, 1) if table is not None else None,
+        "new_markets": delta["new"],
+        "closed_markets": delta["closed"],
+        "parse_errors": parse_errors,
+        "rate_limit_wait_s": round(KALSHI_RATE_LIMITER.waited_sec - wait_start, 2),
+    })
+
+    log.info(f"   General: {found['general']} markets")
+    if found["sports"]:
+        log.info(f"   Sports: +{found['sports']} additional markets")
+    if delta["new"] or delta["closed"]:
+        log.info(f"   Store: +{delta['new']} new listings, -{delta['closed']} closed")
+    if parse_errors:
+        log.warning(f"   ⚠️ Skipped {parse_errors} malformed markets", extra={"component": "scanner"})
+    log.info(f"   Filtered: {len(filtered)}/{len(all_markets)} pass criteria ({scan_wall:.1f}s)",
+             extra={"component": "scanner", "duration_s": round(scan_wall, 2)})
     return filtered
 
 
@@ -1840,8 +2256,9 @@ def check_circuit_breaker() -> tuple:
     except Exception:
         pass
 
-    # Count consecutive losses from trade log
+    # Count consecutive losses from trade log (+ journaled settlements)
     losses = 0
+    journal = get_settlement_journal()
     try:
         if TRADE_LOG_FILE.exists():
             with open(TRADE_LOG_FILE) as f:
@@ -1849,7 +2266,7 @@ def check_circuit_breaker() -> tuple:
             for line in reversed(lines):
                 try:
                     entry = json.loads(line.strip())
-                    status = entry.get("result_status", "pending")
+                    status = journal.status_for(entry)
                     if status == "won":
                         break
                     elif status == "lost":
@@ -1875,6 +2292,7 @@ def check_daily_loss_limit() -> tuple:
     spent = 0
     won = 0
     trades = 0
+    journal = get_settlement_journal()
 
     try:
         if TRADE_LOG_FILE.exists():
@@ -1891,7 +2309,7 @@ def check_daily_loss_limit() -> tuple:
                         trades += 1
                         cost = entry.get("cost_cents", entry.get("contracts", 0) * entry.get("price_cents", 0))
                         spent += cost
-                        if entry.get("result_status") == "won":
+                        if journal.status_for(entry) == "won":
                             contracts = entry.get("contracts", 0)
                             price = entry.get("price_cents", 0)
                             won += contracts * (100 - price)
@@ -1926,49 +2344,109 @@ def check_daily_loss_limit() -> tuple:
 # SETTLEMENT TRACKER
 # ============================================================================
 
+def get_settlement_journal() -> SettlementJournal:
+    """Load the settlement journal on first use."""
+    global _settlement_journal
+    if _settlement_journal is None or _settlement_journal.path != Path(SETTLEMENT_JOURNAL_FILE):
+        _settlement_journal = SettlementJournal(SETTLEMENT_JOURNAL_FILE)
+    return _settlement_journal
+
+
+def _settlement_due(ticker: str, expiry: str, now: float) -> bool:
+    """Expired markets are checked every pass; open ones at most every SETTLEMENT_RECHECK_SEC."""
+    last = _SETTLEMENT_LAST_CHECK.get(ticker)
+    if last is None:
+        return True
+    expiry_ts = expiry_to_ts(expiry) if expiry else 0
+    if expiry_ts and expiry_ts <= now:
+        return True
+    return now - last >= SETTLEMENT_RECHECK_SEC
+
+
+def resolve_settlements(tickers: list) -> dict:
+    """
+    Look up market results for unique tickers. Returns {ticker: result}
+    ("" = not settled yet); tickers whose lookup failed are left out.
+
+    Bulk /markets?tickers= pages first, then concurrent single-market GETs
+    for anything the bulk call didn't return.
+    """
+    results = {}
+    for i in range(0, len(tickers), SETTLEMENT_BATCH_SIZE):
+        chunk = set(tickers[i:i + SETTLEMENT_BATCH_SIZE])
+        resp = kalshi_api("GET", f"/trade-api/v2/markets?tickers={','.join(sorted(chunk))}&limit={len(chunk)}")
+        if "error" in resp:
+            continue
+        for m in resp.get("markets", []) or []:
+            if m.get("ticker") in chunk:
+                results[m["ticker"]] = m.get("result", "") or ""
+
+    missing = [t for t in tickers if t not in results]
+    if missing:
+        def fetch(ticker):
+            return kalshi_api("GET", f"/trade-api/v2/markets/{ticker}")
+
+        with ThreadPoolExecutor(max_workers=min(SCAN_CONCURRENCY, len(missing))) as pool:
+            for ticker, resp in zip(missing, pool.map(fetch, missing)):
+                if "error" in resp:
+                    continue
+                market = resp.get("market", resp)
+                results[ticker] = (market.get("result", "") if isinstance(market, dict) else "") or ""
+    return results
+
+
 def update_trade_results():
-    """Check settled markets and update trade log with results."""
+    """
+    Check settled markets and journal the results.
+
+    Pending tickers are deduped before querying, journaled tickers are never
+    re-queried, and the trade log is only rewritten by the periodic compaction.
+    """
+    global _LAST_TRADE_LOG_COMPACT
     if not TRADE_LOG_FILE.exists():
         return {"updated": 0, "wins": 0, "losses": 0}
 
-    updated_lines = []
     updated_count = 0
     wins = 0
     losses = 0
 
     try:
+        journal = get_settlement_journal()
+        pending = defaultdict(list)  # ticker -> actions of its pending entries
+        expiries = {}
         with open(TRADE_LOG_FILE) as f:
-            lines = f.readlines()
+            for line in f:
+                try:
+                    entry = json.loads(line.strip())
+                except Exception:
+                    continue
+                ticker = entry.get("ticker")
+                if entry.get("result_status") == "pending" and ticker and ticker not in journal:
+                    pending[ticker].append(entry.get("action", ""))
+                    expiries[ticker] = entry.get("expiry", "")
+
+        now = time.time()
+        due = [t for t in pending if _settlement_due(t, expiries[t], now)]
+        results = resolve_settlements(due) if due else {}
+        settled = {t: r for t, r in results.items() if r}
+        for ticker in due:
+            if ticker not in settled:
+                _SETTLEMENT_LAST_CHECK[ticker] = now
+            else:
+                _SETTLEMENT_LAST_CHECK.pop(ticker, None)
+        journal.record(settled)
 
-        for line in lines:
-            try:
-                entry = json.loads(line.strip())
-                if entry.get("result_status") == "pending" and entry.get("ticker"):
-                    # Check if market settled
-                    result = kalshi_api("GET", f"/trade-api/v2/markets/{entry['ticker']}")
-                    if "error" not in result:
-                        market_result = result.get("result", "")
-                        if market_result:
-                            action = entry.get("action", "")
-                            side = "yes" if action == "BUY_YES" else "no"
-                            if (side == "yes" and market_result == "yes") or \
-                               (side == "no" and market_result == "no"):
-                                entry["result_status"] = "won"
-                                wins += 1
-                            else:
-                                entry["result_status"] = "lost"
-                                losses += 1
-                            entry["settled_at"] = datetime.now(timezone.utc).isoformat()
-                            entry["market_result"] = market_result
-                            updated_count += 1
-                    time.sleep(0.2)  # Rate limit
-                updated_lines.append(json.dumps(entry) + "\n")
-            except Exception:
-                updated_lines.append(line)
+        for ticker, market_result in settled.items():
+            for action in pending[ticker]:
+                if trade_outcome(action, market_result) == "won":
+                    wins += 1
+                else:
+                    losses += 1
+                updated_count += 1
 
-        if updated_count > 0:
-            with open(TRADE_LOG_FILE, "w") as f:
-                f.writelines(updated_lines)
+        if time.time() - _LAST_TRADE_LOG_COMPACT >= SETTLEMENT_COMPACT_INTERVAL_SEC:
+            journal.compact_trade_log(TRADE_LOG_FILE)
+            _LAST_TRADE_LOG_COMPACT = time.time()
 
     except Exception as e:
         log.warning(f"⚠️ Settlement check error: {e}",
@@ -2033,6 +2511,113 @@ def log_skip(ticker: str, reason: str, details: dict = None):
         f.write(json.dumps(entry) + "\n")
 
 
+# ============================================================================
+# ANALYSIS PIPELINE (forecast → critique, concurrent across markets)
+# ============================================================================
+
+class TokenBudget:
+    """Per-cycle LLM token allowance shared by the analysis workers."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.used = 0
+        self._lock = threading.Lock()
+
+    def spend(self, tokens: int):
+        with self._lock:
+            self.used += tokens
+
+    @property
+    def exhausted(self) -> bool:
+        return self.limit > 0 and self.used >= self.limit
+
+
+def build_market_context(market: MarketInfo, context: dict) -> dict:
+    """Cycle context narrowed to the market's asset (crypto momentum/regime)."""
+    mkt_context = dict(context)
+    if classify_market_type(market) == "crypto":
+        asset = "btc" if "BTC" in market.ticker.upper() else "eth"
+        mkt_context["momentum"] = context.get("momentum", {}).get(asset, {})
+        mkt_context["regime"] = context.get("regime", {}).get(asset, {})
+    return mkt_context
+
+
+def get_forecast_cache() -> ForecastCache:
+    """Load the persistent forecast cache on first use."""
+    global _forecast_cache
+    if _forecast_cache is None or _forecast_cache.path != Path(FORECAST_CACHE_FILE):
+        _forecast_cache = ForecastCache(FORECAST_CACHE_FILE, ttl_sec=FORECAST_CACHE_TTL_SEC,
+                                        max_entries=FORECAST_CACHE_MAX_ENTRIES)
+    return _forecast_cache
+
+
+def forecast_cache_key(market: MarketInfo, context: dict) -> str:
+    """Ticker + quantized market state; small moves map to the same key."""
+    tte_bucket = bisect_left(FORECAST_CACHE_TTE_BUCKETS_H, market.days_to_expiry * 24)
+    regime = (context.get("regime") or {}).get("regime", "")
+    direction = round((context.get("momentum") or {}).get("composite_direction", 0) or 0, 1)
+    news = context.get("news_sentiment") or {}
+    news_hash = fingerprint(news.get("sentiment"), round(news.get("confidence", 0) or 0, 1))
+    fear_greed = (context.get("sentiment") or {}).get("classification", "")
+    underlying = None
+    if classify_market_type(market) == "crypto":
+        asset = "btc" if "BTC" in market.ticker.upper() else "eth"
+        price = (context.get("crypto_prices") or {}).get(asset)
+        underlying = round(math.log(price) / math.log(1.005)) if price else None  # 0.5% steps
+    return f"{market.ticker}:" + fingerprint(
+        market.yes_price // FORECAST_CACHE_PRICE_BUCKET, int(math.log2(market.volume + 1)),
+        tte_bucket, regime, direction, fear_greed, news_hash, underlying)
+
+
+def analyze_market(market: MarketInfo, context: dict, use_heuristic: bool,
+                   budget: TokenBudget) -> MarketAnalysis:
+    """Forecast one market and, if it clears the quick-edge gate, critique it."""
+    mkt_context = build_market_context(market, context)
+    cache = None if use_heuristic else get_forecast_cache()
+    key = forecast_cache_key(market, mkt_context) if cache is not None else None
+    cached = cache.get(key) if key else None
+
+    start = time.perf_counter()
+    if cached:
+        # Reused answers cost no tokens this cycle
+        forecast = ForecastResult(**{**cached["forecast"], "tokens_used": 0})
+    elif not use_heuristic and budget.exhausted:
+        return MarketAnalysis(skipped="token_budget")
+    elif use_heuristic:
+        forecast = heuristic_forecast(market, mkt_context)
+    else:
+        forecast = forecast_market_llm(market, mkt_context)
+    analysis = MarketAnalysis(forecast=forecast, forecast_s=time.perf_counter() - start,
+                              quick_edge=abs(forecast.probability - market.market_prob),
+                              cache_hit=bool(cached))
+    budget.spend(forecast.tokens_used)
+    cacheable = cache is not None and forecast.model_used != "error"
+    entry = cached or {"forecast": {**asdict(forecast), "raw_response": ""}, "critic": None}
+
+    if analysis.quick_edge < MIN_EDGE_BUY_NO * 0.5:
+        if cacheable and not cached:
+            cache.put(key, entry)
+        return analysis
+
+    start = time.perf_counter()
+    if cached and cached.get("critic"):
+        analysis.critic = CriticResult(**{**cached["critic"], "tokens_used": 0})
+    elif not use_heuristic and budget.exhausted:
+        if cacheable and not cached:
+            cache.put(key, entry)
+        analysis.skipped = "token_budget"
+        return analysis
+    elif use_heuristic:
+        analysis.critic = heuristic_critique(market, forecast)
+    else:
+        analysis.critic = critique_forecast_llm(market, forecast)
+        if cacheable:
+            cache.put(key, {**entry, "critic": asdict(analysis.critic)})
+    analysis.critic_s = time.perf_counter() - start
+    budget.spend(analysis.critic.tokens_used)
+    return analysis
+
+
 # ============================================================================
 # MAIN TRADING CYCLE
 # ============================================================================
@@ -2043,12 +2628,14 @@ def run_cycle(dry_run: bool = True, max_markets: int = 20, max_trades: int = 5):
     1. Check safety (circuit breaker, daily loss, holiday, risk limits)
     2. Gather context (prices, momentum, sentiment, regime)
     3. Scan & rank markets
-    4. For top N: Forecast → Critique → Decide → Risk Check → Execute
-    5. Log everything (structured JSON)
-    6. Check drawdown alerts
+    4. For top N: Forecast → Critique → Decide
+    5. Size all candidates jointly (portfolio Kelly under risk limits) → Execute
+    6. Log everything (structured JSON)
+    7. Check drawdown alerts
     """
     cycle_start = time.time()
     shutdown.current_cycle += 1
+    signing_start = get_signing_stats()
     cycle_id = f"cycle-{shutdown.current_cycle}-{int(cycle_start)}"
 
     log.info("=" * 70)
@@ -2182,13 +2769,16 @@ def run_cycle(dry_run: bool = True, max_markets: int = 20, max_trades: int = 5):
     # OHLC + Momentum + Regime
     btc_ohlc = get_crypto_ohlc("bitcoin", 7)
     eth_ohlc = get_crypto_ohlc("ethereum", 7)
-    btc_momentum = get_multi_timeframe_momentum(btc_ohlc)
-    eth_momentum = get_multi_timeframe_momentum(eth_ohlc)
+    # Indicator state persists between cycles; only new candles are folded in
+    btc_candles = candle_series(btc_ohlc, "btc") if INDICATORS_AVAILABLE else btc_ohlc
+    eth_candles = candle_series(eth_ohlc, "eth") if INDICATORS_AVAILABLE else eth_ohlc
+    btc_momentum = get_multi_timeframe_momentum(btc_candles)
+    eth_momentum = get_multi_timeframe_momentum(eth_candles)
     context["ohlc"] = {"btc": btc_ohlc, "eth": eth_ohlc}
     context["momentum"] = {"btc": btc_momentum, "eth": eth_momentum}
 
-    btc_regime = detect_market_regime(btc_ohlc, btc_momentum)
-    eth_regime = detect_market_regime(eth_ohlc, eth_momentum)
+    btc_regime = detect_market_regime(btc_candles, btc_momentum)
+    eth_regime = detect_market_regime(eth_candles, eth_momentum)
     context["regime"] = {"btc": btc_regime, "eth": eth_regime}
 
     for asset, mom in [("BTC", btc_momentum), ("ETH", eth_momentum)]:
@@ -2210,10 +2800,35 @@ def run_cycle(dry_run: bool = True, max_markets: int = 20, max_trades: int = 5):
                     extra={"component": "scanner", "cycle_id": cycle_id})
         return
 
-    # Score and rank
-    scored = [(m, score_market(m)) for m in markets]
-    scored.sort(key=lambda x: x[1], reverse=True)
-    top_markets = scored[:max_markets]
+    # Rank: vectorized score + top-K over the filtered table
+    top_markets, rest = rank_markets(markets, max_markets)
+
+    # ── Implied-vol surface: every crypto strike ladder solved at once, reused by all forecasts ──
+    if IV_SURFACE_AVAILABLE and prices:
+        context["iv_surface"] = IVSurface.from_markets(
+            [m for m in markets if classify_market_type(m) == "crypto"], prices,
+            fat_tail_multiplier=CRYPTO_FAT_TAIL_MULTIPLIER,
+            ref_vol={"btc": BTC_HOURLY_VOL, "eth": ETH_HOURLY_VOL})
+        iv_summary = context["iv_surface"].summary()
+        atm = ", ".join(f"{a.upper()} {s['atm_iv_1h']*100:.3f}%/hr" for a, s in iv_summary["assets"].items()
+                        if s["atm_iv_1h"] is not None)
+        log.info(f"📐 IV surface: {iv_summary['solved']} strikes solved in {iv_summary['solve_ms']:.1f}ms"
+                 + (f" — ATM {atm}" if atm else ""), extra={"component": "forecast"})
+
+    # ── Batch crypto forecast: real edge for every crypto market, not just the top-N ──
+    batch_start = time.perf_counter()
+    crypto_batch = score_crypto_universe(markets, context)
+    batch_ms = (time.perf_counter() - batch_start) * 1000
+    with_edge = [(m, s) for m, s in rest
+                 if m.ticker in crypto_batch and crypto_batch[m.ticker][1] >= MIN_EDGE_BUY_YES]
+    with_edge.sort(key=lambda x: crypto_batch[x[0].ticker][1], reverse=True)
+    promoted = with_edge[:BATCH_PROMOTE_MAX]
+    top_markets += promoted
+    if crypto_batch:
+        n_edge = sum(1 for _, e in crypto_batch.values() if e >= MIN_EDGE_BUY_YES)
+        log.info(f"🧮 Crypto batch: {len(crypto_batch)} markets in {batch_ms:.1f}ms, "
+                 f"{n_edge} with edge ≥ {MIN_EDGE_BUY_YES:.0%}, {len(promoted)} promoted",
+                 extra={"component": "forecast"})
 
     log.info(f"\n🎯 TOP {len(top_markets)} MARKETS:")
     log.info("-" * 70)
@@ -2222,7 +2837,8 @@ def run_cycle(dry_run: bool = True, max_markets: int = 20, max_trades: int = 5):
         log.info(f"      YES:{m.yes_price}¢ Vol:{m.volume:,} DTE:{m.days_to_expiry:.1f}d")
     log.info("-" * 70)
 
-    # ── Analyze markets: Forecast → Critique → Decide → Risk Check ──
+    # ── Analyze markets: Forecast → Critique → Decide, then size all candidates jointly ──
+    candidates = []  # (market, decision) in rank order
     trades_executed = 0
     trades_skipped = 0
     risk_blocked = 0
@@ -2243,99 +2859,155 @@ def run_cycle(dry_run: bool = True, max_markets: int = 20, max_trades: int = 5):
         except Exception:
             pass
 
-    for i, (market, score) in enumerate(top_markets, 1):
-        # ── Graceful shutdown check (between markets) ──
-        if shutdown.check_stop():
-            log.info(f"🛑 Shutdown requested — stopping market analysis at {i}/{len(top_markets)}",
-                     extra={"component": "shutdown", "cycle_id": cycle_id})
-            break
+    # Forecasts (and critiques that clear the quick-edge gate) run concurrently;
+    # results are consumed below in score order, so candidates stay ranked.
+    workers = 1 if use_heuristic else max(1, LLM_CONCURRENCY)
+    budget = TokenBudget(0 if use_heuristic else LLM_CYCLE_TOKEN_BUDGET)
+    forecast_cache = get_forecast_cache()
+    forecast_cache.reset_stats()
+    pipeline_start = time.time()
+    pool = ThreadPoolExecutor(max_workers=workers)
+    pending = {m.ticker: pool.submit(analyze_market, m, context, use_heuristic, budget)
+               for m, _ in top_markets if m.ticker not in existing_tickers}
+    stage = {"forecast_s": 0.0, "critic_s": 0.0, "execution_s": 0.0,
+             "forecasts": 0, "critiques": 0, "budget_skipped": 0}
 
-        if trades_executed >= max_trades:
-            log.info(f"\n⏹️ Max trades ({max_trades}) reached")
-            break
+    try:
+        for i, (market, score) in enumerate(top_markets, 1):
+            # ── Graceful shutdown check (between markets) ──
+            if shutdown.check_stop():
+                log.info(f"🛑 Shutdown requested — stopping market analysis at {i}/{len(top_markets)}",
+                         extra={"component": "shutdown", "cycle_id": cycle_id})
+                break
 
-        if market.ticker in existing_tickers:
-            continue
+            if market.ticker in existing_tickers or market.ticker not in pending:
+                continue
 
-        log.info(f"\n{'='*50}")
-        log.info(f"🔍 [{i}/{len(top_markets)}] {market.ticker}",
-                 extra={"component": "analysis", "ticker": market.ticker})
-        log.info(f"   {market.title[:75]}")
-        log.info(f"   YES:{market.yes_price}¢ NO:{market.no_price}¢ Vol:{market.volume:,}")
-
-        # Build market-specific context
-        mkt_context = dict(context)
-        mkt_type = classify_market_type(market)
-        if mkt_type == "crypto":
-            asset = "btc" if "BTC" in market.ticker.upper() else "eth"
-            mkt_context["momentum"] = context.get("momentum", {}).get(asset, {})
-            mkt_context["regime"] = context.get("regime", {}).get(asset, {})
-
-        # Step 1: FORECAST
-        if use_heuristic:
-            log.info(f"   🧮 Heuristic ({mkt_type}/{detect_sport(market)})...")
-            forecast = heuristic_forecast(market, mkt_context)
-        else:
-            log.info(f"   🧠 LLM Forecasting...")
-            forecast = forecast_market_llm(market, mkt_context)
-        total_tokens += forecast.tokens_used
-        log.info(f"   📊 Forecast: {forecast.probability:.1%} ({forecast.confidence})",
-                 extra={"component": "forecast", "ticker": market.ticker})
-        log.info(f"   📝 Factors: {', '.join(forecast.key_factors[:3]) if forecast.key_factors else 'N/A'}")
-
-        # Quick edge check before critic
-        quick_edge = abs(forecast.probability - market.market_prob)
-        if quick_edge < MIN_EDGE_BUY_NO * 0.5:
-            log.debug(f"   ⏭️ Quick skip: edge {quick_edge:.1%} too small",
-                      extra={"component": "analysis", "ticker": market.ticker, "edge": quick_edge})
-            log.info(f"   ⏭️ Quick skip: edge {quick_edge:.1%} too small")
-            trades_skipped += 1
-            log_skip(market.ticker, f"quick_edge_{quick_edge:.3f}", {"market_prob": market.market_prob})
-            continue
+            log.info(f"\n{'='*50}")
+            log.info(f"🔍 [{i}/{len(top_markets)}] {market.ticker}",
+                     extra={"component": "analysis", "ticker": market.ticker})
+            log.info(f"   {market.title[:75]}")
+            log.info(f"   YES:{market.yes_price}¢ NO:{market.no_price}¢ Vol:{market.volume:,}")
+
+            # Step 1: FORECAST (+ Step 2: CRITIQUE, already running in the pool)
+            analysis = pending[market.ticker].result()
+            forecast, critic = analysis.forecast, analysis.critic
+            if forecast is None:
+                log.info(f"   ⏭️ Skipped: LLM token budget ({LLM_CYCLE_TOKEN_BUDGET:,}) exhausted")
+                stage["budget_skipped"] += 1
+                trades_skipped += 1
+                log_skip(market.ticker, analysis.skipped)
+                continue
+            stage["forecasts"] += 1
+            stage["forecast_s"] += analysis.forecast_s
+            total_tokens += forecast.tokens_used
+            if use_heuristic:
+                log.info(f"   🧮 Heuristic ({classify_market_type(market)}/{detect_sport(market)})")
+            log.info(f"   📊 Forecast: {forecast.probability:.1%} ({forecast.confidence}) "
+                     f"{'(cached)' if analysis.cache_hit else f'in {analysis.forecast_s:.1f}s'}",
+                     extra={"component": "forecast", "ticker": market.ticker})
+            log.info(f"   📝 Factors: {', '.join(forecast.key_factors[:3]) if forecast.key_factors else 'N/A'}")
+
+            # Quick edge check before critic
+            quick_edge = analysis.quick_edge
+            if critic is None and not analysis.skipped:
+                log.debug(f"   ⏭️ Quick skip: edge {quick_edge:.1%} too small",
+                          extra={"component": "analysis", "ticker": market.ticker, "edge": quick_edge})
+                log.info(f"   ⏭️ Quick skip: edge {quick_edge:.1%} too small")
+                trades_skipped += 1
+                log_skip(market.ticker, f"quick_edge_{quick_edge:.3f}", {"market_prob": market.market_prob})
+                continue
+            if critic is None:
+                log.info(f"   ⏭️ Skipped critique: LLM token budget ({LLM_CYCLE_TOKEN_BUDGET:,}) exhausted")
+                stage["budget_skipped"] += 1
+                trades_skipped += 1
+                log_skip(market.ticker, analysis.skipped, {"forecast_prob": forecast.probability})
+                continue
 
-        # Step 2: CRITIQUE
-        if use_heuristic:
-            critic = heuristic_critique(market, forecast)
-        else:
-            log.info(f"   🔎 LLM Critiquing...")
-            critic = critique_forecast_llm(market, forecast)
-        total_tokens += critic.tokens_used
-        log.info(f"   📊 Critic: {critic.adjusted_probability:.1%} | Flaws: {len(critic.major_flaws)} | Trade: {'✅' if critic.should_trade else '❌'}",
-                 extra={"component": "critic", "ticker": market.ticker})
-
-        # Step 3: TRADE DECISION
-        decision = make_trade_decision(market, forecast, critic, balance)
-        log.info(f"   📋 DECISION: {decision.action} — {decision.reason}",
-                 extra={"component": "decision", "ticker": market.ticker,
-                        "action": decision.action, "edge": round(decision.edge, 4)})
+            stage["critiques"] += 1
+            stage["critic_s"] += analysis.critic_s
+            total_tokens += critic.tokens_used
+            log.info(f"   📊 Critic: {critic.adjusted_probability:.1%} | Flaws: {len(critic.major_flaws)} | Trade: {'✅' if critic.should_trade else '❌'}",
+                     extra={"component": "critic", "ticker": market.ticker})
+
+            # Step 3: TRADE DECISION
+            decision = make_trade_decision(market, forecast, critic, balance)
+            log.info(f"   📋 DECISION: {decision.action} — {decision.reason}",
+                     extra={"component": "decision", "ticker": market.ticker,
+                            "action": decision.action, "edge": round(decision.edge, 4)})
+
+            if decision.action == "SKIP":
+                trades_skipped += 1
+                log_trade(market, decision, {}, dry_run)
+                continue
 
-        if decision.action == "SKIP":
-            trades_skipped += 1
-            log_trade(market, decision, {}, dry_run)
-            continue
+            candidates.append((market, decision))
+    finally:
+        # Drop forecasts nobody will look at (shutdown)
+        stage["cancelled"] = sum(f.cancel() for f in pending.values())
+        pool.shutdown(wait=False)
+    analysis_wall = time.time() - pipeline_start
+    llm_busy = stage["forecast_s"] + stage["critic_s"]
+    cache_stats = forecast_cache.stats()
+    if not use_heuristic:
+        try:
+            forecast_cache.save()
+        except Exception as e:
+            log.warning(f"⚠️ Forecast cache save failed: {e}", extra={"component": "forecast"})
 
-        # Step 3.5: RISK LIMITS CHECK (new!)
-        risk_ok, risk_reason = check_position_risk_limits(
-            market, decision, balance, positions, dl_pnl)
-        if not risk_ok:
-            log.warning(f"   🛡️ RISK BLOCKED: {risk_reason}",
-                        extra={"component": "risk", "ticker": market.ticker,
-                               "action": decision.action})
+    # ── Weather opportunities ──
+    if WEATHER_ENABLED and not shutdown.check_stop():
+        weather_opps = find_weather_opportunities()
+        if weather_opps:
+            log.info(f"\n🌡️ Weather: {len(weather_opps)} opportunities found",
+                     extra={"component": "weather"})
+            for wo in weather_opps[:3]:
+                wm = wo["market"]
+                if wm.ticker in existing_tickers:
+                    continue
+                log.info(f"   🌡️ {wm.ticker}: {wo['side'].upper()} @{wo['price']}¢ edge:{wo['edge']*100:.1f}% ({wo['city']})")
+                # Simple forecast/critic for weather
+                wf = ForecastResult(probability=wo["our_prob"], reasoning="NWS forecast",
+                                    confidence="medium", key_factors=["NWS"], model_used="nws-weather")
+                wc = CriticResult(adjusted_probability=wo["our_prob"], should_trade=True)
+                wd = make_trade_decision(wm, wf, wc, balance)
+                if wd.action != "SKIP":
+                    candidates.append((wm, wd))
+
+    # ── Portfolio sizing: one joint Kelly allocation under every exposure limit ──
+    slots = min(max_trades, MAX_CONCURRENT_POSITIONS - num_positions,
+                MAX_DAILY_TRADES - dl_pnl.get("trades_today", 0))
+    portfolio_ok, portfolio_reason = check_portfolio_limits(balance, positions, dl_pnl)
+    if not portfolio_ok:
+        slots = 0
+    sized, portfolio = allocate_portfolio(candidates, balance, positions, slots)
+    if candidates:
+        log.info(f"\n🧮 Portfolio Kelly: {portfolio['sized']}/{len(candidates)} candidates sized, "
+                 f"{portfolio['joint_pct']:.1f}% of balance, cap {portfolio['cap_pct']:.1f}% "
+                 f"(vs {portfolio['independent_pct']:.1f}% sized one at a time) in {portfolio['ms']:.1f}ms",
+                 extra={"component": "risk", "cycle_id": cycle_id})
+
+    # ── Execute in rank order ──
+    for market, decision in sized:
+        if decision.action == "SKIP":
+            reason = decision.reason if portfolio_ok else f"Risk limit: {portfolio_reason}"
+            log.warning(f"   🛡️ RISK BLOCKED {market.ticker}: {reason}",
+                        extra={"component": "risk", "ticker": market.ticker})
             risk_blocked += 1
-            decision_blocked = TradeDecision(
-                action="SKIP", edge=decision.edge, kelly_size=decision.kelly_size,
-                contracts=0, price_cents=decision.price_cents,
-                reason=f"Risk limit: {risk_reason}",
-                forecast=forecast, critic=critic)
-            log_trade(market, decision_blocked, {}, dry_run)
+            log_trade(market, _resized(decision, 0, decision.kelly_size, reason), {}, dry_run)
             continue
+        if shutdown.check_stop():
+            log.info("🛑 Shutdown requested — stopping execution",
+                     extra={"component": "shutdown", "cycle_id": cycle_id})
+            break
 
-        # Step 4: EXECUTE (with graceful shutdown protection)
+        # EXECUTE (with graceful shutdown protection)
+        exec_start = time.time()
         shutdown.enter_trade()
         try:
             side = "yes" if decision.action == "BUY_YES" else "no"
             cost = decision.contracts * decision.price_cents
-            log.info(f"   💰 {decision.action} × {decision.contracts} @ {decision.price_cents}¢ = ${cost/100:.2f}",
+            log.info(f"   💰 {market.ticker} {decision.action} × {decision.contracts} @ {decision.price_cents}¢ = ${cost/100:.2f}",
                      extra={"component": "execution", "ticker": market.ticker,
                             "action": decision.action, "contracts": decision.contracts,
                             "price_cents": decision.price_cents, "cost_cents": cost})
@@ -2343,7 +3015,7 @@ def run_cycle(dry_run: bool = True, max_markets: int = 20, max_trades: int = 5):
             order_result = place_order(market.ticker, side, decision.price_cents, decision.contracts, dry_run)
 
             if dry_run:
-                log.info(f"   🧪 DRY RUN: Simulated",
+                log.info("   🧪 DRY RUN: Simulated",
                          extra={"component": "execution", "ticker": market.ticker})
             else:
                 if "error" in order_result:
@@ -2360,42 +3032,7 @@ def run_cycle(dry_run: bool = True, max_markets: int = 20, max_trades: int = 5):
             log_trade(market, decision, order_result, dry_run)
         finally:
             shutdown.exit_trade()
-
-        time.sleep(1)
-
-    # ── Weather opportunities ──
-    if WEATHER_ENABLED and not shutdown.check_stop():
-        weather_opps = find_weather_opportunities()
-        if weather_opps:
-            log.info(f"\n🌡️ Weather: {len(weather_opps)} opportunities found",
-                     extra={"component": "weather"})
-            for wo in weather_opps[:3]:
-                if trades_executed >= max_trades or shutdown.check_stop():
-                    break
-                wm = wo["market"]
-                if wm.ticker in existing_tickers:
-                    continue
-                log.info(f"   🌡️ {wm.ticker}: {wo['side'].upper()} @{wo['price']}¢ edge:{wo['edge']*100:.1f}% ({wo['city']})")
-                # Simple forecast/critic for weather
-                wf = ForecastResult(probability=wo["our_prob"], reasoning="NWS forecast",
-                                    confidence="medium", key_factors=["NWS"], model_used="nws-weather")
-                wc = CriticResult(adjusted_probability=wo["our_prob"], should_trade=True)
-                wd = make_trade_decision(wm, wf, wc, balance)
-                if wd.action != "SKIP":
-                    # Risk check for weather trades too
-                    risk_ok, risk_reason = check_position_risk_limits(
-                        wm, wd, balance, positions, dl_pnl)
-                    if not risk_ok:
-                        log.warning(f"   🛡️ Weather trade risk blocked: {risk_reason}")
-                        continue
-                    shutdown.enter_trade()
-                    try:
-                        order = place_order(wm.ticker, wo["side"], wo["price"], wd.contracts, dry_run)
-                        log_trade(wm, wd, order, dry_run)
-                        trades_executed += 1
-                        existing_tickers.add(wm.ticker)
-                    finally:
-                        shutdown.exit_trade()
+            stage["execution_s"] += time.time() - exec_start
 
     # ── Cycle summary ──
     duration = time.time() - cycle_start
@@ -2404,14 +3041,23 @@ def run_cycle(dry_run: bool = True, max_markets: int = 20, max_trades: int = 5):
              extra={"component": "summary", "cycle_id": cycle_id, "duration_s": round(duration, 1)})
     log.info(f"   Forecaster: {'🧮 HEURISTIC' if use_heuristic else '🧠 LLM'}")
     log.info(f"   Duration: {duration:.1f}s")
-    log.info(f"   Markets scanned: {len(markets)}")
+    log.info(f"   Markets scanned: {len(markets)} ({LAST_SCAN_STATS.get('scan_wall_s', 0)}s scan)")
     log.info(f"   Markets analyzed: {min(len(top_markets), max_markets)}")
     log.info(f"   Trades executed: {trades_executed}")
     log.info(f"   Trades skipped: {trades_skipped}")
     log.info(f"   Risk blocked: {risk_blocked}")
+    log.info(f"   Analysis: {analysis_wall:.1f}s wall ({workers} workers) — "
+             f"forecast {stage['forecast_s']:.1f}s, critic {stage['critic_s']:.1f}s, "
+             f"execution {stage['execution_s']:.1f}s")
     if not use_heuristic:
-        log.info(f"   Tokens: {total_tokens:,} (~${total_tokens * 0.000004:.4f})")
-
+        log.info(f"   Tokens: {total_tokens:,} (~${total_tokens * 0.000004:.4f}), "
+                 f"{total_tokens / analysis_wall if analysis_wall > 0 else 0:.0f} tok/s")
+        log.info(f"   Forecast cache: {cache_stats['hits']} hits / {cache_stats['misses']} misses "
+                 f"({cache_stats['size']} entries)")
+
+    signing = cycle_signing_stats(signing_start, duration)
+    log.info(f"   Signing: {signing['signatures']} signatures ({signing['signatures_per_sec']}/s over the cycle, "
+             f"{signing['avg_sign_ms']}ms each), PEM parses: {signing['pem_parses']}")
     # Latency summary
     avg_lat = get_avg_latency("markets_search")
     if avg_lat > 0:
@@ -2424,15 +3070,41 @@ def run_cycle(dry_run: bool = True, max_markets: int = 20, max_trades: int = 5):
         "forecaster": "heuristic" if use_heuristic else "llm",
         "duration_s": round(duration, 1),
         "markets_scanned": len(markets),
+        "scan_wall_s": LAST_SCAN_STATS.get("scan_wall_s"),
+        "scan": dict(LAST_SCAN_STATS),
         "markets_analyzed": min(len(top_markets), max_markets),
         "trades_executed": trades_executed,
         "trades_skipped": trades_skipped,
         "risk_blocked": risk_blocked,
+        "portfolio": portfolio,
         "tokens": total_tokens,
+        "pipeline": {
+            "workers": workers,
+            "analysis_wall_s": round(analysis_wall, 2),
+            "forecast_s": round(stage["forecast_s"], 2),
+            "critic_s": round(stage["critic_s"], 2),
+            "execution_s": round(stage["execution_s"], 2),
+            "forecasts": stage["forecasts"],
+            "critiques": stage["critiques"],
+            "budget_skipped": stage["budget_skipped"],
+            "cancelled": stage["cancelled"],
+            "tokens_per_sec": round(total_tokens / analysis_wall, 1) if analysis_wall > 0 else 0.0,
+            "llm_tokens_per_busy_sec": round(total_tokens / llm_busy, 1) if llm_busy > 0 else 0.0,
+        },
+        "forecast_cache": cache_stats,
+        "iv_surface": context["iv_surface"].summary() if "iv_surface" in context else None,
+        "crypto_batch": {
+            "scored": len(crypto_batch),
+            "with_edge": sum(1 for _, e in crypto_batch.values() if e >= MIN_EDGE_BUY_YES),
+            "promoted": len(promoted),
+            "ms": round(batch_ms, 2),
+        },
         "balance": balance,
         "peak_balance": peak_balance,
         "positions": num_positions,
         "daily_pnl_cents": dl_pnl.get("net_pnl_cents", 0),
+        "api_latency": get_latency_summary(),
+        "signing": signing,
         "shutdown_requested": shutdown.check_stop(),
     })
 
@@ -2547,6 +3219,7 @@ Examples:
     finally:
         # Cleanup
         shutdown.cleanup()
+        http_pool.close_all()
         log.info("👋 Autotrader shutdown complete",
                  extra={"component": "shutdown"})
 
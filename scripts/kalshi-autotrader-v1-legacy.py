@@ -16,7 +16,6 @@ Usage:
     python kalshi-autotrader.py --backtest   # Backtest strategy
 """
 
-import requests
 import json
 import sys
 import time
@@ -28,6 +27,10 @@ from cryptography.hazmat.primitives.asymmetric import padding
 import statistics
 from pathlib import Path
 
+# Pooled keep-alive HTTP transport shared with the other traders
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import http_pool
+
 # ============== CONFIG ==============
 # Credentials — loaded from environment or .kalshi-private-key.pem
 API_KEY_ID = os.environ.get("KALSHI_API_KEY_ID", "4308d1ca-585e-4b73-be82-5c0968b9a59a")
@@ -306,9 +309,9 @@ def api_request(method: str, path: str, body: dict = None) -> dict:
     
     try:
         if method == "GET":
-            resp = requests.get(url, headers=headers, timeout=10)
+            resp = http_pool.get(url, headers=headers, timeout=10)
         elif method == "POST":
-            resp = requests.post(url, headers=headers, json=body, timeout=10)
+            resp = http_pool.post(url, headers=headers, json=body, timeout=10)
         else:
             raise ValueError(f"Unknown method: {method}")
         return resp.json()
@@ -354,7 +357,7 @@ def place_order(ticker: str, side: str, count: int, price_cents: int) -> dict:
 def get_crypto_prices() -> dict:
     """Get current BTC/ETH prices"""
     try:
-        resp = requests.get(
+        resp = http_pool.get(
             "https://api.coingecko.com/api/v3/simple/price?ids=bitcoin,ethereum&vs_currencies=usd",
             timeout=5
         )
@@ -370,7 +373,7 @@ def get_crypto_prices() -> dict:
 def get_fear_greed_index() -> dict:
     """Get crypto Fear & Greed Index (sentiment)"""
     try:
-        resp = requests.get("https://api.alternative.me/fng/?limit=1", timeout=5)
+        resp = http_pool.get("https://api.alternative.me/fng/?limit=1", timeout=5)
         data = resp.json()
         return {
             "value": int(data["data"][0]["value"]),
@@ -383,7 +386,7 @@ def get_fear_greed_index() -> dict:
 def get_btc_volatility() -> float:
     """Get BTC 24h volatility from price history"""
     try:
-        resp = requests.get(
+        resp = http_pool.get(
             "https://api.coingecko.com/api/v3/coins/bitcoin/market_chart?vs_currency=usd&days=1",
             timeout=10
         )
@@ -437,7 +440,7 @@ def kelly_size(edge: float, odds: float, bankroll: float) -> int:
 def get_btc_momentum() -> float:
     """Get BTC momentum (% change over last 4 hours). Positive = uptrend."""
     try:
-        resp = requests.get(
+        resp = http_pool.get(
             "https://api.coingecko.com/api/v3/coins/bitcoin/market_chart?vs_currency=usd&days=1",
             timeout=10
         )
@@ -20,13 +20,15 @@ import time
 import math
 import threading
 from datetime import datetime, timezone, timedelta
-import base64
-from cryptography.hazmat.primitives import hashes, serialization
-from cryptography.hazmat.primitives.asymmetric import padding
 from pathlib import Path
 from collections import defaultdict
 from http.server import HTTPServer, BaseHTTPRequestHandler
 
+# Shared Kalshi signer (PEM parsed once per process) + pooled HTTP transport
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from kalshi_signing import get_signer
+import http_pool
+
 # Import news sentiment analysis (T661 - Grok Fundamental strategy)
 try:
     # Add scripts dir to path for local import
@@ -309,7 +311,7 @@ TILT_RISK_ALERT_FILE = "scripts/kalshi-tilt-risk.alert"
 # API Latency Profiling (T279)
 LATENCY_PROFILE_FILE = "scripts/kalshi-latency-profile.json"
 LATENCY_PROFILE_WINDOW = 100  # Keep last N calls per endpoint
-API_LATENCY_LOG = defaultdict(list)  # endpoint -> list of (timestamp, latency_ms)
+API_LATENCY_LOG = http_pool.LatencyRegistry(window=LATENCY_PROFILE_WINDOW)  # endpoint -> histogram + recent (timestamp, latency_ms)
 
 # Latency-based position sizing (T801) - reduce position when API is slow
 LATENCY_POSITION_SIZING_ENABLED = os.getenv("LATENCY_POSITION_SIZING", "true").lower() in ("true", "1", "yes")
@@ -427,13 +429,9 @@ def record_api_latency(endpoint: str, latency_ms: float):
         endpoint: API endpoint name (e.g., "balance", "positions", "order")
         latency_ms: Time taken for the call in milliseconds
     """
-    global API_LATENCY_LOG
     timestamp = datetime.now(timezone.utc).isoformat()
-    API_LATENCY_LOG[endpoint].append((timestamp, latency_ms))
-    
-    # Keep only last N entries per endpoint
-    if len(API_LATENCY_LOG[endpoint]) > LATENCY_PROFILE_WINDOW:
-        API_LATENCY_LOG[endpoint] = API_LATENCY_LOG[endpoint][-LATENCY_PROFILE_WINDOW:]
+    # Histogram keeps all-time buckets; only the last N raw samples are retained
+    API_LATENCY_LOG[endpoint].record(latency_ms, timestamp)
 
 
 def calculate_latency_stats(latencies: list) -> dict:
@@ -519,7 +517,8 @@ def save_latency_profile():
     data = {
         "timestamp": datetime.now(timezone.utc).isoformat(),
         "endpoints": profile,
-        "raw_data": {endpoint: entries[-20:] for endpoint, entries in API_LATENCY_LOG.items()}  # Last 20 per endpoint
+        "histograms": {endpoint: hist.to_dict()["buckets"] for endpoint, hist in API_LATENCY_LOG.items()},
+        "raw_data": {endpoint: list(entries)[-20:] for endpoint, entries in API_LATENCY_LOG.items()}  # Last 20 per endpoint
     }
     
     with open(LATENCY_PROFILE_FILE, "w") as f:
@@ -2308,7 +2307,7 @@ def get_crypto_ohlc(coin_id: str = "bitcoin", days: int = 1) -> list:
         # CoinGecko OHLC endpoint - days=1 gives ~48 candles (30min intervals)
         # days=7 gives hourly candles - better for 24h momentum
         valid_days = min(7, max(1, days))  # Clamp to valid values
-        resp = requests.get(
+        resp = http_pool.get(
             f"https://api.coingecko.com/api/v3/coins/{coin_id}/ohlc?vs_currency=usd&days={valid_days}",
             timeout=10
         )
@@ -2750,14 +2749,7 @@ def get_volatility_advantage(ohlc_data: dict) -> dict:
 
 def sign_request(method: str, path: str, timestamp: str) -> str:
     """Sign request with RSA-PSS"""
-    private_key = serialization.load_pem_private_key(PRIVATE_KEY.encode(), password=None)
-    message = f"{timestamp}{method}{path}".encode('utf-8')
-    signature = private_key.sign(
-        message,
-        padding.PSS(mgf=padding.MGF1(hashes.SHA256()), salt_length=padding.PSS.MAX_LENGTH),
-        hashes.SHA256()
-    )
-    return base64.b64encode(signature).decode('utf-8')
+    return get_signer(PRIVATE_KEY).sign(method, path, timestamp)
 
 
 def api_request(method: str, path: str, body: dict = None, max_retries: int = 3) -> dict:
@@ -2797,16 +2789,16 @@ def api_request(method: str, path: str, body: dict = None, max_retries: int = 3)
         
         try:
             if method == "GET":
-                resp = requests.get(url, headers=headers, timeout=timeout_seconds)
+                resp = http_pool.get(url, headers=headers, timeout=timeout_seconds)
             elif method == "POST":
-                resp = requests.post(url, headers=headers, json=body, timeout=timeout_seconds)
+                resp = http_pool.post(url, headers=headers, json=body, timeout=timeout_seconds)
             
             attempt_latency = (time.time() - attempt_start) * 1000  # Convert to ms
             
             # Check for server errors (5xx) - retry these
             if resp.status_code >= 500:
                 if attempt < max_retries - 1:
-                    wait_time = (2 ** attempt) + (time.time() % 1)  # Exponential backoff with jitter
+                    wait_time = http_pool.backoff_delay(attempt)  # Exponential backoff with jitter
                     print(f"[RETRY] API {resp.status_code} error, waiting {wait_time:.1f}s (attempt {attempt + 1}/{max_retries})")
                     time.sleep(wait_time)
                     continue
@@ -2825,7 +2817,7 @@ def api_request(method: str, path: str, body: dict = None, max_retries: int = 3)
             
         except requests.exceptions.Timeout:
             if attempt < max_retries - 1:
-                wait_time = (2 ** attempt) + (time.time() % 1)
+                wait_time = http_pool.backoff_delay(attempt)
                 print(f"[RETRY] Timeout ({timeout_seconds}s), waiting {wait_time:.1f}s (attempt {attempt + 1}/{max_retries})")
                 time.sleep(wait_time)
                 continue
@@ -2837,7 +2829,7 @@ def api_request(method: str, path: str, body: dict = None, max_retries: int = 3)
             
         except requests.exceptions.ConnectionError:
             if attempt < max_retries - 1:
-                wait_time = (2 ** attempt) + (time.time() % 1)
+                wait_time = http_pool.backoff_delay(attempt)
                 print(f"[RETRY] Connection error, waiting {wait_time:.1f}s (attempt {attempt + 1}/{max_retries})")
                 time.sleep(wait_time)
                 continue
@@ -3982,7 +3974,7 @@ def get_prices_coingecko() -> dict:
     
     start = time.time()
     try:
-        resp = requests.get(
+        resp = http_pool.get(
             "https://api.coingecko.com/api/v3/simple/price?ids=bitcoin,ethereum,solana&vs_currencies=usd",  # T423: Added SOL
             timeout=5
         )
@@ -4015,7 +4007,7 @@ def get_prices_binance() -> dict:
     
     start = time.time()
     try:
-        resp = requests.get(
+        resp = http_pool.get(
             "https://api.binance.com/api/v3/ticker/price?symbols=[\"BTCUSDT\",\"ETHUSDT\",\"SOLUSDT\"]",  # T423: Added SOL
             timeout=5
         )
@@ -4051,15 +4043,15 @@ def get_prices_coinbase() -> dict:
     
     start = time.time()
     try:
-        btc_resp = requests.get(
+        btc_resp = http_pool.get(
             "https://api.coinbase.com/v2/prices/BTC-USD/spot",
             timeout=5
         )
-        eth_resp = requests.get(
+        eth_resp = http_pool.get(
             "https://api.coinbase.com/v2/prices/ETH-USD/spot",
             timeout=5
         )
-        sol_resp = requests.get(  # T423: SOL price
+        sol_resp = http_pool.get(  # T423: SOL price
             "https://api.coinbase.com/v2/prices/SOL-USD/spot",
             timeout=5
         )
@@ -4116,7 +4108,7 @@ def get_crypto_prices(max_retries: int = 3) -> dict:
                 sources_used.append(source_name)
                 break
             if attempt < max_retries - 1:
-                wait_time = (2 ** attempt) * 0.5 + (time.time() % 0.5)
+                wait_time = http_pool.backoff_delay(attempt, base=0.5)
                 time.sleep(wait_time)
     
     if not all_prices:
@@ -4169,7 +4161,7 @@ def get_fear_greed(max_retries: int = 2) -> int:
     start = time.time()
     for attempt in range(max_retries):
         try:
-            resp = requests.get("https://api.alternative.me/fng/?limit=1", timeout=5)
+            resp = http_pool.get("https://api.alternative.me/fng/?limit=1", timeout=5)
             latency = (time.time() - start) * 1000
             record_api_latency("ext_fear_greed", latency)
             record_api_call("feargreed", dict(resp.headers))  # Track rate limit
@@ -4180,7 +4172,7 @@ def get_fear_greed(max_retries: int = 2) -> int:
             return value
         except Exception as e:
             if attempt < max_retries - 1:
-                wait_time = (2 ** attempt) + (time.time() % 1)
+                wait_time = http_pool.backoff_delay(attempt)
                 print(f"[RETRY] F&G error: {e}, waiting {wait_time:.1f}s")
                 time.sleep(wait_time)
                 continue
@@ -5105,7 +5097,7 @@ def find_weather_opportunities(verbose: bool = True) -> list:
                 # Fetch markets for this series
                 url = f"{BASE_URL}/trade-api/v2/markets"
                 params = {"series_ticker": series, "limit": 20, "status": "open"}
-                resp = requests.get(url, params=params, timeout=10)
+                resp = http_pool.get(url, params=params, timeout=10)
                 
                 if resp.status_code != 200:
                     continue
@@ -23,7 +23,6 @@ import time
 import math
 import re
 import argparse
-import base64
 import traceback
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
@@ -31,8 +30,11 @@ from dataclasses import dataclass, field, asdict
 from typing import Optional
 
 import requests
-from cryptography.hazmat.primitives import hashes, serialization
-from cryptography.hazmat.primitives.asymmetric import padding
+
+# Shared Kalshi signer (PEM parsed once per process) + pooled HTTP transport
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from kalshi_signing import get_signer
+import http_pool
 
 # ============== CONFIGURATION ==============
 
@@ -300,14 +302,7 @@ class TradeDecision:
 
 def sign_request(method: str, path: str, timestamp: str) -> str:
     """Sign request with RSA-PSS for Kalshi API."""
-    private_key = serialization.load_pem_private_key(PRIVATE_KEY.encode(), password=None)
-    message = f"{timestamp}{method}{path}".encode('utf-8')
-    signature = private_key.sign(
-        message,
-        padding.PSS(mgf=padding.MGF1(hashes.SHA256()), salt_length=padding.PSS.MAX_LENGTH),
-        hashes.SHA256()
-    )
-    return base64.b64encode(signature).decode('utf-8')
+    return get_signer(PRIVATE_KEY).sign(method, path, timestamp)
 
 
 def kalshi_api(method: str, path: str, body: dict = None, max_retries: int = 3) -> dict:
@@ -326,17 +321,17 @@ def kalshi_api(method: str, path: str, body: dict = None, max_retries: int = 3)
         
         try:
             if method == "GET":
-                resp = requests.get(url, headers=headers, timeout=15)
+                resp = http_pool.get(url, headers=headers, timeout=15)
             elif method == "POST":
-                resp = requests.post(url, headers=headers, json=body, timeout=10)
+                resp = http_pool.post(url, headers=headers, json=body, timeout=10)
             elif method == "DELETE":
-                resp = requests.delete(url, headers=headers, timeout=10)
+                resp = http_pool.delete(url, headers=headers, timeout=10)
             else:
                 return {"error": f"Unknown method {method}"}
             
             if resp.status_code >= 500:
                 if attempt < max_retries - 1:
-                    time.sleep(2 ** attempt)
+                    time.sleep(http_pool.backoff_delay(attempt))
                     continue
                 return {"error": f"Server error {resp.status_code}"}
             
@@ -344,12 +339,12 @@ def kalshi_api(method: str, path: str, body: dict = None, max_retries: int = 3)
             
         except requests.exceptions.Timeout:
             if attempt < max_retries - 1:
-                time.sleep(2 ** attempt)
+                time.sleep(http_pool.backoff_delay(attempt))
                 continue
             return {"error": "Timeout"}
         except requests.exceptions.ConnectionError:
             if attempt < max_retries - 1:
-                time.sleep(2 ** attempt)
+                time.sleep(http_pool.backoff_delay(attempt))
                 continue
             return {"error": "Connection error"}
         except Exception as e:
@@ -462,7 +457,7 @@ def call_claude(system_prompt: str, user_prompt: str, max_tokens: int = 2000) ->
                 "system": system_prompt,
                 "messages": [{"role": "user", "content": user_prompt}]
             }
-            resp = requests.post(base_url, headers=headers, json=body, timeout=60)
+            resp = http_pool.post(base_url, headers=headers, json=body, timeout=60)
             
             if resp.status_code != 200:
                 return {"error": f"Anthropic API {resp.status_code}: {resp.text[:300]}", "content": "", "tokens_used": 0}
@@ -488,7 +483,7 @@ def call_claude(system_prompt: str, user_prompt: str, max_tokens: int = 2000) ->
                     {"role": "user", "content": user_prompt}
                 ]
             }
-            resp = requests.post(base_url, headers=headers, json=body, timeout=60)
+            resp = http_pool.post(base_url, headers=headers, json=body, timeout=60)
             
             if resp.status_code != 200:
                 return {"error": f"LLM API {resp.status_code}: {resp.text[:300]}", "content": "", "tokens_used": 0}
@@ -31,7 +31,6 @@ import time
 import math
 import re
 import argparse
-import base64
 import traceback
 import signal
 import logging
@@ -43,8 +42,12 @@ from typing import Optional
 from collections import defaultdict
 
 import requests
-from cryptography.hazmat.primitives import hashes, serialization
-from cryptography.hazmat.primitives.asymmetric import padding
+
+# Shared Kalshi signer (PEM parsed once per process) + pooled HTTP transport
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from kalshi_signing import cycle_signing_stats, get_signer, get_signing_stats
+import http_pool
+from trade_ledger import TradeLedger
 
 # ============================================================================
 # OPTIONAL MODULE IMPORTS (from v2 ecosystem)
@@ -93,6 +96,21 @@ except Exception:
     def is_market_holiday(check_date=None):
         return False, None
 
+# Shared streaming indicators over NumPy candle series (needs numpy)
+try:
+    from indicators import (CandleSeries, series_for, timeframe_momentum,
+                            multi_timeframe_momentum, regime_features, hourly_vol as hourly_vol_of)
+    INDICATORS_AVAILABLE = True
+except ImportError:
+    INDICATORS_AVAILABLE = False
+
+# Local append-only OHLC store with gap-filling fetcher (needs numpy)
+try:
+    from ohlc_store import OHLCFetcher, OHLCStore, ASSET_FOR_COIN, as_rows
+    OHLC_STORE_AVAILABLE = True
+except ImportError:
+    OHLC_STORE_AVAILABLE = False
+
 # ============================================================================
 # CONFIGURATION
 # ============================================================================
@@ -228,6 +246,10 @@ DECISION_LOG_FILE = PROJECT_ROOT / "data" / "trading" / "kalshi-decisions.jsonl"
 LOSS_STREAK_ALERT_FILE = Path(__file__).parent / "kalshi-loss-streak.alert"
 HIGH_EDGE_CLUSTER_ALERT_FILE = Path(__file__).parent / "kalshi-high-edge-cluster.alert"
 
+# ── Trade ledger: incremental risk aggregates over the trade/decision logs ──
+LEDGER_CHECKPOINT_FILE = PROJECT_ROOT / "data" / "trading" / "kalshi-ledger-checkpoint.json"
+_trade_ledger = None
+
 # ── Risk limits (GROK-TRADE-002: portfolio-level) ──
 MAX_EXPOSURE_PCT = 0.50          # Don't trade if total open positions value > 50% of balance
 MAX_CATEGORY_EXPOSURE_PCT = 0.30 # Max 30% in any single category (crypto, weather, sports)
@@ -252,8 +274,9 @@ API_ERROR_RATE_WINDOW_SEC = 300  # 5 minute rolling window
 API_ERROR_RATE_THRESHOLD = 0.10  # Alert if >10% of API calls fail
 
 # ── Latency tracking (from v2) ──
-API_LATENCY_LOG = defaultdict(list)
+# endpoint -> bucketed histogram + last LATENCY_PROFILE_WINDOW samples
 LATENCY_PROFILE_WINDOW = 50
+API_LATENCY_LOG = http_pool.LatencyRegistry(window=LATENCY_PROFILE_WINDOW)
 
 # ── Rate limit tracking (from v2) ──
 API_RATE_LIMITS = {
@@ -266,6 +289,10 @@ API_RATE_WINDOW_START = time.time()
 EXT_API_CACHE = {}
 EXT_API_CACHE_TTL = 60
 
+# ── Local OHLC candle store (opened lazily, see get_ohlc_fetcher) ──
+OHLC_STORE_DIR = PROJECT_ROOT / "data" / "ohlc" / "store"
+_ohlc_fetcher = None
+
 # ============================================================================
 # LLM CONFIGURATION (from v3)
 # ============================================================================
@@ -672,15 +699,13 @@ class TradeDecision:
 # ============================================================================
 
 def record_api_latency(endpoint: str, latency_ms: float):
-    API_LATENCY_LOG[endpoint].append((time.time(), latency_ms))
-    if len(API_LATENCY_LOG[endpoint]) > LATENCY_PROFILE_WINDOW:
-        API_LATENCY_LOG[endpoint] = API_LATENCY_LOG[endpoint][-LATENCY_PROFILE_WINDOW:]
+    API_LATENCY_LOG.record(endpoint, latency_ms)
 
 def get_avg_latency(endpoint: str) -> float:
-    entries = API_LATENCY_LOG.get(endpoint, [])
-    if not entries:
+    hist = API_LATENCY_LOG.get(endpoint)
+    if not hist:
         return 0
-    return sum(lat for _, lat in entries) / len(entries)
+    return hist.recent_avg()
 
 def record_api_call(source: str):
     global API_RATE_WINDOW_START
@@ -708,14 +733,7 @@ def set_cached_response(cache_key: str, data):
 # ============================================================================
 
 def sign_request(method: str, path: str, timestamp: str) -> str:
-    private_key = serialization.load_pem_private_key(PRIVATE_KEY.encode(), password=None)
-    message = f"{timestamp}{method}{path}".encode('utf-8')
-    signature = private_key.sign(
-        message,
-        padding.PSS(mgf=padding.MGF1(hashes.SHA256()), salt_length=padding.PSS.MAX_LENGTH),
-        hashes.SHA256()
-    )
-    return base64.b64encode(signature).decode('utf-8')
+    return get_signer(PRIVATE_KEY).sign(method, path, timestamp)
 
 
 def kalshi_api(method: str, path: str, body: dict = None, max_retries: int = 3) -> dict:
@@ -739,15 +757,15 @@ def kalshi_api(method: str, path: str, body: dict = None, max_retries: int = 3)
         }
         try:
             if method == "GET":
-                resp = requests.get(url, headers=headers, timeout=15)
+                resp = http_pool.get(url, headers=headers, timeout=15)
             elif method == "POST":
-                resp = requests.post(url, headers=headers, json=body, timeout=10)
+                resp = http_pool.post(url, headers=headers, json=body, timeout=10)
             else:
                 return {"error": f"Unknown method {method}"}
 
             if resp.status_code >= 500:
                 if attempt < max_retries - 1:
-                    time.sleep(2 ** attempt)
+                    time.sleep(http_pool.backoff_delay(attempt))
                     continue
                 track_api_error(True)  # GROK-TRADE-002: track API errors
                 structured_log("api_error", {"endpoint": endpoint_name,
@@ -762,14 +780,14 @@ def kalshi_api(method: str, path: str, body: dict = None, max_retries: int = 3)
 
         except requests.exceptions.Timeout:
             if attempt < max_retries - 1:
-                time.sleep(2 ** attempt)
+                time.sleep(http_pool.backoff_delay(attempt))
                 continue
             track_api_error(True)  # GROK-TRADE-002: track API errors
             structured_log("api_error", {"endpoint": endpoint_name, "error": "Timeout"}, level="error")
             return {"error": "Timeout"}
         except requests.exceptions.ConnectionError:
             if attempt < max_retries - 1:
-                time.sleep(2 ** attempt)
+                time.sleep(http_pool.backoff_delay(attempt))
                 continue
             track_api_error(True)  # GROK-TRADE-002: track API errors
             structured_log("api_error", {"endpoint": endpoint_name, "error": "Connection error"}, level="error")
@@ -1006,7 +1024,7 @@ def get_crypto_prices() -> Optional[dict]:
 
     # Try CoinGecko first
     try:
-        resp = requests.get(
+        resp = http_pool.get(
             "https://api.coingecko.com/api/v3/simple/price?ids=bitcoin,ethereum&vs_currencies=usd",
             timeout=5)
         record_api_call("coingecko")
@@ -1019,8 +1037,8 @@ def get_crypto_prices() -> Optional[dict]:
 
     # Fallback: Binance
     try:
-        btc_resp = requests.get("https://api.binance.com/api/v3/ticker/price?symbol=BTCUSDT", timeout=5)
-        eth_resp = requests.get("https://api.binance.com/api/v3/ticker/price?symbol=ETHUSDT", timeout=5)
+        btc_resp = http_pool.get("https://api.binance.com/api/v3/ticker/price?symbol=BTCUSDT", timeout=5)
+        eth_resp = http_pool.get("https://api.binance.com/api/v3/ticker/price?symbol=ETHUSDT", timeout=5)
         result = {"btc": float(btc_resp.json()["price"]), "eth": float(eth_resp.json()["price"])}
         set_cached_response("crypto_prices", result)
         return result
@@ -1030,7 +1048,7 @@ def get_crypto_prices() -> Optional[dict]:
 
 def get_fear_greed_index() -> dict:
     try:
-        resp = requests.get("https://api.alternative.me/fng/?limit=1", timeout=5)
+        resp = http_pool.get("https://api.alternative.me/fng/?limit=1", timeout=5)
         data = resp.json()
         return {"value": int(data["data"][0]["value"]),
                 "classification": data["data"][0]["value_classification"]}
@@ -1038,13 +1056,32 @@ def get_fear_greed_index() -> dict:
         return {"value": 50, "classification": "Neutral"}
 
 
+def get_ohlc_fetcher() -> "OHLCFetcher":
+    """Open the shared local candle store on first use."""
+    global _ohlc_fetcher
+    if _ohlc_fetcher is None or _ohlc_fetcher.store.root != Path(OHLC_STORE_DIR):
+        _ohlc_fetcher = OHLCFetcher(OHLCStore(OHLC_STORE_DIR))
+    return _ohlc_fetcher
+
+
 def get_crypto_ohlc(coin_id: str = "bitcoin", days: int = 7) -> list:
-    """Get OHLC data from CoinGecko (or cache)."""
+    """Get 4h OHLC data from the local candle store (or cache / CoinGecko)."""
     cache_key = f"ohlc_{coin_id}_{days}"
     cached = get_cached_response(cache_key)
     if cached:
         return cached
 
+    # Local store: only candles newer than the last stored one hit the network
+    if OHLC_STORE_AVAILABLE and coin_id in ASSET_FOR_COIN:
+        try:
+            candles = get_ohlc_fetcher().load(ASSET_FOR_COIN[coin_id], "4h", time.time() - days * 86400)
+            if len(candles):
+                ohlc = as_rows(candles)
+                set_cached_response(cache_key, ohlc)
+                return ohlc
+        except Exception:
+            pass
+
     # Try local cache file first (from v2's OHLC caching)
     cache_dir = PROJECT_ROOT / "data" / "ohlc"
     cache_file = cache_dir / f"{coin_id[:3]}-ohlc.json"
@@ -1067,7 +1104,7 @@ def get_crypto_ohlc(coin_id: str = "bitcoin", days: int = 7) -> list:
 
     # Fetch from CoinGecko
     try:
-        resp = requests.get(
+        resp = http_pool.get(
             f"https://api.coingecko.com/api/v3/coins/{coin_id}/ohlc?vs_currency=usd&days={days}",
             timeout=10)
         record_api_call("coingecko")
@@ -1105,25 +1142,34 @@ def get_dynamic_hourly_vol(asset: str = "btc") -> float:
             return fallback
         
         # CoinGecko 7d OHLC gives ~4h candles (42 candles for 7 days)
-        # Compute log returns from close prices
-        closes = [c[4] for c in ohlc if c[4] and c[4] > 0]
-        if len(closes) < 10:
-            return fallback
-        
-        log_returns = [math.log(closes[i] / closes[i-1]) for i in range(1, len(closes))]
-        if not log_returns:
-            return fallback
-        
-        # Std dev of log returns
-        mean_ret = sum(log_returns) / len(log_returns)
-        variance = sum((r - mean_ret) ** 2 for r in log_returns) / len(log_returns)
-        candle_vol = math.sqrt(variance)
-        
-        # Scale to hourly: CoinGecko 7d gives ~4h candles
-        # hourly_vol = candle_vol / sqrt(candle_hours)
-        total_hours = (ohlc[-1][0] - ohlc[0][0]) / (1000 * 3600)  # ms to hours
-        candle_hours = total_hours / len(log_returns) if len(log_returns) > 0 else 4
-        hourly_vol = candle_vol / math.sqrt(max(1, candle_hours))
+        if INDICATORS_AVAILABLE:
+            # Same definition calculate-historical-volatility.py reports as current vol
+            series = candle_series(ohlc, asset)
+            if len(series) < 10:
+                return fallback
+            closes = series.close
+            candle_hours = series.interval_sec() / 3600
+            hourly_vol = hourly_vol_of(series)
+        else:
+            # Compute log returns from close prices
+            closes = [c[4] for c in ohlc if c[4] and c[4] > 0]
+            if len(closes) < 10:
+                return fallback
+
+            log_returns = [math.log(closes[i] / closes[i-1]) for i in range(1, len(closes))]
+            if not log_returns:
+                return fallback
+
+            # Std dev of log returns
+            mean_ret = sum(log_returns) / len(log_returns)
+            variance = sum((r - mean_ret) ** 2 for r in log_returns) / len(log_returns)
+            candle_vol = math.sqrt(variance)
+
+            # Scale to hourly: CoinGecko 7d gives ~4h candles
+            # hourly_vol = candle_vol / sqrt(candle_hours)
+            total_hours = (ohlc[-1][0] - ohlc[0][0]) / (1000 * 3600)  # ms to hours
+            candle_hours = total_hours / len(log_returns) if len(log_returns) > 0 else 4
+            hourly_vol = candle_vol / math.sqrt(max(1, candle_hours))
         
         # Sanity bounds: 0.3% - 5% hourly
         hourly_vol = max(0.003, min(0.05, hourly_vol))
@@ -1145,8 +1191,20 @@ def get_dynamic_hourly_vol(asset: str = "btc") -> float:
 # MOMENTUM & REGIME DETECTION (from v2)
 # ============================================================================
 
+def candle_series(ohlc_data, key: str = None):
+    """
+    OHLC rows as an indicators.CandleSeries. With `key` the series is kept
+    across cycles and only new candles are folded in (see series_for).
+    """
+    if isinstance(ohlc_data, CandleSeries):
+        return ohlc_data
+    return series_for(key, ohlc_data) if key else CandleSeries(ohlc_data)
+
+
 def calculate_momentum(ohlc_data: list, timeframe: str) -> dict:
     """Calculate momentum for a single timeframe."""
+    if INDICATORS_AVAILABLE:
+        return timeframe_momentum(candle_series(ohlc_data or []).close, timeframe)
     result = {"direction": 0, "strength": 0, "pct_change": 0}
     if not ohlc_data or len(ohlc_data) < 4:
         return result
@@ -1170,6 +1228,8 @@ def calculate_momentum(ohlc_data: list, timeframe: str) -> dict:
 
 def get_multi_timeframe_momentum(ohlc_data: list) -> dict:
     """Get momentum across 1h, 4h, 24h timeframes."""
+    if INDICATORS_AVAILABLE:
+        return multi_timeframe_momentum(candle_series(ohlc_data or []).close)
     result = {"timeframes": {}, "composite_direction": 0, "composite_strength": 0, "alignment": False}
     if not ohlc_data:
         return result
@@ -1199,23 +1259,31 @@ def detect_market_regime(ohlc_data: list, momentum: dict) -> dict:
     if not ohlc_data or len(ohlc_data) < 24:
         return result
 
-    current_price = ohlc_data[-1][4]
-    if not current_price:
-        return result
-
-    price_4h = ohlc_data[-4][4] if len(ohlc_data) >= 4 else current_price
-    price_24h = ohlc_data[0][4] if len(ohlc_data) >= 24 else current_price
-    change_4h = (current_price - price_4h) / price_4h if price_4h else 0
-    change_24h = (current_price - price_24h) / price_24h if price_24h else 0
-
-    # Volatility from candle ranges
-    ranges = []
-    for c in ohlc_data[-24:]:
-        if c and len(c) >= 4 and c[3] > 0:
-            ranges.append((c[2] - c[3]) / c[3])
-    avg_range = sum(ranges) / len(ranges) if ranges else 0
-    vol_class = ("very_low" if avg_range < 0.003 else "low" if avg_range < 0.005 else
-                 "normal" if avg_range < 0.01 else "high" if avg_range < 0.02 else "very_high")
+    if INDICATORS_AVAILABLE:
+        series = candle_series(ohlc_data)
+        if len(series) < 24:
+            return result
+        features = regime_features(series)
+        change_4h, change_24h = features["change_4h"], features["change_24h"]
+        avg_range, vol_class = features["avg_range"], features["volatility"]
+    else:
+        current_price = ohlc_data[-1][4]
+        if not current_price:
+            return result
+
+        price_4h = ohlc_data[-4][4] if len(ohlc_data) >= 4 else current_price
+        price_24h = ohlc_data[0][4] if len(ohlc_data) >= 24 else current_price
+        change_4h = (current_price - price_4h) / price_4h if price_4h else 0
+        change_24h = (current_price - price_24h) / price_24h if price_24h else 0
+
+        # Volatility from candle ranges
+        ranges = []
+        for c in ohlc_data[-24:]:
+            if c and len(c) >= 4 and c[3] > 0:
+                ranges.append((c[2] - c[3]) / c[3])
+        avg_range = sum(ranges) / len(ranges) if ranges else 0
+        vol_class = ("very_low" if avg_range < 0.003 else "low" if avg_range < 0.005 else
+                     "normal" if avg_range < 0.01 else "high" if avg_range < 0.02 else "very_high")
     result["volatility"] = vol_class
 
     mom_dir = momentum.get("composite_direction", 0)
@@ -1294,7 +1362,7 @@ def call_claude(system_prompt: str, user_prompt: str, max_tokens: int = 2000) ->
             body = {"model": LLM_CONFIG["model"], "max_tokens": max_tokens,
                     "system": system_prompt,
                     "messages": [{"role": "user", "content": user_prompt}]}
-            resp = requests.post(LLM_CONFIG["base_url"], headers=LLM_CONFIG["headers"], json=body, timeout=60)
+            resp = http_pool.post(LLM_CONFIG["base_url"], headers=LLM_CONFIG["headers"], json=body, timeout=60)
             if resp.status_code != 200:
                 return {"error": f"API {resp.status_code}: {resp.text[:300]}", "content": "", "tokens_used": 0}
             data = resp.json()
@@ -1306,7 +1374,7 @@ def call_claude(system_prompt: str, user_prompt: str, max_tokens: int = 2000) ->
             body = {"model": LLM_CONFIG["model"], "max_tokens": max_tokens,
                     "messages": [{"role": "system", "content": system_prompt},
                                  {"role": "user", "content": user_prompt}]}
-            resp = requests.post(LLM_CONFIG["base_url"], headers=LLM_CONFIG["headers"], json=body, timeout=60)
+            resp = http_pool.post(LLM_CONFIG["base_url"], headers=LLM_CONFIG["headers"], json=body, timeout=60)
             if resp.status_code != 200:
                 return {"error": f"API {resp.status_code}: {resp.text[:300]}", "content": "", "tokens_used": 0}
             data = resp.json()
@@ -1668,7 +1736,16 @@ def _heuristic_crypto(market: MarketInfo, context: dict = None) -> tuple:
     # PROC-002 Task 5.1: use dynamic vol from CoinGecko, fallback to static
     hourly_vol = get_dynamic_hourly_vol(asset) if asset in ("btc", "eth") else 0.005
     ohlc_data = (context or {}).get("ohlc", {}).get(asset, [])
-    if ohlc_data and len(ohlc_data) >= 10:
+    if ohlc_data and len(ohlc_data) >= 10 and INDICATORS_AVAILABLE:
+        try:
+            # Shared per-asset series: EWMA is updated once per new candle, read O(1) per market
+            ewma = series_for(asset, ohlc_data).indicators["ewma"]
+            if ewma.count >= 4:
+                default_vol = hourly_vol
+                hourly_vol = max(default_vol * 0.3, min(default_vol * 3.0, ewma.value))
+        except Exception:
+            pass
+    elif ohlc_data and len(ohlc_data) >= 10:
         try:
             closes = [c[4] for c in ohlc_data[-48:] if c and len(c) >= 5 and c[4] and c[4] > 0]
             if len(closes) >= 5:
@@ -2273,22 +2350,10 @@ def check_circuit_breaker() -> tuple:
     except Exception:
         pass
 
-    # Count consecutive losses from trade log
+    # Consecutive losses since the last win (ledger keeps the running streak)
     losses = 0
     try:
-        if TRADE_LOG_FILE.exists():
-            with open(TRADE_LOG_FILE) as f:
-                lines = f.readlines()
-            for line in reversed(lines):
-                try:
-                    entry = json.loads(line.strip())
-                    status = entry.get("result_status", "pending")
-                    if status == "won":
-                        break
-                    elif status == "lost":
-                        losses += 1
-                except Exception:
-                    continue
+        losses = get_trade_ledger().consecutive_losses()
     except Exception:
         pass
 
@@ -2308,6 +2373,14 @@ def check_circuit_breaker() -> tuple:
     return False, losses, f"OK ({losses}/{CIRCUIT_BREAKER_THRESHOLD} losses)"
 
 
+def get_trade_ledger() -> TradeLedger:
+    """Shared trade ledger, caught up with anything appended since the last call."""
+    global _trade_ledger
+    if _trade_ledger is None or _trade_ledger.trade_log != Path(TRADE_LOG_FILE):
+        _trade_ledger = TradeLedger(TRADE_LOG_FILE, DECISION_LOG_FILE, checkpoint=LEDGER_CHECKPOINT_FILE)
+    return _trade_ledger.refresh()
+
+
 def check_daily_loss_limit() -> tuple:
     """Check daily loss limit. Returns (is_paused, pnl_info)."""
     today = datetime.now(timezone.utc).date()
@@ -2316,26 +2389,8 @@ def check_daily_loss_limit() -> tuple:
     trades = 0
 
     try:
-        if TRADE_LOG_FILE.exists():
-            with open(TRADE_LOG_FILE) as f:
-                for line in f:
-                    try:
-                        entry = json.loads(line.strip())
-                        ts = entry.get("timestamp", "")
-                        if not ts:
-                            continue
-                        trade_date = datetime.fromisoformat(ts.replace("Z", "+00:00")).date()
-                        if trade_date != today:
-                            continue
-                        trades += 1
-                        cost = entry.get("cost_cents", entry.get("contracts", 0) * entry.get("price_cents", 0))
-                        spent += cost
-                        if entry.get("result_status") == "won":
-                            contracts = entry.get("contracts", 0)
-                            price = entry.get("price_cents", 0)
-                            won += contracts * (100 - price)
-                    except Exception:
-                        continue
+        day = get_trade_ledger().day(today.isoformat())
+        trades, spent, won = day["trades"], day["spent"], day["won"]
     except Exception:
         pass
 
@@ -2374,8 +2429,11 @@ def update_trade_results():
     updated_count = 0
     wins = 0
     losses = 0
+    settled_results = {}
 
     try:
+        # Catch the ledger up first so it can adopt the rewritten file below
+        ledger = get_trade_ledger()
         with open(TRADE_LOG_FILE) as f:
             lines = f.readlines()
 
@@ -2401,6 +2459,7 @@ def update_trade_results():
                                 losses += 1
                             entry["settled_at"] = datetime.now(timezone.utc).isoformat()
                             entry["market_result"] = market_result
+                            settled_results[entry["ticker"]] = market_result
                             updated_count += 1
                     time.sleep(0.2)  # Rate limit
                 updated_lines.append(json.dumps(entry) + "\n")
@@ -2410,6 +2469,9 @@ def update_trade_results():
         if updated_count > 0:
             with open(TRADE_LOG_FILE, "w") as f:
                 f.writelines(updated_lines)
+            for ticker, market_result in settled_results.items():
+                ledger.settle(ticker, market_result)
+            ledger.adopt_rewrite()
             # GROK-TRADE-002: structured log for settlements
             structured_log("settlement", {"updated": updated_count, "wins": wins, "losses": losses})
 
@@ -2696,21 +2758,7 @@ def check_high_edge_cluster():
     if not DECISION_LOG_FILE.exists():
         return
     try:
-        one_hour_ago = datetime.now(timezone.utc) - timedelta(hours=1)
-        high_edge_skips = 0
-        with open(DECISION_LOG_FILE) as f:
-            for line in f:
-                try:
-                    entry = json.loads(line.strip())
-                    ts = datetime.fromisoformat(entry["timestamp"])
-                    if ts.tzinfo is None:
-                        ts = ts.replace(tzinfo=timezone.utc)
-                    if ts >= one_hour_ago and entry.get("outcome") != "executed":
-                        if abs(entry.get("edge", 0)) > 0.15:
-                            high_edge_skips += 1
-                except (json.JSONDecodeError, KeyError, ValueError):
-                    continue
-
+        high_edge_skips = get_trade_ledger().high_edge_skips()
         if high_edge_skips >= 5:
             write_alert(HIGH_EDGE_CLUSTER_ALERT_FILE,
                        f"{high_edge_skips} high-edge trades (>15%) skipped/vetoed in last hour — possible forecaster miscalibration",
@@ -2741,20 +2789,10 @@ def get_daily_trades_cost() -> int:
     """Sum cost_cents of all trades executed today."""
     if not TRADE_LOG_FILE.exists():
         return 0
-    today_str = datetime.now(timezone.utc).strftime("%Y-%m-%d")
-    total_cost = 0
     try:
-        with open(TRADE_LOG_FILE) as f:
-            for line in f:
-                try:
-                    entry = json.loads(line.strip())
-                    if entry.get("timestamp", "").startswith(today_str) and entry.get("action") != "SKIP":
-                        total_cost += entry.get("cost_cents", 0)
-                except (json.JSONDecodeError, KeyError):
-                    continue
+        return get_trade_ledger().day()["cost"]
     except Exception:
-        pass
-    return total_cost
+        return 0
 
 
 # ============================================================================
@@ -2771,6 +2809,7 @@ def run_cycle(dry_run: bool = True, max_markets: int = 30, max_trades: int = 10)
     5. Log everything
     """
     cycle_start = time.time()
+    signing_start = get_signing_stats()
 
     # GROK-TRADE-002: check shutdown before starting
     if shutdown_requested:
@@ -2934,13 +2973,16 @@ def run_cycle(dry_run: bool = True, max_markets: int = 30, max_trades: int = 10)
     # OHLC + Momentum + Regime
     btc_ohlc = get_crypto_ohlc("bitcoin", 7)
     eth_ohlc = get_crypto_ohlc("ethereum", 7)
-    btc_momentum = get_multi_timeframe_momentum(btc_ohlc)
-    eth_momentum = get_multi_timeframe_momentum(eth_ohlc)
+    # Indicator state persists between cycles; only new candles are folded in
+    btc_candles = candle_series(btc_ohlc, "btc") if INDICATORS_AVAILABLE else btc_ohlc
+    eth_candles = candle_series(eth_ohlc, "eth") if INDICATORS_AVAILABLE else eth_ohlc
+    btc_momentum = get_multi_timeframe_momentum(btc_candles)
+    eth_momentum = get_multi_timeframe_momentum(eth_candles)
     context["ohlc"] = {"btc": btc_ohlc, "eth": eth_ohlc}
     context["momentum"] = {"btc": btc_momentum, "eth": eth_momentum}
 
-    btc_regime = detect_market_regime(btc_ohlc, btc_momentum)
-    eth_regime = detect_market_regime(eth_ohlc, eth_momentum)
+    btc_regime = detect_market_regime(btc_candles, btc_momentum)
+    eth_regime = detect_market_regime(eth_candles, eth_momentum)
     context["regime"] = {"btc": btc_regime, "eth": eth_regime}
 
     for asset, mom in [("BTC", btc_momentum), ("ETH", eth_momentum)]:
@@ -2988,14 +3030,7 @@ def run_cycle(dry_run: bool = True, max_markets: int = 30, max_trades: int = 10)
     # Dedup from trade log (paper mode)
     if dry_run and TRADE_LOG_FILE.exists():
         try:
-            with open(TRADE_LOG_FILE) as f:
-                for line in f:
-                    try:
-                        e = json.loads(line.strip())
-                        if e.get("action") in ("BUY_YES", "BUY_NO") and e.get("dry_run"):
-                            existing_tickers.add(e.get("ticker", ""))
-                    except Exception:
-                        continue
+            existing_tickers |= get_trade_ledger().paper_tickers
         except Exception:
             pass
 
@@ -3199,6 +3234,9 @@ def run_cycle(dry_run: bool = True, max_markets: int = 30, max_trades: int = 10)
         except Exception:
             pass
 
+    signing = cycle_signing_stats(signing_start, duration)
+    print(f"   Signing: {signing['signatures']} signatures ({signing['signatures_per_sec']}/s over the cycle, "
+          f"{signing['avg_sign_ms']}ms each), PEM parses: {signing['pem_parses']}")
     # Latency summary
     avg_lat = get_avg_latency("markets_search")
     if avg_lat > 0:
@@ -3216,6 +3254,7 @@ def run_cycle(dry_run: bool = True, max_markets: int = 30, max_trades: int = 10)
         "tokens": total_tokens,
         "balance": balance,
         "positions": num_positions,
+        "signing": signing,
     }
     log_cycle(cycle_stats)
     # GROK-TRADE-002: structured log for cycle end
@@ -13,6 +13,8 @@ Features:
   - Per-asset and per-regime breakdown
   - Detailed reports with actionable parameter recommendations
   - Monte Carlo bootstrap confidence intervals
+  - Vectorized sweeps / bootstrap via scripts/backtest_engine.py (NumPy),
+    falling back to the scalar replay when NumPy is unavailable
 
 Data sources:
   - scripts/kalshi-trades-v2.jsonl        (live trades)
@@ -24,6 +26,8 @@ Data sources:
 Usage:
     python scripts/kalshi-backtest.py                   # Full backtest with defaults
     python scripts/kalshi-backtest.py --sweep            # Parameter sweep
+    python scripts/kalshi-backtest.py --grid min_edge kelly_fraction --workers 4  # Joint grid sweep
+    python scripts/kalshi-backtest.py --search halving --workers 0  # Pareto front over SWEEP_RANGES
     python scripts/kalshi-backtest.py --report           # Analyze existing trades only
     python scripts/kalshi-backtest.py --monte-carlo 1000 # Bootstrap confidence intervals
     python scripts/kalshi-backtest.py --compare v1 v2    # Compare strategy versions
@@ -36,13 +40,23 @@ import math
 import sys
 import os
 import copy
+import itertools
 import random
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
 from collections import defaultdict
 from dataclasses import dataclass, field, asdict
+from functools import partial
 from typing import Optional
 
+sys.path.insert(0, str(Path(__file__).parent))
+import param_search  # noqa: E402
+try:
+    import backtest_engine  # noqa: E402
+    BACKTEST_ENGINE_AVAILABLE = True
+except ImportError:
+    BACKTEST_ENGINE_AVAILABLE = False
+
 # ============== CONFIGURATION ==============
 
 # Default strategy parameters (mirrors kalshi-autotrader-v2.py defaults)
@@ -728,68 +742,129 @@ def run_backtest(trades: list[Trade], params: dict,
 
 # ============== PARAMETER SWEEP ==============
 
+def apply_sweep_value(params: dict, param_name: str, value) -> dict:
+    """Set one swept parameter, keeping coupled per-asset overrides in step."""
+    params[param_name] = value
+    # For per-asset min_edge, also update the individual overrides
+    if param_name == "min_edge":
+        params["btc_min_edge"] = value
+        params["eth_min_edge"] = value * 1.25
+        params["sol_min_edge"] = value * 1.5
+    return params
+
+
+def _sweep_summary(bt: BacktestResult) -> dict:
+    return {
+        "trades": bt.included_trades,
+        "win_rate": round(bt.win_rate, 4),
+        "pnl_cents": bt.total_profit_cents,
+        "roi_pct": round(bt.roi_pct, 2),
+        "sharpe": round(bt.sharpe_ratio, 3),
+        "max_dd_pct": round(bt.max_drawdown_pct, 2),
+        "profit_factor": round(bt.profit_factor, 3),
+        "expectation": round(bt.expectation_per_trade_cents, 2),
+    }
+
+
+def evaluate_param_sets(trades: list[Trade], param_sets: list[dict], workers: int = None) -> list[dict]:
+    """Sweep summaries for many parameter sets (vectorized engine, else one run_backtest each)."""
+    if BACKTEST_ENGINE_AVAILABLE:
+        arrays = backtest_engine.TradeArrays.from_trades(trades)
+        return backtest_engine.evaluate(arrays, param_sets, workers=workers)
+    return [_sweep_summary(run_backtest(trades, p)) for p in param_sets]
+
+
 def run_parameter_sweep(trades: list[Trade], sweep_param: str = None,
-                        verbose: bool = True) -> list[dict]:
+                        verbose: bool = True, workers: int = None) -> list[dict]:
     """
     Run backtests across multiple parameter values.
     If sweep_param is specified, only sweep that parameter.
     Otherwise sweep all parameters in SWEEP_RANGES.
     """
-    results = []
     params_to_sweep = {sweep_param: SWEEP_RANGES[sweep_param]} if sweep_param else SWEEP_RANGES
+    runs = [(name, value) for name, values in params_to_sweep.items() for value in values]
+    param_sets = [apply_sweep_value(dict(DEFAULT_PARAMS), name, value) for name, value in runs]
 
-    total_runs = sum(len(v) for v in params_to_sweep.values())
-    run_idx = 0
+    results = []
+    for run_idx, ((param_name, value), row) in enumerate(
+            zip(runs, evaluate_param_sets(trades, param_sets, workers)), 1):
+        summary = {"param": param_name, "value": value, **row}
+        results.append(summary)
+
+        if verbose:
+            print(f"  [{run_idx}/{len(runs)}] {param_name}={value}: "
+                  f"{row['trades']} trades, WR={row['win_rate']:.1%}, "
+                  f"PnL=${row['pnl_cents']/100:+.2f}, "
+                  f"Sharpe={row['sharpe']:.2f}, "
+                  f"MaxDD={row['max_dd_pct']:.1f}%")
 
-    for param_name, values in params_to_sweep.items():
-        for value in values:
-            run_idx += 1
-            test_params = dict(DEFAULT_PARAMS)
-            test_params[param_name] = value
+    return results
 
-            # For per-asset min_edge, also update the individual overrides
-            if param_name == "min_edge":
-                test_params["btc_min_edge"] = value
-                test_params["eth_min_edge"] = value * 1.25
-                test_params["sol_min_edge"] = value * 1.5
 
-            bt = run_backtest(trades, test_params)
+def run_grid_sweep(trades: list[Trade], grid_params: list[str], base_params: dict = None,
+                   workers: int = None, verbose: bool = True) -> list[dict]:
+    """
+    Joint sweep over the cartesian product of SWEEP_RANGES for grid_params.
+    Returns one summary per combination, best PnL first.
+    """
+    names = list(grid_params)
+    combos = [dict(zip(names, values)) for values in
+              itertools.product(*(SWEEP_RANGES[n] for n in names))]
+    param_sets = []
+    for combo in combos:
+        params = dict(base_params or DEFAULT_PARAMS)
+        for name, value in combo.items():
+            apply_sweep_value(params, name, value)
+        param_sets.append(params)
 
-            summary = {
-                "param": param_name,
-                "value": value,
-                "trades": bt.included_trades,
-                "win_rate": round(bt.win_rate, 4),
-                "pnl_cents": bt.total_profit_cents,
-                "roi_pct": round(bt.roi_pct, 2),
-                "sharpe": round(bt.sharpe_ratio, 3),
-                "max_dd_pct": round(bt.max_drawdown_pct, 2),
-                "profit_factor": round(bt.profit_factor, 3),
-                "expectation": round(bt.expectation_per_trade_cents, 2),
-            }
-            results.append(summary)
+    if verbose:
+        print(f"  {len(param_sets)} combinations x {sum(t.result_status in ('win', 'loss') for t in trades)} "
+              f"settled trades ({'vectorized' if BACKTEST_ENGINE_AVAILABLE else 'scalar'})")
+    rows = evaluate_param_sets(trades, param_sets, workers)
+    results = [{"params": combo, **row} for combo, row in zip(combos, rows)]
+    results.sort(key=lambda r: r["pnl_cents"], reverse=True)
+    return results
 
-            if verbose:
-                print(f"  [{run_idx}/{total_runs}] {param_name}={value}: "
-                      f"{bt.included_trades} trades, WR={bt.win_rate:.1%}, "
-                      f"PnL=${bt.total_profit_cents/100:+.2f}, "
-                      f"Sharpe={bt.sharpe_ratio:.2f}, "
-                      f"MaxDD={bt.max_drawdown_pct:.1f}%")
 
-    return results
+SEARCH_OBJECTIVES = (("pnl_cents", "max"), ("max_dd_pct", "min"), ("trades", "max"))
 
 
-# ============== MONTE CARLO BOOTSTRAP ==============
+def search_evaluate(trades: list[Trade], param_sets: list[dict], fraction: float = 1.0) -> list[dict]:
+    """param_search evaluate callable without NumPy: run_backtest on the oldest `fraction` of settled trades."""
+    settled = [t for t in trades if t.result_status in ("win", "loss")]
+    head = settled[:max(1, int(round(len(settled) * fraction)))] if fraction < 1.0 else settled
+    return [_sweep_summary(run_backtest(head, p)) for p in param_sets]
 
-def monte_carlo_bootstrap(trades: list[Trade], params: dict,
-                          n_simulations: int = 1000,
-                          verbose: bool = True) -> dict:
-    """
-    Bootstrap confidence intervals for backtest metrics.
 
-    Resamples settled trades with replacement to estimate
-    the distribution of win rate, PnL, and Sharpe ratio.
+def _derive_min_edge(params: dict):
+    apply_sweep_value(params, "min_edge", params["min_edge"])
+
+
+def run_search(trades: list[Trade], strategy: str = "grid", grid_params: list[str] = None,
+               base_params: dict = None, workers: int = None, budget: int = 243, eta: int = 3) -> tuple:
+    """
+    Joint search over SWEEP_RANGES (or just grid_params) via scripts/param_search.py.
+    Returns (search, pareto_front); the front is saved to data/backtests/pareto-kalshi-backtest.json.
     """
+    space = {n: SWEEP_RANGES[n] for n in (grid_params or SWEEP_RANGES)}
+    settled = [asdict(t) for t in trades if t.result_status in ("win", "loss")]
+    if BACKTEST_ENGINE_AVAILABLE:
+        evaluate = partial(backtest_engine.search_objective, backtest_engine.TradeArrays.from_trades(trades))
+    else:
+        evaluate = partial(search_evaluate, trades)
+    search = param_search.ParamSearch(
+        "kalshi-backtest", space, evaluate, base=base_params or DEFAULT_PARAMS,
+        derive=_derive_min_edge if "min_edge" in space else None,
+        data_key=param_search.fingerprint(settled), objectives=SEARCH_OBJECTIVES, workers=workers)
+    rows = search.grid() if strategy == "grid" else search.halving(n=budget, eta=eta)
+    return search, search.save_front(rows, strategy)
+
+
+# ============== MONTE CARLO BOOTSTRAP ==============
+
+def _monte_carlo_scalar(trades: list[Trade], params: dict, n_simulations: int,
+                        verbose: bool) -> dict:
+    """Bootstrap with one run_backtest() per resample (no NumPy)."""
     # Filter to settled, included trades
     settled = [t for t in trades if t.result_status in ("win", "loss")]
     included = [t for t in settled if should_include_trade(t, params)[0]]
@@ -835,11 +910,35 @@ def monte_carlo_bootstrap(trades: list[Trade], params: dict,
         },
     }
 
+    return result
+
+
+def monte_carlo_bootstrap(trades: list[Trade], params: dict,
+                          n_simulations: int = 1000,
+                          verbose: bool = True) -> dict:
+    """
+    Bootstrap confidence intervals for backtest metrics.
+
+    Resamples settled trades with replacement to estimate
+    the distribution of win rate, PnL, and Sharpe ratio.
+    """
+    if BACKTEST_ENGINE_AVAILABLE:
+        # Resamples as an index matrix, all simulations replayed side by side
+        arrays = backtest_engine.TradeArrays.from_trades(trades)
+        result = backtest_engine.bootstrap(arrays, params, n_simulations)
+        if "n_simulations" not in result:
+            print(f"  ⚠️ Only {result['n_trades']} settled+included trades, need ≥10 for bootstrap")
+            return {}
+    else:
+        result = _monte_carlo_scalar(trades, params, n_simulations, verbose)
+        if not result:
+            return {}
+
     if verbose:
         wr = result["win_rate"]
         pnl = result["pnl_cents"]
         sr = result["sharpe_ratio"]
-        print(f"\n  📊 Monte Carlo ({n_simulations} sims, {len(included)} trades):")
+        print(f"\n  📊 Monte Carlo ({n_simulations} sims, {result['n_trades']} trades):")
         print(f"     Win Rate:  {wr['mean']:.1%}  [{wr['p5']:.1%} - {wr['p95']:.1%}] 90% CI")
         print(f"     PnL:       ${pnl['mean']/100:+.2f}  [${pnl['p5']/100:+.2f} - ${pnl['p95']/100:+.2f}]")
         print(f"     Sharpe:    {sr['mean']:.2f}  [{sr['p5']:.2f} - {sr['p95']:.2f}]")
@@ -1069,6 +1168,12 @@ def main():
     parser = argparse.ArgumentParser(description="Kalshi AutoTrader Backtesting Framework")
     parser.add_argument("--sweep", action="store_true", help="Run parameter sweep")
     parser.add_argument("--sweep-param", type=str, help="Sweep a specific parameter only")
+    parser.add_argument("--grid", nargs="+", metavar="PARAM", choices=sorted(SWEEP_RANGES),
+                        help="Joint sweep over every combination of these SWEEP_RANGES parameters")
+    parser.add_argument("--workers", type=int, help="Processes for sweeps (0 = all cores; default 1)")
+    parser.add_argument("--search", choices=["grid", "halving"],
+                        help="Joint search over SWEEP_RANGES (or --grid params) with a cached Pareto front")
+    parser.add_argument("--budget", type=int, default=243, help="Points sampled by --search halving")
     parser.add_argument("--report", action="store_true", help="Analyze existing trades (no simulation)")
     parser.add_argument("--monte-carlo", type=int, metavar="N", help="Run N Monte Carlo simulations")
     parser.add_argument("--compare", nargs=2, metavar=("V1", "V2"), help="Compare two strategy versions")
@@ -1127,7 +1232,7 @@ def main():
     # ---- MODE: Parameter Sweep ----
     if args.sweep or args.sweep_param:
         print(f"\n🔬 Running parameter sweep{'(' + args.sweep_param + ')' if args.sweep_param else ''}...")
-        sweep_results = run_parameter_sweep(trades, args.sweep_param, verbose=True)
+        sweep_results = run_parameter_sweep(trades, args.sweep_param, verbose=True, workers=args.workers)
 
         report = format_sweep_report(sweep_results)
         print(f"\n{report}")
@@ -1154,6 +1259,36 @@ def main():
             json.dump(output_data, f, indent=2)
         print(f"\n💾 Sweep results saved to: {output_path}")
 
+    # ---- MODE: Pareto search ----
+    elif args.search:
+        space = args.grid or list(SWEEP_RANGES)
+        print(f"\n🔬 Running {args.search} search over {' x '.join(space)}...")
+        search, front = run_search(trades, args.search, args.grid, params, args.workers, args.budget)
+        print(f"  {search.evaluated} evaluated, {search.cached} cached of {search.size} combinations")
+        print(f"\n🏁 Pareto front (PnL / max DD% / trades), {len(front)} points:")
+        print(param_search.format_front(front, SEARCH_OBJECTIVES))
+        print(f"\n💾 Front saved to: {param_search.front_path('kalshi-backtest')}")
+
+    # ---- MODE: Grid sweep ----
+    elif args.grid:
+        print(f"\n🔬 Running grid sweep ({' x '.join(args.grid)})...")
+        grid_results = run_grid_sweep(trades, args.grid, params, workers=args.workers)
+        print(f"\n{'Params':<50} {'Trades':>6} {'WR':>6} {'PnL':>9} {'Sharpe':>7} {'MaxDD':>6}")
+        for r in grid_results[:15]:
+            label = ", ".join(f"{k}={v}" for k, v in r["params"].items())
+            print(f"{label:<50} {r['trades']:>6} {r['win_rate']:>6.1%} ${r['pnl_cents']/100:>+8.2f} "
+                  f"{r['sharpe']:>7.2f} {r['max_dd_pct']:>5.1f}%")
+
+        output_path = args.output or str(SWEEP_OUTPUT)
+        with open(output_path, "w") as f:
+            json.dump({
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "grid": args.grid,
+                "grid_results": grid_results,
+                "base_params": params,
+            }, f, indent=2)
+        print(f"\n💾 Grid results saved to: {output_path}")
+
     # ---- MODE: Monte Carlo ----
     elif args.monte_carlo:
         print(f"\n🎲 Running Monte Carlo bootstrap ({args.monte_carlo} simulations)...")
@@ -11,18 +11,19 @@ Usage:
   python kalshi-v3-settlement-tracker.py --loop 600 # Check every 10 minutes
 """
 
+import os
 import json
 import sys
 import time
-import base64
 import argparse
 from datetime import datetime, timezone
 from pathlib import Path
 from collections import defaultdict
 
-import requests
-from cryptography.hazmat.primitives import hashes, serialization
-from cryptography.hazmat.primitives.asymmetric import padding
+# Shared Kalshi signer (PEM parsed once per process) + pooled HTTP transport
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from kalshi_signing import get_signer
+import http_pool
 
 # Reuse credentials from autotrader
 PROJECT_ROOT = Path(__file__).parent.parent
@@ -45,14 +46,7 @@ BASE_URL = "https://api.elections.kalshi.com"
 
 
 def sign_request(method: str, path: str, timestamp: str) -> str:
-    private_key = serialization.load_pem_private_key(PRIVATE_KEY.encode(), password=None)
-    message = f"{timestamp}{method}{path}".encode('utf-8')
-    signature = private_key.sign(
-        message,
-        padding.PSS(mgf=padding.MGF1(hashes.SHA256()), salt_length=padding.PSS.MAX_LENGTH),
-        hashes.SHA256()
-    )
-    return base64.b64encode(signature).decode('utf-8')
+    return get_signer(PRIVATE_KEY).sign(method, path, timestamp)
 
 
 def kalshi_api(method: str, path: str) -> dict:
@@ -66,7 +60,7 @@ def kalshi_api(method: str, path: str) -> dict:
         "Content-Type": "application/json"
     }
     try:
-        resp = requests.get(url, headers=headers, timeout=15)
+        resp = http_pool.get(url, headers=headers, timeout=15)
         if resp.status_code >= 400:
             return {"error": f"HTTP {resp.status_code}: {resp.text[:200]}"}
         return resp.json()
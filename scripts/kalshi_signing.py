@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Kalshi Request Signing
+Shared RSA-PSS signer for every Kalshi trader/tracker script.
+
+The PEM private key is parsed once per process and the loaded key object is
+reused for every signature (the old per-script `sign_request` re-parsed the
+PEM on each call, including retries).
+
+Usage:
+    from kalshi_signing import get_signer
+
+    signer = get_signer(PRIVATE_KEY)
+    signature = signer.sign("GET", "/trade-api/v2/portfolio/balance", timestamp)
+    print(signer.stats())   # signatures, sign ops per busy second, PEM parse count
+
+    start = get_signing_stats()
+    ...                      # one trading cycle
+    print(cycle_signing_stats(start, wall_sec=cycle_duration))  # signatures/sec over the cycle
+"""
+
+import base64
+import threading
+import time
+
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import padding
+
+# PSS parameters are immutable — build them once
+_PSS_PADDING = padding.PSS(mgf=padding.MGF1(hashes.SHA256()), salt_length=padding.PSS.MAX_LENGTH)
+
+# Process-wide counters (shared by all signers)
+PEM_PARSE_COUNT = 0
+
+
+class KalshiSigner:
+    """RSA-PSS request signer holding a pre-parsed private key."""
+
+    def __init__(self, private_key_pem: str):
+        global PEM_PARSE_COUNT
+        self._private_key = serialization.load_pem_private_key(
+            private_key_pem.encode(), password=None)
+        PEM_PARSE_COUNT += 1
+        self._lock = threading.Lock()
+        self.signatures = 0
+        self.sign_time_sec = 0.0
+        self.created_at = time.time()
+
+    def sign(self, method: str, path: str, timestamp: str) -> str:
+        """Return base64 RSA-PSS signature of `timestamp + method + path`."""
+        start = time.perf_counter()
+        message = f"{timestamp}{method}{path}".encode('utf-8')
+        signature = self._private_key.sign(message, _PSS_PADDING, hashes.SHA256())
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self.signatures += 1
+            self.sign_time_sec += elapsed
+        return base64.b64encode(signature).decode('utf-8')
+
+    def stats(self) -> dict:
+        """Signing cost and PEM parse counters (ops per busy second = 1 / mean latency)."""
+        with self._lock:
+            count = self.signatures
+            busy = self.sign_time_sec
+        return {
+            "signatures": count,
+            "sign_ops_per_busy_sec": round(count / busy, 1) if busy > 0 else 0.0,
+            "avg_sign_ms": round(busy / count * 1000, 3) if count else 0.0,
+            "pem_parses": PEM_PARSE_COUNT,
+        }
+
+
+# Keyed by the PEM string itself (str hashes are cached, so lookups are O(1))
+_SIGNERS = {}
+_SIGNERS_LOCK = threading.Lock()
+
+
+def get_signer(private_key_pem: str) -> KalshiSigner:
+    """Return the process-wide signer for this PEM, parsing it on first use only."""
+    signer = _SIGNERS.get(private_key_pem)
+    if signer is not None:
+        return signer
+    with _SIGNERS_LOCK:
+        signer = _SIGNERS.get(private_key_pem)
+        if signer is None:
+            signer = KalshiSigner(private_key_pem)
+            _SIGNERS[private_key_pem] = signer
+    return signer
+
+
+def sign_request(private_key_pem: str, method: str, path: str, timestamp: str) -> str:
+    """Drop-in helper for scripts that keep the PEM string around."""
+    return get_signer(private_key_pem).sign(method, path, timestamp)
+
+
+def get_signing_stats() -> dict:
+    """Aggregate stats over every signer created in this process."""
+    with _SIGNERS_LOCK:
+        signers = list(_SIGNERS.values())
+    signatures = sum(s.signatures for s in signers)
+    busy = sum(s.sign_time_sec for s in signers)
+    return {
+        "signers": len(signers),
+        "signatures": signatures,
+        "sign_busy_sec": round(busy, 4),
+        "sign_ops_per_busy_sec": round(signatures / busy, 1) if busy > 0 else 0.0,
+        "pem_parses": PEM_PARSE_COUNT,
+    }
+
+
+def cycle_signing_stats(start: dict, wall_sec: float) -> dict:
+    """Signing activity since `start` (a get_signing_stats() snapshot), as throughput over wall_sec."""
+    now = get_signing_stats()
+    signatures = now["signatures"] - start.get("signatures", 0)
+    busy = now["sign_busy_sec"] - start.get("sign_busy_sec", 0.0)
+    return {
+        "signatures": signatures,
+        "signatures_per_sec": round(signatures / wall_sec, 2) if wall_sec > 0 else 0.0,
+        "avg_sign_ms": round(busy / signatures * 1000, 3) if signatures else 0.0,
+        "pem_parses": now["pem_parses"] - start.get("pem_parses", 0),
+        "pem_parses_total": now["pem_parses"],
+    }
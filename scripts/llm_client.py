@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+Resident Local LLM Client
+In-process Ollama client shared by local_llm, bot_llm, the coordinator CLI
+and the translation pipelines.
+
+Requests go through the pooled keep-alive session from http_pool, so a
+query costs one HTTP round trip instead of an interpreter start + import +
+fresh TCP connect (the old `local-agent-coordinator.py --json` subprocess).
+Every request carries `keep_alive`, which keeps the model resident in
+Ollama between calls instead of reloading it after the 5 minute default.
+Responses can be streamed token by token, and embed() batches texts
+through /api/embed for the memory search vector index.
+
+TASK_ROUTING lives here and is read once at import.
+
+Usage:
+    from llm_client import get_client
+
+    client = get_client()
+    result = client.generate("Write a sort function", task="coding")
+    print(result["response"], result["latency_seconds"])
+
+    for token in client.stream("Tell me a story", model="llama3.2:3b"):
+        print(token, end="", flush=True)
+
+    result = await client.agenerate("Summarize: ...", task="analysis")
+    async for token in client.astream("Translate: ..."):
+        ...
+
+    vectors = client.embed(["first chunk", "second chunk"])  # [[float, ...], ...]
+
+    python3 scripts/llm_client.py --task quick "Say OK"
+    python3 scripts/llm_client.py --stream --model llama3.2:3b "Count to 5"
+
+Config (env):
+    OLLAMA_HOST        Ollama server URL (default http://localhost:11434)
+    OLLAMA_KEEP_ALIVE  how long Ollama keeps a model loaded (default 30m)
+    OLLAMA_EMBED_MODEL embedding model for embed() (default nomic-embed-text)
+"""
+
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, Optional
+
+import requests
+
+sys.path.insert(0, str(Path(__file__).parent))
+import http_pool  # noqa: E402
+
+OLLAMA_HOST = os.environ.get("OLLAMA_HOST", "http://localhost:11434").rstrip("/")
+KEEP_ALIVE = os.environ.get("OLLAMA_KEEP_ALIVE", "30m")
+DEFAULT_MODEL = "qwen2.5-coder:7b"
+EMBED_MODEL = os.environ.get("OLLAMA_EMBED_MODEL", "nomic-embed-text")
+DEFAULT_TIMEOUT = 120
+PING_TIMEOUT = 2
+
+# Task routing rules
+TASK_ROUTING = {
+    "coding": {"backend": "ollama", "model": "qwen2.5-coder:7b"},
+    "quick": {"backend": "ollama", "model": "llama3.2:3b"},
+    "translation": {"backend": "tinygrad", "model": "llama3-8b"},
+    "analysis": {"backend": "ollama", "model": "llama31-8b:latest"},
+    "creative": {"backend": "ollama", "model": "llama31-8b:latest"},
+    "heavy": {"backend": "tinygrad", "model": "llama3-8b"},
+}
+
+
+class LocalLLMClient:
+    """
+    Long-lived Ollama client. Thread-safe: the underlying requests.Session
+    is pooled per host by http_pool.
+
+    generate() returns the coordinator's result dict (success, backend,
+    model, response, latency_seconds, tokens, tokens_per_second, error).
+    """
+
+    def __init__(self, host: str = OLLAMA_HOST, keep_alive: str = KEEP_ALIVE,
+                 default_model: str = DEFAULT_MODEL):
+        self.host = host.rstrip("/")
+        self.keep_alive = keep_alive
+        self.default_model = default_model
+        self.requests = 0
+        self.pinned = set()
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------ routing
+
+    def resolve_model(self, task: Optional[str] = None, model: Optional[str] = None) -> str:
+        """Explicit model wins; else the task's Ollama model; else the default."""
+        if model:
+            return model
+        route = TASK_ROUTING.get(task or "")
+        if route and route["backend"] == "ollama":
+            return route["model"]
+        return self.default_model
+
+    # ------------------------------------------------------------------ health
+
+    def ping(self, timeout: float = PING_TIMEOUT) -> bool:
+        """True when the Ollama server answers."""
+        try:
+            return http_pool.get(f"{self.host}/api/tags", timeout=timeout).status_code == 200
+        except requests.RequestException:
+            return False
+
+    def list_models(self, timeout: float = 5) -> list:
+        """Model names installed in Ollama ([] when unreachable)."""
+        try:
+            resp = http_pool.get(f"{self.host}/api/tags", timeout=timeout)
+            if resp.status_code == 200:
+                return [m.get("name") for m in resp.json().get("models", [])]
+        except (requests.RequestException, ValueError):
+            pass
+        return []
+
+    def pin(self, model: str, timeout: float = DEFAULT_TIMEOUT) -> bool:
+        """Load `model` now and keep it resident for keep_alive (empty prompt = load only)."""
+        try:
+            resp = http_pool.post(f"{self.host}/api/generate", timeout=timeout,
+                                  json={"model": model, "keep_alive": self.keep_alive})
+        except requests.RequestException:
+            return False
+        if resp.status_code == 200:
+            with self._lock:
+                self.pinned.add(model)
+            return True
+        return False
+
+    # ------------------------------------------------------------------ sync
+
+    def _payload(self, prompt: str, model: str, system: Optional[str],
+                 options: Optional[dict], stream: bool) -> dict:
+        payload = {"model": model, "prompt": prompt, "stream": stream, "keep_alive": self.keep_alive}
+        if system:
+            payload["system"] = system
+        if options:
+            payload["options"] = options
+        return payload
+
+    def _count(self, model: str):
+        with self._lock:
+            self.requests += 1
+            self.pinned.add(model)
+
+    def generate(self, prompt: str, task: Optional[str] = None, model: Optional[str] = None,
+                 system: Optional[str] = None, options: Optional[dict] = None,
+                 timeout: float = DEFAULT_TIMEOUT,
+                 on_token: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
+        """
+        Run one completion. With on_token the response is streamed and each
+        chunk is passed to the callback as it arrives; the full text is still
+        returned in the result dict.
+        """
+        model = self.resolve_model(task, model)
+        start = time.time()
+        stats = {}
+        try:
+            if on_token is None:
+                resp = http_pool.post(f"{self.host}/api/generate", timeout=timeout,
+                                      json=self._payload(prompt, model, system, options, False))
+                resp.raise_for_status()
+                stats = resp.json()
+                text = stats.get("response", "")
+            else:
+                parts = []
+                for chunk in self._stream_chunks(prompt, model, system, options, timeout):
+                    if chunk.get("response"):
+                        parts.append(chunk["response"])
+                        on_token(chunk["response"])
+                    if chunk.get("done"):
+                        stats = chunk
+                text = "".join(parts)
+        except requests.Timeout:
+            return self._failure(model, f"Timeout after {timeout}s", start)
+        except (requests.RequestException, ValueError) as e:
+            return self._failure(model, str(e), start)
+
+        self._count(model)
+        latency = time.time() - start
+        tokens = stats.get("eval_count", 0)
+        return {
+            "success": True,
+            "backend": "ollama",
+            "model": model,
+            "response": text,
+            "latency_seconds": round(latency, 2),
+            "tokens": tokens,
+            "tokens_per_second": round(tokens / latency, 1) if latency > 0 else 0,
+        }
+
+    def _failure(self, model: str, error: str, start: float) -> Dict[str, Any]:
+        return {
+            "success": False,
+            "backend": "ollama",
+            "model": model,
+            "error": error,
+            "latency_seconds": round(time.time() - start, 2),
+        }
+
+    def _stream_chunks(self, prompt: str, model: str, system: Optional[str],
+                       options: Optional[dict], timeout: float) -> Iterator[dict]:
+        resp = http_pool.post(f"{self.host}/api/generate", timeout=timeout, stream=True,
+                              json=self._payload(prompt, model, system, options, True))
+        try:
+            resp.raise_for_status()
+            for line in resp.iter_lines():
+                if line:
+                    chunk = json.loads(line)
+                    if chunk.get("error"):
+                        raise requests.RequestException(chunk["error"])
+                    yield chunk
+        finally:
+            # Returns the connection to the pool even if the caller stops early
+            resp.close()
+
+    def stream(self, prompt: str, task: Optional[str] = None, model: Optional[str] = None,
+               system: Optional[str] = None, options: Optional[dict] = None,
+               timeout: float = DEFAULT_TIMEOUT) -> Iterator[str]:
+        """Yield response tokens as Ollama produces them. Raises on transport errors."""
+        model = self.resolve_model(task, model)
+        for chunk in self._stream_chunks(prompt, model, system, options, timeout):
+            if chunk.get("response"):
+                yield chunk["response"]
+        self._count(model)
+
+    def embed(self, texts: list, model: Optional[str] = None,
+              timeout: float = DEFAULT_TIMEOUT) -> list:
+        """One embedding vector per text, in a single /api/embed request. Raises on transport errors."""
+        model = model or EMBED_MODEL
+        resp = http_pool.post(f"{self.host}/api/embed", timeout=timeout,
+                              json={"model": model, "input": list(texts), "keep_alive": self.keep_alive})
+        resp.raise_for_status()
+        data = resp.json()
+        if data.get("error"):
+            raise requests.RequestException(data["error"])
+        self._count(model)
+        return data["embeddings"]
+
+    # ------------------------------------------------------------------ asyncio
+
+    async def agenerate(self, prompt: str, **kwargs) -> Dict[str, Any]:
+        """asyncio generate(): runs on a worker thread over the same pooled session."""
+        return await asyncio.to_thread(self.generate, prompt, **kwargs)
+
+    async def astream(self, prompt: str, **kwargs) -> AsyncIterator[str]:
+        """asyncio stream(): tokens are handed from a worker thread through a queue."""
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue()
+        done = object()
+
+        def pump():
+            try:
+                for token in self.stream(prompt, **kwargs):
+                    loop.call_soon_threadsafe(queue.put_nowait, token)
+            except Exception as e:  # surfaced to the awaiting consumer
+                loop.call_soon_threadsafe(queue.put_nowait, e)
+            loop.call_soon_threadsafe(queue.put_nowait, done)
+
+        worker = loop.run_in_executor(None, pump)
+        while True:
+            item = await queue.get()
+            if item is done:
+                break
+            if isinstance(item, Exception):
+                raise item
+            yield item
+        await worker
+
+
+_CLIENTS: Dict[str, LocalLLMClient] = {}
+_CLIENTS_LOCK = threading.Lock()
+
+
+def get_client(host: str = None) -> LocalLLMClient:
+    """Process-wide client for `host` (default OLLAMA_HOST), created on first use."""
+    key = (host or OLLAMA_HOST).rstrip("/")
+    client = _CLIENTS.get(key)
+    if client is None:
+        with _CLIENTS_LOCK:
+            client = _CLIENTS.setdefault(key, LocalLLMClient(key))
+    return client
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Query the resident local LLM client")
+    parser.add_argument("prompt", help="Prompt to send")
+    parser.add_argument("--task", "-t", choices=list(TASK_ROUTING.keys()), help="Task type for model routing")
+    parser.add_argument("--model", "-m", help="Explicit Ollama model")
+    parser.add_argument("--system", "-s", help="System prompt")
+    parser.add_argument("--stream", action="store_true", help="Print tokens as they arrive")
+    parser.add_argument("--json", action="store_true", help="Print raw JSON result")
+    args = parser.parse_args()
+
+    client = get_client()
+    on_token = (lambda t: print(t, end="", flush=True)) if args.stream and not args.json else None
+    result = client.generate(args.prompt, task=args.task, model=args.model,
+                             system=args.system, on_token=on_token)
+    if args.json:
+        print(json.dumps(result, indent=2))
+    elif not result["success"]:
+        print(f"Error: {result['error']}", file=sys.stderr)
+        sys.exit(1)
+    elif args.stream:
+        print()
+    else:
+        print(result["response"])
+
+
+if __name__ == "__main__":
+    main()
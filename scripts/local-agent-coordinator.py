@@ -10,10 +10,12 @@ Usage:
     python local-agent-coordinator.py --query "Write a function to sort a list"
     python local-agent-coordinator.py --query "Translate to Italian" --backend tinygrad
     python local-agent-coordinator.py --task coding --query "Fix this bug..."
+    python local-agent-coordinator.py --task quick --stream --query "Explain TCP"
     python local-agent-coordinator.py --list-backends
     
 Environment:
     OLLAMA_HOST: Ollama server URL (default: http://localhost:11434)
+    OLLAMA_KEEP_ALIVE: How long Ollama keeps models loaded (default: 30m)
     TINYGRAD_PATH: Path to TinyGrad examples (default: ~/tinygrad/examples)
 """
 
@@ -30,15 +32,9 @@ from typing import Optional, Dict, Any
 OLLAMA_HOST = os.environ.get("OLLAMA_HOST", "http://localhost:11434")
 TINYGRAD_PATH = Path(os.environ.get("TINYGRAD_PATH", os.path.expanduser("~/tinygrad/examples")))
 
-# Task routing rules
-TASK_ROUTING = {
-    "coding": {"backend": "ollama", "model": "qwen2.5-coder:7b"},
-    "quick": {"backend": "ollama", "model": "llama3.2:3b"},
-    "translation": {"backend": "tinygrad", "model": "llama3-8b"},
-    "analysis": {"backend": "ollama", "model": "llama31-8b:latest"},
-    "creative": {"backend": "ollama", "model": "llama31-8b:latest"},
-    "heavy": {"backend": "tinygrad", "model": "llama3-8b"},
-}
+# Task routing rules and the resident Ollama client (pooled, keep_alive-pinned)
+sys.path.insert(0, str(Path(__file__).parent))
+from llm_client import TASK_ROUTING, get_client  # noqa: E402
 
 # Ollama available models (from `ollama list`)
 OLLAMA_MODELS = {
@@ -51,12 +47,7 @@ OLLAMA_MODELS = {
 
 def check_ollama_available() -> bool:
     """Check if Ollama server is running."""
-    try:
-        import urllib.request
-        req = urllib.request.urlopen(f"{OLLAMA_HOST}/api/tags", timeout=2)
-        return req.status == 200
-    except Exception:
-        return False
+    return get_client(OLLAMA_HOST).ping()
 
 
 def check_tinygrad_available() -> bool:
@@ -65,54 +56,13 @@ def check_tinygrad_available() -> bool:
     return llama_script.exists()
 
 
-def query_ollama(prompt: str, model: str = "qwen2.5-coder:7b", 
-                 system_prompt: Optional[str] = None) -> Dict[str, Any]:
-    """Send query to Ollama and return response."""
-    import urllib.request
-    import urllib.error
-    
-    start_time = time.time()
-    
-    payload = {
-        "model": model,
-        "prompt": prompt,
-        "stream": False,
-    }
-    
-    if system_prompt:
-        payload["system"] = system_prompt
-    
-    try:
-        req = urllib.request.Request(
-            f"{OLLAMA_HOST}/api/generate",
-            data=json.dumps(payload).encode(),
-            headers={"Content-Type": "application/json"},
-            method="POST"
-        )
-        
-        with urllib.request.urlopen(req, timeout=120) as response:
-            result = json.loads(response.read().decode())
-            
-        latency = time.time() - start_time
-        
-        return {
-            "success": True,
-            "backend": "ollama",
-            "model": model,
-            "response": result.get("response", ""),
-            "latency_seconds": round(latency, 2),
-            "tokens": result.get("eval_count", 0),
-            "tokens_per_second": round(result.get("eval_count", 0) / latency, 1) if latency > 0 else 0,
-        }
-        
-    except urllib.error.URLError as e:
-        return {
-            "success": False,
-            "backend": "ollama",
-            "model": model,
-            "error": str(e),
-            "latency_seconds": time.time() - start_time,
-        }
+def query_ollama(prompt: str, model: str = "qwen2.5-coder:7b",
+                 system_prompt: Optional[str] = None, stream: bool = False,
+                 timeout: float = 120) -> Dict[str, Any]:
+    """Send query to Ollama through the resident client and return response."""
+    on_token = (lambda t: print(t, end="", flush=True)) if stream else None
+    return get_client(OLLAMA_HOST).generate(prompt, model=model, system=system_prompt,
+                                            timeout=timeout, on_token=on_token)
 
 
 def query_tinygrad(prompt: str, max_tokens: int = 512) -> Dict[str, Any]:
@@ -132,10 +82,11 @@ def query_tinygrad(prompt: str, max_tokens: int = 512) -> Dict[str, Any]:
     # Activate TinyGrad venv and run
     venv_activate = Path(os.path.expanduser("~/.venv-tinygrad/bin/activate"))
     
+    escaped = prompt.replace('"', '\\"')
     cmd = f"""
     source {venv_activate} 2>/dev/null || true
     cd {TINYGRAD_PATH}
-    python llama3.py --prompt "{prompt.replace('"', '\\"')}" --max-tokens {max_tokens} 2>/dev/null
+    python llama3.py --prompt "{escaped}" --max-tokens {max_tokens} 2>/dev/null
     """
     
     try:
@@ -177,13 +128,15 @@ def query_tinygrad(prompt: str, max_tokens: int = 512) -> Dict[str, Any]:
 
 
 def route_query(query: str, task_type: Optional[str] = None, 
-                backend: Optional[str] = None, model: Optional[str] = None) -> Dict[str, Any]:
+                backend: Optional[str] = None, model: Optional[str] = None,
+                system_prompt: Optional[str] = None, stream: bool = False,
+                timeout: float = 120) -> Dict[str, Any]:
     """Route query to appropriate backend based on task type or explicit choice."""
     
     # Explicit backend override
     if backend:
         if backend == "ollama":
-            return query_ollama(query, model or "qwen2.5-coder:7b")
+            return query_ollama(query, model or "qwen2.5-coder:7b", system_prompt, stream, timeout)
         elif backend == "tinygrad":
             return query_tinygrad(query)
         else:
@@ -193,12 +146,12 @@ def route_query(query: str, task_type: Optional[str] = None,
     if task_type and task_type in TASK_ROUTING:
         route = TASK_ROUTING[task_type]
         if route["backend"] == "ollama":
-            return query_ollama(query, route["model"])
+            return query_ollama(query, model or route["model"], system_prompt, stream, timeout)
         else:
             return query_tinygrad(query)
     
     # Default: use Ollama for quick response
-    return query_ollama(query, model or "qwen2.5-coder:7b")
+    return query_ollama(query, model or "qwen2.5-coder:7b", system_prompt, stream, timeout)
 
 
 def list_backends() -> None:
@@ -240,6 +193,8 @@ def main():
     parser.add_argument("--json", action="store_true",
                         help="Output as JSON")
     parser.add_argument("--system", "-s", help="System prompt (Ollama only)")
+    parser.add_argument("--stream", action="store_true",
+                        help="Print Ollama tokens as they arrive")
     
     args = parser.parse_args()
     
@@ -256,10 +211,14 @@ def main():
         task_type=args.task,
         backend=args.backend,
         model=args.model,
+        system_prompt=args.system,
+        stream=args.stream and not args.json,
     )
     
     if args.json:
         print(json.dumps(result, indent=2))
+    elif args.stream and result["success"] and result["backend"] == "ollama":
+        print(f"\n\n✅ [{result['backend']}:{result['model']}] ({result['latency_seconds']}s)")
     else:
         if result["success"]:
             print(f"✅ [{result['backend']}:{result.get('model', 'unknown')}] "
@@ -8,12 +8,20 @@ Usage as module:
     result = delegate("Write a sorting function", task="coding")
     code = quick_code("Parse a JSON file in Python")
     analysis = quick_analysis("Summarize this text: ...")
+    result = await adelegate("Explain this diff", task="analysis")
+    for token in stream("Tell me a story", task="creative"):
+        print(token, end="")
 
 Usage as CLI:
     python local_llm.py "Write a function"
     python local_llm.py --task analysis "Summarize: ..."
+
+Queries run in-process through the coordinator's routing and the resident
+llm_client (pooled connection, keep_alive-pinned models) instead of spawning
+a coordinator subprocess per call.
 """
 
+import importlib.util
 import json
 import subprocess
 import sys
@@ -25,6 +33,9 @@ from typing import Optional, Dict, Any
 SCRIPT_DIR = Path(__file__).parent
 COORDINATOR = SCRIPT_DIR / "local-agent-coordinator.py"
 
+sys.path.insert(0, str(SCRIPT_DIR))
+from llm_client import get_client  # noqa: E402
+
 # Fallback chains by task type (fastest to slowest, or most capable to least)
 FALLBACK_CHAINS = {
     "coding": ["qwen2.5-coder:7b", "deepseek-coder:6.7b", "llama3.2:3b"],
@@ -127,103 +138,23 @@ def delegate(
             error=f"Invalid task type: {task}. Valid: {list(TASK_TYPES.keys())}",
         )
     
-    cmd = [
-        sys.executable, str(COORDINATOR),
-        "--task", task,
-        "--query", query,
-        "--json",  # Always get JSON for parsing
-    ]
-    
     start = time.time()
     try:
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=timeout,
-        )
-        latency = (time.time() - start) * 1000
-        
-        if result.returncode != 0:
-            return LLMResponse(
-                text="",
-                model="",
-                backend="",
-                latency_ms=latency,
-                tokens=0,
-                tokens_per_sec=0,
-                success=False,
-                error=result.stderr or f"Exit code {result.returncode}",
-            )
-        
-        # Parse JSON output
-        try:
-            data = json.loads(result.stdout)
-            resp = LLMResponse(
-                text=data.get("response", ""),
-                model=data.get("model", "unknown"),
-                backend=data.get("backend", "unknown"),
-                latency_ms=data.get("latency_ms", latency),
-                tokens=data.get("tokens", 0),
-                tokens_per_sec=data.get("tokens_per_sec", 0),
-                success=True,
-            )
-            # Log metrics
-            _log_metrics(
-                task_type=task,
-                model=resp.model,
-                latency_sec=resp.latency_ms / 1000,
-                tokens_in=len(query.split()),  # Rough estimate
-                tokens_out=resp.tokens,
-                success=True
-            )
-            return resp
-        except json.JSONDecodeError:
-            # Fallback: treat as plain text
-            resp = LLMResponse(
-                text=result.stdout.strip(),
-                model="unknown",
-                backend="unknown",
-                latency_ms=latency,
-                tokens=0,
-                tokens_per_sec=0,
-                success=True,
-            )
-            _log_metrics(
-                task_type=task,
-                model="unknown",
-                latency_sec=latency / 1000,
-                tokens_in=len(query.split()),
-                tokens_out=len(resp.text.split()),
-                success=True
-            )
-            return resp
-            
-    except subprocess.TimeoutExpired:
-        _log_metrics(task, "", timeout, len(query.split()), 0, False, f"Timeout after {timeout}s")
-        return LLMResponse(
-            text="",
-            model="",
-            backend="",
-            latency_ms=timeout * 1000,
-            tokens=0,
-            tokens_per_sec=0,
-            success=False,
-            error=f"Timeout after {timeout}s",
-        )
+        resp = _to_response(_coordinator().route_query(query, task_type=task, timeout=timeout),
+                            "", start)
     except Exception as e:
-        elapsed = time.time() - start
-        _log_metrics(task, "", elapsed, len(query.split()), 0, False, str(e))
-        return LLMResponse(
-            text="",
-            model="",
-            backend="",
-            latency_ms=elapsed * 1000,
-            tokens=0,
-            tokens_per_sec=0,
-            success=False,
-            error=str(e),
-        )
+        resp = _failed("", "", start, str(e))
+
+    _log_metrics(
+        task_type=task,
+        model=resp.model,
+        latency_sec=resp.latency_ms / 1000,
+        tokens_in=len(query.split()),  # Rough estimate
+        tokens_out=resp.tokens or len(resp.text.split()),
+        success=resp.success,
+        error=resp.error,
+    )
+    return resp
 
 
 def delegate_with_retry(
@@ -301,6 +232,50 @@ def delegate_with_retry(
     )
 
 
+_COORDINATOR_MODULE = None
+
+
+def _coordinator():
+    """The coordinator module, loaded once per process (its file name has dashes)."""
+    global _COORDINATOR_MODULE
+    if _COORDINATOR_MODULE is None:
+        spec = importlib.util.spec_from_file_location("local_agent_coordinator", str(COORDINATOR))
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        _COORDINATOR_MODULE = module
+    return _COORDINATOR_MODULE
+
+
+def _failed(model: str, backend: str, start: float, error: str) -> LLMResponse:
+    return LLMResponse(
+        text="",
+        model=model,
+        backend=backend,
+        latency_ms=(time.time() - start) * 1000,
+        tokens=0,
+        tokens_per_sec=0,
+        success=False,
+        error=error,
+    )
+
+
+def _to_response(result: Dict[str, Any], model: str, start: float) -> LLMResponse:
+    """Convert a coordinator result dict into an LLMResponse."""
+    if not result.get("success"):
+        return _failed(result.get("model", model), result.get("backend", ""), start,
+                       result.get("error", "Unknown error"))
+    latency_s = result.get("latency_seconds")
+    return LLMResponse(
+        text=result.get("response", ""),
+        model=result.get("model", model) or "unknown",
+        backend=result.get("backend", "unknown"),
+        latency_ms=latency_s * 1000 if latency_s is not None else (time.time() - start) * 1000,
+        tokens=result.get("tokens", 0),
+        tokens_per_sec=result.get("tokens_per_second", 0),
+        success=True,
+    )
+
+
 def _delegate_with_model(
     query: str,
     task: str,
@@ -308,80 +283,12 @@ def _delegate_with_model(
     timeout: int,
 ) -> LLMResponse:
     """Internal: delegate to specific model."""
-    cmd = [
-        sys.executable, str(COORDINATOR),
-        "--task", task,
-        "--model", model,
-        "--query", query,
-        "--json",
-    ]
-    
     start = time.time()
     try:
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=timeout,
-        )
-        latency = (time.time() - start) * 1000
-        
-        if result.returncode != 0:
-            return LLMResponse(
-                text="",
-                model=model,
-                backend="ollama",
-                latency_ms=latency,
-                tokens=0,
-                tokens_per_sec=0,
-                success=False,
-                error=result.stderr or f"Exit code {result.returncode}",
-            )
-        
-        try:
-            data = json.loads(result.stdout)
-            return LLMResponse(
-                text=data.get("response", ""),
-                model=data.get("model", model),
-                backend=data.get("backend", "ollama"),
-                latency_ms=data.get("latency_ms", latency),
-                tokens=data.get("tokens", 0),
-                tokens_per_sec=data.get("tokens_per_sec", 0),
-                success=True,
-            )
-        except json.JSONDecodeError:
-            return LLMResponse(
-                text=result.stdout.strip(),
-                model=model,
-                backend="ollama",
-                latency_ms=latency,
-                tokens=0,
-                tokens_per_sec=0,
-                success=True,
-            )
-            
-    except subprocess.TimeoutExpired:
-        return LLMResponse(
-            text="",
-            model=model,
-            backend="ollama",
-            latency_ms=timeout * 1000,
-            tokens=0,
-            tokens_per_sec=0,
-            success=False,
-            error=f"Timeout after {timeout}s",
-        )
+        result = _coordinator().route_query(query, task_type=task, model=model, timeout=timeout)
+        return _to_response(result, model, start)
     except Exception as e:
-        return LLMResponse(
-            text="",
-            model=model,
-            backend="ollama",
-            latency_ms=(time.time() - start) * 1000,
-            tokens=0,
-            tokens_per_sec=0,
-            success=False,
-            error=str(e),
-        )
+        return _failed(model, "ollama", start, str(e))
 
 
 def quick_code(query: str, timeout: int = 60) -> str:
@@ -399,14 +306,20 @@ def quick_answer(query: str, timeout: int = 30) -> str:
     return delegate(query, task="quick", timeout=timeout).text
 
 
+async def adelegate(query: str, task: str = "coding", timeout: int = 120) -> LLMResponse:
+    """asyncio delegate(): runs on a worker thread, sharing the pooled client."""
+    import asyncio
+    return await asyncio.to_thread(delegate, query, task, timeout)
+
+
+def stream(query: str, task: str = "coding", timeout: int = 120):
+    """Yield response tokens from the task's Ollama model as they arrive."""
+    return get_client().stream(query, task=task, timeout=timeout)
+
+
 def is_ollama_running() -> bool:
     """Check if Ollama server is running."""
-    import urllib.request
-    try:
-        urllib.request.urlopen("http://localhost:11434/api/tags", timeout=2)
-        return True
-    except:
-        return False
+    return get_client().ping()
 
 
 def start_ollama() -> bool:
@@ -7,7 +7,8 @@ Tracks aggregate momentum across BTC/ETH to identify market regimes:
 - RANGING: Sideways chop, mean-reversion strategies favored
 - VOLATILE: High volatility regime changes, caution advised
 
-Uses ADX-like momentum scoring and regime classification.
+Uses ADX-based momentum scoring (shared indicators.py engine) and regime
+classification.
 
 Output: data/trading/momentum-regime.json
 Alerts: scripts/kalshi-momentum-regime.alert (on regime change)
@@ -21,7 +22,11 @@ from pathlib import Path
 import urllib.request
 import urllib.error
 from typing import Optional, Tuple, List
-import statistics
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent))
+from indicators import CandleSeries  # noqa: E402
+from ohlc_store import OHLCFetcher, OHLCStore  # noqa: E402
 
 # Configuration
 PROJECT_ROOT = Path(__file__).parent.parent
@@ -33,6 +38,7 @@ STATE_FILE = PROJECT_ROOT / "scripts" / "kalshi-momentum-regime-state.json"
 
 BINANCE_BASE = "https://api.binance.com/api/v3"
 COINGECKO_BASE = "https://api.coingecko.com/api/v3"
+OHLC_STORE_DIR = PROJECT_ROOT / "data" / "ohlc" / "store"
 
 # Regime thresholds
 TRENDING_THRESHOLD = 0.6   # Momentum score above this = trending
@@ -132,9 +138,25 @@ def get_hourly_ohlc_coingecko(coin_id: str, days: int = 7) -> Optional[List[dict
     return candles
 
 
+def get_hourly_ohlc_store(symbol: str, hours: int = 168) -> Optional[List[dict]]:
+    """Hourly candles from the shared local store, downloading only the missing tail."""
+    asset = symbol.replace("USDT", "").lower()
+    try:
+        candles = OHLCFetcher(OHLCStore(OHLC_STORE_DIR)).load(asset, "1h", time.time() - hours * 3600)
+    except Exception as e:
+        print(f"   ↳ OHLC store unavailable: {e}")
+        return None
+    return [{"timestamp": ts, "open": o, "high": h, "low": l, "close": c, "volume": 0}
+            for ts, o, h, l, c in candles.tolist()]
+
+
 def get_hourly_ohlc(symbol: str, hours: int = 168) -> Optional[List[dict]]:
-    """Try Binance first, fall back to CoinGecko."""
-    
+    """Try the local store first, then Binance, then CoinGecko."""
+
+    candles = get_hourly_ohlc_store(symbol, hours)
+    if candles:
+        return candles
+
     # Try Binance
     candles = get_hourly_ohlc_binance(symbol, hours)
     if candles:
@@ -157,105 +179,6 @@ def get_hourly_ohlc(symbol: str, hours: int = 168) -> Optional[List[dict]]:
     return get_hourly_ohlc_coingecko(coin_id, days)
 
 
-def calculate_atr(candles: List[dict], period: int = 14) -> float:
-    """Calculate Average True Range (volatility measure)."""
-    if len(candles) < period + 1:
-        return 0
-    
-    true_ranges = []
-    for i in range(1, len(candles)):
-        high = candles[i]["high"]
-        low = candles[i]["low"]
-        prev_close = candles[i-1]["close"]
-        
-        tr = max(
-            high - low,
-            abs(high - prev_close),
-            abs(low - prev_close)
-        )
-        true_ranges.append(tr)
-    
-    # Return average of last 'period' true ranges
-    return statistics.mean(true_ranges[-period:])
-
-
-def calculate_directional_movement(candles: List[dict], period: int = 14) -> Tuple[float, float]:
-    """
-    Calculate +DI and -DI (directional movement indicators).
-    Returns (plus_di, minus_di) as percentages.
-    """
-    if len(candles) < period + 1:
-        return 0, 0
-    
-    plus_dm_sum = 0
-    minus_dm_sum = 0
-    tr_sum = 0
-    
-    for i in range(len(candles) - period, len(candles)):
-        if i < 1:
-            continue
-            
-        high = candles[i]["high"]
-        low = candles[i]["low"]
-        prev_high = candles[i-1]["high"]
-        prev_low = candles[i-1]["low"]
-        prev_close = candles[i-1]["close"]
-        
-        # True range
-        tr = max(
-            high - low,
-            abs(high - prev_close),
-            abs(low - prev_close)
-        )
-        tr_sum += tr
-        
-        # Directional movement
-        up_move = high - prev_high
-        down_move = prev_low - low
-        
-        if up_move > down_move and up_move > 0:
-            plus_dm_sum += up_move
-        if down_move > up_move and down_move > 0:
-            minus_dm_sum += down_move
-    
-    if tr_sum == 0:
-        return 0, 0
-    
-    plus_di = (plus_dm_sum / tr_sum) * 100
-    minus_di = (minus_dm_sum / tr_sum) * 100
-    
-    return plus_di, minus_di
-
-
-def calculate_adx(candles: List[dict], period: int = 14) -> float:
-    """
-    Calculate ADX (Average Directional Index).
-    High ADX (>25) = strong trend
-    Low ADX (<20) = weak trend / ranging
-    """
-    if len(candles) < period * 2:
-        return 0
-    
-    dx_values = []
-    
-    # Calculate DX for rolling periods
-    for end_idx in range(period + 1, len(candles) + 1):
-        window = candles[max(0, end_idx - period - 1):end_idx]
-        plus_di, minus_di = calculate_directional_movement(window, period)
-        
-        if plus_di + minus_di == 0:
-            dx = 0
-        else:
-            dx = abs(plus_di - minus_di) / (plus_di + minus_di) * 100
-        dx_values.append(dx)
-    
-    if not dx_values:
-        return 0
-    
-    # ADX is smoothed average of DX
-    return statistics.mean(dx_values[-period:])
-
-
 def calculate_momentum_score(candles: List[dict]) -> Tuple[float, dict]:
     """
     Calculate overall momentum score (0-1 scale).
@@ -269,12 +192,16 @@ def calculate_momentum_score(candles: List[dict]) -> Tuple[float, dict]:
     if len(candles) < 20:
         return 0.5, {"error": "insufficient data"}
     
-    # 1. ADX component (0-100 raw, normalize to 0-1)
-    adx = calculate_adx(candles, 14)
+    # One pass over the candles updates ATR / ADX / DI incrementally
+    series = CandleSeries(candles)
+    dmi = series.indicators["adx14"]
+    
+    # 1. ADX component (0-100 raw, normalize to 0-1), Wilder-smoothed
+    adx = dmi.value
     adx_score = min(adx / 50, 1.0)  # Cap at ADX=50
     
     # 2. Rate of change over different periods
-    close_prices = [c["close"] for c in candles]
+    close_prices = series.close
     
     roc_24h = (close_prices[-1] - close_prices[-24]) / close_prices[-24] if len(close_prices) >= 24 else 0
     roc_7d = (close_prices[-1] - close_prices[0]) / close_prices[0] if len(close_prices) > 1 else 0
@@ -284,12 +211,12 @@ def calculate_momentum_score(candles: List[dict]) -> Tuple[float, dict]:
     roc_score = min(roc_strength, 1.0)
     
     # 3. Directional consistency (are moves in same direction?)
-    plus_di, minus_di = calculate_directional_movement(candles, 14)
+    plus_di, minus_di = dmi.plus_di, dmi.minus_di
     di_diff = abs(plus_di - minus_di)
     consistency_score = min(di_diff / 30, 1.0)  # Cap at 30 diff
     
     # 4. Volatility check (ATR relative to price)
-    atr = calculate_atr(candles, 14)
+    atr = series.value("atr14")
     atr_pct = (atr / close_prices[-1]) * 100 if close_prices[-1] > 0 else 0
     
     # Combined score (weighted average)
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Kalshi Market Store
+Persistent SQLite snapshot of the Kalshi market universe, keyed by ticker.
+
+Static metadata (title, subtitle, category) is written once when a
+market is first seen; every later cycle only refreshes the dynamic fields
+(prices, volume, open interest, status) and the expiry, which Kalshi can
+move earlier or later while a market is open. The store also detects newly
+listed markets and markets that dropped out of the open universe, and gives
+the scanner a warm static-field cache right after a restart. A market that
+comes back after being marked closed is reopened with its first_seen kept.
+
+Usage:
+    from market_store import MarketStore
+
+    store = MarketStore(PROJECT_ROOT / "data" / "trading" / "kalshi-markets.db")
+    static = store.get_static("KXBTC-...")          # None if never seen
+    delta = store.sync(markets, full_universe=True, universe_max_ts=max_close_ts)
+    # {"new": .., "reopened": .., "updated": .., "closed": .., "open_total": ..}
+"""
+
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+STATIC_FIELDS = ("title", "subtitle", "category", "expiry")
+DYNAMIC_FIELDS = ("yes_price", "no_price", "yes_bid", "yes_ask", "last_price",
+                  "volume", "open_interest", "status", "result")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS markets (
+    ticker        TEXT PRIMARY KEY,
+    title         TEXT,
+    subtitle      TEXT,
+    category      TEXT,
+    expiry        TEXT,
+    expiry_ts     REAL,
+    yes_price     INTEGER,
+    no_price      INTEGER,
+    yes_bid       INTEGER,
+    yes_ask       INTEGER,
+    last_price    INTEGER,
+    volume        INTEGER,
+    open_interest INTEGER,
+    status        TEXT,
+    result        TEXT,
+    first_seen    REAL,
+    last_seen     REAL,
+    closed_at     REAL
+);
+CREATE INDEX IF NOT EXISTS idx_markets_open ON markets(closed_at, expiry_ts);
+"""
+
+
+def expiry_to_ts(expiry: str) -> float:
+    """ISO expiry -> epoch seconds (0 if unparseable)."""
+    try:
+        return datetime.fromisoformat(expiry.replace('Z', '+00:00')).timestamp()
+    except Exception:
+        return 0.0
+
+
+class MarketStore:
+    """SQLite-backed market snapshot with an in-memory static-field cache."""
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        # Warm start: static fields of every open market, loaded once
+        self._static = {}
+        for row in self._conn.execute(
+                "SELECT ticker, title, subtitle, category, expiry FROM markets WHERE closed_at IS NULL"):
+            self._static[row[0]] = dict(zip(STATIC_FIELDS, row[1:]))
+
+    def __len__(self):
+        return len(self._static)
+
+    def get_static(self, ticker: str):
+        """Cached static fields for an open ticker, or None if unknown."""
+        return self._static.get(ticker)
+
+    def sync(self, markets: list, full_universe: bool = False, universe_max_ts: float = None) -> dict:
+        """
+        Upsert a scan result.
+
+        New tickers get a full insert; known tickers only get their dynamic
+        fields and expiry updated. With full_universe=True (the scan walked every page),
+        open tickers missing from `markets` are marked closed. When the walk
+        was limited to markets closing by `universe_max_ts` (max_close_ts),
+        absence only means closed for tickers expiring inside that window;
+        anything dated later was filtered out by the server, not delisted.
+        Tickers already past expiry are closed unless this scan still
+        returned them as open.
+        """
+        now = time.time()
+        new_rows, dyn_rows = [], []
+        seen = set()
+        for m in markets:
+            seen.add(m.ticker)
+            dyn = tuple(getattr(m, f) for f in DYNAMIC_FIELDS)
+            if m.ticker in self._static:
+                dyn_rows.append(dyn + (m.expiry, expiry_to_ts(m.expiry), now, m.ticker))
+            else:
+                new_rows.append((m.ticker,) + tuple(getattr(m, f) for f in STATIC_FIELDS) +
+                                (expiry_to_ts(m.expiry),) + dyn + (now, now))
+
+        with self._lock, self._conn:
+            reopened = 0
+            candidates = [row[0] for row in new_rows]
+            for i in range(0, len(candidates), 500):
+                chunk = candidates[i:i + 500]
+                reopened += self._conn.execute(
+                    f"SELECT COUNT(*) FROM markets WHERE ticker IN ({','.join('?' * len(chunk))})",
+                    chunk).fetchone()[0]
+            # Upsert: a ticker seen before (closed, or re-listed with a new close time) keeps first_seen
+            self._conn.executemany(
+                "INSERT INTO markets (ticker, title, subtitle, category, expiry, expiry_ts, "
+                "yes_price, no_price, yes_bid, yes_ask, last_price, volume, open_interest, status, result, "
+                "first_seen, last_seen) VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?) "
+                "ON CONFLICT(ticker) DO UPDATE SET title=excluded.title, subtitle=excluded.subtitle, "
+                "category=excluded.category, expiry=excluded.expiry, expiry_ts=excluded.expiry_ts, "
+                "yes_price=excluded.yes_price, no_price=excluded.no_price, yes_bid=excluded.yes_bid, "
+                "yes_ask=excluded.yes_ask, last_price=excluded.last_price, volume=excluded.volume, "
+                "open_interest=excluded.open_interest, status=excluded.status, result=excluded.result, "
+                "last_seen=excluded.last_seen, closed_at=NULL", new_rows)
+            self._conn.executemany(
+                "UPDATE markets SET yes_price=?, no_price=?, yes_bid=?, yes_ask=?, last_price=?, "
+                "volume=?, open_interest=?, status=?, result=?, expiry=?, expiry_ts=?, last_seen=? "
+                "WHERE ticker=?", dyn_rows)
+
+            closed = []
+            if full_universe and universe_max_ts is None:
+                closed = [t for t in self._static if t not in seen]
+            elif full_universe:
+                closed = [r[0] for r in self._conn.execute(
+                    "SELECT ticker FROM markets WHERE closed_at IS NULL AND expiry_ts > 0 AND expiry_ts <= ?",
+                    (universe_max_ts,)) if r[0] not in seen]
+            expired = [r[0] for r in self._conn.execute(
+                "SELECT ticker FROM markets WHERE closed_at IS NULL AND expiry_ts > 0 AND expiry_ts < ?",
+                (now,)) if r[0] not in seen]
+            closed = list(set(closed) | set(expired))
+            self._conn.executemany("UPDATE markets SET closed_at=? WHERE ticker=?",
+                                   [(now, t) for t in closed])
+
+        for row in new_rows:
+            self._static[row[0]] = dict(zip(STATIC_FIELDS, row[1:5]))
+        for row in dyn_rows:
+            self._static[row[-1]]["expiry"] = row[-4]
+        for t in closed:
+            self._static.pop(t, None)
+
+        return {"new": len(new_rows) - reopened, "reopened": reopened,
+                "updated": len(dyn_rows), "closed": len(closed),
+                "open_total": len(self._static)}
+
+    def new_since(self, since_ts: float) -> list:
+        """Tickers first listed after `since_ts`."""
+        with self._lock:
+            return [r[0] for r in self._conn.execute(
+                "SELECT ticker FROM markets WHERE first_seen > ?", (since_ts,))]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Market Table
+Columnar (struct-of-arrays) store for one scan's worth of Kalshi markets,
+replacing thousands of per-market MarketInfo objects on the scanner hot path.
+
+  - numeric fields live in compact `array` columns (int16 prices, int64
+    volume / open interest, float64 expiry pre-parsed to epoch seconds)
+  - status / result are stored as uint8 codes into a small vocabulary
+  - ticker / title / subtitle / category / expiry stay as plain str lists
+  - filter and score are NumPy passes over the whole table; ranking returns
+    top-K indices via a partition instead of sorting every market
+  - `row(i)` gives a light MarketInfo-compatible view for the forecasting code
+
+Filter and score rules match the unified trader's scalar filter_markets /
+score_market exactly.
+
+Usage:
+    from market_table import MarketTable
+
+    table = MarketTable()
+    table.append(ticker, title, subtitle, category, yes_price, no_price, volume,
+                 open_interest, expiry, status, result, yes_bid, yes_ask, last_price)
+    keep = table.filter_mask(min_volume=200, min_liquidity=1000, min_dte=0.02,
+                             max_dte=30, min_price=5, max_price=95)
+    table = table.take(keep.nonzero()[0])
+    scores = table.scores()
+    for i in table.top_k(10, scores):
+        m = table.row(i)                     # m.ticker, m.days_to_expiry, ...
+"""
+
+import math
+import time
+from array import array
+
+import numpy as np
+
+from crypto_batch_forecast import parse_expiry
+
+OPEN_STATUSES = ("open", "active", "")
+UNPARSEABLE_DTE = 999  # what MarketInfo.days_to_expiry reports for a bad expiry
+
+STR_COLUMNS = ("ticker", "title", "subtitle", "category", "expiry")
+# name -> array typecode
+NUM_COLUMNS = {
+    "yes_price": "h", "no_price": "h", "yes_bid": "h", "yes_ask": "h", "last_price": "h",
+    "volume": "q", "open_interest": "q", "expiry_ts": "d",
+    "status_code": "B", "result_code": "B",
+}
+FIELDS = ("ticker", "title", "subtitle", "category", "yes_price", "no_price", "volume",
+          "open_interest", "expiry", "status", "result", "yes_bid", "yes_ask", "last_price")
+
+
+class _Vocab:
+    """str <-> small int code, shared by every row of a table."""
+
+    __slots__ = ("codes", "values")
+
+    def __init__(self):
+        self.codes = {}
+        self.values = []
+
+    def code(self, value: str) -> int:
+        c = self.codes.get(value)
+        if c is None:
+            c = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return c
+
+
+class MarketRow:
+    """Read-only MarketInfo-compatible view of one table row."""
+
+    __slots__ = ("table", "index")
+
+    def __init__(self, table, index: int):
+        self.table = table
+        self.index = index
+
+    def __repr__(self):
+        return f"MarketRow({self.ticker!r}, yes={self.yes_price}, vol={self.volume})"
+
+    @property
+    def status(self) -> str:
+        return self.table._status.values[self.table._num["status_code"][self.index]]
+
+    @property
+    def result(self) -> str:
+        return self.table._result.values[self.table._num["result_code"][self.index]]
+
+    @property
+    def expiry_ts(self) -> float:
+        return self.table._num["expiry_ts"][self.index]
+
+    @property
+    def market_prob(self) -> float:
+        return self.yes_price / 100.0
+
+    @property
+    def days_to_expiry(self) -> float:
+        ts = self.expiry_ts
+        if math.isnan(ts):
+            return UNPARSEABLE_DTE
+        return max(0, (ts - time.time()) / 86400)
+
+
+def _str_column(name):
+    return property(lambda self: self.table._str[name][self.index])
+
+
+def _num_column(name):
+    # array.array indexing yields plain Python ints/floats (JSON-safe, unlike numpy scalars)
+    return property(lambda self: self.table._num[name][self.index])
+
+
+for _name in STR_COLUMNS:
+    setattr(MarketRow, _name, _str_column(_name))
+for _name in ("yes_price", "no_price", "yes_bid", "yes_ask", "last_price", "volume", "open_interest"):
+    setattr(MarketRow, _name, _num_column(_name))
+
+
+class MarketTable:
+    """Append-only struct-of-arrays market table with vectorized filter / score / top-K."""
+
+    def __init__(self):
+        self._str = {name: [] for name in STR_COLUMNS}
+        self._num = {name: array(code) for name, code in NUM_COLUMNS.items()}
+        self._status = _Vocab()
+        self._result = _Vocab()
+        self._np = {}
+
+    @classmethod
+    def from_markets(cls, markets) -> "MarketTable":
+        """Build from MarketInfo-like objects (anything with the FIELDS attributes)."""
+        table = cls()
+        for m in markets:
+            table.append(*(getattr(m, f) for f in FIELDS))
+        return table
+
+    def __len__(self):
+        return len(self._str["ticker"])
+
+    def append(self, ticker, title, subtitle, category, yes_price, no_price, volume,
+               open_interest, expiry, status, result, yes_bid=0, yes_ask=0, last_price=0) -> int:
+        """Add one market (same argument order as MarketInfo). Returns its row index."""
+        num = self._num
+        # Convert everything first so a bad value can't leave columns misaligned
+        values = (int(yes_price), int(no_price), int(yes_bid), int(yes_ask), int(last_price),
+                  int(volume), int(open_interest), parse_expiry(expiry or ""),
+                  self._status.code(status or ""), self._result.code(result or ""))
+        for name, value in zip(NUM_COLUMNS, values):
+            num[name].append(value)
+        for name, value in zip(STR_COLUMNS, (ticker, title, subtitle, category, expiry)):
+            self._str[name].append(value)
+        self._np.clear()
+        return len(self) - 1
+
+    def column(self, name: str) -> np.ndarray:
+        """NumPy copy of a numeric column (cached until the next append)."""
+        col = self._np.get(name)
+        if col is None:
+            col = self._np[name] = np.array(self._num[name])
+        return col
+
+    def nbytes(self) -> int:
+        """Approximate footprint: numeric columns + str list slots (strings themselves excluded)."""
+        return (sum(a.itemsize * len(a) for a in self._num.values()) +
+                8 * len(STR_COLUMNS) * len(self))
+
+    # ── rows ──
+
+    def row(self, i: int) -> MarketRow:
+        return MarketRow(self, int(i))
+
+    def rows(self, indices=None) -> list:
+        if indices is None:
+            indices = range(len(self))
+        return [MarketRow(self, int(i)) for i in indices]
+
+    def take(self, indices) -> "MarketTable":
+        """New compact table holding only `indices` (in that order)."""
+        out = MarketTable()
+        idx = [int(i) for i in indices]
+        for name in STR_COLUMNS:
+            col = self._str[name]
+            out._str[name] = [col[i] for i in idx]
+        for name, code in NUM_COLUMNS.items():
+            out._num[name] = array(code, self.column(name)[idx].tobytes()) if idx else array(code)
+        out._status, out._result = self._status, self._result
+        return out
+
+    # ── vectorized filter / score ──
+
+    def days_to_expiry(self, now: float = None) -> np.ndarray:
+        now = time.time() if now is None else now
+        ts = self.column("expiry_ts")
+        return np.where(np.isnan(ts), UNPARSEABLE_DTE, np.maximum(0.0, (ts - now) / 86400))
+
+    def filter_mask(self, min_volume: int = 0, min_liquidity: int = 0, min_dte: float = 0.0,
+                    max_dte: float = math.inf, min_price: int = 0, max_price: int = 100,
+                    now: float = None) -> np.ndarray:
+        """Boolean mask of tradeable rows (same rules as filter_markets)."""
+        n = len(self)
+        if not n:
+            return np.zeros(0, dtype=bool)
+        has_text = np.fromiter((bool(t and s) for t, s in zip(self._str["ticker"], self._str["title"])),
+                               dtype=bool, count=n)
+        open_codes = [c for v, c in self._status.codes.items() if v in OPEN_STATUSES]
+        unsettled_codes = [c for v, c in self._result.codes.items() if not v]
+        volume = self.column("volume")
+        yes = self.column("yes_price")
+        dte = self.days_to_expiry(now)
+        return (has_text
+                & np.isin(self.column("status_code"), open_codes)
+                & np.isin(self.column("result_code"), unsettled_codes)
+                & (volume >= min_volume)
+                & (np.maximum(self.column("open_interest"), volume) >= min_liquidity)
+                & (dte <= max_dte) & (dte >= min_dte)
+                & (yes >= min_price) & (yes <= max_price))
+
+    def scores(self, now: float = None) -> np.ndarray:
+        """Ranking score per row (same formula as score_market)."""
+        volume = self.column("volume").astype(float)
+        oi = self.column("open_interest").astype(float)
+        yes = self.column("yes_price").astype(float)
+        dte = self.days_to_expiry(now)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            score = np.where(volume > 0, np.minimum(10, np.log10(volume) * 2), 0.0)
+            score += np.maximum(0, 10 - np.abs(yes - 50) * 0.2)
+            score += np.select([(dte >= 1) & (dte <= 7), (dte > 7) & (dte <= 14), (dte >= 0.1) & (dte < 1)],
+                               [5.0, 3.0, 2.0], default=1.0)
+            score += np.where(oi > 0, np.minimum(5, np.log10(oi + 1) * 1.5), 0.0)
+        return score
+
+    @staticmethod
+    def top_k(k: int, scores: np.ndarray) -> np.ndarray:
+        """Indices of the k best scores, best first; ties keep table order."""
+        n = len(scores)
+        k = max(0, min(k, n))
+        if not k:
+            return np.zeros(0, dtype=np.intp)
+        if k == n:
+            idx = np.arange(n)
+        else:
+            # k-th best score via partition (O(n)); rows tied at the cut are taken in table order
+            cut = np.partition(scores, n - k)[n - k]
+            above = np.flatnonzero(scores > cut)
+            idx = np.concatenate([above, np.flatnonzero(scores == cut)[:k - len(above)]])
+        return idx[np.lexsort((idx, -scores[idx]))]
@@ -3,208 +3,183 @@
 Local Memory Search with SQLite FTS5
 NO API KEYS - 100% FREE - 100% LOCAL
 
+Indexes memory/, docs/, books/ and the top-level *.md task files
+incrementally (see scripts/memory_search.py). `serve` keeps the index
+resident: it refreshes in the background and answers the
+memory-search*.sh wrappers over localhost HTTP in a few milliseconds,
+with an LRU of recent queries. With --hybrid, chunk embeddings from a
+local Ollama model (memory_vectors.py) are fused with BM25 so paraphrased
+queries still find the note.
+
 Usage:
-    python memory-index.py index    # Build/rebuild index
-    python memory-index.py search "query"  # Search
+    python memory-index.py index [--full]       # Update (or rebuild) the index
+    python memory-index.py search "query"       # Search (auto-updates first)
+    python memory-index.py search "query" --limit 5 --format json
+    python memory-index.py search "query" --hybrid   # BM25 + stored embeddings (see `embed`)
+    python memory-index.py embed                # Embed new / changed chunks
+    python memory-index.py serve [--port 8791] [--hybrid]  # Resident daemon
+    python memory-index.py stats
+
+Config (env):
+    MEMORY_INDEX_PORT   daemon port (default 8791)
+    plus ONDE_ROOT / MEMORY_INDEX_DB / MEMORY_INDEX_GLOBS (see memory_search.py)
+    and MEMORY_EMBED_MODEL / MEMORY_EMBED_BATCH (see memory_vectors.py)
 """
 
-import sqlite3
+import argparse
+import json
 import os
 import sys
-import re
-import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
-from datetime import datetime
-
-WORKSPACE = Path("/Users/mattia/Projects/Onde")
-MEMORY_DIR = WORKSPACE / "memory"
-DB_PATH = WORKSPACE / "data" / "memory-search.db"
-
-def init_db():
-    """Initialize SQLite with FTS5"""
-    DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-    
-    # FTS5 virtual table for full-text search
-    c.execute('''
-        CREATE VIRTUAL TABLE IF NOT EXISTS memory_fts USING fts5(
-            path,
-            line_start,
-            line_end,
-            content,
-            date_ref,
-            tokenize='porter unicode61'
-        )
-    ''')
-    
-    # Metadata table
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS index_meta (
-            path TEXT PRIMARY KEY,
-            mtime REAL,
-            indexed_at TEXT
-        )
-    ''')
-    
-    conn.commit()
-    return conn
-
-def chunk_file(filepath: Path) -> list:
-    """Split file into searchable chunks (by section/paragraph)"""
-    chunks = []
+from urllib.parse import parse_qs, urlparse
+
+sys.path.insert(0, str(Path(__file__).parent))
+from memory_search import MemoryIndex  # noqa: E402
+
+PORT = int(os.environ.get("MEMORY_INDEX_PORT", "8791"))
+REFRESH_INTERVAL = 5.0
+
+
+def format_results(query: str, results: list) -> str:
+    if not results:
+        return f"No results for: {query}\n"
+    lines = [f"\n=== Results for: {query} ===\n"]
+    for i, r in enumerate(results, 1):
+        lines.append(f"{i}. {Path(r['path']).name} (lines {r['lines']}) [score: {r['score']:.3g}]")
+        lines.append(f"   {r['snippet']}")
+        lines.append("")
+    return "\n".join(lines) + "\n"
+
+
+def make_handler(index: MemoryIndex):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urlparse(self.path)
+            params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+            if url.path == "/search":
+                query = params.get("q", "")
+                hybrid = params.get("hybrid", "") in ("1", "true", "yes")
+                results = index.search(query, int(params.get("limit", 10)), hybrid) if query else []
+                if params.get("format") == "text":
+                    self._send(format_results(query, results), "text/plain; charset=utf-8")
+                else:
+                    self._send(json.dumps(results), "application/json")
+            elif url.path == "/stats":
+                self._send(json.dumps(index.stats()), "application/json")
+            elif url.path == "/refresh":
+                self._send(json.dumps(index.refresh()), "application/json")
+            else:
+                self.send_error(404)
+
+        def _send(self, body: str, ctype: str):
+            data = body.encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", ctype)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+def sync_vectors(index: MemoryIndex) -> dict:
+    """Embed new chunks; on failure (Ollama down) hybrid search degrades to BM25."""
+    try:
+        return index.vectors.sync(progress=lambda done, total: print(
+            f"\r   embedded {done}/{total}", end="\n" if done == total else "", file=sys.stderr, flush=True))
+    except Exception as e:
+        print(f"vector sync failed: {e} (keyword results only)", file=sys.stderr)
+        return {}
+
+
+def serve(index: MemoryIndex, port: int = PORT, interval: float = REFRESH_INTERVAL):
+    """Refresh in the background and answer queries until interrupted."""
+    print(f"Indexed: {index.refresh()}")
+
+    def watch():
+        while True:
+            if index.vectors is not None:
+                sync_vectors(index)
+            time.sleep(interval)
+            try:
+                index.refresh()
+            except Exception as e:  # keep serving the last good index
+                print(f"refresh failed: {e}", file=sys.stderr)
+
+    threading.Thread(target=watch, daemon=True).start()
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(index))
+    print(f"🔎 memory index serving on http://127.0.0.1:{port} (refresh every {interval:g}s)")
     try:
-        content = filepath.read_text(encoding='utf-8')
-    except:
-        return chunks
-    
-    lines = content.split('\n')
-    current_chunk = []
-    chunk_start = 1
-    
-    for i, line in enumerate(lines, 1):
-        # New section on ## headers or empty line after content
-        if line.startswith('## ') or (not line.strip() and current_chunk):
-            if current_chunk:
-                text = '\n'.join(current_chunk)
-                if text.strip():
-                    # Extract date references
-                    date_refs = re.findall(r'\d{4}-\d{2}-\d{2}', text)
-                    date_ref = date_refs[0] if date_refs else ''
-                    chunks.append({
-                        'path': str(filepath),
-                        'line_start': chunk_start,
-                        'line_end': i - 1,
-                        'content': text,
-                        'date_ref': date_ref
-                    })
-            current_chunk = [line] if line.strip() else []
-            chunk_start = i
-        else:
-            current_chunk.append(line)
-    
-    # Last chunk
-    if current_chunk:
-        text = '\n'.join(current_chunk)
-        if text.strip():
-            date_refs = re.findall(r'\d{4}-\d{2}-\d{2}', text)
-            date_ref = date_refs[0] if date_refs else ''
-            chunks.append({
-                'path': str(filepath),
-                'line_start': chunk_start,
-                'line_end': len(lines),
-                'content': text,
-                'date_ref': date_ref
-            })
-    
-    return chunks
-
-def index_files(conn):
-    """Index all memory files"""
-    c = conn.cursor()
-    
-    # Files to index
-    files_to_index = list(MEMORY_DIR.glob('*.md'))
-    files_to_index.append(WORKSPACE / 'MEMORY.md')
-    
-    indexed = 0
-    for filepath in files_to_index:
-        if not filepath.exists():
-            continue
-            
-        mtime = filepath.stat().st_mtime
-        
-        # Check if already indexed and up to date
-        c.execute('SELECT mtime FROM index_meta WHERE path = ?', (str(filepath),))
-        row = c.fetchone()
-        if row and row[0] >= mtime:
-            continue
-        
-        # Remove old entries
-        c.execute('DELETE FROM memory_fts WHERE path = ?', (str(filepath),))
-        
-        # Index chunks
-        chunks = chunk_file(filepath)
-        for chunk in chunks:
-            c.execute('''
-                INSERT INTO memory_fts (path, line_start, line_end, content, date_ref)
-                VALUES (?, ?, ?, ?, ?)
-            ''', (chunk['path'], chunk['line_start'], chunk['line_end'], 
-                  chunk['content'], chunk['date_ref']))
-        
-        # Update metadata
-        c.execute('''
-            INSERT OR REPLACE INTO index_meta (path, mtime, indexed_at)
-            VALUES (?, ?, ?)
-        ''', (str(filepath), mtime, datetime.now().isoformat()))
-        
-        indexed += 1
-        print(f"Indexed: {filepath.name} ({len(chunks)} chunks)")
-    
-    conn.commit()
-    print(f"\nTotal files indexed: {indexed}")
-
-def search(conn, query: str, max_results: int = 10):
-    """Search memory with FTS5"""
-    c = conn.cursor()
-    
-    # FTS5 search with BM25 ranking
-    c.execute('''
-        SELECT path, line_start, line_end, snippet(memory_fts, 3, '>>>', '<<<', '...', 64),
-               bm25(memory_fts) as score
-        FROM memory_fts
-        WHERE memory_fts MATCH ?
-        ORDER BY score
-        LIMIT ?
-    ''', (query, max_results))
-    
-    results = []
-    for row in c.fetchall():
-        results.append({
-            'path': row[0],
-            'lines': f"{row[1]}-{row[2]}",
-            'snippet': row[3],
-            'score': -row[4]  # BM25 returns negative scores
-        })
-    
-    return results
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
 
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: memory-index.py [index|search] [query]")
-        sys.exit(1)
-    
-    action = sys.argv[1]
-    conn = init_db()
-    
-    if action == 'index':
-        index_files(conn)
-    elif action == 'search':
-        if len(sys.argv) < 3:
-            print("Usage: memory-index.py search <query>")
-            sys.exit(1)
-        
-        query = ' '.join(sys.argv[2:])
-        
-        # Auto-index before search
-        index_files(conn)
-        
-        results = search(conn, query)
-        
-        if not results:
-            print(f"No results for: {query}")
-        else:
-            print(f"\n=== Results for: {query} ===\n")
-            for i, r in enumerate(results, 1):
-                print(f"{i}. {Path(r['path']).name} (lines {r['lines']}) [score: {r['score']:.2f}]")
-                print(f"   {r['snippet']}")
-                print()
-        
-        # Output JSON for programmatic use
-        print("\n--- JSON ---")
-        print(json.dumps(results, indent=2))
-    
-    conn.close()
-
-if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Local memory search (SQLite FTS5)")
+    sub = parser.add_subparsers(dest="action", required=True)
+    p_index = sub.add_parser("index", help="Update the index")
+    p_index.add_argument("--full", action="store_true", help="Re-chunk every file")
+    p_search = sub.add_parser("search", help="Search the index")
+    p_search.add_argument("query", nargs="+")
+    p_search.add_argument("--limit", type=int, default=10)
+    p_search.add_argument("--format", choices=["both", "text", "json"], default="both",
+                          help="Output: readable results, JSON, or both (default)")
+    p_search.add_argument("--hybrid", action="store_true",
+                          help="Fuse BM25 with similarity to the chunks embedded so far")
+    sub.add_parser("embed", help="Update the index and embed new / changed chunks")
+    p_serve = sub.add_parser("serve", help="Run the resident search daemon")
+    p_serve.add_argument("--port", type=int, default=PORT)
+    p_serve.add_argument("--interval", type=float, default=REFRESH_INTERVAL, help="Refresh period (s)")
+    p_serve.add_argument("--hybrid", action="store_true", help="Keep chunk embeddings up to date too")
+    sub.add_parser("stats", help="Index statistics")
+    args = parser.parse_args()
+
+    embedder = None
+    if args.action == "embed" or getattr(args, "hybrid", False):
+        from memory_vectors import OllamaEmbedder
+        embedder = OllamaEmbedder()
+    index = MemoryIndex(embedder=embedder)
+    try:
+        if args.action == "index":
+            start = time.perf_counter()
+            result = index.refresh(full=args.full)
+            print(f"Total files indexed: {result['changed']} changed, {result['removed']} removed, "
+                  f"{result['chunks']} chunks ({result['files']} files, "
+                  f"{(time.perf_counter() - start) * 1000:.1f} ms)")
+        elif args.action == "search":
+            query = " ".join(args.query)
+            index.refresh()  # Auto-index before search (embedding is left to `embed` / `serve --hybrid`)
+            results = index.search(query, args.limit, hybrid=args.hybrid)
+            if args.format == "json":
+                print(json.dumps(results, indent=2))
+            elif args.format == "text":
+                print(format_results(query, results))
+            else:
+                print(format_results(query, results))
+                # Output JSON for programmatic use
+                print("\n--- JSON ---")
+                print(json.dumps(results, indent=2))
+        elif args.action == "embed":
+            print(f"Indexed: {index.refresh()}")
+            start = time.perf_counter()
+            result = sync_vectors(index)
+            print(f"Embedded: {result} ({time.perf_counter() - start:.1f} s)")
+        elif args.action == "serve":
+            serve(index, args.port, args.interval)
+        elif args.action == "stats":
+            print(json.dumps(index.stats(), indent=2))
+    finally:
+        index.close()
+
+
+if __name__ == "__main__":
     main()
@@ -1,8 +1,10 @@
 #!/bin/bash
 # Local memory search - NO API KEYS NEEDED
-# Uses grep + fuzzy matching for semantic-ish search
+# Uses the FTS index (memory-index.py: daemon if running, else CLI);
+# falls back to grep + fuzzy matching over <memory_dir>
 
-MEMORY_DIR="${1:-/Users/mattia/Projects/Onde/memory}"
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+MEMORY_DIR="${1:-$(dirname "$SCRIPT_DIR")/memory}"
 QUERY="$2"
 MAX_RESULTS="${3:-10}"
 
@@ -11,6 +13,19 @@ if [ -z "$QUERY" ]; then
     exit 1
 fi
 
+# MEMORY_SEARCH_HYBRID=1 also ranks by embedding similarity (daemon started with --hybrid)
+INDEX_PORT="${MEMORY_INDEX_PORT:-8791}"
+HYBRID="${MEMORY_SEARCH_HYBRID:-0}"
+HYBRID_FLAG=""
+[ "$HYBRID" = "1" ] && HYBRID_FLAG="--hybrid"
+if curl -sf --max-time 1 --get "http://127.0.0.1:$INDEX_PORT/search" --data-urlencode "q=$QUERY" \
+        --data "limit=$MAX_RESULTS" --data "format=text" --data "hybrid=$HYBRID" 2>/dev/null; then
+    exit 0
+fi
+if python3 "$SCRIPT_DIR/memory-index.py" search "$QUERY" --limit "$MAX_RESULTS" --format text $HYBRID_FLAG 2>/dev/null; then
+    exit 0
+fi
+
 # Split query into words for multi-term search
 IFS=' ' read -ra WORDS <<< "$QUERY"
 
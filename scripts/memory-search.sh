@@ -8,7 +8,10 @@
 #   ./memory-search.sh "trading" 10
 #   ./memory-search.sh "polymarket" 5
 #
-# Searches: MEMORY.md, memory/*.md, daily notes
+# Searches: MEMORY.md, memory/, docs/, books/ and the *.md task files through
+# the FTS index (memory-index.py). With `memory-index.py serve` running the
+# answer comes from the resident daemon in milliseconds; otherwise the index
+# CLI is used, and grep over memory/*.md is the last resort.
 
 set -e
 
@@ -40,6 +43,20 @@ echo -e "${BLUE}  🔍 MEMORY SEARCH: \"$QUERY\"${NC}"
 echo -e "${BLUE}━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━${NC}"
 echo ""
 
+# Fast path: resident index daemon, then the index CLI
+# MEMORY_SEARCH_HYBRID=1 also ranks by embedding similarity (daemon started with --hybrid)
+INDEX_PORT="${MEMORY_INDEX_PORT:-8791}"
+HYBRID="${MEMORY_SEARCH_HYBRID:-0}"
+HYBRID_FLAG=""
+[ "$HYBRID" = "1" ] && HYBRID_FLAG="--hybrid"
+if curl -sf --max-time 1 --get "http://127.0.0.1:$INDEX_PORT/search" --data-urlencode "q=$QUERY" \
+        --data "limit=$MAX_RESULTS" --data "format=text" --data "hybrid=$HYBRID" 2>/dev/null; then
+    exit 0
+fi
+if python3 "$SCRIPT_DIR/memory-index.py" search "$QUERY" --limit "$MAX_RESULTS" --format text $HYBRID_FLAG 2>/dev/null; then
+    exit 0
+fi
+
 RESULT_COUNT=0
 
 # Search function with context
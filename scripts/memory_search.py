@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+Memory Search Index
+Incremental SQLite FTS5 index over the workspace notes: memory/, docs/,
+books/ and the top-level *.md task files (TASKS.md, MEMORY.md, ...).
+Library behind scripts/memory-index.py and the memory-search*.sh wrappers.
+
+refresh() stats every file under the configured globs and only touches
+what changed: removed files are dropped, new / modified files are
+re-chunked (across a process pool when many files changed) and written
+with executemany inside one transaction on a WAL-mode database. Each
+refresh that changes something bumps a generation number; search()
+keeps an in-memory LRU of recent results that is only valid for the
+generation it was computed at.
+
+Chunks live in `chunks` (stable integer id, path, lines, date, content
+hash) and the FTS5 table `memory_fts` shares the same rowid. Given an
+embedder, the index also keeps chunk embeddings (memory_vectors.py) and
+search(hybrid=True) fuses BM25 with cosine similarity by reciprocal rank.
+
+Usage:
+    from memory_search import MemoryIndex
+
+    index = MemoryIndex()                      # data/memory-search.db
+    index.refresh()                            # {"files": .., "changed": .., "removed": .., "chunks": ..}
+    index.search("kalshi stop loss", limit=5)  # [{"path", "lines", "snippet", "score"}, ...]
+
+    index = MemoryIndex(embedder=OllamaEmbedder())   # see memory_vectors.py
+    index.vectors.sync()
+    index.search("what did we decide about sizing", hybrid=True)
+
+    python3 scripts/memory-index.py serve      # resident daemon for the shell wrappers
+
+Config (env):
+    ONDE_ROOT            workspace root (default: the repo containing scripts/)
+    MEMORY_INDEX_DB      database path (default $ONDE_ROOT/data/memory-search.db)
+    MEMORY_INDEX_GLOBS   comma-separated globs relative to the root
+                         (default memory/**/*.md,docs/**/*.md,books/**/*.md,*.md)
+"""
+
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).parent
+WORKSPACE = Path(os.environ.get("ONDE_ROOT", SCRIPT_DIR.parent))
+DEFAULT_DB = Path(os.environ.get("MEMORY_INDEX_DB", WORKSPACE / "data" / "memory-search.db"))
+DEFAULT_GLOBS = tuple(g.strip() for g in os.environ.get(
+    "MEMORY_INDEX_GLOBS", "memory/**/*.md,docs/**/*.md,books/**/*.md,*.md").split(",") if g.strip())
+
+SCHEMA_VERSION = 2
+PARALLEL_MIN_FILES = 64   # below this, forking workers costs more than it saves
+CACHE_SIZE = 256
+HYBRID_DEPTH = 50         # candidates taken from each ranking before fusion
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS chunks (
+    id          INTEGER PRIMARY KEY,
+    path        TEXT,
+    line_start  INTEGER,
+    line_end    INTEGER,
+    date_ref    TEXT,
+    hash        TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_chunks_path ON chunks(path);
+CREATE VIRTUAL TABLE IF NOT EXISTS memory_fts USING fts5(
+    path,
+    line_start,
+    line_end,
+    content,
+    date_ref,
+    tokenize='porter unicode61'
+);
+CREATE TABLE IF NOT EXISTS index_meta (
+    path        TEXT PRIMARY KEY,
+    mtime       REAL,
+    size        INTEGER,
+    indexed_at  TEXT
+);
+CREATE TABLE IF NOT EXISTS index_state (
+    key    TEXT PRIMARY KEY,
+    value  INTEGER
+);
+"""
+
+_BLOCK = re.compile(r"[^\n]*\S[^\n]*(?:\n[^\n]*\S[^\n]*)*")  # run of non-blank lines
+_SECTION = re.compile(r"\n(?=## )")
+_DATE = re.compile(r"\d{4}-\d{2}-\d{2}")
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+def chunk_text(text: str, path: str = "") -> list:
+    """
+    Split a note into chunks: runs of non-blank lines, further split before
+    `## ` headers. Returns (path, line_start, line_end, content, date_ref)
+    tuples with 1-based inclusive line numbers.
+    """
+    chunks = []
+    line, pos = 1, 0
+    for block in _BLOCK.finditer(text):
+        line += text.count("\n", pos, block.start())
+        pos = block.start()
+        start = line
+        for part in _SECTION.split(block.group()):
+            end = start + part.count("\n")
+            date = _DATE.search(part)
+            chunks.append((path, start, end, part, date.group() if date else ""))
+            start = end + 1
+    return chunks
+
+
+def chunk_file(path: str) -> list:
+    try:
+        return chunk_text(Path(path).read_text(encoding="utf-8"), path)
+    except (OSError, UnicodeDecodeError):
+        return []
+
+
+def content_hash(content: str) -> str:
+    return hashlib.sha1(content.encode("utf-8")).hexdigest()
+
+
+def fts_query(query: str) -> str:
+    """Quote each word so punctuation in free text can't break FTS5 syntax."""
+    return " ".join(f'"{t}"' for t in _TOKEN.findall(query))
+
+
+class MemoryIndex:
+    """Thread-safe; one connection shared under a lock (the daemon serves from threads)."""
+
+    def __init__(self, db_path: Path = DEFAULT_DB, root: Path = WORKSPACE, globs=DEFAULT_GLOBS,
+                 cache_size: int = CACHE_SIZE, workers: int = None, embedder=None):
+        self.db_path = Path(db_path)
+        self.root = Path(root)
+        self.globs = tuple(globs)
+        self.cache_size = cache_size
+        self.workers = workers or os.cpu_count() or 1
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self._cache = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False,
+                                     isolation_level=None, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        if self._conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            # v1 kept chunks only in memory_fts with no stable ids: rebuild from scratch
+            self._conn.executescript("DROP TABLE IF EXISTS memory_fts; DROP TABLE IF EXISTS index_meta; "
+                                     "DROP TABLE IF EXISTS chunks; DROP TABLE IF EXISTS index_state;")
+            self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self._conn.executescript(SCHEMA)
+        self.vectors = None
+        if embedder is not None:
+            # Imported here so keyword-only use never loads numpy / the LLM client
+            from memory_vectors import VectorStore
+            self.vectors = VectorStore(self, embedder)
+
+    # ------------------------------------------------------------------ indexing
+
+    def files(self) -> dict:
+        """Indexable files under the roots: {path: (mtime, size)}."""
+        found = {}
+        for pattern in self.globs:
+            for path in self.root.glob(pattern):
+                if path.is_file():
+                    st = path.stat()
+                    found[str(path)] = (st.st_mtime, st.st_size)
+        return found
+
+    @property
+    def generation(self) -> int:
+        row = self._conn.execute("SELECT value FROM index_state WHERE key = 'gen'").fetchone()
+        return row[0] if row else 0
+
+    def _bump_generation(self):
+        self._conn.execute(
+            "INSERT INTO index_state (key, value) VALUES ('gen', 1) "
+            "ON CONFLICT (key) DO UPDATE SET value = value + 1")
+        self._cache.clear()
+
+    def _chunk_all(self, paths: list) -> list:
+        if len(paths) >= PARALLEL_MIN_FILES and self.workers > 1:
+            with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                return list(pool.map(chunk_file, paths, chunksize=max(1, len(paths) // (self.workers * 4))))
+        return [chunk_file(p) for p in paths]
+
+    def refresh(self, full: bool = False) -> dict:
+        """Bring the index up to date with the files on disk (full=True re-chunks everything)."""
+        with self._lock:
+            current = self.files()
+            known = {p: (m, s) for p, m, s in self._conn.execute("SELECT path, mtime, size FROM index_meta")}
+            removed = [p for p in known if p not in current]
+            changed = [p for p, meta in current.items() if full or known.get(p) != meta]
+            if not removed and not changed:
+                return {"files": len(current), "changed": 0, "removed": 0, "chunks": 0,
+                        "generation": self.generation}
+
+            chunked = self._chunk_all(changed)
+            now = datetime.now().isoformat()
+            stale = [(p,) for p in removed + changed]
+            n_chunks = 0
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(
+                    "DELETE FROM memory_fts WHERE rowid IN (SELECT id FROM chunks WHERE path = ?)", stale)
+                self._conn.executemany("DELETE FROM chunks WHERE path = ?", stale)
+                self._conn.executemany("DELETE FROM index_meta WHERE path = ?", stale)
+                next_id = self._conn.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM chunks").fetchone()[0]
+                for path, chunks in zip(changed, chunked):
+                    ids = range(next_id, next_id + len(chunks))
+                    next_id += len(chunks)
+                    n_chunks += len(chunks)
+                    self._conn.executemany(
+                        "INSERT INTO chunks (id, path, line_start, line_end, date_ref, hash) VALUES (?, ?, ?, ?, ?, ?)",
+                        [(i, c[0], c[1], c[2], c[4], content_hash(c[3])) for i, c in zip(ids, chunks)])
+                    self._conn.executemany(
+                        "INSERT INTO memory_fts (rowid, path, line_start, line_end, content, date_ref) "
+                        "VALUES (?, ?, ?, ?, ?, ?)", [(i, *c) for i, c in zip(ids, chunks)])
+                self._conn.executemany(
+                    "INSERT INTO index_meta (path, mtime, size, indexed_at) VALUES (?, ?, ?, ?)",
+                    [(p, *current[p], now) for p in changed])
+                self._bump_generation()
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            return {"files": len(current), "changed": len(changed), "removed": len(removed),
+                    "chunks": n_chunks, "generation": self.generation}
+
+    # ------------------------------------------------------------------ search
+
+    def _bm25(self, query: str, limit: int) -> list:
+        sql = """
+            SELECT rowid, path, line_start, line_end, snippet(memory_fts, 3, '>>>', '<<<', '...', 64),
+                   bm25(memory_fts) AS score
+            FROM memory_fts WHERE memory_fts MATCH ? ORDER BY score LIMIT ?
+        """
+        try:
+            rows = self._conn.execute(sql, (query, limit)).fetchall()
+        except sqlite3.OperationalError:
+            quoted = fts_query(query)
+            rows = self._conn.execute(sql, (quoted, limit)).fetchall() if quoted else []
+        return [{"id": r[0], "path": r[1], "lines": f"{r[2]}-{r[3]}", "snippet": r[4], "score": -r[5]}
+                for r in rows]
+
+    def _hybrid(self, query: str, limit: int, query_vector) -> list:
+        from memory_vectors import reciprocal_rank_fusion
+        depth = max(limit, HYBRID_DEPTH)
+        lexical = self._bm25(query, depth)
+        dense = self.vectors.nearest(query_vector, depth)
+        fused = reciprocal_rank_fusion([[r["id"] for r in lexical], [i for i, _ in dense]])
+        top = sorted(fused, key=fused.get, reverse=True)[:limit]
+        found = {r["id"]: r for r in lexical}
+        missing = [i for i in top if i not in found]
+        if missing:
+            # Semantic-only hits have no FTS snippet: show the start of the chunk
+            rows = self._conn.execute(
+                f"SELECT rowid, path, line_start, line_end, substr(content, 1, 200) FROM memory_fts "
+                f"WHERE rowid IN ({','.join('?' * len(missing))})", missing).fetchall()
+            for r in rows:
+                found[r[0]] = {"id": r[0], "path": r[1], "lines": f"{r[2]}-{r[3]}", "snippet": r[4]}
+        return [{**found[i], "score": fused[i]} for i in top if i in found]
+
+    def search(self, query: str, limit: int = 10, hybrid: bool = False) -> list:
+        """
+        BM25 search, or BM25 fused with embedding similarity when hybrid=True
+        and the index has an embedder. Repeated queries are served from the
+        LRU until the index changes.
+        """
+        hybrid = hybrid and self.vectors is not None
+        key = (query, limit, hybrid)
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None and cached[0] == self.generation:
+                self._cache.move_to_end(key)
+                self.cache_hits += 1
+                return cached[1]
+            self.cache_misses += 1
+
+        query_vector = None
+        if hybrid:
+            try:
+                query_vector = self.vectors.embed_query(query)  # network call: outside the lock
+            except Exception:  # embedding backend down: keyword results, not cached
+                pass
+
+        with self._lock:
+            gen = self.generation
+            if query_vector is None:
+                results = self._bm25(query, limit)
+                if hybrid:
+                    return results
+            else:
+                results = self._hybrid(query, limit, query_vector)
+            self._cache[key] = (gen, results)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+            return results
+
+    def stats(self) -> dict:
+        with self._lock:
+            files, chunks = self._conn.execute(
+                "SELECT (SELECT COUNT(*) FROM index_meta), (SELECT COUNT(*) FROM chunks)").fetchone()
+            stats = {"files": files, "chunks": chunks, "generation": self.generation,
+                     "cache_entries": len(self._cache), "cache_hits": self.cache_hits,
+                     "cache_misses": self.cache_misses, "db": str(self.db_path)}
+            if self.vectors is not None:
+                stats["vectors"] = self.vectors.stats()
+            return stats
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
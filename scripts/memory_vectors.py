@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Memory Vector Index
+Optional dense side of the memory search index (memory_search.py): one
+embedding per chunk, computed by a local Ollama embedding model, so
+queries that paraphrase a note still find it when BM25 has no keyword
+overlap to work with.
+
+Vectors are L2-normalised and stored as a float16 matrix in a
+memory-mapped file next to the database (<db>.vec). `chunk_vectors` maps
+chunk content hashes to matrix rows, so sync() only embeds text it has
+not seen: editing one paragraph of a note re-embeds that paragraph, and
+the rows of chunks that disappeared are reused. sync() holds an exclusive
+lock on <db>.vec.lock for its whole run, so an `embed` run and a
+`serve --hybrid` daemon never hand out the same free row. Queries run brute-force
+cosine similarity with NumPy (~1 ms for a few thousand chunks);
+MemoryIndex.search(hybrid=True) fuses that ranking with BM25 by
+reciprocal rank.
+
+Usage:
+    from memory_search import MemoryIndex
+    from memory_vectors import OllamaEmbedder
+
+    index = MemoryIndex(embedder=OllamaEmbedder())
+    index.refresh()
+    index.vectors.sync()     # {"embedded": .., "freed": .., "vectors": ..}
+    index.search("how did we size bets after the drawdown", hybrid=True)
+
+    python3 scripts/memory-index.py embed
+    python3 scripts/memory-index.py search "..." --hybrid
+
+Config (env):
+    MEMORY_EMBED_MODEL   Ollama embedding model (default nomic-embed-text)
+    MEMORY_EMBED_BATCH   chunks per embedding request (default 32)
+"""
+
+import fcntl
+import os
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent))
+from llm_client import get_client  # noqa: E402
+
+EMBED_MODEL = os.environ.get("MEMORY_EMBED_MODEL", "nomic-embed-text")
+EMBED_BATCH = int(os.environ.get("MEMORY_EMBED_BATCH", "32"))
+EMBED_MAX_CHARS = 2000  # keeps long chunks inside the embedding model's context
+RRF_K = 60
+MIN_ROWS = 1024
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS chunk_vectors (
+    hash  TEXT PRIMARY KEY,
+    row   INTEGER UNIQUE
+);
+CREATE TABLE IF NOT EXISTS vector_meta (
+    key    TEXT PRIMARY KEY,
+    value  TEXT
+);
+"""
+
+
+def normalize(vectors) -> np.ndarray:
+    """Rows scaled to unit length (cosine similarity becomes a dot product)."""
+    m = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+    norms = np.linalg.norm(m, axis=1, keepdims=True)
+    return m / np.where(norms > 0, norms, 1)
+
+
+def reciprocal_rank_fusion(rankings: List[list], k: int = RRF_K) -> Dict:
+    """{id: sum over rankings of 1 / (k + rank)}, ranks starting at 1."""
+    scores = {}
+    for ranking in rankings:
+        for rank, item in enumerate(ranking, 1):
+            scores[item] = scores.get(item, 0.0) + 1.0 / (k + rank)
+    return scores
+
+
+class OllamaEmbedder:
+    """texts -> (n, dim) float32 array, over the resident llm_client session."""
+
+    def __init__(self, model: str = EMBED_MODEL, client=None, batch_size: int = EMBED_BATCH):
+        self.model = model
+        self.client = client or get_client()
+        self.batch_size = batch_size
+
+    def __call__(self, texts: List[str]) -> np.ndarray:
+        out = []
+        for i in range(0, len(texts), self.batch_size):
+            batch = [t[:EMBED_MAX_CHARS] for t in texts[i:i + self.batch_size]]
+            out.extend(self.client.embed(batch, model=self.model))
+        return np.asarray(out, dtype=np.float32)
+
+
+class VectorStore:
+    """
+    Embeddings for the chunks of a MemoryIndex. Shares the index's
+    connection and lock; the embedding calls themselves run outside the
+    lock so the daemon keeps answering while sync() works through a batch.
+    Writers (sync, a model reset) also take the <db>.vec.lock file lock;
+    readers never wait on it.
+    """
+
+    def __init__(self, index, embed: Callable[[List[str]], np.ndarray], path: Optional[Path] = None):
+        self.index = index
+        self.embed = embed
+        self.model = getattr(embed, "model", type(embed).__name__)
+        self.batch_size = getattr(embed, "batch_size", EMBED_BATCH)
+        self.path = Path(path) if path else index.db_path.with_suffix(".vec")
+        self._mat = None
+        self._dense = None  # (generation, chunk ids, float32 matrix) used by nearest()
+        with index._lock:
+            index._conn.executescript(SCHEMA)
+            model = index._conn.execute("SELECT value FROM vector_meta WHERE key = 'model'").fetchone()
+        if model is None or model[0] != self.model:
+            with self._exclusive(), index._lock:
+                self._load_dim(reset=True)
+        with index._lock:
+            self.dim = self._load_dim()
+
+    @contextmanager
+    def _exclusive(self):
+        """Cross-process lock for writers of the matrix file and its row mapping."""
+        with open(self.path.with_name(self.path.name + ".lock"), "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _load_dim(self, reset: bool = False) -> int:
+        meta = dict(self.index._conn.execute("SELECT key, value FROM vector_meta"))
+        if reset and meta.get("model") != self.model:
+            self._reset()
+            meta = {}
+        return int(meta.get("dim", 0))
+
+    def _reset(self):
+        # Another model's vectors live in another space: start over
+        conn = self.index._conn
+        conn.execute("DELETE FROM chunk_vectors")
+        conn.execute("DELETE FROM vector_meta")
+        conn.execute("INSERT INTO vector_meta (key, value) VALUES ('model', ?)", (self.model,))
+        self._mat = None
+        self.path.unlink(missing_ok=True)
+
+    def _map(self, rows: int = 0):
+        """The float16 matrix, grown (doubling) to hold at least `rows` rows."""
+        row_bytes = self.dim * 2
+        capacity = self.path.stat().st_size // row_bytes if self.path.exists() else 0
+        if rows > capacity:
+            capacity = max(rows, 2 * capacity, MIN_ROWS)
+            self._mat = None
+            with open(self.path, "ab") as f:
+                f.truncate(capacity * row_bytes)
+        if capacity and (self._mat is None or self._mat.shape[0] != capacity):
+            self._mat = np.memmap(self.path, dtype=np.float16, mode="r+", shape=(capacity, self.dim))
+        return self._mat
+
+    def _allocate(self, n: int) -> List[int]:
+        used = {r for (r,) in self.index._conn.execute("SELECT row FROM chunk_vectors")}
+        high = max(used) + 1 if used else 0
+        free = [r for r in range(high) if r not in used][:n]
+        return free + list(range(high, high + n - len(free)))
+
+    def sync(self, progress: Optional[Callable[[int, int], None]] = None) -> dict:
+        """Embed chunks whose text has no vector yet; release vectors of chunks that are gone."""
+        with self._exclusive():
+            return self._sync(progress)
+
+    def _sync(self, progress) -> dict:
+        conn = self.index._conn
+        with self.index._lock:
+            self.dim = self._load_dim()  # another process may have set it
+            freed = conn.execute("DELETE FROM chunk_vectors WHERE hash NOT IN (SELECT hash FROM chunks)").rowcount
+            pending = conn.execute(
+                "SELECT c.hash, MIN(f.content) FROM chunks c JOIN memory_fts f ON f.rowid = c.id "
+                "WHERE c.hash NOT IN (SELECT hash FROM chunk_vectors) GROUP BY c.hash").fetchall()
+
+        done = 0
+        for i in range(0, len(pending), self.batch_size):
+            batch = pending[i:i + self.batch_size]
+            vectors = normalize(self.embed([content for _, content in batch]))
+            with self.index._lock:
+                if not self.dim:
+                    self.dim = vectors.shape[1]
+                    conn.execute("INSERT INTO vector_meta (key, value) VALUES ('dim', ?)", (str(self.dim),))
+                elif vectors.shape[1] != self.dim:
+                    raise ValueError(f"{self.model} returned {vectors.shape[1]}-d vectors, index has {self.dim}")
+                rows = self._allocate(len(batch))
+                mat = self._map(max(rows) + 1)
+                mat[rows] = vectors.astype(np.float16)
+                mat.flush()  # vectors reach the file before the rows are published
+                conn.executemany("INSERT INTO chunk_vectors (hash, row) VALUES (?, ?)",
+                                 [(h, r) for (h, _), r in zip(batch, rows)])
+            done += len(batch)
+            if progress:
+                progress(done, len(pending))
+
+        if done or freed:
+            with self.index._lock:
+                self.index._bump_generation()
+        return {"embedded": done, "freed": freed, "vectors": self.count()}
+
+    def embed_query(self, query: str) -> np.ndarray:
+        return normalize(self.embed([query]))[0]
+
+    def nearest(self, query_vector: np.ndarray, k: int = 10) -> List[Tuple[int, float]]:
+        """(chunk id, cosine) of the k chunks most similar to a normalised query vector."""
+        with self.index._lock:
+            gen = self.index.generation
+            if self._dense is None or self._dense[0] != gen:
+                pairs = self.index._conn.execute(
+                    "SELECT c.id, v.row FROM chunks c JOIN chunk_vectors v ON v.hash = c.hash").fetchall()
+                ids = np.array([p[0] for p in pairs], dtype=np.int64)
+                if pairs:
+                    matrix = np.asarray(self._map()[[p[1] for p in pairs]], dtype=np.float32)
+                else:
+                    matrix = np.zeros((0, self.dim), dtype=np.float32)
+                self._dense = (gen, ids, matrix)
+            _, ids, matrix = self._dense
+        if not len(ids):
+            return []
+        sims = matrix @ query_vector
+        k = min(k, len(sims))
+        top = np.argpartition(-sims, k - 1)[:k]
+        top = top[np.argsort(-sims[top], kind="stable")]
+        return [(int(ids[i]), float(sims[i])) for i in top]
+
+    def count(self) -> int:
+        with self.index._lock:
+            return self.index._conn.execute("SELECT COUNT(*) FROM chunk_vectors").fetchone()[0]
+
+    def stats(self) -> dict:
+        return {"model": self.model, "dim": self.dim, "vectors": self.count(),
+                "file_mb": round(self.path.stat().st_size / 1e6, 2) if self.path.exists() else 0.0}
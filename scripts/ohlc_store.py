@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+"""
+OHLC Store
+Local append-only candle store shared by the traders and the crypto cron
+jobs, plus a fetcher that only downloads the ranges the store is missing.
+
+Layout: one flat binary file per asset and resolution
+(data/ohlc/store/btc-1h.f64, btc-4h.f64, ...), each a sequence of
+fixed-size float64 records [open_ts_sec, open, high, low, close] in
+ascending time order. New candles are appended under a file lock; candles
+older than the tail (head backfill, holes) are merged in with an atomic
+rewrite. Reads memory-map the file and return zero-copy array slices found
+by binary search on the timestamp column.
+
+Only closed candles are stored. Missing ranges at the head (older
+history), the tail (newer candles) and holes in between (a short Binance
+page, the sparse CoinGecko fallback) are filled from the finer resolution
+already on disk when possible (4h from 1h), then from Binance klines, then
+CoinGecko. Holes no source can fill are remembered and not re-requested.
+
+Usage:
+    from ohlc_store import OHLCStore, OHLCFetcher
+
+    store = OHLCStore()                                  # data/ohlc/store
+    fetcher = OHLCFetcher(store)
+    candles = fetcher.load("btc", "4h", start=time.time() - 7 * 86400)
+    candles[:, 4]                                        # closes (memmap view)
+    store.read("eth", "1h", start, end)                  # no network
+"""
+
+import fcntl
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+import http_pool
+
+PROJECT_ROOT = Path(__file__).parent.parent
+DEFAULT_ROOT = PROJECT_ROOT / "data" / "ohlc" / "store"
+
+RESOLUTIONS = {"1h": 3600, "4h": 4 * 3600}
+FIELDS = 5  # ts, open, high, low, close
+RECORD_BYTES = FIELDS * 8
+
+BINANCE_KLINES = "https://api.binance.com/api/v3/klines"
+BINANCE_LIMIT = 1000
+COINGECKO_OHLC = "https://api.coingecko.com/api/v3/coins/{coin}/ohlc?vs_currency=usd&days={days}"
+COINGECKO_IDS = {"btc": "bitcoin", "eth": "ethereum", "sol": "solana"}
+ASSET_FOR_COIN = {coin: asset for asset, coin in COINGECKO_IDS.items()}
+COINGECKO_4H_DAYS = (7, 14, 30)  # CoinGecko serves 4h candles for 3-30 day windows
+
+
+def _empty() -> np.ndarray:
+    return np.zeros((0, FIELDS), dtype=np.float64)
+
+
+def _as_candles(rows) -> np.ndarray:
+    """[[ts, o, h, l, c], ...] (ts in s or ms) -> sorted, de-duplicated (n, 5) float64 array."""
+    arr = np.asarray(rows, dtype=np.float64).reshape(-1, FIELDS) if len(rows) else _empty()
+    if not len(arr):
+        return arr
+    arr = arr.copy()
+    ms = arr[:, 0] > 1e11
+    arr[ms, 0] /= 1000.0
+    arr = arr[arr[:, 4] > 0]
+    _, keep = np.unique(arr[::-1, 0], return_index=True)  # last occurrence of each ts wins
+    return arr[::-1][keep]
+
+
+def as_rows(candles: np.ndarray) -> list:
+    """Store candles -> [[ts_ms, o, h, l, c], ...] (the CoinGecko /ohlc layout)."""
+    return [[ts * 1000, o, h, l, c] for ts, o, h, l, c in candles.tolist()]
+
+
+def resample(candles: np.ndarray, src_sec: int, dst_sec: int) -> np.ndarray:
+    """Aggregate finer candles into complete coarser ones (e.g. 1h -> 4h)."""
+    if not len(candles) or dst_sec % src_sec:
+        return _empty()
+    per = dst_sec // src_sec
+    bucket = np.floor(candles[:, 0] / dst_sec).astype(np.int64)
+    starts = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+    counts = np.diff(np.r_[starts, len(candles)])
+    full = counts == per
+    if not full.any():
+        return _empty()
+    # Complete buckets are `per` consecutive rows, so gather them as (k, per) blocks
+    rows = starts[full][:, None] + np.arange(per)
+    block = candles[rows]
+    out = np.empty((len(rows), FIELDS))
+    out[:, 0] = bucket[rows[:, 0]] * dst_sec
+    out[:, 1] = block[:, 0, 1]
+    out[:, 2] = block[:, :, 2].max(axis=1)
+    out[:, 3] = block[:, :, 3].min(axis=1)
+    out[:, 4] = block[:, -1, 4]
+    return out
+
+
+class OHLCStore:
+    """Per-asset, per-resolution append-only float64 candle files."""
+
+    def __init__(self, root: Path = None):
+        self.root = Path(root) if root else DEFAULT_ROOT
+        self._maps = {}  # path -> (size, (n, 5) memmap view, inode)
+        self._lock = threading.Lock()
+
+    def path(self, asset: str, res: str) -> Path:
+        if res not in RESOLUTIONS:
+            raise ValueError(f"unknown resolution {res!r}")
+        return self.root / f"{asset.lower()}-{res}.f64"
+
+    def _map(self, path: Path) -> np.ndarray:
+        try:
+            size = path.stat().st_size
+        except FileNotFoundError:
+            return _empty()
+        size -= size % RECORD_BYTES  # ignore a torn trailing record
+        if not size:
+            return _empty()
+        inode = path.stat().st_ino
+        with self._lock:
+            cached = self._maps.get(path)
+            # Re-map after an append (size) or a backfill rewrite (inode)
+            if cached is None or cached[0] != size or cached[2] != inode:
+                mm = np.memmap(path, dtype=np.float64, mode="r", shape=(size // 8,))
+                cached = (size, mm.reshape(-1, FIELDS), inode)
+                self._maps[path] = cached
+            return cached[1]
+
+    def read(self, asset: str, res: str, start: float = None, end: float = None) -> np.ndarray:
+        """Candles with start <= open_ts < end as a read-only view (no copy)."""
+        data = self._map(self.path(asset, res))
+        if not len(data):
+            return data
+        ts = data[:, 0]
+        lo = 0 if start is None else int(np.searchsorted(ts, start, side="left"))
+        hi = len(data) if end is None else int(np.searchsorted(ts, end, side="left"))
+        return data[lo:hi]
+
+    def bounds(self, asset: str, res: str):
+        """(first_ts, last_ts) or (None, None) when empty."""
+        data = self._map(self.path(asset, res))
+        if not len(data):
+            return None, None
+        return float(data[0, 0]), float(data[-1, 0])
+
+    def write(self, asset: str, res: str, rows) -> int:
+        """
+        Add candles. Newer ones are appended in place; anything older than
+        the current head, or filling a hole inside the stored range,
+        triggers a one-off merge + atomic rewrite.
+        Returns the number of new candles stored.
+        """
+        candles = _as_candles(rows)
+        if not len(candles):
+            return 0
+        path = self.path(asset, res)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path.with_suffix(".lock"), "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                existing = self._map(path)
+                if not len(existing):
+                    return self._append(path, candles)
+                first, last = existing[0, 0], existing[-1, 0]
+                inside = candles[(candles[:, 0] >= first) & (candles[:, 0] <= last), 0]
+                ts = existing[:, 0]
+                idx = np.searchsorted(ts, inside).clip(max=len(ts) - 1)
+                if candles[0, 0] >= first and (ts[idx] == inside).all():
+                    return self._append(path, candles[candles[:, 0] > last])
+                merged = _as_candles(np.vstack([existing, candles]))
+                added = len(merged) - len(existing)
+                tmp = path.with_suffix(".tmp")
+                with open(tmp, "wb") as f:
+                    f.write(merged.tobytes())
+                os.replace(tmp, path)
+                return added
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    @staticmethod
+    def _append(path: Path, candles: np.ndarray) -> int:
+        if not len(candles):
+            return 0
+        with open(path, "ab") as f:
+            size = f.tell()
+            if size % RECORD_BYTES:  # drop a torn record left by a crashed writer
+                f.truncate(size - size % RECORD_BYTES)
+            f.write(np.ascontiguousarray(candles, dtype=np.float64).tobytes())
+        return len(candles)
+
+
+# ── sources: (asset, res, start, end) -> [[open_ts_sec, o, h, l, c], ...] ──
+
+def binance_source(asset: str, res: str, start: float, end: float) -> list:
+    rows = []
+    cursor = int(start * 1000)
+    end_ms = int(end * 1000)
+    while cursor <= end_ms:
+        resp = http_pool.get(BINANCE_KLINES, params={
+            "symbol": f"{asset.upper()}USDT", "interval": res, "startTime": cursor,
+            "endTime": end_ms, "limit": BINANCE_LIMIT}, timeout=10)
+        resp.raise_for_status()
+        page = resp.json()
+        if not page:
+            break
+        rows.extend([k[0] / 1000, float(k[1]), float(k[2]), float(k[3]), float(k[4])] for k in page)
+        if len(page) < BINANCE_LIMIT:
+            break
+        cursor = int(page[-1][0]) + 1
+    return rows
+
+
+def coingecko_source(asset: str, res: str, start: float, end: float) -> list:
+    coin = COINGECKO_IDS.get(asset.lower())
+    if res != "4h" or not coin:
+        return []
+    span_days = (time.time() - start) / 86400
+    days = next((d for d in COINGECKO_4H_DAYS if d >= span_days), None)
+    if days is None:
+        return []
+    resp = http_pool.get(COINGECKO_OHLC.format(coin=coin, days=days), timeout=10)
+    resp.raise_for_status()
+    sec = RESOLUTIONS[res]
+    # CoinGecko stamps candles with their close time
+    return [[k[0] / 1000 - sec, k[1], k[2], k[3], k[4]] for k in resp.json()
+            if start <= k[0] / 1000 - sec <= end]
+
+
+DEFAULT_SOURCES = (binance_source, coingecko_source)
+
+
+class OHLCFetcher:
+    """Fills only the missing head, holes and tail of a stored series, then reads it."""
+
+    def __init__(self, store: OHLCStore = None, sources=DEFAULT_SOURCES):
+        self.store = store or OHLCStore()
+        self.sources = list(sources)
+        self._meta_path = self.store.root / "meta.json"
+        self._meta = self._load_meta()
+        self.requests = 0
+
+    def _load_meta(self) -> dict:
+        try:
+            with open(self._meta_path) as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _save_meta(self):
+        self._meta_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self._meta_path.with_suffix(".tmp")
+        with open(tmp, "w") as f:
+            json.dump(self._meta, f)
+        os.replace(tmp, self._meta_path)
+
+    def missing_ranges(self, asset: str, res: str, start: float, end: float = None) -> list:
+        """
+        [(start, end)] open-time ranges not on disk, up to the last closed
+        candle: the head, interior holes, then the tail.
+        """
+        sec = RESOLUTIONS[res]
+        now = time.time() if end is None else end
+        last_closed = (now // sec) * sec - sec
+        start = (start // sec) * sec
+        # Don't keep asking for history the sources already said they don't have
+        start = max(start, self._meta.get(f"{asset}-{res}", {}).get("floor", start))
+        first, last = self.store.bounds(asset, res)
+        if first is None:
+            return [(start, last_closed)] if start <= last_closed else []
+        ranges = []
+        if start < first:
+            ranges.append((start, first - sec))
+        ts = self.store.read(asset, res, start, last_closed + sec)[:, 0]
+        known = {tuple(h) for h in self._meta.get(f"{asset}-{res}", {}).get("holes", [])}
+        for i in np.flatnonzero(np.diff(ts) > sec):
+            hole = (float(ts[i] + sec), float(ts[i + 1] - sec))
+            if hole not in known:
+                ranges.append(hole)
+        if last < last_closed:
+            ranges.append((last + sec, last_closed))
+        return ranges
+
+    def _fill(self, asset: str, res: str, lo: float, hi: float) -> int:
+        sec = RESOLUTIONS[res]
+        # Coarser resolutions come from finer candles already on disk
+        for fine, fine_sec in RESOLUTIONS.items():
+            if fine_sec < sec and sec % fine_sec == 0:
+                derived = resample(self.store.read(asset, fine, lo, hi + sec), fine_sec, sec)
+                if len(derived) and derived[0, 0] <= lo and derived[-1, 0] >= hi:
+                    return self.store.write(asset, res, derived)
+        for source in self.sources:
+            try:
+                self.requests += 1
+                rows = source(asset, res, lo, hi)
+            except Exception:
+                continue
+            if rows:
+                return self.store.write(asset, res, rows)
+        return 0
+
+    def ensure(self, asset: str, res: str, start: float, end: float = None) -> int:
+        """Fetch whatever is missing for [start, end]; returns candles added."""
+        added = 0
+        first, last = self.store.bounds(asset, res)
+        for lo, hi in self.missing_ranges(asset, res, start, end):
+            n = self._fill(asset, res, lo, hi)
+            added += n
+            if first is not None and hi < first:
+                new_first, _ = self.store.bounds(asset, res)
+                if new_first is None or new_first >= first:
+                    # Head backfill came back empty: remember how far back data exists
+                    self._meta.setdefault(f"{asset}-{res}", {})["floor"] = first
+                    self._save_meta()
+            elif first is not None and lo > first and hi < last and not n:
+                # No source has this hole (exchange outage): don't ask again every call
+                self._meta.setdefault(f"{asset}-{res}", {}).setdefault("holes", []).append([lo, hi])
+                self._save_meta()
+        return added
+
+    def load(self, asset: str, res: str, start: float, end: float = None, fetch: bool = True) -> np.ndarray:
+        """Zero-copy candles for [start, end), topping up the store first."""
+        if fetch:
+            self.ensure(asset, res, start, end)
+        return self.store.read(asset, res, start, end)
@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+Parameter Search
+Joint search over backtester parameter spaces, shared by kalshi-backtest.py,
+edge-parameter-sweep.py, parameter-sweep.py and weather-backtest.py.
+
+A search space is {param: [values]}; points are combinations of those
+values applied over a base parameter dict. Two strategies:
+
+  - grid:    every combination.
+  - halving: successive halving. A random sample of points is evaluated on
+             the oldest 1/eta^k of the data, the best 1/eta (by Pareto rank)
+             move up to a larger slice, until the survivors are evaluated
+             on the full data set.
+
+Every evaluated (point, data fingerprint, data fraction) is cached in
+data/backtests/search-cache/<name>.jsonl, so re-running a search after a
+tweak only evaluates new points, and a new trade log invalidates the cache
+through its fingerprint. Uncached points are evaluated in chunks across a
+process pool. Full-data results are reduced to a Pareto front over
+(PnL max, max drawdown min, trade count max) and written to
+data/backtests/pareto-<name>.json, which auto-tune-engine.py consumes.
+
+The evaluate callable takes (param_sets, fraction) and returns one metrics
+dict per param set; it must be picklable (module-level function or
+functools.partial of one) when workers > 1.
+
+Usage:
+    from param_search import ParamSearch, fingerprint, load_front
+
+    search = ParamSearch("kalshi-backtest", SWEEP_RANGES, partial(evaluate_points, trades),
+                         base=DEFAULT_PARAMS, data_key=fingerprint(trades), workers=4)
+    rows = search.grid()                        # or search.halving(n=243, eta=3)
+    front = search.save_front(rows)             # data/backtests/pareto-kalshi-backtest.json
+
+    load_front("kalshi-backtest", max_age_hours=24)
+
+    python3 scripts/param_search.py --show kalshi-backtest
+"""
+
+import hashlib
+import itertools
+import json
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+OUTPUT_DIR = PROJECT_ROOT / "data" / "backtests"
+CACHE_DIR = OUTPUT_DIR / "search-cache"
+
+# (metric, "max" | "min")
+OBJECTIVES = (("pnl_cents", "max"), ("max_drawdown_cents", "min"), ("trades", "max"))
+
+
+def fingerprint(obj) -> str:
+    """Stable short hash of any JSON-serializable input (trade lists, base params)."""
+    blob = json.dumps(obj, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha1(blob.encode("utf-8")).hexdigest()[:16]
+
+
+def front_path(name: str) -> Path:
+    return OUTPUT_DIR / f"pareto-{name}.json"
+
+
+# ── Pareto ──
+
+def _vector(row: dict, objectives) -> tuple:
+    """Metrics oriented so that larger is better on every axis."""
+    return tuple((row.get(m) or 0) * (1 if sense == "max" else -1) for m, sense in objectives)
+
+
+def pareto_front(rows: list, objectives=OBJECTIVES) -> list:
+    """
+    Non-dominated rows, best first objective first. Rows with identical
+    metrics collapse into one entry (the first seen) with an "equivalent" count.
+    """
+    order = sorted(range(len(rows)), key=lambda i: _vector(rows[i], objectives), reverse=True)
+    front, vectors = [], []
+    for i in order:
+        v = _vector(rows[i], objectives)
+        if vectors and vectors[-1] == v:
+            front[-1]["equivalent"] += 1
+            continue
+        # Lexicographic order: nothing later can dominate something earlier
+        if any(all(a >= b for a, b in zip(f, v)) for f in vectors):
+            continue
+        front.append(dict(rows[i], equivalent=1))
+        vectors.append(v)
+    return front
+
+
+def pareto_ranks(rows: list, objectives=OBJECTIVES) -> list:
+    """Front index per row (0 = non-dominated), by repeatedly peeling fronts."""
+    vectors = [_vector(r, objectives) for r in rows]
+    ranks = [None] * len(rows)
+    remaining = sorted(range(len(rows)), key=lambda i: vectors[i], reverse=True)
+    rank = 0
+    while remaining:
+        layer, rest = [], []
+        for i in remaining:
+            v = vectors[i]
+            dominated = any(all(a >= b for a, b in zip(vectors[j], v)) and vectors[j] != v for j in layer)
+            (rest if dominated else layer).append(i)
+        for i in layer:
+            ranks[i] = rank
+        remaining, rank = rest, rank + 1
+    return ranks
+
+
+def load_front(name: str, max_age_hours: float = None) -> dict:
+    """Saved front for `name` (None if missing, unreadable or older than max_age_hours)."""
+    path = front_path(name)
+    try:
+        with open(path) as f:
+            data = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+    if max_age_hours is not None and time.time() - path.stat().st_mtime > max_age_hours * 3600:
+        return None
+    return data
+
+
+# ── search driver ──
+
+class ParamSearch:
+    """Grid / successive-halving search with a per-point disk cache and a process pool."""
+
+    def __init__(self, name: str, space: dict, evaluate, base: dict = None, derive=None,
+                 data_key: str = "", objectives=OBJECTIVES, workers: int = None,
+                 cache_dir: Path = None, chunk: int = 64):
+        self.name = name
+        self.space = {k: list(v) for k, v in space.items()}
+        self.evaluate = evaluate
+        self.base = dict(base or {})
+        self.derive = derive
+        self.data_key = f"{data_key}:{fingerprint(self.base)}"
+        self.objectives = tuple(objectives)
+        self.workers = (os.cpu_count() or 1) if workers is not None and workers <= 0 else (workers or 1)
+        self.chunk = chunk
+        self.cache_path = Path(cache_dir or CACHE_DIR) / f"{name}.jsonl"
+        self.cache = self._load_cache()
+        self.evaluated = 0  # points actually evaluated (cache misses) by this instance
+        self.cached = 0
+
+    @property
+    def size(self) -> int:
+        return math.prod(len(v) for v in self.space.values())
+
+    def points(self) -> list:
+        names = list(self.space)
+        return [dict(zip(names, values)) for values in itertools.product(*self.space.values())]
+
+    def params_for(self, point: dict) -> dict:
+        params = dict(self.base)
+        params.update(point)
+        if self.derive:
+            self.derive(params)
+        return params
+
+    # ── cache ──
+
+    def _key(self, point: dict, fraction: float) -> str:
+        return fingerprint({"data": self.data_key, "fraction": round(fraction, 6), "point": point})
+
+    def _load_cache(self) -> dict:
+        cache = {}
+        try:
+            with open(self.cache_path) as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                        cache[entry["key"]] = entry["metrics"]
+                    except (ValueError, KeyError):
+                        continue
+        except FileNotFoundError:
+            pass
+        return cache
+
+    def _store(self, entries: list):
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.cache_path, "a") as f:
+            f.write("".join(json.dumps({"key": k, "metrics": m}) + "\n" for k, m in entries))
+
+    # ── evaluation ──
+
+    def _run(self, param_sets: list, fraction: float) -> list:
+        chunks = [param_sets[i:i + self.chunk] for i in range(0, len(param_sets), self.chunk)]
+        if self.workers == 1 or len(chunks) == 1:
+            return [row for c in chunks for row in self.evaluate(c, fraction)]
+        with ProcessPoolExecutor(max_workers=min(self.workers, len(chunks))) as pool:
+            parts = pool.map(self.evaluate, chunks, [fraction] * len(chunks))
+            return [row for part in parts for row in part]
+
+    def run(self, points: list, fraction: float = 1.0) -> list:
+        """[{"params": point, **metrics}] for `points`, evaluating only cache misses."""
+        keys = [self._key(p, fraction) for p in points]
+        missing = [i for i, k in enumerate(keys) if k not in self.cache]
+        if missing:
+            metrics = self._run([self.params_for(points[i]) for i in missing], fraction)
+            new = [(keys[i], m) for i, m in zip(missing, metrics)]
+            self.cache.update(new)
+            self._store(new)
+        self.evaluated += len(missing)
+        self.cached += len(points) - len(missing)
+        return [{"params": p, **self.cache[k]} for p, k in zip(points, keys)]
+
+    def grid(self) -> list:
+        return self.run(self.points())
+
+    def halving(self, n: int = 243, eta: int = 3, min_fraction: float = 1 / 9, seed: int = 0) -> list:
+        """
+        Successive halving: n random points on the smallest data slice, keep
+        the best 1/eta by Pareto rank (PnL breaks ties), grow the slice by eta.
+        Returns the full-data rows of the final rung.
+        """
+        points = self.points()
+        if n < len(points):
+            points = random.Random(seed).sample(points, n)
+        rungs = max(1, 1 + int(math.floor(math.log(1 / min_fraction, eta) + 1e-9)))
+        for r in range(rungs):
+            fraction = 1.0 / eta ** (rungs - 1 - r)
+            rows = self.run(points, fraction)
+            if fraction >= 1.0:
+                return rows
+            ranks = pareto_ranks(rows, self.objectives)
+            pnl = self.objectives[0][0]
+            order = sorted(range(len(rows)), key=lambda i: (ranks[i], -(rows[i].get(pnl) or 0)))
+            # Points with identical metrics (e.g. filters that exclude everything) only
+            # get a slot after every distinct outcome has one
+            seen, copies = {}, {}
+            for i in order:
+                v = _vector(rows[i], self.objectives)
+                copies[i] = seen.get(v, 0)
+                seen[v] = copies[i] + 1
+            order.sort(key=lambda i: copies[i])
+            points = [points[i] for i in order[:max(1, len(points) // eta)]]
+        return self.run(points)
+
+    # ── output ──
+
+    def save_front(self, rows: list, strategy: str = "grid", path: Path = None) -> list:
+        """Pareto front of full-data rows, written as data/backtests/pareto-<name>.json."""
+        front = pareto_front(rows, self.objectives)
+        out = Path(path or front_path(self.name))
+        out.parent.mkdir(parents=True, exist_ok=True)
+        tmp = out.with_name(f".{out.name}.tmp")
+        with open(tmp, "w") as f:
+            json.dump({
+                "generated_at": datetime.now(timezone.utc).isoformat(),
+                "name": self.name,
+                "strategy": strategy,
+                "data_key": self.data_key,
+                "objectives": [list(o) for o in self.objectives],
+                "space": self.space,
+                "base_params": self.base,
+                "evaluated": self.evaluated,
+                "cached": self.cached,
+                "front": front,
+            }, f, indent=2)
+        os.replace(tmp, out)
+        return front
+
+
+def format_front(front: list, objectives=OBJECTIVES, limit: int = 15) -> str:
+    lines = []
+    for row in front[:limit]:
+        label = ", ".join(f"{k}={v}" for k, v in row["params"].items())
+        metrics = "  ".join(f"{m}={row.get(m)}" for m, _ in objectives)
+        lines.append(f"  {metrics}  <- {label}" + (f" (+{row['equivalent'] - 1} same)" if row["equivalent"] > 1 else ""))
+    if len(front) > limit:
+        lines.append(f"  ... {len(front) - limit} more")
+    return "\n".join(lines)
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Show saved Pareto fronts from backtester searches")
+    parser.add_argument("--show", metavar="NAME", help="e.g. kalshi-backtest, weather-backtest")
+    args = parser.parse_args()
+
+    if not args.show:
+        for path in sorted(OUTPUT_DIR.glob("pareto-*.json")):
+            data = load_front(path.stem[len("pareto-"):])
+            print(f"{data['name']:<24} {len(data['front']):>3} points  {data['generated_at']}")
+        return
+    data = load_front(args.show)
+    if data is None:
+        print(f"No front saved for {args.show}")
+        return
+    print(f"Pareto front: {data['name']} ({data['strategy']}, {data['generated_at']})")
+    print(format_front(data["front"], [tuple(o) for o in data["objectives"]], limit=50))
+
+
+if __name__ == "__main__":
+    main()
@@ -7,16 +7,22 @@ Runs simulations with different parameter combinations and compares performance.
 
 Usage:
     python3 scripts/parameter-sweep.py [--detailed] [--output FILE]
+    python3 scripts/parameter-sweep.py --search halving --workers 0
 """
 
 import json
 import math
 import argparse
+import sys
 from datetime import datetime, timezone
+from functools import partial
 from pathlib import Path
 from typing import Dict, List, Any
 from dataclasses import dataclass
 
+sys.path.insert(0, str(Path(__file__).parent))
+from param_search import ParamSearch, fingerprint, format_front  # noqa: E402
+
 PROJECT_ROOT = Path(__file__).parent.parent
 OHLC_DIR = PROJECT_ROOT / "data" / "ohlc"
 SETTLEMENTS_FILE = PROJECT_ROOT / "scripts" / "kalshi-settlements-v2.json"
@@ -230,12 +236,20 @@ def run_simulation(
             "trades": 0,
             "win_rate": 0,
             "pnl_cents": 0,
+            "max_drawdown_cents": 0,
             "avg_edge": 0,
             "sharpe": 0,
         }
     
     wins = sum(1 for t in trades if t.won)
     total_pnl = sum(t.pnl_cents for t in trades)
+    
+    # Max drawdown of the cumulative PnL curve
+    cum = peak = max_drawdown = 0
+    for t in trades:
+        cum += t.pnl_cents
+        peak = max(peak, cum)
+        max_drawdown = max(max_drawdown, peak - cum)
     avg_edge = sum(t.edge for t in trades) / len(trades)
     
     # Calculate Sharpe-like ratio
@@ -254,12 +268,21 @@ def run_simulation(
         "losses": len(trades) - wins,
         "win_rate": wins / len(trades) if trades else 0,
         "pnl_cents": total_pnl,
+        "max_drawdown_cents": max_drawdown,
         "avg_edge": avg_edge,
         "sharpe": sharpe,
         "avg_pnl_per_trade": total_pnl / len(trades) if trades else 0,
     }
 
 
+def evaluate_points(settled: List[Dict], param_sets: List[Dict], fraction: float = 1.0) -> List[Dict]:
+    """param_search evaluate callable: simulations on the oldest `fraction` of settlements."""
+    if fraction < 1.0:
+        settled = settled[:max(1, int(round(len(settled) * fraction)))]
+    return [run_simulation(settled, p["min_edge"], p["kelly_fraction"], VOL_ASSUMPTIONS[p["vol_assumption"]])
+            for p in param_sets]
+
+
 def analyze_actual_trades(settlements: List[Dict]) -> None:
     """Analyze what actually happened with historical trades."""
     print("\n📊 ANALYSIS OF ACTUAL HISTORICAL TRADES:")
@@ -331,6 +354,9 @@ def main():
     parser.add_argument("--detailed", action="store_true", help="Show detailed results")
     parser.add_argument("--output", type=str, help="Output file path")
     parser.add_argument("--analyze-only", action="store_true", help="Only analyze actual trades, no simulation")
+    parser.add_argument("--search", choices=["grid", "halving"], default="grid",
+                        help="Sweep strategy (default: every combination)")
+    parser.add_argument("--workers", type=int, help="Processes for the sweep (0 = all cores; default 1)")
     args = parser.parse_args()
     
     print("🔄 Loading settlement data...")
@@ -354,25 +380,33 @@ def main():
         print("❌ No settled trades to backtest against")
         return
     
-    results = []
-    
     print("\n🚀 Running parameter sweep...")
     print("=" * 70)
     
-    for vol_name, vol_values in VOL_ASSUMPTIONS.items():
-        for min_edge in MIN_EDGE_VALUES:
-            for kelly in KELLY_FRACTIONS:
-                sim = run_simulation(settled, min_edge, kelly, vol_values)
-                
-                result = {
-                    "vol_assumption": vol_name,
-                    "vol_btc": vol_values["BTC"],
-                    "vol_eth": vol_values["ETH"],
-                    "min_edge": min_edge,
-                    "kelly_fraction": kelly,
-                    **sim
-                }
-                results.append(result)
+    # Every vol x edge x kelly combination (or a successive-halving sample),
+    # cached and parallelized by scripts/param_search.py
+    space = {
+        "vol_assumption": list(VOL_ASSUMPTIONS),
+        "min_edge": MIN_EDGE_VALUES,
+        "kelly_fraction": KELLY_FRACTIONS,
+    }
+    search = ParamSearch("parameter-sweep", space, partial(evaluate_points, settled),
+                         data_key=fingerprint(settled), workers=args.workers)
+    rows = search.grid() if args.search == "grid" else search.halving()
+    front = search.save_front(rows, args.search)
+    
+    results = []
+    for row in rows:
+        p = row.pop("params")
+        vol_values = VOL_ASSUMPTIONS[p["vol_assumption"]]
+        results.append({
+            "vol_assumption": p["vol_assumption"],
+            "vol_btc": vol_values["BTC"],
+            "vol_eth": vol_values["ETH"],
+            "min_edge": p["min_edge"],
+            "kelly_fraction": p["kelly_fraction"],
+            **row
+        })
     
     # Sort by Sharpe ratio (risk-adjusted return)
     results.sort(key=lambda x: x["sharpe"], reverse=True)
@@ -419,6 +453,9 @@ def main():
             avg_sharpe = sum(r["sharpe"] for r in vol_results) / len(vol_results)
             print(f"   {vol_name:<12}: {avg_wr*100:>5.1f}% WR, {avg_sharpe:>5.2f} Sharpe")
     
+    print(f"\n🏁 PARETO FRONT (PnL / max drawdown / trades), {search.evaluated} evaluated, {search.cached} cached:")
+    print(format_front(front))
+    
     # Save results
     OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
     output_file = args.output or (OUTPUT_DIR / "parameter-sweep-results.json")
@@ -427,6 +464,7 @@ def main():
         "generated_at": datetime.now(timezone.utc).isoformat(),
         "settlement_count": len(settled),
         "optimal": results[0] if results else None,
+        "pareto_front": front,
         "all_results": results if args.detailed else results[:20],
     }
     
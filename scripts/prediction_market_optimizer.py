@@ -65,7 +65,7 @@ class BetRecommendation:
     signals_used: List[SignalType]
 
 # =============================================================================
-# INDEPENDENT COMPONENT ANALYSIS (Simplified FastICA)
+# INDEPENDENT COMPONENT ANALYSIS (Symmetric FastICA)
 # =============================================================================
 
 class SignalICA:
@@ -75,33 +75,142 @@ class SignalICA:
     The idea: Market prices are influenced by multiple independent factors
     (news, sentiment, smart money, noise). ICA separates these to find
     the "true" signal underneath.
+    
+    Symmetric FastICA: all components are updated at once with the batched
+    tanh contrast, then decorrelated together via W <- (W W^T)^-1/2 W
+    (eigendecomposition), so there is no per-component deflation loop.
+    Data are whitened with a PCA projection onto n_components dimensions.
+    
+    fit_transform() fits one matrix; partial_fit() accepts a stream of
+    mini-batches: the whitening comes from the running mean / covariance of
+    the whole stream, and warm-started fixed-point steps run on a bounded
+    uniform reservoir sample of it (buffer_size rows), so hundreds of
+    markets can be folded in per run in constant memory.
     """
     
-    def __init__(self, n_components: int = 4):
+    def __init__(self, n_components: int = 4, random_state: Optional[int] = None,
+                 buffer_size: int = 2048):
         self.n_components = n_components
+        self.random_state = random_state
+        self.buffer_size = buffer_size
         self.mixing_matrix = None
-        self.unmixing_matrix = None
+        self.unmixing_matrix = None  # (k, k) rotation in whitened space
+        self.whitening_matrix = None  # (n_features, k)
+        self.mean = None
+        self.n_iter = 0
+        # Streaming moments (partial_fit)
+        self._count = 0
+        self._sum = None
+        self._sum_sq = None
+        self._buffer = None
+        self._rng = np.random.default_rng(random_state)
         
     def _center(self, X: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
         """Center the data"""
         mean = np.mean(X, axis=0)
         return X - mean, mean
     
-    def _whiten(self, X: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
-        """Whiten data using eigendecomposition"""
-        cov = np.cov(X, rowvar=False)
+    def _whitening(self, cov: np.ndarray, k: int) -> np.ndarray:
+        """PCA whitening matrix (n_features, k) for the top-k eigenvectors of cov"""
         eigenvalues, eigenvectors = np.linalg.eigh(cov)
-        
+        order = np.argsort(eigenvalues)[::-1][:k]
         # Regularize to avoid division by zero
-        eigenvalues = np.maximum(eigenvalues, 1e-10)
-        
-        D = np.diag(1.0 / np.sqrt(eigenvalues))
-        whitening_matrix = eigenvectors @ D @ eigenvectors.T
+        eigenvalues = np.maximum(eigenvalues[order], 1e-10)
+        return eigenvectors[:, order] / np.sqrt(eigenvalues)
+    
+    def _whiten(self, X: np.ndarray, k: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Whiten centered data using eigendecomposition"""
+        k = k or min(self.n_components, X.shape[1])
+        whitening_matrix = self._whitening(np.cov(X, rowvar=False), k)
         return X @ whitening_matrix, whitening_matrix
     
-    def _g(self, u: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
-        """Non-linearity function (tanh) and its derivative"""
-        return math.tanh(u), 1 - math.tanh(u)**2
+    @staticmethod
+    def _g(u: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Non-linearity function (tanh) and its derivative, elementwise over any array"""
+        g = np.tanh(u)
+        return g, 1.0 - g * g
+    
+    @staticmethod
+    def _sym_decorrelate(W: np.ndarray) -> np.ndarray:
+        """W <- (W W^T)^-1/2 W"""
+        eigenvalues, eigenvectors = np.linalg.eigh(W @ W.T)
+        eigenvalues = np.maximum(eigenvalues, 1e-12)
+        return (eigenvectors / np.sqrt(eigenvalues)) @ eigenvectors.T @ W
+    
+    def _init_w(self, k: int) -> np.ndarray:
+        return self._sym_decorrelate(self._rng.standard_normal((k, k)))
+    
+    def _iterate(self, Z: np.ndarray, W: np.ndarray, max_iter: int, tol: float) -> Tuple[np.ndarray, int]:
+        """Symmetric fixed-point updates on whitened data Z (n_samples, k)"""
+        n = Z.shape[0]
+        for it in range(1, max_iter + 1):
+            g, g_prime = self._g(Z @ W.T)  # (n, k) for every component at once
+            W_new = self._sym_decorrelate(g.T @ Z / n - g_prime.mean(axis=0)[:, None] * W)
+            # Converged when each component only flips sign or stays put
+            converged = np.max(np.abs(np.abs(np.einsum("ij,ij->i", W_new, W)) - 1)) < tol
+            W = W_new
+            if converged:
+                break
+        return W, it
+    
+    def _finish(self):
+        self.components = self.unmixing_matrix @ self.whitening_matrix.T  # (k, n_features)
+        self.mixing_matrix = np.linalg.pinv(self.components)
+    
+    def fit(self, X: np.ndarray, max_iter: int = 200, tol: float = 1e-4) -> "SignalICA":
+        """Fit on a full (n_samples, n_features) matrix."""
+        X = np.asarray(X, dtype=float)
+        X_centered, self.mean = self._center(X)
+        Z, self.whitening_matrix = self._whiten(X_centered)
+        self.unmixing_matrix, self.n_iter = self._iterate(
+            Z, self._init_w(Z.shape[1]), max_iter, tol)
+        self._finish()
+        return self
+    
+    def partial_fit(self, X: np.ndarray, n_iter: int = 10, tol: float = 1e-4) -> "SignalICA":
+        """
+        Fold in a mini-batch of observations (n_samples, n_features).
+        
+        Whitening uses the running mean / covariance of everything seen so
+        far; the unmixing matrix is warm-started from the previous batch and
+        refined on the reservoir sample.
+        """
+        X = np.asarray(X, dtype=float)
+        if self._sum is None:
+            self._sum = np.zeros(X.shape[1])
+            self._sum_sq = np.zeros((X.shape[1], X.shape[1]))
+            self._buffer = np.empty((0, X.shape[1]))
+        seen = self._count
+        self._count += X.shape[0]
+        self._sum += X.sum(axis=0)
+        self._sum_sq += X.T @ X
+        
+        # Reservoir sampling (vectorized Algorithm R): row i of the stream
+        # replaces a random slot with probability buffer_size / (i + 1)
+        room = max(0, self.buffer_size - len(self._buffer))
+        self._buffer = np.vstack([self._buffer, X[:room]])
+        rest = X[room:]
+        if len(rest):
+            slots = (self._rng.random(len(rest)) * (seen + room + np.arange(1, len(rest) + 1))).astype(int)
+            keep = slots < self.buffer_size
+            # Later rows win when two pick the same slot, as in the sequential algorithm
+            self._buffer[slots[keep]] = rest[keep]
+        if self._count < 2:
+            return self
+        self.mean = self._sum / self._count
+        cov = (self._sum_sq - self._count * np.outer(self.mean, self.mean)) / (self._count - 1)
+        k = min(self.n_components, X.shape[1])
+        self.whitening_matrix = self._whitening(cov, k)
+        W = self.unmixing_matrix if self.unmixing_matrix is not None else self._init_w(k)
+        self.unmixing_matrix, iters = self._iterate(
+            (self._buffer - self.mean) @ self.whitening_matrix, W, n_iter, tol)
+        self.n_iter += iters
+        self._finish()
+        return self
+    
+    def transform(self, X: np.ndarray) -> np.ndarray:
+        """Independent components (n_samples, n_components) of X with the fitted model."""
+        return (np.asarray(X, dtype=float) - self.mean) @ self.components.T
     
     def fit_transform(self, X: np.ndarray, max_iter: int = 200, tol: float = 1e-4) -> np.ndarray:
         """
@@ -112,44 +221,7 @@ class SignalICA:
         Returns:
             Independent components (n_samples, n_components)
         """
-        n_samples, n_features = X.shape
-        n_components = min(self.n_components, n_features)
-        
-        # Center and whiten
-        X_centered, _ = self._center(X)
-        X_whitened, self.whitening_matrix = self._whiten(X_centered)
-        
-        # Initialize unmixing matrix randomly
-        W = np.random.randn(n_components, n_features)
-        W = W / np.linalg.norm(W, axis=1, keepdims=True)
-        
-        # FastICA iteration
-        for _ in range(max_iter):
-            W_old = W.copy()
-            
-            for i in range(n_components):
-                # Compute w'*x for all samples
-                wx = X_whitened @ W[i]
-                
-                # Apply non-linearity
-                g_wx, g_prime_wx = self._g(wx)
-                
-                # Update rule
-                W[i] = np.mean(X_whitened.T * g_wx, axis=1) - np.mean(g_prime_wx) * W[i]
-                
-                # Decorrelate from previous components
-                for j in range(i):
-                    W[i] -= np.dot(W[i], W[j]) * W[j]
-                
-                # Normalize
-                W[i] /= np.linalg.norm(W[i]) + 1e-10
-            
-            # Check convergence
-            if np.max(np.abs(np.abs(np.diag(W @ W_old.T)) - 1)) < tol:
-                break
-        
-        self.unmixing_matrix = W
-        return X_whitened @ W.T
+        return self.fit(X, max_iter, tol).transform(X)
 
 # =============================================================================
 # SIGNAL EXTRACTION
@@ -623,12 +695,14 @@ class PredictionMarketOptimizer:
             signals_used=[s.type for s in signals]
         )
     
-    def run_ica_analysis(self, signal_matrix: np.ndarray) -> np.ndarray:
+    def run_ica_analysis(self, signal_matrix: np.ndarray, batch_size: Optional[int] = None) -> np.ndarray:
         """
         Run ICA to extract independent components from signal matrix.
         
         Args:
             signal_matrix: (n_markets, n_signal_types) matrix
+            batch_size: stream the rows through partial_fit in mini-batches
+                of this many markets (None = fit the whole matrix at once)
         Returns:
             Independent components
         """
@@ -636,6 +710,10 @@ class PredictionMarketOptimizer:
             return signal_matrix
             
         try:
+            if batch_size and signal_matrix.shape[0] > batch_size:
+                for i in range(0, signal_matrix.shape[0], batch_size):
+                    self.ica.partial_fit(signal_matrix[i:i + batch_size])
+                return self.ica.transform(signal_matrix)
             return self.ica.fit_transform(signal_matrix)
         except Exception as e:
             print(f"ICA failed: {e}, using raw signals")
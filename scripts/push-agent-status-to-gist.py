@@ -9,10 +9,14 @@ Cron: */5 * * * * python3 /Users/mattia/Projects/Onde/scripts/push-agent-status-
 import json
 import os
 import subprocess
+import sys
 from datetime import datetime, timezone
 from pathlib import Path
 import requests
 
+sys.path.insert(0, str(Path(__file__).parent))
+import gist_publisher  # noqa: E402
+
 # Config
 PROJECT_DIR = Path(__file__).parent.parent
 GIST_ID = os.getenv("AGENT_GIST_ID", "2efe5147efa7f09753a6fce9c74dc5d0")
@@ -457,7 +461,7 @@ def build_dashboard_data() -> dict:
     }
 
 def push_to_gist(data: dict) -> bool:
-    """Push data to GitHub Gist using gh CLI (same pattern as push-stats-to-gist.py)."""
+    """Push data to GitHub Gist via the shared gist publisher (same path as push-stats-to-gist.py)."""
     stats_json = json.dumps(data, indent=2)
     
     # Always save locally too
@@ -465,23 +469,13 @@ def push_to_gist(data: dict) -> bool:
     local_file.parent.mkdir(parents=True, exist_ok=True)
     local_file.write_text(stats_json)
     
-    # Push via gh api (uses gh CLI auth, no separate token needed)
-    try:
-        result = subprocess.run(
-            ["gh", "api", "-X", "PATCH", f"/gists/{GIST_ID}",
-             "-f", f"files[{GIST_FILENAME}][content]={stats_json}"],
-            capture_output=True, text=True, timeout=15
-        )
-        
-        if result.returncode == 0:
-            print(f"✅ Pushed to gist: {GIST_ID}")
-            return True
-        else:
-            print(f"❌ Gist push failed: {result.stderr[:200]}")
-            return False
-    except Exception as e:
-        print(f"❌ Gist push error: {e}")
-        return False
+    # Push through the shared publisher (skipped when unchanged since the last push)
+    result = gist_publisher.publish(GIST_ID, {GIST_FILENAME: stats_json})
+    if result["ok"]:
+        print(f"✅ Pushed to gist: {GIST_ID}" if result["sent"] else f"✅ Gist {GIST_ID} already up to date")
+        return True
+    print(f"❌ Gist push failed: {result.get('error', '')[:200]}")
+    return False
 
 def main():
     print(f"🤖 Agent Status Push - {datetime.now().isoformat()}")
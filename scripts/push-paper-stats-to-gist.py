@@ -12,13 +12,14 @@ Usage:
 """
 
 import json
-import subprocess
 import sys
-import time
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
 from collections import defaultdict
 
+sys.path.insert(0, str(Path(__file__).parent))
+import gist_publisher  # noqa: E402
+
 # Paths
 SCRIPT_DIR = Path(__file__).parent
 PROJECT_ROOT = SCRIPT_DIR.parent
@@ -30,8 +31,7 @@ GIST_ID_FILE = PROJECT_ROOT / "data" / "trading" / "stats-gist-id.txt"
 STATS_FILENAME = "onde-paper-stats.json"
 GIST_ID = "43b0815cc640bba8ac799ecb27434579"
 
-MAX_RETRIES = 3
-INITIAL_BACKOFF_SECONDS = 2
+MAX_RETRIES = gist_publisher.MAX_RETRIES
 
 
 def load_trades():
@@ -396,28 +396,14 @@ def get_gist_id():
 
 
 def update_gist(gist_id, stats_json):
-    """Update existing gist with paper stats as a new file."""
-    last_error = None
-    for attempt in range(MAX_RETRIES):
-        if attempt > 0:
-            backoff = INITIAL_BACKOFF_SECONDS * (2 ** (attempt - 1))
-            print(f"  Retry {attempt}/{MAX_RETRIES-1} in {backoff}s...")
-            time.sleep(backoff)
-        
-        result = subprocess.run(
-            ["gh", "api", "-X", "PATCH", f"/gists/{gist_id}",
-             "-f", f"files[{STATS_FILENAME}][content]={stats_json}"],
-            capture_output=True, text=True
-        )
-        
-        if result.returncode == 0:
-            print(f"Updated gist: https://gist.github.com/{gist_id}")
-            return True
-        
-        last_error = result.stderr
-        print(f"Error updating gist (attempt {attempt + 1}/{MAX_RETRIES}): {last_error}")
-    
-    print(f"Failed to update gist after {MAX_RETRIES} attempts: {last_error}")
+    """Update existing gist with paper stats as a new file (via the shared gist publisher)."""
+    result = gist_publisher.publish(gist_id, {STATS_FILENAME: stats_json})
+    if result["ok"]:
+        print(f"Updated gist: https://gist.github.com/{gist_id}" if result["sent"]
+              else f"Gist {gist_id} already up to date")
+        return True
+    
+    print(f"Failed to update gist after {MAX_RETRIES} attempts: {result.get('error', '')}")
     return False
 
 
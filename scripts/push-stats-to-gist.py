@@ -5,6 +5,11 @@ Push trading stats to GitHub Gist for static site consumption.
 Creates/updates a public gist with trading stats JSON that the static site
 can fetch at runtime, bypassing the static export limitation.
 
+Trade stats are derived from per-day rollups over the shared trade index
+(scripts/stats_rollup.py, scripts/trade_log.py): each push folds only the
+days that changed since the last run, so push time stays flat as the
+trade logs grow.
+
 Usage:
     python push-stats-to-gist.py [--create] [--source v1|v2|v3|all] [--polymarket]
 
@@ -15,12 +20,15 @@ Options:
 """
 
 import json
-import subprocess
 import sys
-import time
 from datetime import datetime, timezone
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).parent))
+import gist_publisher  # noqa: E402
+from stats_rollup import EDGE_BOUNDS, DailyRollup, combine, latency_quantile  # noqa: E402
+from trade_log import TradeLog  # noqa: E402
+
 # Paths
 SCRIPT_DIR = Path(__file__).parent
 TRADES_FILE_V1 = SCRIPT_DIR / "kalshi-trades.jsonl"
@@ -46,9 +54,17 @@ HEALTH_HISTORY_FILE = SCRIPT_DIR.parent / "data" / "trading" / "health-history.j
 MOMENTUM_REGIME_FILE = SCRIPT_DIR.parent / "data" / "trading" / "momentum-regime.json"  # T853
 STATS_FILENAME = "onde-trading-stats.json"
 
-# Retry configuration (T767)
-MAX_RETRIES = 3
-INITIAL_BACKOFF_SECONDS = 2  # Doubles each retry: 2, 4, 8
+# --source choice -> trade index sources (scripts/trade_log.py)
+STATS_SOURCES = {
+    'v1': ['legacy'],
+    'v2': ['v2'],
+    'v3': ['v3'],
+    'all': ['legacy', 'v2', 'v3'],
+}
+EDGE_BUCKET_NAMES = ("0-5%", "5-10%", "10-15%", "15-20%", "20-30%", "30%+")  # T368, over EDGE_BOUNDS
+
+# Retry configuration (T767) - backoff is done by the pooled publisher
+MAX_RETRIES = gist_publisher.MAX_RETRIES
 CONSECUTIVE_FAILURES_FILE = SCRIPT_DIR.parent / "data" / "trading" / "gist-consecutive-failures.txt"
 
 
@@ -923,52 +939,29 @@ def load_stop_loss_stats():
         return None
 
 
-def calculate_edge_distribution(trades):
+def calculate_edge_distribution(days):
     """Calculate edge distribution buckets with win rates (T368).
     
-    Groups trades by edge bucket and calculates win rate per bucket.
+    Groups settled trades by edge bucket and calculates win rate per bucket.
     Used for the edge confidence chart on /betting dashboard.
     """
-    buckets = [
-        (0.00, 0.05, "0-5%"),
-        (0.05, 0.10, "5-10%"),
-        (0.10, 0.15, "10-15%"),
-        (0.15, 0.20, "15-20%"),
-        (0.20, 0.30, "20-30%"),
-        (0.30, 1.00, "30%+"),
-    ]
-    
-    # Filter to trades with edge data
-    trades_with_edge = [t for t in trades if t.get('edge') is not None or t.get('edge_with_bonus') is not None]
-    settled_with_edge = [t for t in trades_with_edge if t.get('result_status') in ['won', 'lost']]
+    totals = [[0, 0, 0.0] for _ in EDGE_BUCKET_NAMES]
+    for d in days:
+        for total, (n, won, edge_sum) in zip(totals, d['edge_buckets']):
+            total[0] += n
+            total[1] += won
+            total[2] += edge_sum
     
     distribution = []
-    
-    for low, high, name in buckets:
-        bucket_trades = []
-        for t in settled_with_edge:
-            edge = t.get('edge') or t.get('edge_with_bonus', 0)
-            if low <= edge < high:
-                bucket_trades.append(t)
-        
-        won = sum(1 for t in bucket_trades if t.get('result_status') == 'won')
-        lost = len(bucket_trades) - won
-        win_rate = (won / len(bucket_trades) * 100) if bucket_trades else 0
-        
-        # Calculate average edge in bucket
-        if bucket_trades:
-            avg_edge = sum(t.get('edge') or t.get('edge_with_bonus', 0) for t in bucket_trades) / len(bucket_trades)
-        else:
-            avg_edge = (low + high) / 2
-        
+    for (n, won, edge_sum), low, high, name in zip(totals, EDGE_BOUNDS, EDGE_BOUNDS[1:], EDGE_BUCKET_NAMES):
         distribution.append({
             "bucket": name,
             "range": [low, high],
-            "trades": len(bucket_trades),
+            "trades": n,
             "won": won,
-            "lost": lost,
-            "winRate": round(win_rate, 1),
-            "avgEdge": round(avg_edge * 100, 1)  # as percentage
+            "lost": n - won,
+            "winRate": round(won / n * 100, 1) if n else 0,
+            "avgEdge": round((edge_sum / n if n else (low + high) / 2) * 100, 1)  # as percentage
         })
     
     # Calculate correlation (do higher edges correlate with higher win rates?)
@@ -989,16 +982,16 @@ def calculate_edge_distribution(trades):
     
     return {
         "buckets": distribution,
-        "totalSettled": len(settled_with_edge),
-        "tradesWithEdge": len(trades_with_edge),
+        "totalSettled": sum(d['edge_settled'] for d in days),
+        "tradesWithEdge": sum(d['edge_trades'] for d in days),
         "correlation": correlation
     }
 
 
-def calculate_win_rate_trend(trades):
+def calculate_win_rate_trend(days):
     """Calculate daily win rate trend data for dashboard chart (DASH-001).
     
-    Groups settled trades by day and computes:
+    Uses the settled trades of each day rollup to compute:
     - Daily win rate
     - Cumulative win rate (rolling)
     - Daily PnL and cumulative PnL
@@ -1007,62 +1000,27 @@ def calculate_win_rate_trend(trades):
     Returns:
         dict with 'data' array and 'summary' for the WinRateTrendChart component
     """
-    from collections import defaultdict
-    
-    # Filter to settled trades only
-    settled = [t for t in trades if t.get('result_status') in ('won', 'lost')]
-    if not settled:
-        return None
-    
-    # Sort by timestamp
-    settled.sort(key=lambda t: t.get('timestamp', ''))
-    
-    # Group by date
-    by_date = defaultdict(list)
-    for t in settled:
-        date = t.get('timestamp', '')[:10]
-        if date:
-            by_date[date].append(t)
-    
-    if not by_date:
-        return None
-    
-    # Calculate daily and cumulative stats
     data_points = []
     cum_wins = 0
     cum_total = 0
     cum_pnl = 0
     
-    for date in sorted(by_date.keys()):
-        day_trades = by_date[date]
-        wins = sum(1 for t in day_trades if t.get('result_status') == 'won')
-        losses = len(day_trades) - wins
-        
-        # Daily PnL
-        day_pnl = 0
-        for t in day_trades:
-            price = t.get('price', 50)
-            contracts = t.get('contracts', 1)
-            if t.get('result_status') == 'won':
-                day_pnl += (100 - price) * contracts
-            else:
-                day_pnl -= price * contracts
-        
-        cum_wins += wins
-        cum_total += len(day_trades)
-        cum_pnl += day_pnl
-        
-        cum_wr = (cum_wins / cum_total * 100) if cum_total > 0 else 0
-        day_wr = (wins / len(day_trades) * 100) if day_trades else 0
+    for d in days:
+        settled = d['won'] + d['lost']
+        if not settled:
+            continue
+        cum_wins += d['won']
+        cum_total += settled
+        cum_pnl += d['pnl_cents']
         
         data_points.append({
-            "date": date,
-            "winRate": round(cum_wr, 1),  # Cumulative win rate (smoother for chart)
-            "dailyWinRate": round(day_wr, 1),
-            "trades": len(day_trades),
-            "won": wins,
-            "lost": losses,
-            "pnlCents": day_pnl,
+            "date": d['date'],
+            "winRate": round(cum_wins / cum_total * 100, 1),  # Cumulative win rate (smoother for chart)
+            "dailyWinRate": round(d['won'] / settled * 100, 1),
+            "trades": settled,
+            "won": d['won'],
+            "lost": d['lost'],
+            "pnlCents": d['pnl_cents'],
             "cumulativePnlCents": cum_pnl,
         })
     
@@ -1101,7 +1059,7 @@ def calculate_win_rate_trend(trades):
     }
 
 
-def calculate_daily_volume(trades):
+def calculate_daily_volume(days):
     """Calculate daily trading volume stats (T754).
     
     Volume = sum of (price * contracts) for ALL trades on a given day.
@@ -1110,51 +1068,35 @@ def calculate_daily_volume(trades):
     Returns:
         dict: todayVolumeCents, yesterdayVolumeCents, volumeHistory (7 days)
     """
-    if not trades:
+    if not days:
         return None
     
     from datetime import timedelta
-    from collections import defaultdict
     
-    # Group trades by day
-    by_day = defaultdict(list)
-    for t in trades:
-        ts = t.get('timestamp', '')
-        if not ts:
-            continue
-        day_key = ts[:10]  # YYYY-MM-DD
-        by_day[day_key].append(t)
-    
-    def calc_day_volume(day_trades):
-        """Calculate total volume for a day's trades."""
-        volume = 0
-        trade_count = 0
-        max_trade = 0
-        for t in day_trades:
-            price = t.get('price', 50)
-            contracts = t.get('contracts', 1)
-            trade_value = price * contracts
-            volume += trade_value
-            trade_count += 1
-            max_trade = max(max_trade, trade_value)
+    by_day = {d['date']: d for d in days}
+    
+    def calc_day_volume(day):
+        """Volume stats for one day rollup (zeros when there were no trades)."""
+        volume = day['volume_cents'] if day else 0
+        trade_count = day['trades'] if day else 0
         return {
             "volumeCents": volume,
             "tradeCount": trade_count,
-            "maxTradeCents": max_trade,
+            "maxTradeCents": day['max_trade_cents'] if day else 0,
             "avgTradeCents": round(volume / trade_count) if trade_count > 0 else 0
         }
     
     today = datetime.now(timezone.utc).date().isoformat()
     yesterday = (datetime.now(timezone.utc).date() - timedelta(days=1)).isoformat()
     
-    today_stats = calc_day_volume(by_day.get(today, []))
-    yesterday_stats = calc_day_volume(by_day.get(yesterday, []))
+    today_stats = calc_day_volume(by_day.get(today))
+    yesterday_stats = calc_day_volume(by_day.get(yesterday))
     
     # Calculate 7-day history for trend
     history = []
     for i in range(7):
         day = (datetime.now(timezone.utc).date() - timedelta(days=i)).isoformat()
-        day_stats = calc_day_volume(by_day.get(day, []))
+        day_stats = calc_day_volume(by_day.get(day))
         history.append({
             "date": day,
             "volumeCents": day_stats["volumeCents"],
@@ -1182,83 +1124,20 @@ def calculate_daily_volume(trades):
     }
 
 
-def calculate_streak_stats(trades):
-    """Calculate streak statistics from trades (T624).
+def calculate_streak_stats(totals):
+    """Streak statistics from the chained day rollups (T624).
     
     Returns:
         dict: longestWinStreak, longestLossStreak, currentStreak, currentStreakType
     """
-    # Filter to settled trades and sort by timestamp
-    settled = [t for t in trades if t.get('result_status') in ['won', 'lost']]
-    settled.sort(key=lambda t: t.get('timestamp', ''))
-    
-    if not settled:
-        return {
-            "longestWinStreak": 0,
-            "longestLossStreak": 0,
-            "currentStreak": 0,
-            "currentStreakType": "none"
-        }
-    
-    # Calculate streaks
-    longest_win = 0
-    longest_loss = 0
-    current_streak = 0
-    current_type = None
-    
-    for t in settled:
-        is_win = t.get('result_status') == 'won'
-        
-        if current_type is None:
-            # First trade
-            current_type = 'win' if is_win else 'loss'
-            current_streak = 1
-        elif (current_type == 'win' and is_win) or (current_type == 'loss' and not is_win):
-            # Streak continues
-            current_streak += 1
-        else:
-            # Streak breaks - record and reset
-            if current_type == 'win':
-                longest_win = max(longest_win, current_streak)
-            else:
-                longest_loss = max(longest_loss, current_streak)
-            current_type = 'win' if is_win else 'loss'
-            current_streak = 1
-    
-    # Don't forget to check the final streak
-    if current_type == 'win':
-        longest_win = max(longest_win, current_streak)
-    elif current_type == 'loss':
-        longest_loss = max(longest_loss, current_streak)
-    
     return {
-        "longestWinStreak": longest_win,
-        "longestLossStreak": longest_loss,
-        "currentStreak": current_streak,
-        "currentStreakType": current_type or "none"
+        "longestWinStreak": totals["longest_win_streak"],
+        "longestLossStreak": totals["longest_loss_streak"],
+        "currentStreak": totals["current_streak"],
+        "currentStreakType": totals["current_streak_type"]
     }
 
 
-def load_trades_from_file(filepath, source_tag=None):
-    """Load trades from a JSONL file, optionally tagging with source."""
-    trades = []
-    if not filepath.exists():
-        return trades
-    
-    with open(filepath, 'r') as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                trade = json.loads(line)
-                if source_tag:
-                    trade['_source'] = source_tag
-                trades.append(trade)
-            except json.JSONDecodeError:
-                continue
-    return trades
-
 def load_v3_trades_from_file(filepath, source_tag='v3'):
     """Load v3 trades from JSONL file.
     
@@ -1310,28 +1189,33 @@ def load_v3_trades_from_file(filepath, source_tag='v3'):
     return trades
 
 
-def load_trades(source='v2'):
-    """Load trades based on source selection."""
-    if source == 'v1':
-        return load_trades_from_file(TRADES_FILE_V1, 'v1')
-    elif source == 'v2':
-        return load_trades_from_file(TRADES_FILE_V2, 'v2')
-    elif source == 'v3':
-        return load_v3_trades_from_file(TRADES_FILE_V3, 'v3')
-    elif source == 'all':
-        v1_trades = load_trades_from_file(TRADES_FILE_V1, 'v1')
-        v2_trades = load_trades_from_file(TRADES_FILE_V2, 'v2')
-        v3_trades = load_v3_trades_from_file(TRADES_FILE_V3, 'v3')
-        # Combine and sort by timestamp
-        combined = v1_trades + v2_trades + v3_trades
-        combined.sort(key=lambda t: t.get('timestamp', ''))
-        return combined
-    else:
-        return load_trades_from_file(TRADES_FILE_V2, 'v2')
+def load_day_rollups(source='v2'):
+    """Refresh the trade index and return the per-day rollups for a source selection."""
+    log = TradeLog()
+    try:
+        log.refresh()
+        return DailyRollup(log, STATS_SOURCES.get(source, STATS_SOURCES['v2'])).days()
+    finally:
+        log.close()
+
 
-def calculate_stats(trades, source='v2'):
-    """Calculate trading statistics."""
-    if not trades:
+def _window(days, start, end=None):
+    """Combined rollup for dates in [start, end)."""
+    return combine([d for d in days if d['date'] >= start and (end is None or d['date'] < end)])
+
+
+def _period_stats(totals):
+    settled = totals['won'] + totals['lost']
+    return {
+        "trades": settled,
+        "winRate": round(totals['won'] / settled * 100, 1) if settled else 0,
+        "pnlCents": totals['pnl_cents'],
+    }
+
+
+def calculate_stats(days, source='v2'):
+    """Calculate trading statistics from per-day rollups (see load_day_rollups)."""
+    if not days:
         return {
             "source": source,
             "totalTrades": 0,
@@ -1345,205 +1229,89 @@ def calculate_stats(trades, source='v2'):
             "lastUpdated": datetime.now(timezone.utc).isoformat()
         }
     
-    # Filter settled trades
-    settled = [t for t in trades if t.get('result_status') in ['won', 'lost']]
-    
-    # Calculate overall stats
-    wins = sum(1 for t in settled if t.get('result_status') == 'won')
-    total = len(settled)
-    win_rate = (wins / total * 100) if total > 0 else 0
-    
-    # Calculate PnL
-    total_pnl = 0
-    gross_profit = 0
-    gross_loss = 0
-    
-    for t in settled:
-        price = t.get('price', 50)
-        contracts = t.get('contracts', 1)
-        won = t.get('result_status') == 'won'
-        
-        if won:
-            profit = (100 - price) * contracts
-            total_pnl += profit
-            gross_profit += profit
-        else:
-            loss = price * contracts
-            total_pnl -= loss
-            gross_loss += loss
-    
-    # Today's stats
-    today = datetime.now(timezone.utc).date().isoformat()
-    today_trades = [t for t in settled if t.get('timestamp', '').startswith(today)]
-    today_wins = sum(1 for t in today_trades if t.get('result_status') == 'won')
-    today_total = len(today_trades)
-    today_win_rate = (today_wins / today_total * 100) if today_total > 0 else 0
-    
-    today_pnl = 0
-    for t in today_trades:
-        price = t.get('price', 50)
-        contracts = t.get('contracts', 1)
-        if t.get('result_status') == 'won':
-            today_pnl += (100 - price) * contracts
-        else:
-            today_pnl -= price * contracts
-    
-    # Yesterday's stats (for comparison) - T364
     from datetime import timedelta
-    yesterday = (datetime.now(timezone.utc).date() - timedelta(days=1)).isoformat()
-    yesterday_trades = [t for t in settled if t.get('timestamp', '').startswith(yesterday)]
-    yesterday_wins = sum(1 for t in yesterday_trades if t.get('result_status') == 'won')
-    yesterday_total = len(yesterday_trades)
-    yesterday_win_rate = (yesterday_wins / yesterday_total * 100) if yesterday_total > 0 else 0
-    
-    yesterday_pnl = 0
-    for t in yesterday_trades:
-        price = t.get('price', 50)
-        contracts = t.get('contracts', 1)
-        if t.get('result_status') == 'won':
-            yesterday_pnl += (100 - price) * contracts
-        else:
-            yesterday_pnl -= price * contracts
-    
-    # Last 7 days stats (for week comparison) - T364
-    week_ago = (datetime.now(timezone.utc).date() - timedelta(days=7)).isoformat()
-    prev_week_start = (datetime.now(timezone.utc).date() - timedelta(days=14)).isoformat()
-    
-    this_week_trades = [t for t in settled if t.get('timestamp', '') >= week_ago]
-    prev_week_trades = [t for t in settled if prev_week_start <= t.get('timestamp', '') < week_ago]
-    
-    def calc_period_stats(period_trades):
-        wins = sum(1 for t in period_trades if t.get('result_status') == 'won')
-        total = len(period_trades)
-        wr = (wins / total * 100) if total > 0 else 0
-        pnl = 0
-        for t in period_trades:
-            price = t.get('price', 50)
-            contracts = t.get('contracts', 1)
-            if t.get('result_status') == 'won':
-                pnl += (100 - price) * contracts
-            else:
-                pnl -= price * contracts
-        return {"trades": total, "winRate": round(wr, 1), "pnlCents": pnl}
     
-    this_week_stats = calc_period_stats(this_week_trades)
-    prev_week_stats = calc_period_stats(prev_week_trades)
-    
-    # Latency stats
-    latencies = [t.get('latency_ms') for t in trades if t.get('latency_ms') is not None]
+    totals = combine(days)
+    overall = _period_stats(totals)
+    total_pnl = totals['pnl_cents']
+    gross_profit = totals['gross_profit_cents']
+    gross_loss = totals['gross_loss_cents']
+    
+    # Today / yesterday (T364) and week-over-week windows
+    today_date = datetime.now(timezone.utc).date()
+    today = today_date.isoformat()
+    yesterday = (today_date - timedelta(days=1)).isoformat()
+    week_ago = (today_date - timedelta(days=7)).isoformat()
+    prev_week_start = (today_date - timedelta(days=14)).isoformat()
+    
+    today_stats = _period_stats(_window(days, today))
+    yesterday_stats = _period_stats(_window(days, yesterday, today))
+    this_week_stats = _period_stats(_window(days, week_ago))
+    prev_week_stats = _period_stats(_window(days, prev_week_start, week_ago))
+    
+    # Latency stats (merged from the per-day sketches; p95 is within ~2.5%)
     latency_stats = {}
-    if latencies:
-        latencies_sorted = sorted(latencies)
-        n = len(latencies)
+    latency_days = [d for d in days if d['latency']['count']]
+    if latency_days:
+        sketch = totals['latency']
+        n = sketch['count']
         latency_stats = {
-            "avgLatencyMs": round(sum(latencies) / n),
-            "p95LatencyMs": latencies_sorted[int(n * 0.95)] if n >= 20 else latencies_sorted[-1],
-            "minLatencyMs": latencies_sorted[0],
-            "maxLatencyMs": latencies_sorted[-1],
+            "avgLatencyMs": round(sketch['sum'] / n),
+            "p95LatencyMs": round(latency_quantile(sketch, 0.95)) if n >= 20 else sketch['max'],
+            "minLatencyMs": sketch['min'],
+            "maxLatencyMs": sketch['max'],
             "latencyTradeCount": n
         }
         
         # Compute daily latency trend (last 14 days)
-        from collections import defaultdict
-        by_day = defaultdict(list)
-        for t in trades:
-            if t.get('latency_ms') is None:
-                continue
-            ts = t.get('timestamp', '')
-            if not ts:
-                continue
-            day_key = ts[:10]  # YYYY-MM-DD
-            by_day[day_key].append(t['latency_ms'])
-        
         latency_trend = []
-        for day in sorted(by_day.keys())[-14:]:  # Last 14 days
-            day_latencies = sorted(by_day[day])
-            n_day = len(day_latencies)
+        for d in latency_days[-14:]:
+            day_sketch = d['latency']
+            n_day = day_sketch['count']
             latency_trend.append({
-                "timestamp": f"{day}T12:00:00Z",
-                "avgMs": round(sum(day_latencies) / n_day),
-                "p95Ms": day_latencies[int(n_day * 0.95)] if n_day >= 5 else day_latencies[-1],
-                "minMs": day_latencies[0],
-                "maxMs": day_latencies[-1],
+                "timestamp": f"{d['date']}T12:00:00Z",
+                "avgMs": round(day_sketch['sum'] / n_day),
+                "p95Ms": round(latency_quantile(day_sketch, 0.95)) if n_day >= 5 else day_sketch['max'],
+                "minMs": day_sketch['min'],
+                "maxMs": day_sketch['max'],
                 "count": n_day
             })
         latency_stats["trend"] = latency_trend
     
+    def breakdown(tallies, labels):
+        """{label: tally key} -> {label: trades / winRate / pnlCents}."""
+        out = {}
+        for label, key in labels.items():
+            settled, won, pnl = tallies.get(key, (0, 0, 0))
+            out[label] = {
+                "trades": settled,
+                "winRate": round(won / settled * 100, 1) if settled > 0 else 0,
+                "pnlCents": pnl
+            }
+        return out
+    
     # By asset breakdown
-    by_asset = {}
-    for asset in ['BTC', 'ETH']:
-        asset_trades = [t for t in settled if t.get('asset', 'BTC') == asset]
-        asset_wins = sum(1 for t in asset_trades if t.get('result_status') == 'won')
-        asset_total = len(asset_trades)
-        
-        asset_pnl = 0
-        for t in asset_trades:
-            price = t.get('price', 50)
-            contracts = t.get('contracts', 1)
-            if t.get('result_status') == 'won':
-                asset_pnl += (100 - price) * contracts
-            else:
-                asset_pnl -= price * contracts
-        
-        by_asset[asset] = {
-            "trades": asset_total,
-            "winRate": round(asset_wins / asset_total * 100, 1) if asset_total > 0 else 0,
-            "pnlCents": asset_pnl
-        }
+    by_asset = breakdown(totals['asset'], {'BTC': 'BTC', 'ETH': 'ETH'})
     
     # Profit factor
     profit_factor = gross_profit / gross_loss if gross_loss > 0 else float('inf') if gross_profit > 0 else 0
     
-    # Max drawdown
-    cumulative = 0
-    peak = 0
-    max_drawdown = 0
-    
-    for t in settled:
-        price = t.get('price', 50)
-        contracts = t.get('contracts', 1)
-        if t.get('result_status') == 'won':
-            cumulative += (100 - price) * contracts
-        else:
-            cumulative -= price * contracts
-        
-        if cumulative > peak:
-            peak = cumulative
-        drawdown = peak - cumulative
-        if drawdown > max_drawdown:
-            max_drawdown = drawdown
-    
+    # Max drawdown (chained across days in the rollup)
+    max_drawdown = totals['max_drawdown_cents']
+    peak = totals['peak_cents']
     max_dd_percent = (max_drawdown / peak * 100) if peak > 0 else 0
     
     # By source breakdown (only when source='all')
     by_source = None
     if source == 'all':
-        by_source = {}
-        for src in ['v1', 'v2', 'v3']:
-            src_trades = [t for t in settled if t.get('_source') == src]
-            src_wins = sum(1 for t in src_trades if t.get('result_status') == 'won')
-            src_total = len(src_trades)
-            
-            src_pnl = 0
-            for t in src_trades:
-                price = t.get('price', 50)
-                contracts = t.get('contracts', 1)
-                if t.get('result_status') == 'won':
-                    src_pnl += (100 - price) * contracts
-                else:
-                    src_pnl -= price * contracts
-            
-            by_source[src] = {
-                "trades": src_total,
-                "winRate": round(src_wins / src_total * 100, 1) if src_total > 0 else 0,
-                "pnlCents": src_pnl,
-                "pnlDollars": round(src_pnl / 100, 2)
-            }
+        by_source = breakdown(totals['source'], {src: STATS_SOURCES[src][0] for src in ('v1', 'v2', 'v3')})
+        for src_stats in by_source.values():
+            src_stats["pnlDollars"] = round(src_stats["pnlCents"] / 100, 2)
     
     result = {
         "source": source,
-        "totalTrades": total,
-        "winRate": round(win_rate, 1),
+        "totalTrades": overall['trades'],
+        "winRate": overall['winRate'],
         "pnlCents": total_pnl,
         "pnlDollars": round(total_pnl / 100, 2),
         "grossProfitCents": gross_profit,
@@ -1551,18 +1319,18 @@ def calculate_stats(trades, source='v2'):
         "profitFactor": round(profit_factor, 2) if profit_factor != float('inf') else "∞",
         "maxDrawdownCents": max_drawdown,
         "maxDrawdownPercent": round(max_dd_percent, 1),
-        "todayTrades": today_total,
-        "todayWinRate": round(today_win_rate, 1),
-        "todayPnlCents": today_pnl,
+        "todayTrades": today_stats['trades'],
+        "todayWinRate": today_stats['winRate'],
+        "todayPnlCents": today_stats['pnlCents'],
         # Yesterday comparison (T364)
-        "yesterdayTrades": yesterday_total,
-        "yesterdayWinRate": round(yesterday_win_rate, 1),
-        "yesterdayPnlCents": yesterday_pnl,
+        "yesterdayTrades": yesterday_stats['trades'],
+        "yesterdayWinRate": yesterday_stats['winRate'],
+        "yesterdayPnlCents": yesterday_stats['pnlCents'],
         # Week comparison (T364)
         "thisWeek": this_week_stats,
         "prevWeek": prev_week_stats,
         "byAsset": by_asset,
-        "pendingTrades": len([t for t in trades if t.get('result_status') == 'pending']),
+        "pendingTrades": totals['pending'],
         **latency_stats,
         "lastUpdated": datetime.now(timezone.utc).isoformat()
     }
@@ -1601,11 +1369,11 @@ def calculate_stats(trades, source='v2'):
         result["settlements"] = settlements
     
     # Add streak stats (T624)
-    streak_stats = calculate_streak_stats(trades)
+    streak_stats = calculate_streak_stats(totals)
     result.update(streak_stats)
     
     # Add edge distribution (T368)
-    edge_dist = calculate_edge_distribution(trades)
+    edge_dist = calculate_edge_distribution(days)
     result["edgeDistribution"] = edge_dist
     
     # Add concentration history (T482)
@@ -1644,12 +1412,12 @@ def calculate_stats(trades, source='v2'):
         result["stopLossStats"] = stop_loss_stats
     
     # Add daily volume stats (T754)
-    volume_stats = calculate_daily_volume(trades)
+    volume_stats = calculate_daily_volume(days)
     if volume_stats:
         result["dailyVolume"] = volume_stats
     
     # Add win rate trend data for dashboard chart (DASH-001)
-    win_rate_trend = calculate_win_rate_trend(trades)
+    win_rate_trend = calculate_win_rate_trend(days)
     if win_rate_trend:
         result["winRateTrend"] = win_rate_trend
     
@@ -1741,102 +1509,43 @@ def save_gist_id(gist_id):
     GIST_ID_FILE.write_text(gist_id)
 
 def create_gist(stats_json):
-    """Create a new public gist with retry logic (T767)."""
-    # Write stats to temp file
-    temp_file = Path("/tmp") / STATS_FILENAME
-    temp_file.write_text(stats_json)
-    
-    last_error = None
-    for attempt in range(MAX_RETRIES):
-        if attempt > 0:
-            backoff = INITIAL_BACKOFF_SECONDS * (2 ** (attempt - 1))
-            print(f"  Retry {attempt}/{MAX_RETRIES-1} in {backoff}s...")
-            time.sleep(backoff)
-        
-        # Create gist
-        result = subprocess.run(
-            ["gh", "gist", "create", str(temp_file), "--public", "--desc", "Onde Trading Stats (auto-updated)"],
-            capture_output=True, text=True
-        )
-        
-        if result.returncode == 0:
-            # Parse gist URL to get ID
-            gist_url = result.stdout.strip()
-            gist_id = gist_url.split("/")[-1]
-            
-            print(f"Created gist: {gist_url}")
-            print(f"Raw URL: https://gist.githubusercontent.com/FreeRiverHouse/{gist_id}/raw/{STATS_FILENAME}")
-            
-            track_consecutive_failures(success=True)
-            return gist_id
-        
-        last_error = result.stderr
-        print(f"Error creating gist (attempt {attempt + 1}/{MAX_RETRIES}): {last_error}")
+    """Create a new public gist (T767; retries handled by the pooled publisher)."""
+    gist_id = gist_publisher.create({STATS_FILENAME: stats_json}, "Onde Trading Stats (auto-updated)")
+    if gist_id:
+        print(f"Created gist: https://gist.github.com/{gist_id}")
+        print(f"Raw URL: https://gist.githubusercontent.com/FreeRiverHouse/{gist_id}/raw/{STATS_FILENAME}")
+        track_consecutive_failures(success=True)
+        return gist_id
     
-    # All retries failed
-    log_gist_error(f"create_gist failed after {MAX_RETRIES} attempts: {last_error}")
+    log_gist_error(f"create_gist failed after {MAX_RETRIES} attempts")
     track_consecutive_failures(success=False)
     return None
 
 
 def update_gist(gist_id, stats_json):
-    """Update existing gist using GitHub API with retry logic (T767)."""
-    last_error = None
-    for attempt in range(MAX_RETRIES):
-        if attempt > 0:
-            backoff = INITIAL_BACKOFF_SECONDS * (2 ** (attempt - 1))
-            print(f"  Retry {attempt}/{MAX_RETRIES-1} in {backoff}s...")
-            time.sleep(backoff)
-        
-        # Update gist via gh api
-        result = subprocess.run(
-            ["gh", "api", "-X", "PATCH", f"/gists/{gist_id}", "-f", f"files[{STATS_FILENAME}][content]={stats_json}"],
-            capture_output=True, text=True
-        )
-        
-        if result.returncode == 0:
-            print(f"Updated gist: https://gist.github.com/{gist_id}")
-            track_consecutive_failures(success=True)
-            return True
-        
-        last_error = result.stderr
-        # Check for rate limit (common GitHub API error)
-        if "rate limit" in last_error.lower():
-            print(f"⚠️ GitHub API rate limit hit, backing off...")
-        print(f"Error updating gist (attempt {attempt + 1}/{MAX_RETRIES}): {last_error}")
-    
-    # All retries failed
-    log_gist_error(f"update_gist({gist_id}) failed after {MAX_RETRIES} attempts: {last_error}")
-    track_consecutive_failures(success=False)
-    return False
+    """Update the stats file of an existing gist (T767)."""
+    return update_gist_multi(gist_id, {STATS_FILENAME: stats_json})
 
 def update_gist_multi(gist_id, files_dict):
-    """Update existing gist with multiple files using GitHub API (T767)."""
-    import tempfile
+    """Publish changed files to an existing gist in a single PATCH (T767).
     
-    # Build the -f arguments for multiple files
-    last_error = None
-    for attempt in range(MAX_RETRIES):
-        if attempt > 0:
-            backoff = INITIAL_BACKOFF_SECONDS * (2 ** (attempt - 1))
-            print(f"  Retry {attempt}/{MAX_RETRIES-1} in {backoff}s...")
-            time.sleep(backoff)
-        
-        # Build gh api command with multiple file contents
-        cmd = ["gh", "api", "-X", "PATCH", f"/gists/{gist_id}"]
-        for filename, content in files_dict.items():
-            cmd.extend(["-f", f"files[{filename}][content]={content}"])
-        
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        
-        if result.returncode == 0:
-            print(f"Updated gist with {len(files_dict)} files: https://gist.github.com/{gist_id}")
-            track_consecutive_failures(success=True)
-            return True
-        
-        last_error = result.stderr
-        print(f"Error updating gist (attempt {attempt + 1}/{MAX_RETRIES}): {last_error}")
+    Goes through the shared gist publisher: files whose content matches the
+    last push are skipped, retries use jittered backoff on the pooled session.
+    """
+    result = gist_publisher.publish(gist_id, files_dict)
     
+    if result["ok"]:
+        if result["sent"]:
+            print(f"Updated gist with {len(result['sent'])} files: https://gist.github.com/{gist_id}")
+        else:
+            print(f"Gist {gist_id} already up to date")
+        track_consecutive_failures(success=True)
+        return True
+    
+    last_error = result.get("error", "")
+    if "rate limit" in last_error.lower():
+        print(f"⚠️ GitHub API rate limit hit, will retry next run")
+    print(f"Error updating gist: {last_error}")
     log_gist_error(f"update_gist_multi({gist_id}) failed after {MAX_RETRIES} attempts: {last_error}")
     track_consecutive_failures(success=False)
     return False
@@ -1855,9 +1564,8 @@ def main():
                 print(f"Invalid source '{source}'. Use v1, v2, v3, or all.")
                 sys.exit(1)
     
-    # Load trades and calculate stats
-    trades = load_trades(source)
-    stats = calculate_stats(trades, source)
+    # Calculate stats from the incremental per-day rollups
+    stats = calculate_stats(load_day_rollups(source), source)
     
     # Add v3 paper trading summary from paper-trade-state.json (primary source)
     paper_state_file = Path(__file__).parent.parent / "data" / "trading" / "paper-trade-state.json"
@@ -1961,10 +1669,7 @@ def main():
             files[POLYMARKET_STATS_FILENAME] = pm_json
             print(f"Also pushing Polymarket data as {POLYMARKET_STATS_FILENAME}")
         
-        if len(files) > 1:
-            update_gist_multi(gist_id, files)
-        else:
-            update_gist(gist_id, stats_json)
+        update_gist_multi(gist_id, files)
     
     # Print raw URL for static site
     if gist_id:
@@ -9,10 +9,13 @@ Cron: */10 * * * * python3 /Users/mattia/Projects/Onde/scripts/push-tasks-to-gis
 import json
 import os
 import re
-import subprocess
+import sys
 from datetime import datetime
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).parent))
+import gist_publisher  # noqa: E402
+
 # Config
 PROJECT_DIR = Path(__file__).parent.parent
 GIST_ID = os.getenv("TASKS_GIST_ID", "0c71303677d56c9f579b40094128b00b")
@@ -155,7 +158,7 @@ def get_stats(tasks: list[dict]) -> dict:
 
 
 def push_to_gist(data: dict) -> bool:
-    """Push data to GitHub Gist using gh CLI."""
+    """Push data to GitHub Gist via the shared gist publisher."""
     # Save locally first
     output_file = PROJECT_DIR / "data" / "tasks-dashboard.json"
     output_file.parent.mkdir(parents=True, exist_ok=True)
@@ -163,21 +166,14 @@ def push_to_gist(data: dict) -> bool:
     output_file.write_text(content)
     print(f"Saved locally to {output_file}")
     
-    # Push via gh CLI
-    try:
-        result = subprocess.run(
-            ["gh", "gist", "edit", GIST_ID, "-f", GIST_FILENAME, "-"],
-            input=content, capture_output=True, text=True, timeout=15
-        )
-        if result.returncode == 0:
-            print(f"✅ Pushed {len(data.get('tasks', []))} tasks to Gist {GIST_ID}")
-            return True
-        else:
-            print(f"❌ Gist push failed: {result.stderr[:200]}")
-            return False
-    except Exception as e:
-        print(f"❌ Error pushing to Gist: {e}")
-        return False
+    # Push through the shared publisher (skipped when unchanged since the last push)
+    result = gist_publisher.publish(GIST_ID, {GIST_FILENAME: content})
+    if result["ok"]:
+        print(f"✅ Pushed {len(data.get('tasks', []))} tasks to Gist {GIST_ID}" if result["sent"]
+              else f"✅ Gist {GIST_ID} already up to date")
+        return True
+    print(f"❌ Gist push failed: {result.get('error', '')[:200]}")
+    return False
 
 
 def main():
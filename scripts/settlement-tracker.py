@@ -11,12 +11,15 @@ Usage:
 
 import json
 import sys
-import requests
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
 import re
 from typing import Optional, Dict, List, Tuple
 
+# Pooled keep-alive HTTP transport shared with the traders
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+import http_pool
+
 # ============== CONFIG ==============
 TRADE_LOG_FILE = Path(__file__).parent / "kalshi-trades.jsonl"
 SETTLEMENT_FILE = Path(__file__).parent / "kalshi-settlements.json"
@@ -88,7 +91,7 @@ def get_btc_price_at_time(dt: datetime) -> Optional[float]:
             "end": end_iso,
             "granularity": 3600
         }
-        resp = requests.get(url, params=params, timeout=10)
+        resp = http_pool.get(url, params=params, timeout=10)
         resp.raise_for_status()
         data = resp.json()
         
@@ -111,7 +114,7 @@ def get_btc_price_at_time(dt: datetime) -> Optional[float]:
             "limit": 1,
             "toTs": ts + 3600  # End of the hour
         }
-        resp = requests.get(url, params=params, timeout=10)
+        resp = http_pool.get(url, params=params, timeout=10)
         resp.raise_for_status()
         data = resp.json()
         
@@ -143,12 +146,12 @@ def get_btc_price_at_time(dt: datetime) -> Optional[float]:
             "from": start_ts,
             "to": end_ts
         }
-        resp = requests.get(url, params=params, timeout=10)
+        resp = http_pool.get(url, params=params, timeout=10)
         
         if resp.status_code == 429:
             print("⚠️ Rate limited by CoinGecko, waiting 30s...")
             time_module.sleep(30)
-            resp = requests.get(url, params=params, timeout=10)
+            resp = http_pool.get(url, params=params, timeout=10)
         
         if resp.status_code != 200:
             return None
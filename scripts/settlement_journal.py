@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Settlement Journal
+Append-only record of settled Kalshi markets, shared by the trader's
+settlement step and its risk checks.
+
+Each line is one settled ticker: {"ticker", "market_result", "settled_at"}.
+A ticker is written once and never queried again. The trade log itself is
+only folded with the journal occasionally (see `compact_trade_log`), so a
+settlement pass costs one small append instead of rewriting the full log.
+
+Usage:
+    from settlement_journal import SettlementJournal
+
+    journal = SettlementJournal(PROJECT_ROOT / "data" / "trading" / "kalshi-unified-settlements.jsonl")
+    journal.get("KXBTC-...")                       # "yes" / "no" / None
+    journal.record({"KXBTC-...": "yes"})           # append newly settled tickers
+    status = journal.status_for(entry)             # trade entry -> won/lost/pending
+"""
+
+import json
+import os
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+
+
+def trade_outcome(action: str, market_result: str) -> str:
+    """won/lost for a BUY_YES/BUY_NO trade given the market's result."""
+    side = "yes" if action == "BUY_YES" else "no"
+    return "won" if side == market_result else "lost"
+
+
+class SettlementJournal:
+    """ticker -> market_result, loaded once and appended to as markets settle."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._results = {}
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path) as f:
+                for line in f:
+                    try:
+                        rec = json.loads(line)
+                    except Exception:
+                        continue
+                    if isinstance(rec, dict) and rec.get("ticker") and rec.get("market_result"):
+                        self._results[rec["ticker"]] = rec["market_result"]
+        except (FileNotFoundError, OSError):
+            pass
+
+    def __len__(self):
+        return len(self._results)
+
+    def __contains__(self, ticker):
+        return ticker in self._results
+
+    def get(self, ticker: str):
+        return self._results.get(ticker)
+
+    def record(self, results: dict) -> int:
+        """Append newly settled {ticker: market_result}; already-known tickers are ignored."""
+        now = datetime.now(timezone.utc).isoformat()
+        with self._lock:
+            fresh = {t: r for t, r in results.items() if r and t not in self._results}
+            if not fresh:
+                return 0
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a") as f:
+                for ticker, result in fresh.items():
+                    f.write(json.dumps({"ticker": ticker, "market_result": result, "settled_at": now}) + "\n")
+            self._results.update(fresh)
+        return len(fresh)
+
+    def status_for(self, entry: dict) -> str:
+        """Entry's result_status with journal settlements applied."""
+        status = entry.get("result_status", "pending")
+        if status == "pending":
+            market_result = self._results.get(entry.get("ticker", ""))
+            if market_result:
+                return trade_outcome(entry.get("action", ""), market_result)
+        return status
+
+    def compact_trade_log(self, trade_log: Path) -> int:
+        """
+        Fold journal results into `trade_log` (pending -> won/lost) via an
+        atomic temp-file replace. Returns the number of entries updated.
+        """
+        trade_log = Path(trade_log)
+        if not trade_log.exists() or not self._results:
+            return 0
+        updated = 0
+        tmp = trade_log.with_suffix(trade_log.suffix + ".tmp")
+        with open(trade_log) as src, open(tmp, "w") as dst:
+            for line in src:
+                try:
+                    entry = json.loads(line)
+                except Exception:
+                    dst.write(line)
+                    continue
+                status = self.status_for(entry)
+                if status != entry.get("result_status", "pending"):
+                    entry["result_status"] = status
+                    entry["market_result"] = self._results[entry["ticker"]]
+                    entry["settled_at"] = datetime.now(timezone.utc).isoformat()
+                    updated += 1
+                    line = json.dumps(entry) + "\n"
+                dst.write(line)
+        if updated:
+            os.replace(tmp, trade_log)
+        else:
+            tmp.unlink(missing_ok=True)
+        return updated
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Staged Paragraph Pipeline
+Streams paragraphs through an ordered chain of stages (a linear DAG), each
+stage with its own bounded worker pool. Stage N+1 starts on paragraph k as
+soon as stage N finishes it, while stage N moves on to paragraph k+1, so a
+book no longer waits for a whole cycle to finish before the next begins.
+
+Every successful stage result is appended to a JSONL checkpoint keyed by a
+hash of (namespace, stage, source paragraph, stage input). Reruns replay
+those results instead of calling the model again, so a crash only loses
+the in-flight paragraphs. Failed results (e.g. "[TIMEOUT]") are never
+checkpointed; the paragraph passes through unchanged and is retried on the
+next run. An exception anywhere in a paragraph's step (checkpoint write,
+failure check) ends that paragraph with its last good text, counted as
+failed for the stage; an exception in on_done is recorded too. Both land
+in `errors`, and run() always returns.
+
+Usage:
+    from staged_pipeline import Stage, StagedPipeline, ParagraphCheckpoint
+
+    stages = [Stage("fix", lambda text, src: fix(text), workers=2),
+              Stage("check", lambda text, src: check(src, text), workers=2)]
+    checkpoint = ParagraphCheckpoint("out/checkpoint.jsonl", namespace="llama3:70b")
+    pipe = StagedPipeline(stages, checkpoint)
+    final = pipe.run(translated_paragraphs, sources=original_paragraphs)
+    print(pipe.stats())   # per-stage done / cached / failed / paragraphs_per_min
+"""
+
+import hashlib
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+
+def is_failure(result: str) -> bool:
+    """Pipelines signal errors in-band as "[TIMEOUT]" / "[ERRORE: ...]"; empty output is a failure too."""
+    return not result or result.startswith("[")
+
+
+@dataclass
+class Stage:
+    """One pipeline step: fn(text, source) -> new text, run by `workers` threads."""
+    name: str
+    fn: Callable[[str, str], str]
+    workers: int = 1
+
+
+@dataclass
+class StageStats:
+    name: str
+    done: int = 0
+    cached: int = 0
+    failed: int = 0
+    busy_sec: float = 0.0
+    first_start: Optional[float] = None
+    last_end: Optional[float] = None
+
+    @property
+    def processed(self) -> int:
+        return self.done - self.cached
+
+    @property
+    def span_sec(self) -> float:
+        if self.first_start is None or self.last_end is None:
+            return 0.0
+        return self.last_end - self.first_start
+
+    @property
+    def paragraphs_per_min(self) -> float:
+        """Model-processed paragraphs per wall-clock minute (checkpoint hits excluded)."""
+        return self.processed * 60 / self.span_sec if self.span_sec > 0 else 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "done": self.done,
+            "cached": self.cached,
+            "failed": self.failed,
+            "duration_sec": round(self.span_sec, 1),
+            "busy_sec": round(self.busy_sec, 1),
+            "paragraphs_per_min": round(self.paragraphs_per_min, 2),
+        }
+
+
+class ParagraphCheckpoint:
+    """Append-only JSONL store of stage results, keyed by content hash."""
+
+    def __init__(self, path, namespace: str = ""):
+        self.path = Path(path)
+        self.namespace = namespace
+        self._results: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        if self.path.exists():
+            with open(self.path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        row = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # torn last line from a crash
+                    self._results[row["key"]] = row["text"]
+        self.loaded = len(self._results)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def key(self, stage: str, source: str, text: str) -> str:
+        h = hashlib.sha256()
+        for part in (self.namespace, stage, source, text):
+            h.update(part.encode("utf-8"))
+            h.update(b"\x1f")
+        return h.hexdigest()[:32]
+
+    def get(self, key: str) -> Optional[str]:
+        return self._results.get(key)
+
+    def put(self, key: str, stage: str, text: str, seconds: float = 0.0):
+        row = json.dumps({"key": key, "stage": stage, "text": text, "sec": round(seconds, 2)},
+                         ensure_ascii=False)
+        with self._lock:
+            self._results[key] = text
+            self._file.write(row + "\n")
+            self._file.flush()
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+
+class StagedPipeline:
+    """
+    Run paragraphs through `stages` concurrently. run() returns the final
+    text per paragraph in input order; stats() reports per-stage throughput.
+    """
+
+    def __init__(self, stages: List[Stage], checkpoint: Optional[ParagraphCheckpoint] = None,
+                 failed: Callable[[str], bool] = is_failure,
+                 on_done: Optional[Callable[[int, str], None]] = None):
+        self.stages = stages
+        self.checkpoint = checkpoint
+        self.failed = failed
+        self.on_done = on_done
+        self._stats = {s.name: StageStats(s.name) for s in stages}
+        self._lock = threading.Lock()
+        self.wall_sec = 0.0
+        self.errors: List[str] = []  # "paragraph <i> <stage|on_done>: <exception>"
+
+    def run(self, texts: List[str], sources: Optional[List[str]] = None) -> List[str]:
+        n = len(texts)
+        sources = list(sources or [])
+        sources += [""] * (n - len(sources))
+        results = list(texts)
+        remaining = [n]
+        finished = threading.Event()
+        pools = [ThreadPoolExecutor(max_workers=max(1, s.workers), thread_name_prefix=f"stage-{s.name}")
+                 for s in self.stages]
+
+        def finish(i: int, text: str):
+            results[i] = text
+            try:
+                if self.on_done:
+                    self.on_done(i, text)
+            except Exception as e:
+                self._error(i, "on_done", e)
+            finally:
+                with self._lock:
+                    remaining[0] -= 1
+                    if remaining[0] == 0:
+                        finished.set()
+
+        def advance(stage_idx: int, i: int, text: str):
+            if stage_idx < len(self.stages):
+                pools[stage_idx].submit(step, stage_idx, i, text)
+            else:
+                finish(i, text)
+
+        def step(stage_idx: int, i: int, text: str):
+            # Runs in a pool thread: nothing would observe an exception, and the run would hang
+            stage = self.stages[stage_idx]
+            stats = self._stats[stage.name]
+            try:
+                out = self._apply(stage, stats, text, sources[i])
+            except Exception as e:
+                with self._lock:
+                    stats.done += 1
+                    stats.failed += 1
+                self._error(i, stage.name, e)
+                finish(i, text)
+                return
+            advance(stage_idx + 1, i, out)
+
+        start = time.time()
+        try:
+            if n == 0:
+                finished.set()
+            for i, text in enumerate(texts):
+                advance(0, i, text)
+            finished.wait()
+        finally:
+            for pool in pools:
+                pool.shutdown(wait=True)
+            self.wall_sec = time.time() - start
+        return results
+
+    def _apply(self, stage: Stage, stats: StageStats, text: str, source: str) -> str:
+        key = self.checkpoint.key(stage.name, source, text) if self.checkpoint is not None else None
+        hit = self.checkpoint.get(key) if key else None
+        if hit is not None:
+            with self._lock:
+                stats.done += 1
+                stats.cached += 1
+            return hit
+
+        t0 = time.time()
+        try:
+            out = stage.fn(text, source)
+        except Exception as e:
+            out = f"[ERRORE: {e}]"
+        t1 = time.time()
+        bad = self.failed(out)
+        if not bad and key:
+            self.checkpoint.put(key, stage.name, out, t1 - t0)
+        with self._lock:
+            stats.done += 1
+            stats.failed += bad
+            stats.busy_sec += t1 - t0
+            stats.first_start = t0 if stats.first_start is None else min(stats.first_start, t0)
+            stats.last_end = t1 if stats.last_end is None else max(stats.last_end, t1)
+        return text if bad else out
+
+    def _error(self, i: int, where: str, e: Exception):
+        with self._lock:
+            self.errors.append(f"paragraph {i} {where}: {e!r}")
+
+    def stats(self) -> Dict[str, dict]:
+        with self._lock:
+            return {name: s.to_dict() for name, s in self._stats.items()}
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Stats Rollup
+Persisted per-day aggregates over the trade index (scripts/trade_log.py)
+for the dashboard stats pushers.
+
+Each day of a source scope (e.g. ["v2"] or ["legacy", "v2", "v3"]) is
+folded once into a small JSON record: win/loss/pending counts, PnL, gross
+profit/loss, volume, edge-bucket tallies, a latency sketch (sum / count /
+min / max plus a log-spaced histogram, so the all-time p95 merges in
+O(days) instead of O(trades)), and the streak and drawdown summaries
+needed to chain days in order. Records live in the
+`rollups` table of the trade index DB, stamped with the generation from
+`day_versions`; a refresh that appends trades or settles tickers only
+marks the days it touched, so only those days are re-folded. Everything
+the dashboard shows is then derived from the day records in O(days).
+
+Usage:
+    from trade_log import TradeLog
+    from stats_rollup import DailyRollup, combine
+
+    log = TradeLog()
+    log.refresh()
+    days = DailyRollup(log, ["v2"]).days()      # [{"date": "2026-01-29", "won": .., ...}, ...]
+    totals = combine(days)                      # won/lost/pnl + longest streaks + max drawdown
+    latency_quantile(totals["latency"], 0.95)   # within ~2.5% of the exact p95
+"""
+
+import json
+import math
+
+EDGE_BOUNDS = (0.0, 0.05, 0.10, 0.15, 0.20, 0.30, 1.0)
+LATENCY_GROWTH = 1.05  # histogram bin i holds latencies in [GROWTH**i, GROWTH**(i+1)) ms
+ROLLUP_VERSION = 2     # part of the scope, so records in an older layout are re-folded
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS rollups (
+    scope   TEXT,
+    date    TEXT,
+    gen     INTEGER,
+    data    TEXT,
+    PRIMARY KEY (scope, date)
+)
+"""
+
+SUM_FIELDS = ("trades", "won", "lost", "pending", "pnl_cents", "gross_profit_cents",
+              "gross_loss_cents", "volume_cents", "edge_trades", "edge_settled")
+BREAKDOWNS = ("asset", "source")  # per-day [settled, won, pnl_cents] tallies
+
+ROW_SQL = """
+SELECT date, source, asset, result, pnl_cents, edge,
+       COALESCE(price_cents, 50) * COALESCE(contracts, 1) AS value_cents,
+       json_extract(raw, '$.latency_ms') AS latency_ms
+FROM trades
+WHERE kind = 'trade' AND source IN ({sources}) AND date IN ({dates})
+ORDER BY ts, source, offset
+"""
+
+
+def _bucket(edge, bounds):
+    for i, (lo, hi) in enumerate(zip(bounds, bounds[1:])):
+        if lo <= edge < hi:
+            return i
+    return None
+
+
+def _latency_bin(ms) -> int:
+    return int(math.log(max(ms, 1.0)) / math.log(LATENCY_GROWTH))
+
+
+def merge_latency(sketches) -> dict:
+    """Latency sketches (see fold_day) -> one sketch over all of them."""
+    out = {"count": 0, "sum": 0.0, "min": None, "max": None, "bins": {}}
+    for s in sketches:
+        if not s["count"]:
+            continue
+        out["count"] += s["count"]
+        out["sum"] += s["sum"]
+        out["min"] = s["min"] if out["min"] is None else min(out["min"], s["min"])
+        out["max"] = s["max"] if out["max"] is None else max(out["max"], s["max"])
+        for b, n in s["bins"].items():
+            out["bins"][b] = out["bins"].get(b, 0) + n
+    return out
+
+
+def latency_quantile(sketch, q: float):
+    """Latency at rank int(count * q) (0-based, like indexing the sorted list), None when empty."""
+    if not sketch["count"]:
+        return None
+    rank = min(int(sketch["count"] * q), sketch["count"] - 1)
+    seen = 0
+    for b in sorted(sketch["bins"], key=int):
+        seen += sketch["bins"][b]
+        if seen > rank:
+            mid = LATENCY_GROWTH ** (int(b) + 0.5)
+            return min(max(mid, sketch["min"]), sketch["max"])
+    return sketch["max"]
+
+
+def fold_day(rows, bounds=EDGE_BOUNDS) -> dict:
+    """One day's trades (in time order) -> rollup record."""
+    day = {f: 0 for f in SUM_FIELDS}
+    day.update({key: {} for key in BREAKDOWNS})
+    latency = {"count": 0, "sum": 0.0, "min": None, "max": None, "bins": {}}
+    day.update(max_trade_cents=0, latency=latency, edge_buckets=[[0, 0, 0.0] for _ in bounds[:-1]],
+               first=None, first_run=0, last=None, last_run=0, max_win_run=0, max_loss_run=0,
+               cum_max=0, cum_min=0, drawdown=0)
+    cum = peak = 0
+    for r in rows:
+        value = int(round(r["value_cents"] or 0))
+        day["trades"] += 1
+        day["volume_cents"] += value
+        day["max_trade_cents"] = max(day["max_trade_cents"], value)
+        ms = r["latency_ms"]
+        if ms is not None:
+            latency["count"] += 1
+            latency["sum"] += ms
+            latency["min"] = ms if latency["min"] is None else min(latency["min"], ms)
+            latency["max"] = ms if latency["max"] is None else max(latency["max"], ms)
+            b = str(_latency_bin(ms))
+            latency["bins"][b] = latency["bins"].get(b, 0) + 1
+        if r["edge"] is not None:
+            day["edge_trades"] += 1
+        result = r["result"]
+        if result == "pending":
+            day["pending"] += 1
+        if result not in ("won", "lost"):
+            continue
+
+        won = result == "won"
+        pnl = int(round(r["pnl_cents"] or 0))
+        day["won" if won else "lost"] += 1
+        day["pnl_cents"] += pnl
+        day["gross_profit_cents" if won else "gross_loss_cents"] += abs(pnl)
+        for key in BREAKDOWNS:
+            tally = day[key].setdefault(r[key], [0, 0, 0])
+            tally[0] += 1
+            tally[1] += won
+            tally[2] += pnl
+        if r["edge"] is not None:
+            day["edge_settled"] += 1
+            i = _bucket(r["edge"], bounds)
+            if i is not None:
+                b = day["edge_buckets"][i]
+                b[0] += 1
+                b[1] += won
+                b[2] += r["edge"]
+
+        # Streak runs: the first and last run can join the neighbouring days
+        if day["last"] is won:
+            day["last_run"] += 1
+        else:
+            day["last"], day["last_run"] = won, 1
+        if day["first"] is None:
+            day["first"] = won
+        if day["first_run"] == day["won"] + day["lost"] - 1 and day["first"] is won:
+            day["first_run"] += 1
+        key = "max_win_run" if won else "max_loss_run"
+        day[key] = max(day[key], day["last_run"])
+
+        # Drawdown inside the day, relative to the day's opening balance
+        cum += pnl
+        peak = max(peak, cum)
+        day["cum_max"] = max(day["cum_max"], cum)
+        day["cum_min"] = min(day["cum_min"], cum)
+        day["drawdown"] = max(day["drawdown"], peak - cum)
+    return day
+
+
+def combine(days) -> dict:
+    """Chain day records in date order: sums, breakdowns, latency, longest streaks, current streak, max drawdown."""
+    total = {f: sum(d[f] for d in days) for f in SUM_FIELDS}
+    total["latency"] = merge_latency(d["latency"] for d in days)
+    for key in BREAKDOWNS:
+        merged = total[key] = {}
+        for d in days:
+            for name, (settled, won, pnl) in d[key].items():
+                tally = merged.setdefault(name, [0, 0, 0])
+                tally[0] += settled
+                tally[1] += won
+                tally[2] += pnl
+    longest = {True: 0, False: 0}
+    current, current_run = None, 0
+    cum = peak = max_dd = 0
+    for d in days:
+        if d["first"] is None:
+            continue
+        settled = d["won"] + d["lost"]
+        head = d["first_run"] + (current_run if d["first"] is current else 0)
+        longest[d["first"]] = max(longest[d["first"]], head)
+        longest[True] = max(longest[True], d["max_win_run"])
+        longest[False] = max(longest[False], d["max_loss_run"])
+        if d["first_run"] == settled:  # the whole day was one run
+            current_run = head
+        else:
+            current_run = d["last_run"]
+        current = d["last"]
+        longest[current] = max(longest[current], current_run)
+
+        max_dd = max(max_dd, d["drawdown"], peak - (cum + d["cum_min"]))
+        peak = max(peak, cum + d["cum_max"])
+        cum += d["pnl_cents"]
+    total.update(longest_win_streak=longest[True], longest_loss_streak=longest[False],
+                 current_streak=current_run,
+                 current_streak_type="none" if current is None else ("win" if current else "loss"),
+                 peak_cents=peak, max_drawdown_cents=max_dd)
+    return total
+
+
+class DailyRollup:
+    """Per-day records for one source scope, re-folded only for days the index changed."""
+
+    def __init__(self, log, sources, bounds=EDGE_BOUNDS):
+        self.log = log
+        self.sources = list(sources)
+        self.bounds = tuple(bounds)
+        self.scope = json.dumps([sorted(self.sources), self.bounds, ROLLUP_VERSION])
+        self.refolded = 0
+        with self.log.transaction() as conn:
+            conn.execute(SCHEMA)
+            # Records of this scope in the pre-sketch layout (raw latency lists)
+            conn.execute("DELETE FROM rollups WHERE scope = ?", (json.dumps([sorted(self.sources), self.bounds]),))
+
+    def _fold(self, dates) -> dict:
+        by_date = {d: [] for d in dates}
+        for i in range(0, len(dates), 500):
+            chunk = dates[i:i + 500]
+            sql = ROW_SQL.format(sources=", ".join("?" * len(self.sources)), dates=", ".join("?" * len(chunk)))
+            for r in self.log.query(sql, self.sources + chunk):
+                by_date[r["date"]].append(r)
+        # Days with no trades (only skips) still get a record so they aren't re-folded every run
+        return {d: fold_day(rows, self.bounds) for d, rows in by_date.items()}
+
+    def days(self) -> list:
+        """Day records with trades, in date order (each with its "date"), after re-folding stale days."""
+        versions = self.log.day_versions(self.sources)
+        stored = {r["date"]: r for r in self.log.query(
+            "SELECT date, gen, data FROM rollups WHERE scope = ?", (self.scope,))}
+        stale = [d for d, gen in versions.items() if d not in stored or stored[d]["gen"] < gen]
+        gone = [d for d in stored if d not in versions]
+        records = {d: json.loads(r["data"]) for d, r in stored.items() if d in versions}
+        records.update(self._fold(stale) if stale else {})
+        self.refolded = len(stale)
+        if stale or gone:
+            with self.log.transaction() as conn:
+                conn.executemany("DELETE FROM rollups WHERE scope = ? AND date = ?",
+                                 [(self.scope, d) for d in stale + gone])
+                conn.executemany("INSERT INTO rollups (scope, date, gen, data) VALUES (?, ?, ?, ?)",
+                                 [(self.scope, d, versions[d], json.dumps(records[d])) for d in stale])
+        return [dict(records[d], date=d) for d in sorted(records) if records[d]["trades"]]
@@ -11,6 +11,7 @@ Run:
 import json
 import math
 import os
+import random
 import signal
 import sys
 import time
@@ -62,8 +63,17 @@ logging.disable(logging.NOTSET)
 # ============================================================================
 
 @pytest.fixture(autouse=True)
-def _reset_globals():
+def _reset_globals(tmp_path):
     """Reset mutable global state between tests."""
+    at.MARKET_STORE_FILE = tmp_path / "kalshi-markets.db"
+    at._market_store = None
+    at.SETTLEMENT_JOURNAL_FILE = tmp_path / "kalshi-unified-settlements.jsonl"
+    at._settlement_journal = None
+    at._SETTLEMENT_LAST_CHECK.clear()
+    at.FORECAST_CACHE_FILE = tmp_path / "kalshi-forecast-cache.json"
+    at._forecast_cache = None
+    at.OHLC_STORE_DIR = tmp_path / "ohlc"
+    at._ohlc_fetcher = None
     at.ERROR_COUNTER.clear()
     at.ERROR_WINDOW_START = time.time()
     at.DRAWDOWN_ALERTED.clear()
@@ -242,13 +252,35 @@ class TestAuthentication:
         sig_post = at.sign_request("POST", "/path", "111")
         assert sig_get != sig_post
 
+    def test_sign_request_parses_pem_once(self):
+        at.sign_request("GET", "/path", "111")
+        signer = at.get_signer(at.PRIVATE_KEY)
+        parses = signer.stats()["pem_parses"]
+        before = signer.signatures
+        for i in range(5):
+            at.sign_request("GET", "/path", str(i))
+        assert at.get_signer(at.PRIVATE_KEY) is signer
+        assert signer.signatures == before + 5
+        assert signer.stats()["pem_parses"] == parses
+
+    def test_cycle_signing_stats_are_per_cycle_throughput(self):
+        from kalshi_signing import cycle_signing_stats, get_signing_stats
+        at.sign_request("GET", "/path", "111")
+        start = get_signing_stats()
+        for i in range(4):
+            at.sign_request("GET", "/path", str(i))
+        cycle = cycle_signing_stats(start, wall_sec=2.0)
+        assert cycle["signatures"] == 4 and cycle["signatures_per_sec"] == 2.0
+        assert cycle["pem_parses"] == 0 and cycle["avg_sign_ms"] > 0
+        assert "signatures_per_sec" not in at.get_signer(at.PRIVATE_KEY).stats()
+
 
 # ============================================================================
 # 3. KALSHI API — kalshi_api with mocked requests
 # ============================================================================
 
 class TestKalshiApi:
-    @patch("autotrader.requests.get")
+    @patch("autotrader.http_pool.get")
     def test_get_success(self, mock_get):
         mock_resp = MagicMock()
         mock_resp.status_code = 200
@@ -259,7 +291,7 @@ class TestKalshiApi:
         assert result == {"balance": 5000}
         mock_get.assert_called_once()
 
-    @patch("autotrader.requests.post")
+    @patch("autotrader.http_pool.post")
     def test_post_success(self, mock_post):
         mock_resp = MagicMock()
         mock_resp.status_code = 200
@@ -270,7 +302,7 @@ class TestKalshiApi:
                                body={"ticker": "T", "action": "buy"})
         assert result["order"]["order_id"] == "abc123"
 
-    @patch("autotrader.requests.get")
+    @patch("autotrader.http_pool.get")
     def test_server_error_retries(self, mock_get):
         """500 errors should trigger retries."""
         fail_resp = MagicMock()
@@ -284,7 +316,7 @@ class TestKalshiApi:
         assert result == {"ok": True}
         assert mock_get.call_count == 2
 
-    @patch("autotrader.requests.get")
+    @patch("autotrader.http_pool.get")
     def test_server_error_all_retries_exhausted(self, mock_get):
         fail_resp = MagicMock()
         fail_resp.status_code = 502
@@ -294,7 +326,7 @@ class TestKalshiApi:
         assert "error" in result
         assert "502" in result["error"]
 
-    @patch("autotrader.requests.get")
+    @patch("autotrader.http_pool.get")
     def test_timeout_retries(self, mock_get):
         import requests as req
         mock_get.side_effect = req.exceptions.Timeout("timeout")
@@ -302,7 +334,7 @@ class TestKalshiApi:
         assert result == {"error": "Timeout"}
         assert mock_get.call_count == 2
 
-    @patch("autotrader.requests.get")
+    @patch("autotrader.http_pool.get")
     def test_connection_error_retries(self, mock_get):
         import requests as req
         mock_get.side_effect = req.exceptions.ConnectionError("conn err")
@@ -314,7 +346,7 @@ class TestKalshiApi:
         assert "error" in result
         assert "Unknown method" in result["error"]
 
-    @patch("autotrader.requests.get")
+    @patch("autotrader.http_pool.get")
     def test_latency_recorded(self, mock_get):
         mock_resp = MagicMock()
         mock_resp.status_code = 200
@@ -325,7 +357,7 @@ class TestKalshiApi:
         # balance endpoint → "balance"
         assert len(at.API_LATENCY_LOG.get("balance", [])) == 1
 
-    @patch("autotrader.requests.get")
+    @patch("autotrader.http_pool.get")
     def test_rate_limit_counter(self, mock_get):
         mock_resp = MagicMock()
         mock_resp.status_code = 200
@@ -897,6 +929,37 @@ class TestScoreMarket:
         score_balanced = at.score_market(m2)
         assert score_balanced > score_extreme
 
+    def test_market_table_matches_scalar_filter_and_score(self):
+        rng = random.Random(3)
+        now = datetime.now(timezone.utc)
+        markets = [at.MarketInfo(
+            ticker=f"T{i}", title="" if i % 17 == 0 else f"Market {i}", subtitle="", category="",
+            yes_price=rng.randint(1, 99), no_price=0, volume=rng.choice([0, 150, 400, 3000, 90000]),
+            open_interest=rng.choice([0, 500, 2000]),
+            expiry="bad" if i % 23 == 0 else (now + timedelta(days=rng.uniform(-1, 40))).isoformat(),
+            status=rng.choice(["open", "open", "active", "closed", ""]),
+            result=rng.choice(["", "", "", "yes"])) for i in range(600)]
+
+        table = at.MarketTable.from_markets(markets)
+        keep = table.filter_mask(
+            min_volume=at.MIN_VOLUME, min_liquidity=at.MIN_LIQUIDITY,
+            min_dte=at.MIN_DAYS_TO_EXPIRY, max_dte=at.MAX_DAYS_TO_EXPIRY,
+            min_price=at.MIN_PRICE_CENTS, max_price=at.MAX_PRICE_CENTS)
+        assert [markets[i].ticker for i in keep.nonzero()[0]] == [m.ticker for m in at.filter_markets(markets)]
+
+        scores = table.scores()
+        assert scores.tolist() == pytest.approx([at.score_market(m) for m in markets])
+        top, rest = at.rank_markets(markets, 25)
+        expected = sorted(((m, at.score_market(m)) for m in markets), key=lambda x: x[1], reverse=True)
+        assert [m.ticker for m, _ in top] == [m.ticker for m, _ in expected[:25]]
+        assert len(rest) == len(markets) - 25
+
+        row = table.row(5)
+        assert (row.ticker, row.yes_price, row.status, row.result) == (
+            markets[5].ticker, markets[5].yes_price, markets[5].status, markets[5].result)
+        assert row.days_to_expiry == pytest.approx(markets[5].days_to_expiry, abs=1e-3)
+        assert table.row(0).days_to_expiry == 999
+
 
 # ============================================================================
 # 13. MARKET TYPE CLASSIFICATION
@@ -1056,6 +1119,34 @@ class TestHeuristicForecaster:
         # Favorite underpriced → prob should be > market
         assert f.probability >= m.market_prob
 
+    def test_batch_crypto_forecast_matches_scalar(self):
+        now = datetime.now(timezone.utc)
+        closes = [90000 * (1 + 0.004 * math.sin(i)) for i in range(30)]
+        context = {
+            "crypto_prices": {"btc": 90500, "eth": 3300},
+            "ohlc": {"btc": [[0, 0, 0, 0, c] for c in closes], "eth": []},
+            "momentum": {"btc": {"composite_direction": 0.4}, "eth": {"composite_direction": -0.2}},
+            "sentiment": {"value": 70},
+            "news_sentiment": {"edge_adjustment": 0.02},
+        }
+        markets = [
+            at.MarketInfo(ticker=f"KX{asset}D-T{k}", title=f"{asset} price", subtitle=f"${strike:,} or above",
+                          category="crypto", yes_price=yes, no_price=100 - yes, volume=100,
+                          open_interest=10, expiry=(now + timedelta(hours=h)).isoformat(),
+                          status="open", result="")
+            for k, (asset, strike, yes, h) in enumerate([
+                ("BTC", 88000, 60, 3), ("BTC", 91000, 45, 12), ("BTC", 95000, 10, 30),
+                ("ETH", 3250, 55, 2), ("ETH", 3500, 20, 48)])
+        ]
+        markets.append(at.MarketInfo(ticker="KXBTCD-NOSTRIKE", title="BTC up?", subtitle="",
+                                     category="crypto", yes_price=50, no_price=50, volume=1,
+                                     open_interest=1, expiry="", status="open", result=""))
+        batch = at.batch_crypto_forecast(markets, context,
+                                         default_vol={"btc": at.BTC_HOURLY_VOL, "eth": at.ETH_HOURLY_VOL})
+        for m, p in zip(markets, batch["prob"]):
+            assert p == pytest.approx(at._heuristic_crypto(m, context)[0], abs=1e-4)
+        assert list(batch["valid"]) == [True] * 5 + [False]
+
 
 class TestHeuristicCritique:
     def test_normal_edge_passes(self, sample_market, sample_forecast):
@@ -1121,6 +1212,30 @@ class TestMomentumRegime:
         assert result["regime"] in ("sideways", "choppy", "trending_bullish", "trending_bearish")
         assert 0 < result["dynamic_min_edge"] < 1.0
 
+    def test_candle_series_incremental_matches_rebuild(self):
+        rng = random.Random(5)
+        rows, price = [], 90000.0
+        for i in range(120):
+            prev, price = price, price * math.exp(rng.gauss(0, 0.006))
+            rows.append([1_700_000_000_000 + i * 3_600_000, prev, max(prev, price) * 1.001,
+                         min(prev, price) * 0.999, price])
+
+        series = at.candle_series(rows[:42], "test-btc")
+        for k in range(1, 79):  # sliding 42-candle window, one new candle per "cycle"
+            assert at.candle_series(rows[k:k + 42], "test-btc") is series
+        fresh = at.CandleSeries(rows[78:120])
+        assert series.close.tolist() == fresh.close.tolist()
+        for name in ("rv24", "atr14", "range24"):
+            assert series.value(name) == pytest.approx(fresh.value(name), rel=1e-9)
+        assert at.detect_market_regime(series, {}) == at.detect_market_regime(rows[78:120], {})
+
+        # rv24 is the scalar realized-vol formula the heuristic used to recompute per market
+        closes = [r[4] for r in rows[-24:]]
+        rets = [math.log(closes[i] / closes[i - 1]) for i in range(1, len(closes))]
+        mean = sum(rets) / len(rets)
+        assert series.value("rv24") == pytest.approx(
+            math.sqrt(sum((r - mean) ** 2 for r in rets) / len(rets)), rel=1e-9)
+
 
 # ============================================================================
 # 17. CACHING & RATE LIMITING
@@ -1150,6 +1265,36 @@ class TestCachingRateLimiting:
             at.record_api_latency("ep", float(i))
         assert len(at.API_LATENCY_LOG["ep"]) <= at.LATENCY_PROFILE_WINDOW
 
+    def test_latency_histogram_keeps_all_time_counts(self):
+        for i in range(100):
+            at.record_api_latency("ep", float(i * 10))
+        hist = at.API_LATENCY_LOG["ep"].to_dict()
+        assert hist["count"] == 100
+        assert sum(hist["buckets"].values()) == 100
+        assert hist["p50_ms"] <= hist["p95_ms"] <= 1000
+
+    def test_latency_histogram_counts_survive_concurrent_records(self):
+        from concurrent.futures import ThreadPoolExecutor
+        hist = at.http_pool.LatencyHistogram(window=5)
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(lambda i: hist.record(float(i % 300)), range(8000)))
+        stats = hist.to_dict()
+        assert stats["count"] == 8000 and sum(stats["buckets"].values()) == 8000
+        assert len(list(hist)) == 5
+
+    def test_pooled_session_reused_per_host(self):
+        s1 = at.http_pool.get_session("https://api.elections.kalshi.com/trade-api/v2/markets")
+        s2 = at.http_pool.get_session("https://api.elections.kalshi.com/trade-api/v2/portfolio/balance")
+        s3 = at.http_pool.get_session("https://api.coingecko.com/api/v3/ping")
+        assert s1 is s2
+        assert s1 is not s3
+
+    def test_backoff_delay_jittered_and_capped(self):
+        for attempt in range(6):
+            d = at.http_pool.backoff_delay(attempt, base=1.0, cap=8.0)
+            ceiling = min(8.0, 2 ** attempt)
+            assert ceiling / 2 <= d <= ceiling
+
     def test_record_api_call_increments(self):
         at.record_api_call("kalshi")
         at.record_api_call("kalshi")
@@ -1167,7 +1312,7 @@ class TestCachingRateLimiting:
 # ============================================================================
 
 class TestExternalData:
-    @patch("autotrader.requests.get")
+    @patch("autotrader.http_pool.get")
     def test_get_crypto_prices_coingecko(self, mock_get):
         mock_resp = MagicMock()
         mock_resp.json.return_value = {
@@ -1179,7 +1324,7 @@ class TestExternalData:
         assert prices["btc"] == 92000
         assert prices["eth"] == 3400
 
-    @patch("autotrader.requests.get")
+    @patch("autotrader.http_pool.get")
     def test_get_crypto_prices_fallback_binance(self, mock_get):
         # First call (CoinGecko) fails, Binance succeeds
         call_count = [0]
@@ -1198,7 +1343,7 @@ class TestExternalData:
         assert prices is not None
         assert prices["btc"] == pytest.approx(91000.50)
 
-    @patch("autotrader.requests.get")
+    @patch("autotrader.http_pool.get")
     def test_get_fear_greed(self, mock_get):
         mock_resp = MagicMock()
         mock_resp.json.return_value = {
@@ -1209,13 +1354,81 @@ class TestExternalData:
         assert fng["value"] == 72
         assert fng["classification"] == "Greed"
 
-    @patch("autotrader.requests.get")
+    @patch("autotrader.http_pool.get")
     def test_get_fear_greed_error(self, mock_get):
         mock_get.side_effect = Exception("timeout")
         fng = at.get_fear_greed_index()
         assert fng["value"] == 50  # default
         assert fng["classification"] == "Neutral"
 
+    def test_ohlc_store_fetches_only_missing_candles(self):
+        requested = []
+
+        def source(asset, res, lo, hi):
+            requested.append((res, lo, hi))
+            step = 3600 if res == "1h" else 4 * 3600
+            return [[t, 100.0, 101.0 + (t // 3600) % 3, 99.0, 100.0 + (t // 3600) % 5]
+                    for t in range(int(lo), int(hi) + 1, step)]
+
+        fetcher = at.OHLCFetcher(at.OHLCStore(at.OHLC_STORE_DIR), [source])
+        now = 1_800_000_000  # on a 4h boundary
+        start = now - 48 * 3600
+        assert fetcher.ensure("btc", "1h", start, end=now) == 48
+        assert fetcher.ensure("btc", "1h", start, end=now) == 0
+        assert fetcher.ensure("btc", "1h", start, end=now + 3 * 3600) == 3
+        assert requested == [("1h", start, now - 3600), ("1h", now, now + 2 * 3600)]
+
+        # 4h candles are rolled up from the stored 1h ones, no download
+        four = fetcher.load("btc", "4h", start, end=now + 3 * 3600)
+        hourly = fetcher.store.read("btc", "1h", start, start + 4 * 3600)
+        assert len(requested) == 2 and len(four) == 12
+        assert four[0].tolist() == [start, 100.0, hourly[:, 2].max(), 99.0, hourly[-1, 4]]
+        assert hourly.base is not None  # a view of the mapped file, not a copy
+
+        # Trader reads through the shared fetcher and keeps the CoinGecko row layout
+        at._ohlc_fetcher = at.OHLCFetcher(at.OHLCStore(at.OHLC_STORE_DIR), [source])
+        ohlc = at.get_crypto_ohlc("ethereum", 1)
+        assert requested[-1][0] == "4h"
+        assert 5 <= len(ohlc) <= 6 and ohlc[-1][0] == ohlc[-2][0] + 4 * 3_600_000
+        assert ohlc[-1][0] / 1000 <= time.time() - 4 * 3600  # closed candles only
+
+    def test_ohlc_store_detects_and_refills_interior_holes(self):
+        import numpy as np
+        now = 1_800_000_000
+        start = now - 24 * 3600
+        outage = set(range(now - 6 * 3600, now - 3 * 3600, 3600))  # never available
+        short_page = [True]  # first download drops a few hours, like a partial page
+        requested = []
+
+        def source(asset, res, lo, hi):
+            requested.append((lo, hi))
+            rows = []
+            for t in range(int(lo), int(hi) + 1, 3600):
+                if t in outage or (short_page[0] and start + 5 * 3600 <= t < start + 8 * 3600):
+                    continue
+                rows.append([t, 100.0, 101.0, 99.0, 100.5])
+            short_page[0] = False
+            return rows
+
+        fetcher = at.OHLCFetcher(at.OHLCStore(at.OHLC_STORE_DIR), [source])
+        assert fetcher.ensure("btc", "1h", start, end=now) == 24 - 3 - 3
+        holes = fetcher.missing_ranges("btc", "1h", start, end=now)
+        assert holes == [(start + 5 * 3600, start + 7 * 3600), (now - 6 * 3600, now - 4 * 3600)]
+
+        # Holes are merged into the stored series in time order
+        assert fetcher.ensure("btc", "1h", start, end=now) == 3
+        ts = fetcher.store.read("btc", "1h", start, now)[:, 0]
+        assert (np.diff(ts) > 0).all() and len(ts) == 21
+        # The outage no source can fill is remembered, not re-requested every call
+        calls = len(requested)
+        assert fetcher.missing_ranges("btc", "1h", start, end=now) == []
+        assert fetcher.ensure("btc", "1h", start, end=now) == 0 and len(requested) == calls
+
+        # write() merges rows inside the stored bounds without duplicating known ones
+        store = fetcher.store
+        assert store.write("btc", "1h", [[now - 5 * 3600, 1, 2, 0.5, 1.5], [start, 1, 2, 0.5, 1.5]]) == 1
+        assert len(store.read("btc", "1h", start, now)) == 22
+
 
 # ============================================================================
 # 19. ALERTS & DRAWDOWN
@@ -1346,6 +1559,123 @@ class TestScanAllMarkets:
         markets = at.scan_all_markets()
         assert markets == []  # gracefully returns empty
 
+    @patch("autotrader.kalshi_api")
+    def test_scan_streams_sports_series_and_records_wall_time(self, mock_api):
+        expiry = (datetime.now(timezone.utc) + timedelta(days=3)).isoformat()
+
+        def market(ticker):
+            return {"ticker": ticker, "title": ticker, "yes_bid": 50, "volume": 5000,
+                    "open_interest": 3000, "close_time": expiry, "status": "open"}
+
+        def side_effect(method, path, *args, **kwargs):
+            if "series_ticker=" in path:
+                series = path.split("series_ticker=")[1].split("&")[0]
+                return {"markets": [market(f"{series}-1")]}
+            return {"markets": [market("GEN-1"), market("GEN-2")], "cursor": None}
+
+        mock_api.side_effect = side_effect
+        markets = at.scan_all_markets()
+        assert len(markets) == 2 + len(at.SPORTS_EVENT_TICKERS)
+        assert {m.ticker for m in markets} >= {"GEN-1", "GEN-2"}
+        assert at.LAST_SCAN_STATS["filtered_markets"] == len(markets)
+        assert at.LAST_SCAN_STATS["scan_wall_s"] >= 0
+
+    @patch("autotrader.kalshi_api")
+    def test_scan_counts_malformed_markets_and_reports_per_scan_wait(self, mock_api, monkeypatch):
+        if not at.MARKET_TABLE_AVAILABLE:
+            pytest.skip("numpy MarketTable not available")
+        expiry = (datetime.now(timezone.utc) + timedelta(days=3)).isoformat()
+        good = {"ticker": "GEN-1", "title": "GEN-1", "yes_bid": 50, "volume": 5000,
+                "open_interest": 3000, "close_time": expiry, "status": "open"}
+        bad = dict(good, ticker="GEN-2", volume="n/a")
+        mock_api.side_effect = lambda method, path, *a, **k: (
+            {"markets": []} if "series_ticker=" in path else {"markets": [good, bad], "cursor": None})
+        # Wait accumulated by earlier cycles is not part of this scan
+        monkeypatch.setattr(at.KALSHI_RATE_LIMITER, "waited_sec", 120.0)
+
+        markets = at.scan_all_markets()
+        assert [m.ticker for m in markets] == ["GEN-1"]
+        assert at.LAST_SCAN_STATS["parse_errors"] == 1
+        assert at.LAST_SCAN_STATS["rate_limit_wait_s"] < 1.0
+
+    def test_token_bucket_limits_rate(self):
+        bucket = at.http_pool.TokenBucket(rate=100, capacity=2)
+        start = time.monotonic()
+        for _ in range(6):
+            bucket.acquire()
+        # 2 burst tokens, then 4 more at 100/s → at least ~40ms
+        assert time.monotonic() - start >= 0.035
+
+    def test_market_store_detects_new_updated_and_closed(self, tmp_path):
+        expiry = (datetime.now(timezone.utc) + timedelta(days=3)).isoformat()
+
+        def market(ticker, price=50):
+            return at.MarketInfo(ticker=ticker, title=ticker, subtitle="", category="X",
+                                 yes_price=price, no_price=100 - price, volume=10,
+                                 open_interest=5, expiry=expiry, status="open", result="")
+
+        store = at.MarketStore(tmp_path / "m.db")
+        assert store.sync([market("A"), market("B")], full_universe=True)["new"] == 2
+        delta = store.sync([market("A", 60), market("C")], full_universe=True)
+        assert (delta["new"], delta["updated"], delta["closed"]) == (1, 1, 1)
+        # Partial scan: absence doesn't mean closed
+        assert store.sync([market("C")])["closed"] == 0
+        store.close()
+
+        reopened = at.MarketStore(tmp_path / "m.db")
+        assert reopened.get_static("A")["category"] == "X"
+        assert reopened.get_static("B") is None
+        reopened.close()
+
+    def test_market_store_only_infers_closures_inside_walked_window(self, tmp_path):
+        now = datetime.now(timezone.utc)
+
+        def market(ticker, days):
+            return at.MarketInfo(ticker=ticker, title=ticker, subtitle="", category="X", yes_price=50,
+                                 no_price=50, volume=10, open_interest=5,
+                                 expiry=(now + timedelta(days=days)).isoformat(), status="open", result="")
+
+        store = at.MarketStore(tmp_path / "m.db")
+        store.sync([market("NEAR", 3), market("FAR", 90)], full_universe=True)
+        listed = store._conn.execute("SELECT first_seen FROM markets WHERE ticker = 'NEAR'").fetchone()[0]
+        window = now.timestamp() + 30 * 86400
+        # max_close_ts walk: FAR was filtered out by the server, not delisted
+        delta = store.sync([], full_universe=True, universe_max_ts=window)
+        assert delta["closed"] == 1
+        assert store.get_static("FAR") is not None and store.get_static("NEAR") is None
+        # A closed ticker that shows up again is reopened, not counted as a new listing
+        delta = store.sync([market("NEAR", 40)], full_universe=True, universe_max_ts=window)
+        assert (delta["new"], delta["reopened"]) == (0, 1)
+        row = store._conn.execute("SELECT first_seen, closed_at FROM markets WHERE ticker = 'NEAR'").fetchone()
+        assert row == (listed, None)
+
+        # A moved close time is written for a known ticker; one this scan returned is not closed
+        past = market("NEAR", 1)
+        past.expiry = (now - timedelta(minutes=5)).isoformat()
+        delta = store.sync([past, market("FAR", 60)], full_universe=True, universe_max_ts=window)
+        assert delta["closed"] == 0 and store.get_static("NEAR")["expiry"] == past.expiry
+        far_ts = store._conn.execute("SELECT expiry_ts FROM markets WHERE ticker = 'FAR'").fetchone()[0]
+        assert far_ts == pytest.approx((now + timedelta(days=60)).timestamp())
+        assert store.sync([], full_universe=False)["closed"] == 1  # gone and past expiry
+        store.close()
+
+    @patch("autotrader.kalshi_api")
+    def test_scan_reuses_static_fields_from_store(self, mock_api):
+        expiry = (datetime.now(timezone.utc) + timedelta(days=3)).isoformat()
+        raw = {"ticker": "GEN-1", "title": "Original title", "yes_bid": 50, "volume": 5000,
+               "open_interest": 3000, "close_time": expiry, "status": "open"}
+        mock_api.side_effect = lambda method, path, *a, **k: (
+            {"markets": []} if "series_ticker=" in path else {"markets": [dict(raw)], "cursor": None})
+
+        at.scan_all_markets()
+        assert at.LAST_SCAN_STATS["new_markets"] == 1
+        raw["title"] = ""  # dynamic-only payload: static fields come from the store
+        raw["close_time"] = moved = (datetime.now(timezone.utc) + timedelta(days=2)).isoformat()
+        markets = at.scan_all_markets()
+        assert markets[0].title == "Original title"
+        assert markets[0].expiry == moved  # a moved close time is taken from the live payload
+        assert at.LAST_SCAN_STATS["new_markets"] == 0
+
 
 # ============================================================================
 # 22. COMBO / PARLAY ANALYSIS
@@ -1424,13 +1754,81 @@ class TestLLMForecaster:
         assert c.should_trade is False
         assert len(c.major_flaws) == 2
 
+    @patch.object(at, "FORECAST_CACHE_TTL_SEC", 0)  # no reuse between calls
+    @patch("autotrader.critique_forecast_llm")
+    @patch("autotrader.forecast_market_llm")
+    def test_analyze_market_critiques_only_past_edge_gate(self, mock_fc, mock_crit,
+                                                          sample_market, sample_critic):
+        budget = at.TokenBudget(0)
+        mock_fc.return_value = at.ForecastResult(probability=sample_market.market_prob, reasoning="",
+                                                 confidence="low", tokens_used=100)
+        a = at.analyze_market(sample_market, {}, use_heuristic=False, budget=budget)
+        assert a.critic is None and not a.skipped
+        mock_crit.assert_not_called()
+
+        mock_fc.return_value = at.ForecastResult(probability=0.9, reasoning="", confidence="high",
+                                                 tokens_used=100)
+        mock_crit.return_value = sample_critic
+        a = at.analyze_market(sample_market, {}, use_heuristic=False, budget=budget)
+        assert a.critic is sample_critic
+        assert budget.used == 200 + sample_critic.tokens_used
+
+    @patch.object(at, "FORECAST_CACHE_TTL_SEC", 0)  # no reuse between calls
+    @patch("autotrader.critique_forecast_llm")
+    @patch("autotrader.forecast_market_llm")
+    def test_token_budget_stops_llm_calls(self, mock_fc, mock_crit, sample_market):
+        budget = at.TokenBudget(1000)
+        mock_fc.return_value = at.ForecastResult(probability=0.9, reasoning="", confidence="high",
+                                                 tokens_used=1500)
+        a = at.analyze_market(sample_market, {}, use_heuristic=False, budget=budget)
+        assert a.skipped == "token_budget" and a.forecast is not None
+        mock_crit.assert_not_called()
+        assert at.analyze_market(sample_market, {}, use_heuristic=False, budget=budget).forecast is None
+        assert mock_fc.call_count == 1
+
+    @patch("autotrader.critique_forecast_llm")
+    @patch("autotrader.forecast_market_llm")
+    def test_forecast_cache_reuses_unchanged_market(self, mock_fc, mock_crit,
+                                                    sample_market, sample_critic):
+        mock_fc.return_value = at.ForecastResult(probability=0.9, reasoning="r", confidence="high",
+                                                 tokens_used=800)
+        mock_crit.return_value = sample_critic
+        budget = at.TokenBudget(0)
+        first = at.analyze_market(sample_market, {}, use_heuristic=False, budget=budget)
+        second = at.analyze_market(sample_market, {}, use_heuristic=False, budget=budget)
+        assert not first.cache_hit and second.cache_hit
+        assert second.forecast.probability == 0.9 and second.forecast.tokens_used == 0
+        assert second.critic.adjusted_probability == sample_critic.adjusted_probability
+        assert mock_fc.call_count == 1 and mock_crit.call_count == 1
+
+        # A real price move lands in a different bucket → fresh forecast
+        sample_market.yes_price += 10
+        assert not at.analyze_market(sample_market, {}, use_heuristic=False, budget=budget).cache_hit
+        assert at.get_forecast_cache().stats()["hits"] == 1
+
+        # Persisted across restarts
+        at.get_forecast_cache().save()
+        at._forecast_cache = None
+        assert len(at.get_forecast_cache()) == 2
+
+    def test_forecast_cache_ttl_and_lru(self, tmp_path):
+        cache = at.ForecastCache(tmp_path / "c.json", ttl_sec=60, max_entries=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        assert cache.get("a") == 1
+        cache.put("c", 3)  # evicts b (least recently used)
+        assert cache.get("b") is None and cache.get("a") == 1
+        assert cache.stats()["evictions"] == 1
+        cache.ttl_sec = 0
+        assert cache.get("a") is None and cache.stats()["expired"] == 1
+
 
 # ============================================================================
 # 24. call_claude (mocked HTTP)
 # ============================================================================
 
 class TestCallClaude:
-    @patch("autotrader.requests.post")
+    @patch("autotrader.http_pool.post")
     def test_anthropic_provider(self, mock_post):
         mock_resp = MagicMock()
         mock_resp.status_code = 200
@@ -1452,7 +1850,7 @@ class TestCallClaude:
         assert result["content"] == "Hello"
         assert result["tokens_used"] == 150
 
-    @patch("autotrader.requests.post")
+    @patch("autotrader.http_pool.post")
     def test_openrouter_provider(self, mock_post):
         mock_resp = MagicMock()
         mock_resp.status_code = 200
@@ -1480,7 +1878,7 @@ class TestCallClaude:
         assert "error" in result
         assert "No LLM API key" in result["error"]
 
-    @patch("autotrader.requests.post")
+    @patch("autotrader.http_pool.post")
     def test_api_error_status(self, mock_post):
         mock_resp = MagicMock()
         mock_resp.status_code = 429
@@ -1646,6 +2044,9 @@ class TestRunCycleIntegration:
 
         # Verify cycle was logged
         assert mock_log_cycle.called
+        pipeline = mock_log_cycle.call_args[0][0]["pipeline"]
+        assert pipeline["forecasts"] == 1
+        assert pipeline["analysis_wall_s"] >= 0
 
     @patch("autotrader.check_circuit_breaker", return_value=(True, 5, "TRIGGERED: 5 consecutive losses"))
     @patch("autotrader.update_trade_results", return_value={"updated": 0, "wins": 0, "losses": 0})
@@ -1707,7 +2108,7 @@ class TestEdgeCases:
         m = at.parse_market(raw)
         assert m is not None
 
-    @patch("autotrader.requests.get")
+    @patch("autotrader.http_pool.get")
     def test_crypto_prices_total_failure(self, mock_get):
         mock_get.side_effect = Exception("Network down")
         result = at.get_crypto_prices()
@@ -1779,6 +2180,97 @@ class TestSettlementTracker:
             result = at.update_trade_results()
         assert result["losses"] == 1
 
+    @patch("autotrader.kalshi_api")
+    def test_dedupes_tickers_and_journals_results(self, mock_api, tmp_path):
+        log_file = tmp_path / "trades.jsonl"
+        rows = [{"ticker": "KXA", "action": "BUY_YES", "result_status": "pending"},
+                {"ticker": "KXA", "action": "BUY_NO", "result_status": "pending"},
+                {"ticker": "KXB", "action": "BUY_YES", "result_status": "pending"}]
+        log_file.write_text("".join(json.dumps(r) + "\n" for r in rows))
+        before = log_file.read_text()
+
+        def side_effect(method, path, *args, **kwargs):
+            assert "?tickers=" in path
+            return {"markets": [{"ticker": "KXA", "result": "yes"}, {"ticker": "KXB", "result": ""}]}
+
+        mock_api.side_effect = side_effect
+        with patch.object(at, "TRADE_LOG_FILE", log_file):
+            result = at.update_trade_results()
+            assert mock_api.call_count == 1  # one bulk lookup for both tickers
+            assert result == {"updated": 2, "wins": 1, "losses": 1}
+            assert log_file.read_text() == before  # no full rewrite
+
+            # KXA is journaled, KXB was just checked and hasn't expired → no lookups
+            mock_api.reset_mock()
+            assert at.update_trade_results()["updated"] == 0
+            mock_api.assert_not_called()
+
+            journal = at.get_settlement_journal()
+            assert journal.status_for(rows[1]) == "lost"
+            assert journal.compact_trade_log(log_file) == 2
+            assert [json.loads(l)["result_status"] for l in log_file.read_text().splitlines()] == \
+                ["won", "lost", "pending"]
+
+
+# ============================================================================
+# QUANT MODELS
+# ============================================================================
+
+class TestQuantModels:
+    def test_allocate_portfolio_leaves_room_for_existing_exposure(self):
+        # Existing exposure on a ticker shrinks its room, contracts respect it
+        market = at.MarketInfo(ticker="KXBTCD-26JAN2804-T88000", title="BTC above $88,000?", subtitle="",
+                               category="crypto", yes_price=50, no_price=50, volume=5000,
+                               open_interest=3000, expiry="", status="open", result="")
+        decision = at.TradeDecision(action="BUY_YES", edge=0.1, kelly_size=0.03, contracts=60,
+                                    price_cents=50, reason="test", prob=0.6)
+        positions = [{"ticker": market.ticker, "market_exposure": 900}]
+        sized, stats = at.allocate_portfolio([(market, decision)], 1000.0, positions, slots=5)
+        (_, resized), = sized
+        assert resized.action == "BUY_YES" and resized.contracts == 2  # $1 left under the $10 market cap
+        assert stats["sized"] == 1
+        sized, _ = at.allocate_portfolio([(market, decision)], 1000.0, positions, slots=0)
+        assert sized[0][1].action == "SKIP" and sized[0][1].contracts == 0
+
+    def test_allocate_portfolio_respects_deploy_cap(self, monkeypatch):
+        # PORTFOLIO_MAX_DEPLOY_PCT caps what the cycle commits
+        candidates = [(at.MarketInfo(ticker=f"KXNBA{i}-E-T1", title="", subtitle="", category="sports",
+                                     yes_price=50, no_price=50, volume=5000, open_interest=3000, expiry="",
+                                     status="open", result=""),
+                       at.TradeDecision(action="BUY_YES", edge=0.4, kelly_size=0.05, contracts=10,
+                                        price_cents=50, reason="test", prob=0.9)) for i in range(10)]
+        monkeypatch.setattr(at, "PORTFOLIO_MAX_DEPLOY_PCT", 0.06)
+        sized, stats = at.allocate_portfolio(candidates, 100.0, [], slots=10)
+        assert sum(d.contracts * d.price_cents for _, d in sized) <= 0.06 * 10000
+        assert stats["cap_pct"] == 6.0 and stats["joint_pct"] <= 6.0
+
+    def test_iv_surface_feeds_the_crypto_prior(self):
+        import numpy as np
+        from crypto_batch_forecast import norm_cdf
+        from iv_surface import IVSurface
+
+        spot, hours = 90000.0, np.array([2.0, 2.0, 6.0, 6.0, 6.0])
+        strikes = np.array([89500.0, 90600.0, 89200.0, 90100.0, 91000.0])
+        s = np.array([0.004, 0.005, 0.0045, 0.004, 0.006]) * np.sqrt(hours)
+        prob = norm_cdf(np.log(spot / strikes) / s - s / 2)
+        now = datetime.now(timezone.utc)
+        context = {"crypto_prices": {"btc": spot, "eth": 3300}, "sentiment": {"value": 50}}
+        ladder = [at.MarketInfo(ticker=f"KXBTCD-E{h:g}-T{k:g}", title="BTC price", subtitle=f"${k:,.0f} or above",
+                                category="crypto", yes_price=int(round(p * 100)), no_price=100 - int(round(p * 100)),
+                                volume=100, open_interest=10, expiry=(now + timedelta(hours=h)).isoformat(),
+                                status="open", result="")
+                  for k, h, p in zip(strikes, hours, prob)]
+        context["iv_surface"] = IVSurface.from_markets(ladder, context["crypto_prices"], ref_vol={"btc": 0.005})
+
+        # Scalar heuristic and batch forecaster apply the same market-implied prior
+        batch = at.batch_crypto_forecast(ladder, context, default_vol={"btc": at.BTC_HOURLY_VOL},
+                                         iv_prior_weight=at.IV_PRIOR_WEIGHT)
+        for m, p in zip(ladder, batch["prob"]):
+            assert p == pytest.approx(at._heuristic_crypto(m, context)[0], abs=1e-4)
+        without = at.batch_crypto_forecast(ladder, {k: v for k, v in context.items() if k != "iv_surface"},
+                                           default_vol={"btc": at.BTC_HOURLY_VOL})
+        assert not np.allclose(batch["prob"], without["prob"])
+
 
 # ============================================================================
 # Run with: python -m pytest scripts/tests/test_autotrader_unified.py -v
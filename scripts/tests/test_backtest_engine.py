@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Tests for backtest_engine.py — the vectorized parameter sweep and
+bootstrap behind kalshi-backtest.py, checked against its scalar replay —
+and param_search.py, the cached grid / halving search on top of it.
+
+Run:
+    python -m pytest scripts/tests/test_backtest_engine.py -v
+"""
+
+import importlib.util
+import json
+import random
+import sys
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+import backtest_engine  # noqa: E402
+from param_search import ParamSearch, pareto_front  # noqa: E402
+
+
+class TestBacktestEngine:
+    def test_vectorized_sweep_matches_scalar_backtest(self):
+        spec = importlib.util.spec_from_file_location("kalshi_backtest", str(SCRIPTS_DIR / "kalshi-backtest.py"))
+        kb = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(kb)
+
+        rng = random.Random(7)
+        trades = []
+        for i in range(300):
+            asset = rng.choice(["btc", "eth", "sol", "weather"])
+            side = rng.choice(["yes", "no"])
+            market = rng.uniform(0.05, 0.95)
+            prob = min(0.99, max(0.01, market + rng.uniform(-0.1, 0.3)))
+            price = max(1, min(99, int(market * 100) if side == "yes" else int((1 - market) * 100)))
+            spot = rng.uniform(90, 110) if asset != "weather" else None
+            trades.append(kb.Trade(
+                timestamp=f"2026-01-01T00:{i % 60:02d}:00Z", ticker=f"KX{i}", asset=asset, side=side,
+                contracts=1, price_cents=price, cost_cents=price,
+                edge=prob - (market if side == "yes" else 1 - market), edge_with_bonus=0.0,
+                our_prob=prob, base_prob=prob, market_prob=market, strike=100.0 if spot else None, current_price=spot,
+                minutes_to_expiry=rng.choice([None, 30, 60, 240]),
+                momentum_dir=rng.uniform(-1, 1), momentum_str=rng.uniform(0, 1),
+                regime=rng.choice(["choppy", "trending_bullish", "sideways", "unknown"]),
+                result_status=rng.choice(["win", "loss", "loss", "pending"])))
+
+        param_sets = backtest_engine.grid(
+            dict(kb.DEFAULT_PARAMS, max_edge=1.0),
+            {"min_edge": [0.02, 0.08], "fat_tail_multiplier": [1.0, 1.4, 1.8],
+             "use_regime_filter": [True, False], "streak_tilt_threshold": [2, 4]},
+            derive=lambda p: kb.apply_sweep_value(p, "min_edge", p["min_edge"]))
+        assert len(param_sets) == 24
+        expected = [kb._sweep_summary(kb.run_backtest(trades, p)) for p in param_sets]
+        arrays = backtest_engine.TradeArrays.from_trades(trades)
+        assert backtest_engine.evaluate(arrays, param_sets) == expected
+        assert backtest_engine.evaluate(arrays, param_sets, workers=2, chunk=8) == expected
+
+        # Bootstrap resamples replay the same way as run_backtest over the resampled list
+        mc = backtest_engine.bootstrap(arrays, kb.DEFAULT_PARAMS, n=50, seed=1)
+        assert mc["n_simulations"] == 50 and mc["win_rate"]["p5"] <= mc["win_rate"]["p95"]
+        base = [t for t in trades if t.result_status != "pending" and kb.should_include_trade(t, kb.DEFAULT_PARAMS)[0]]
+        assert mc["n_trades"] == len(base)
+
+
+class TestParamSearch:
+    def test_caches_points_and_builds_pareto_front(self, tmp_path):
+        calls = []
+
+        def evaluate(param_sets, fraction):
+            calls.append((len(param_sets), fraction))
+            return [{"pnl_cents": int((p["a"] * 10 - p["b"] ** 2) * fraction), "trades": int(p["b"] * 10 * fraction),
+                     "max_drawdown_cents": p["b"] * 3} for p in param_sets]
+
+        space = {"a": [1, 2, 3], "b": [0, 1, 2, 3]}
+        search = ParamSearch("toy", space, evaluate, base={"c": 1}, data_key="d1", cache_dir=tmp_path)
+        rows = search.grid()
+        assert len(rows) == 12 and search.evaluated == 12
+
+        # Only the non-dominated points survive; b trades drawdown for volume
+        front = search.save_front(rows, path=tmp_path / "front.json")
+        assert [(r["params"]["a"], r["params"]["b"]) for r in front] == [(3, 0), (3, 1), (3, 2), (3, 3)]
+        assert json.loads((tmp_path / "front.json").read_text())["front"] == front
+        assert pareto_front([{"pnl_cents": 1, "trades": 1, "max_drawdown_cents": 0}] * 2)[0]["equivalent"] == 2
+
+        # A new search over the same data reuses the disk cache; new data re-evaluates
+        again = ParamSearch("toy", space, evaluate, base={"c": 1}, data_key="d1", cache_dir=tmp_path)
+        assert again.grid() == rows and again.evaluated == 0
+        assert ParamSearch("toy", space, evaluate, base={"c": 1}, data_key="d2", cache_dir=tmp_path).run(
+            [{"a": 1, "b": 1}]) and len(calls) == 2
+
+        # Successive halving: 12 -> 4 -> 1 points on 1/9, 1/3, then all of the data
+        calls.clear()
+        halving = ParamSearch("toy", space, evaluate, data_key="d3", cache_dir=tmp_path)
+        best = halving.halving(n=12, eta=3)
+        assert [c[1] for c in calls] == [1 / 9, 1 / 3, 1.0] and [c[0] for c in calls] == [12, 4, 1]
+        assert best[0]["params"]["a"] == 3
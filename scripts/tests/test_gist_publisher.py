@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Tests for gist_publisher.py — the shared diff-based gist publishing path —
+and the alert uploader that merges into the stats gist through it.
+
+Run:
+    python -m pytest scripts/tests/test_gist_publisher.py -v
+"""
+
+import importlib.util
+import json
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+import gist_publisher  # noqa: E402
+from gist_publisher import GistPublisher  # noqa: E402
+
+
+class TestGistPublisher:
+    def test_sends_only_changed_files(self, tmp_path):
+        patches = []
+
+        class MockGist(BaseHTTPRequestHandler):
+            def do_PATCH(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                patches.append((self.path, self.headers.get("Authorization"), sorted(body["files"])))
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.end_headers()
+                self.wfile.write(b"{}")
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), MockGist)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            pub = GistPublisher(tmp_path / "outbox", api_url=f"http://127.0.0.1:{server.server_port}",
+                                token="t0ken")
+            # Queued files from several producers go out in one PATCH
+            pub.enqueue("g1", {"stats.json": "{}", "tasks.json": "[]"})
+            result = pub.publish("g1", {"agent.json": '{"ok": 1}'})
+            assert result["ok"] and result["sent"] == ["agent.json", "stats.json", "tasks.json"]
+            assert patches == [("/gists/g1", "Bearer t0ken", ["agent.json", "stats.json", "tasks.json"])]
+
+            # Unchanged content is not re-sent; only the changed file is
+            assert pub.publish("g1", {"stats.json": "{}"})["sent"] == []
+            assert pub.publish("g1", {"stats.json": '{"n": 2}', "tasks.json": "[]"})["sent"] == ["stats.json"]
+            assert len(patches) == 2 and patches[-1][2] == ["stats.json"]
+            assert pub.status()["g1"]["queued"] == []
+        finally:
+            server.shutdown()
+
+    def test_alerts_upload_never_overwrites_stats_it_could_not_read(self, monkeypatch):
+        spec = importlib.util.spec_from_file_location("upload_alerts", str(SCRIPTS_DIR / "upload-alerts-to-gist.py"))
+        uploader = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(uploader)
+        published = []
+        monkeypatch.setattr(gist_publisher, "publish",
+                            lambda gist_id, files: published.append(files) or {"ok": True})
+
+        # Unreachable gist (or missing file): nothing is published
+        monkeypatch.setattr(gist_publisher, "fetch", lambda gist_id, filename: None)
+        assert uploader.update_gist_with_alerts([]) is False and published == []
+
+        # The stats owned by the other pusher are kept
+        monkeypatch.setattr(gist_publisher, "fetch", lambda gist_id, filename: '{"winRate": 61.5}')
+        assert uploader.update_gist_with_alerts([{"summary": "x"}]) is True
+        data = json.loads(published[-1][uploader.GIST_FILE])
+        assert data["winRate"] == 61.5 and data["alerts"]["count"] == 1
+
+        # Content that exists but doesn't parse is replaced
+        monkeypatch.setattr(gist_publisher, "fetch", lambda gist_id, filename: "{not json")
+        assert uploader.update_gist_with_alerts([]) is True
+        assert "winRate" not in json.loads(published[-1][uploader.GIST_FILE])
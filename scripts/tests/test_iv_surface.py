@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Tests for iv_surface.py — implied vols solved from Kalshi strike ladders
+and the smile / term-structure surface fitted over them.
+
+Run:
+    python -m pytest scripts/tests/test_iv_surface.py -v
+"""
+
+import math
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+from crypto_batch_forecast import norm_cdf  # noqa: E402
+from iv_surface import IVSurface, implied_vol  # noqa: E402
+
+
+class TestIVSurface:
+    def test_solves_ladders_into_a_surface(self):
+        spot, hours = 90000.0, np.array([2.0, 2.0, 6.0, 6.0, 6.0])
+        strikes = np.array([89500.0, 90600.0, 89200.0, 90100.0, 91000.0])
+        vol = np.array([0.004, 0.005, 0.0045, 0.004, 0.006])
+        s = vol * np.sqrt(hours)
+        prob = norm_cdf(np.log(spot / strikes) / s - s / 2)
+        iv = implied_vol(spot, strikes, hours, prob, ref_vol=0.005)
+        assert np.allclose(iv, vol, rtol=1e-6)  # both sides of spot, incl. the two-root near-ATM strike
+        assert np.isnan(implied_vol(spot, 80000.0, 1.0, 0.2))  # deep ITM priced at 20%: no root
+
+        # Any MarketInfo-like object will do
+        now = datetime.now(timezone.utc)
+        ladder = [SimpleNamespace(ticker=f"KXBTCD-E{h:g}-T{k:g}", title="BTC price",
+                                  subtitle=f"${k:,.0f} or above", yes_price=int(round(p * 100)),
+                                  expiry=(now + timedelta(hours=h)).isoformat())
+                  for k, h, p in zip(strikes, hours, prob)]
+        surface = IVSurface.from_markets(ladder, {"btc": spot, "eth": 3300}, ref_vol={"btc": 0.005})
+        assert surface.solved == 5 and set(surface.smiles) == {"btc"}
+        assert 0.003 < surface.lookup("btc", 90000, 4.0) < 0.007  # between the two expiries
+        assert math.isnan(surface.lookup("eth", 3300, 4.0))
+        assert np.all(np.diff(surface.atm("btc", [2.0, 6.0])) != 0)
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Tests for llm_client.py — the resident pooled Ollama client — and
+local_llm.delegate running on it in-process.
+
+Run:
+    python -m pytest scripts/tests/test_llm_client.py -v
+"""
+
+import asyncio
+import json
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest.mock import patch
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+import local_llm  # noqa: E402
+from llm_client import LocalLLMClient  # noqa: E402
+
+
+class TestLLMClient:
+    def test_pins_models_and_serves_local_llm_in_process(self, monkeypatch):
+        payloads = []
+
+        class MockOllama(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                payloads.append(body)
+                if body["stream"]:
+                    lines = [{"response": t, "done": False} for t in ("Ci", "ao")]
+                    lines.append({"response": "", "done": True, "eval_count": 2})
+                else:
+                    lines = [{"response": f"echo:{body['prompt']}", "done": True, "eval_count": 3}]
+                data = b"".join(json.dumps(line).encode() + b"\n" for line in lines)
+                self.send_response(200)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), MockOllama)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        host = f"http://127.0.0.1:{server.server_port}"
+        try:
+            client = LocalLLMClient(host, keep_alive="1h")
+            result = client.generate("hi", task="quick")
+            assert result["success"] and result["response"] == "echo:hi" and result["tokens"] == 3
+            assert payloads[-1]["model"] == "llama3.2:3b" and payloads[-1]["keep_alive"] == "1h"
+
+            # Streaming yields tokens; on_token sees them while generate still returns the text
+            assert list(client.stream("x", model="m:1b")) == ["Ci", "ao"]
+            seen = []
+            assert client.generate("x", on_token=seen.append)["response"] == "Ciao" and seen == ["Ci", "ao"]
+
+            async def fan_out():
+                tokens = [t async for t in client.astream("x")]
+                results = await asyncio.gather(*(client.agenerate(str(i)) for i in range(3)))
+                return tokens, [r["response"] for r in results]
+            assert asyncio.run(fan_out()) == (["Ci", "ao"], ["echo:0", "echo:1", "echo:2"])
+            assert client.requests == 7
+
+            # local_llm.delegate no longer spawns a coordinator process per query
+            monkeypatch.setattr(local_llm._coordinator(), "OLLAMA_HOST", host)
+            monkeypatch.setattr(local_llm, "_log_metrics", lambda *a, **k: None)
+            with patch("subprocess.run", side_effect=AssertionError("spawned")):
+                resp = local_llm.delegate("sort a list", task="coding")
+            assert resp.success and resp.text == "echo:sort a list" and resp.model == "qwen2.5-coder:7b"
+            assert payloads[-1]["keep_alive"]
+        finally:
+            server.shutdown()
+
+        # Transport errors come back as a failed result, not an exception
+        failed = LocalLLMClient("http://127.0.0.1:9").generate("hi", timeout=1)
+        assert not failed["success"] and failed["error"]
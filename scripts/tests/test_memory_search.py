@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Tests for memory_search.py — the incremental SQLite FTS5 memory index —
+its embedding side (memory_vectors.py) and the memory-index.py daemon
+endpoint used by memory-search*.sh.
+
+Run:
+    python -m pytest scripts/tests/test_memory_search.py -v
+"""
+
+import importlib.util
+import json
+import re
+import sys
+import threading
+import time
+import urllib.request
+from http.server import ThreadingHTTPServer
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+from memory_search import MemoryIndex, chunk_text  # noqa: E402
+from memory_vectors import reciprocal_rank_fusion  # noqa: E402
+
+
+class TestMemorySearch:
+    def test_incremental_refresh_and_query_cache(self, tmp_path):
+        root = tmp_path / "ws"
+        (root / "memory").mkdir(parents=True)
+        (root / "MEMORY.md").write_text("# Memory\n\nKalshi stop loss is 15%.\n")
+        note = root / "memory" / "2026-10-01.md"
+        note.write_text("Intro line\n\n## Trading\nBTC ladder review\nstill open\n\n## Books\nfox translation\n")
+        (root / "memory" / "old.md").write_text("obsolete weather notes\n")
+
+        # Chunks break on blank lines and before "## " headers, with exact line numbers
+        assert [(c[1], c[2]) for c in chunk_text(note.read_text())] == [(1, 1), (3, 5), (7, 8)]
+
+        index = MemoryIndex(tmp_path / "idx.db", root=root, globs=("memory/**/*.md", "*.md"))
+        first = index.refresh()
+        assert (first["files"], first["changed"], first["chunks"]) == (3, 3, 6)
+        assert index.refresh()["changed"] == 0  # nothing touched: no-op
+        hits = index.search("ladder")
+        assert hits[0]["path"].endswith("2026-10-01.md") and hits[0]["lines"] == "3-5"
+        assert index.search("don't-panic") == []  # free-text punctuation is not FTS syntax
+
+        # Repeated queries come from the LRU until the generation moves
+        index.search("ladder")
+        assert index.stats()["cache_hits"] == 1
+        gen = index.generation
+        (root / "memory" / "old.md").unlink()
+        note.write_text("ETH ladder only\n")
+        result = index.refresh()
+        assert (result["changed"], result["removed"], index.generation) == (1, 1, gen + 1)
+        assert index.search("ladder")[0]["snippet"] == "ETH >>>ladder<<< only"
+        assert index.search("weather") == []
+        assert index.stats()["chunks"] == 3
+
+        # Daemon endpoint used by memory-search*.sh
+        spec = importlib.util.spec_from_file_location("memory_index", str(SCRIPTS_DIR / "memory-index.py"))
+        mi = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(mi)
+        server = ThreadingHTTPServer(("127.0.0.1", 0), mi.make_handler(index))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            base = f"http://127.0.0.1:{server.server_address[1]}"
+            with urllib.request.urlopen(f"{base}/search?q=stop+loss&limit=1") as r:
+                assert json.loads(r.read())[0]["path"].endswith("MEMORY.md")
+            with urllib.request.urlopen(f"{base}/search?q=stop+loss&format=text") as r:
+                assert "=== Results for: stop loss ===" in r.read().decode()
+        finally:
+            server.shutdown()
+            index.close()
+
+    def test_hybrid_search_embeds_incrementally_and_fuses_ranks(self, tmp_path):
+
+        concepts = {"bankroll": 0, "cash": 0, "money": 0, "rain": 1, "weather": 1, "storm": 1,
+                    "fox": 2, "book": 2, "chapter": 2}
+        embedded = []
+
+        class ConceptEmbedder:
+            model = "concepts"
+            batch_size = 2
+
+            def __init__(self):
+                self.down = False
+
+            def __call__(self, texts):
+                if self.down:
+                    raise ConnectionError("ollama unreachable")
+                embedded.extend(texts)
+                out = np.full((len(texts), 4), 0.01, dtype=np.float32)
+                for i, text in enumerate(texts):
+                    for word in re.findall(r"\w+", text.lower()):
+                        out[i, concepts.get(word, 3)] += 1
+                return out
+
+        root = tmp_path / "ws"
+        (root / "memory").mkdir(parents=True)
+        note = root / "memory" / "notes.md"
+        note.write_text("Keep cash aside for losses\n\nStorm season notes\n\nThe fox book chapter one\n")
+        embedder = ConceptEmbedder()
+        index = MemoryIndex(tmp_path / "idx.db", root=root, globs=("memory/*.md",), embedder=embedder)
+        index.refresh()
+        assert index.vectors.sync()["embedded"] == 3
+        assert index.vectors.sync()["embedded"] == 0
+
+        # No keyword overlap: BM25 misses, the dense ranking finds the paraphrase
+        assert index.search("bankroll") == []
+        hit = index.search("bankroll", hybrid=True)[0]
+        assert hit["lines"] == "1-1" and hit["snippet"].startswith("Keep cash")
+        assert index.search("storm", limit=1, hybrid=True)[0]["lines"] == "3-3"
+        assert reciprocal_rank_fusion([["a", "b"], ["b"]])["b"] == pytest.approx(1 / 62 + 1 / 61)
+
+        # Editing one paragraph re-embeds only that paragraph; the dead row is reused
+        embedded.clear()
+        note.write_text("Keep cash aside for losses\n\nRain season notes\n\nThe fox book chapter one\n")
+        index.refresh()
+        assert index.vectors.sync() == {"embedded": 1, "freed": 1, "vectors": 3}
+        assert embedded == ["Rain season notes"]
+        rows = index._conn.execute("SELECT row FROM chunk_vectors ORDER BY row").fetchall()
+        assert [r[0] for r in rows] == [0, 1, 2]
+        assert index.vectors.path.stat().st_size == 1024 * 4 * 2  # float16 rows
+        assert index.search("weather", limit=1, hybrid=True)[0]["lines"] == "3-3"
+
+        # Embedding backend down: hybrid degrades to keyword results
+        embedder.down = True
+        assert index.search("fox", hybrid=True)[0]["lines"] == "5-5"
+        index.close()
+
+        # Vectors persist; a different embedding model starts over
+        embedded.clear()
+        again = MemoryIndex(tmp_path / "idx.db", root=root, globs=("memory/*.md",), embedder=ConceptEmbedder())
+        assert again.vectors.sync()["embedded"] == 0 and embedded == []
+        ConceptEmbedder.model = "other-model"
+        other = MemoryIndex(tmp_path / "idx.db", root=root, globs=("memory/*.md",), embedder=ConceptEmbedder())
+        assert other.vectors.count() == 0 and other.vectors.sync()["embedded"] == 3
+
+    def test_vector_sync_is_serialized_across_indexes(self, tmp_path):
+
+        class SlowEmbedder:
+            model = "slow"
+            batch_size = 2
+
+            def __init__(self):
+                self.calls = 0
+
+            def __call__(self, texts):
+                self.calls += len(texts)
+                time.sleep(0.02)
+                return np.array([[len(t), t.count("a") + 1, 1.0] for t in texts], dtype=np.float32)
+
+        root = tmp_path / "ws"
+        (root / "memory").mkdir(parents=True)
+        (root / "memory" / "notes.md").write_text("\n\n".join(f"note {'a' * i} {i}" for i in range(9)) + "\n")
+        # Two indexes over one database stand in for `embed` and a `serve --hybrid` daemon
+        embedders = [SlowEmbedder(), SlowEmbedder()]
+        indexes = [MemoryIndex(tmp_path / "idx.db", root=root, globs=("memory/*.md",), embedder=e)
+                   for e in embedders]
+        indexes[0].refresh()
+        threads = [threading.Thread(target=ix.vectors.sync) for ix in indexes]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert sum(e.calls for e in embedders) == 9  # the second sync found nothing left to embed
+        conn = indexes[0]._conn
+        pairs = conn.execute("SELECT f.content, v.row FROM chunks c JOIN chunk_vectors v ON v.hash = c.hash "
+                             "JOIN memory_fts f ON f.rowid = c.id").fetchall()
+        assert len({row for _, row in pairs}) == 9
+        mat = indexes[1].vectors._map()
+        for content, row in pairs:
+            expected = SlowEmbedder()([content])
+            assert np.allclose(mat[row], expected / np.linalg.norm(expected), atol=1e-3)
+        for ix in indexes:
+            ix.close()
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Tests for portfolio_kelly.py — the joint Kelly allocation across
+correlated strikes, with per-bet, per-group and total budget caps.
+
+Run:
+    python -m pytest scripts/tests/test_portfolio_kelly.py -v
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+import portfolio_kelly as pk  # noqa: E402
+
+
+class TestPortfolioKelly:
+    def test_shares_capacity_across_correlated_strikes(self):
+        # A lone bet gets the textbook Kelly fraction
+        alone = pk.allocate([pk.Bet(key="A", prob=0.6, price_cents=50)])
+        assert alone.fractions[0] == pytest.approx(0.2, abs=0.005)
+
+        def bets(event_for):
+            return [pk.Bet(key=f"KXBTCD-E-T{i}", prob=0.6, price_cents=50, event=event_for(i),
+                           asset="", group="KXBTCD", cap=0.05) for i in range(4)]
+
+        no_corr = {}
+        ladder = pk.allocate(bets(lambda i: "KXBTCD-E"), kelly_fraction=0.15, asset_corr=no_corr)
+        spread = pk.allocate(bets(lambda i: f"EV{i}"), kelly_fraction=0.15, asset_corr=no_corr)
+        # Four copies of one outcome are one bet: together they get one Kelly stake (3%)
+        assert ladder.total == pytest.approx(0.03, abs=0.002)
+        assert spread.total > 2 * ladder.total
+        assert ladder.independent.sum() == pytest.approx(0.12)
+
+        capped = pk.allocate(bets(lambda i: f"EV{i}"), group_caps={"KXBTCD": 0.04}, kelly_fraction=0.15,
+                             max_bets=2, asset_corr=no_corr)
+        assert capped.total <= 0.04 + 1e-9 and (capped.fractions > 0).sum() == 2
+        assert (capped.fractions <= 0.05 + 1e-9).all() and capped.ms < 1000
+
+    def test_total_respects_deploy_cap(self):
+        bets = [pk.Bet(key=f"KXNBA{i}-E-T1", prob=0.9, price_cents=50, group=f"KXNBA{i}", cap=0.05)
+                for i in range(10)]
+
+        # A binding budget holds; above MAX_TOTAL * kelly_fraction it can't bind and the lower cap is reported
+        tight = pk.allocate(bets, budget=0.06, kelly_fraction=0.15, asset_corr={})
+        assert tight.budget == 0.06 and tight.total == pytest.approx(0.06, abs=1e-3) and tight.total <= 0.06
+        loose = pk.allocate(bets, budget=0.5, kelly_fraction=0.15, asset_corr={})
+        assert loose.budget == pytest.approx(pk.MAX_TOTAL * 0.15) and loose.total <= loose.budget
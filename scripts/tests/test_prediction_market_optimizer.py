@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Tests for prediction_market_optimizer.py — SignalICA, fitted in one
+batch and streamed through the optimizer in time-ordered mini-batches.
+
+Run:
+    python -m pytest scripts/tests/test_prediction_market_optimizer.py -v
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+from prediction_market_optimizer import PredictionMarketOptimizer, SignalICA  # noqa: E402
+
+
+class TestSignalICA:
+    def test_unmixes_in_batch_and_streaming(self):
+        rng = np.random.default_rng(3)
+        n = 3000
+        t = np.linspace(0, 1, n)
+        S = np.column_stack([np.sign(np.sin(2 * np.pi * 11 * t)), rng.laplace(size=n),
+                             rng.uniform(-1, 1, n), np.sin(2 * np.pi * 5 * t)])
+        X = S @ rng.normal(size=(6, 4)).T + 0.01 * rng.normal(size=(n, 6))
+
+        def separation(Y):
+            C = np.abs(np.corrcoef(np.column_stack([S, Y]).T)[:4, 4:])
+            return C.max(axis=1).min()
+
+        g, g_prime = SignalICA._g(np.array([[0.0, 1.0], [-2.0, 3.0]]))  # arrays, not scalars
+        assert g.shape == (2, 2) and np.allclose(g_prime, 1 - np.tanh([[0.0, 1.0], [-2.0, 3.0]]) ** 2)
+
+        ica = SignalICA(4, random_state=0)
+        Y = ica.fit_transform(X)
+        assert Y.shape == (n, 4) and separation(Y) > 0.98
+        W = ica.unmixing_matrix
+        assert np.allclose(W @ W.T, np.eye(4), atol=1e-8)  # symmetric decorrelation keeps W orthonormal
+
+        # Streamed in time-ordered mini-batches, through the optimizer
+        optimizer = PredictionMarketOptimizer()
+        optimizer.ica = SignalICA(4, random_state=0, buffer_size=1024)
+        Y_stream = optimizer.run_ica_analysis(X, batch_size=200)
+        assert Y_stream.shape == (n, 4) and separation(Y_stream) > 0.97
+        assert len(optimizer.ica._buffer) == 1024
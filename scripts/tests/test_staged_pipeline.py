@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Tests for staged_pipeline.py — the streaming paragraph pipeline — and
+translation-pipeline-v2.py running its revision cycles on it.
+
+Run:
+    python -m pytest scripts/tests/test_staged_pipeline.py -v
+"""
+
+import importlib.util
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+import translation_memory  # noqa: E402
+from staged_pipeline import ParagraphCheckpoint, Stage, StagedPipeline  # noqa: E402
+
+
+def run_with_deadline(pipe, texts, sources=None, timeout=10):
+    """pipe.run() in a thread; fails the test instead of hanging it."""
+    out = {}
+    worker = threading.Thread(target=lambda: out.setdefault("results", pipe.run(texts, sources)), daemon=True)
+    worker.start()
+    worker.join(timeout)
+    assert not worker.is_alive(), "pipeline run hung"
+    return out["results"]
+
+
+class TestStagedPipeline:
+    def test_stages_chain_and_replay_from_checkpoint(self, tmp_path):
+        calls = []
+        stages = [Stage("upper", lambda text, src: calls.append(text) or text.upper(), workers=2),
+                  Stage("tag", lambda text, src: f"{text}|{src}", workers=2)]
+        checkpoint = ParagraphCheckpoint(tmp_path / "cp.jsonl", namespace="m")
+        pipe = StagedPipeline(stages, checkpoint)
+        assert run_with_deadline(pipe, ["a", "b", "c"], ["1", "2", "3"]) == ["A|1", "B|2", "C|3"]
+        checkpoint.close()
+
+        # A rerun replays every stage result instead of calling the stages again
+        checkpoint = ParagraphCheckpoint(tmp_path / "cp.jsonl", namespace="m")
+        pipe = StagedPipeline(stages, checkpoint)
+        assert run_with_deadline(pipe, ["a", "b", "c"], ["1", "2", "3"]) == ["A|1", "B|2", "C|3"]
+        assert len(calls) == 3 and pipe.stats()["upper"]["cached"] == 3
+        checkpoint.close()
+
+    def test_exceptions_in_pool_threads_do_not_hang_the_run(self, tmp_path):
+        class BrokenCheckpoint(ParagraphCheckpoint):
+            def put(self, key, stage, text, seconds=0.0):
+                if text == "B!":
+                    raise OSError("disk full")
+                super().put(key, stage, text, seconds)
+
+        def shout(text, src):
+            return text.upper() + "!"
+
+        done = []
+
+        def on_done(i, text):
+            done.append(i)
+            if i == 2:
+                raise RuntimeError("listener broke")
+
+        checkpoint = BrokenCheckpoint(tmp_path / "cp.jsonl")
+        pipe = StagedPipeline([Stage("shout", shout, workers=2), Stage("same", lambda t, s: t)],
+                              checkpoint, on_done=on_done)
+        results = run_with_deadline(pipe, ["a", "b", "c"])
+        checkpoint.close()
+
+        # The paragraph whose checkpoint write failed keeps its last good text and skips later stages
+        assert results == ["A!", "b", "C!"]
+        assert sorted(done) == [0, 1, 2]
+        assert pipe.stats()["shout"]["failed"] == 1 and pipe.stats()["same"]["done"] == 2
+        assert len(pipe.errors) == 2
+        assert any("shout" in e and "disk full" in e for e in pipe.errors)
+        assert any("on_done" in e and "listener broke" in e for e in pipe.errors)
+
+    def test_stage_exception_passes_text_through_as_failure(self):
+        def flaky(text, src):
+            if text == "bad":
+                raise ValueError("nope")
+            return text + "."
+
+        pipe = StagedPipeline([Stage("dot", flaky, workers=3)])
+        assert run_with_deadline(pipe, ["ok", "bad", "fine"]) == ["ok.", "bad", "fine."]
+        assert pipe.stats()["dot"]["failed"] == 1 and pipe.errors == []
+
+    def test_translation_pipeline_streams_stages_and_resumes_from_checkpoint(self, tmp_path, monkeypatch):
+        spec = importlib.util.spec_from_file_location("translation_pipeline_v2",
+                                                      str(SCRIPTS_DIR / "translation-pipeline-v2.py"))
+        tp = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(tp)
+        monkeypatch.setattr(tp, "log", lambda msg: None)
+        monkeypatch.setattr(tp, "print", lambda *a, **k: None, raising=False)
+        monkeypatch.setattr(translation_memory, "DEFAULT_DB", tmp_path / "tm.db")
+
+        calls, active, peak = [], set(), [0]
+        lock = threading.Lock()
+
+        def fake_llm(prompt, timeout=120):
+            stage = prompt.split("\n")[0]
+            text = prompt.rsplit(":\n", 1)[1].rsplit("\n\n", 1)[0]
+            with lock:
+                calls.append(stage)
+                active.add(stage)
+                peak[0] = max(peak[0], len(active))
+            time.sleep(0.01)
+            with lock:
+                active.discard(stage)
+            if "boom" in text and stage.startswith("Rendi"):
+                return "[TIMEOUT]"
+            return text
+
+        monkeypatch.setattr(tp, "ollama_generate", fake_llm)
+        orig, trans = tmp_path / "en.txt", tmp_path / "it.md"
+        orig.write_text("\n\n".join(f"Paragraph {i}." for i in range(8)), encoding="utf-8")
+        trans.write_text("\n\n".join(f"Paragrafo {i}{' boom' if i == 3 else ''}." for i in range(8)),
+                         encoding="utf-8")
+
+        metrics, final = tp.run_pipeline(str(orig), str(trans), str(tmp_path / "out"), workers=2)
+        assert final.split("\n\n") == [f"Paragrafo {i}{' boom' if i == 3 else ''}." for i in range(8)]
+        assert len(calls) == 40 and peak[0] >= 2  # stages overlap instead of running cycle by cycle
+        cycles = metrics["cycles"]
+        assert list(cycles) == ["1_riletttore", "2_revisore", "3_grammatico", "4_antislop", "5_formattatore"]
+        assert cycles["4_antislop"]["failed"] == 1 and cycles["1_riletttore"]["paragraphs_per_min"] > 0
+
+        # A rerun replays the checkpoint: only the failed anti-slop call is retried
+        calls.clear()
+        metrics, _ = tp.run_pipeline(str(orig), str(trans), str(tmp_path / "out"), workers=2)
+        assert len(calls) == 1 and calls[0].startswith("Rendi")
+        assert metrics["cycles"]["1_riletttore"]["cached"] == 8
+        assert metrics["cycles"]["5_formattatore"]["cached"] == 8
+        assert json.loads((tmp_path / "out" / "metrics.json").read_text())["workers_per_cycle"] == 2
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Tests for stats_rollup.py — the per-day aggregates behind
+push-stats-to-gist.py (streaks, drawdown, latency sketch).
+
+Run:
+    python -m pytest scripts/tests/test_stats_rollup.py -v
+"""
+
+import json
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+from stats_rollup import DailyRollup, combine, fold_day, latency_quantile  # noqa: E402
+from trade_log import TradeLog  # noqa: E402
+
+
+class TestStatsRollup:
+    def test_refolds_only_touched_days(self, tmp_path):
+        trades = tmp_path / "trades.jsonl"
+
+        def append(day, status, price=40):
+            with open(trades, "a") as f:
+                f.write(json.dumps({"timestamp": f"2026-02-0{day}T12:00:00Z", "type": "trade",
+                                    "ticker": "KXBTCD-X", "side": "yes", "price_cents": price,
+                                    "contracts": 1, "result_status": status}) + "\n")
+
+        for day, status in [(1, "won"), (1, "won"), (2, "lost"), (2, "won"), (3, "lost"), (3, "lost")]:
+            append(day, status)
+        log = TradeLog(tmp_path / "index.db", sources={"v2": trades}, journal=None)
+        rollup = DailyRollup(log, ["v2"])
+        log.refresh()
+        days = rollup.days()
+        assert [d["date"] for d in days] == ["2026-02-01", "2026-02-02", "2026-02-03"]
+        assert rollup.refolded == 3
+
+        # Streaks and drawdown chain across day boundaries
+        totals = combine(days)
+        assert (totals["won"], totals["lost"], totals["pnl_cents"]) == (3, 3, 3 * 60 - 3 * 40)
+        assert (totals["longest_win_streak"], totals["longest_loss_streak"]) == (2, 2)
+        assert (totals["current_streak"], totals["current_streak_type"]) == (2, "loss")
+        assert totals["max_drawdown_cents"] == 80  # peak 140 after day 2, then two losses
+        assert totals["asset"]["BTC"] == [6, 3, 60]
+
+        # An appended trade only re-folds its own day; unchanged logs re-fold nothing
+        append(3, "lost")
+        log.refresh()
+        assert combine(rollup.days())["current_streak"] == 3
+        assert rollup.refolded == 1
+        log.refresh()
+        rollup.days()
+        assert rollup.refolded == 0
+
+    def test_latency_sketch_merges_days(self):
+        rng = random.Random(3)
+        by_day = [[rng.lognormvariate(6, 0.8) for _ in range(400)] for _ in range(5)]
+        rows = [[{"value_cents": 40, "latency_ms": ms, "edge": None, "result": "pending",
+                  "pnl_cents": None, "asset": "BTC", "source": "v2"} for ms in day] for day in by_day]
+        days = [fold_day(r) for r in rows]
+        assert all(len(d["latency"]["bins"]) < 200 for d in days)  # bounded, not one entry per trade
+
+        sketch = combine(days)["latency"]
+        exact = sorted(ms for day in by_day for ms in day)
+        assert sketch["count"] == len(exact)
+        assert sketch["sum"] / sketch["count"] == pytest.approx(sum(exact) / len(exact))
+        assert (sketch["min"], sketch["max"]) == (exact[0], exact[-1])
+        assert latency_quantile(sketch, 0.95) == pytest.approx(exact[int(len(exact) * 0.95)], rel=0.03)
+        assert latency_quantile(combine([])["latency"], 0.95) is None
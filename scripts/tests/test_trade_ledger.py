@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Tests for trade_ledger.py — the incremental risk aggregates behind
+kalshi-autotrader.py's circuit breaker, daily loss limit, daily exposure,
+high-edge cluster alert and paper dedup.
+
+Each aggregate is checked against the full-file scan the trader used to do
+every cycle (kept here as reference implementations).
+
+Run:
+    python -m pytest scripts/tests/test_trade_ledger.py -v
+"""
+
+import json
+import os
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+import trade_ledger  # noqa: E402
+from trade_ledger import TradeLedger  # noqa: E402
+
+NOW = datetime.now(timezone.utc)
+TODAY = NOW.replace(hour=12, minute=0, second=0, microsecond=0)
+YESTERDAY = TODAY - timedelta(days=1)
+
+
+# ---------------------------------------------------------------------------
+# Reference: the per-cycle scans kalshi-autotrader.py ran before the ledger
+# ---------------------------------------------------------------------------
+
+def scan_consecutive_losses(path: Path) -> int:
+    losses = 0
+    for line in reversed(path.read_text().splitlines()):
+        try:
+            entry = json.loads(line.strip())
+        except Exception:
+            continue
+        status = entry.get("result_status", "pending")
+        if status == "won":
+            break
+        elif status == "lost":
+            losses += 1
+    return losses
+
+
+def scan_daily_loss(path: Path, today) -> tuple:
+    spent = won = trades = 0
+    for line in path.read_text().splitlines():
+        try:
+            entry = json.loads(line.strip())
+            ts = entry.get("timestamp", "")
+            if not ts:
+                continue
+            if datetime.fromisoformat(ts.replace("Z", "+00:00")).date() != today:
+                continue
+            trades += 1
+            spent += entry.get("cost_cents", entry.get("contracts", 0) * entry.get("price_cents", 0))
+            if entry.get("result_status") == "won":
+                won += entry.get("contracts", 0) * (100 - entry.get("price_cents", 0))
+        except Exception:
+            continue
+    return trades, spent, won
+
+
+def scan_daily_trades_cost(path: Path, today_str: str) -> int:
+    total = 0
+    for line in path.read_text().splitlines():
+        try:
+            entry = json.loads(line.strip())
+        except json.JSONDecodeError:
+            continue
+        if entry.get("timestamp", "").startswith(today_str) and entry.get("action") != "SKIP":
+            total += entry.get("cost_cents", 0)
+    return total
+
+
+def scan_high_edge_skips(path: Path, now: datetime) -> int:
+    one_hour_ago = now - timedelta(hours=1)
+    count = 0
+    for line in path.read_text().splitlines():
+        try:
+            entry = json.loads(line.strip())
+            ts = datetime.fromisoformat(entry["timestamp"])
+            if ts.tzinfo is None:
+                ts = ts.replace(tzinfo=timezone.utc)
+            if ts >= one_hour_ago and entry.get("outcome") != "executed":
+                if abs(entry.get("edge", 0)) > 0.15:
+                    count += 1
+        except (json.JSONDecodeError, KeyError, ValueError):
+            continue
+    return count
+
+
+def scan_paper_tickers(path: Path) -> set:
+    tickers = set()
+    for line in path.read_text().splitlines():
+        try:
+            e = json.loads(line.strip())
+        except Exception:
+            continue
+        if e.get("action") in ("BUY_YES", "BUY_NO") and e.get("dry_run"):
+            tickers.add(e.get("ticker", ""))
+    return tickers
+
+
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+
+def trade(ticker, when, action="BUY_YES", status="pending", contracts=2, price=40, dry_run=True):
+    entry = {"timestamp": when.isoformat(), "ticker": ticker, "action": action,
+             "contracts": contracts, "price_cents": price, "result_status": status, "dry_run": dry_run}
+    if action != "SKIP":
+        entry["cost_cents"] = contracts * price
+    return entry
+
+
+def decision(when, edge, outcome="skipped"):
+    return {"timestamp": when.isoformat(), "edge": edge, "outcome": outcome}
+
+
+def write_jsonl(path: Path, entries: list, mode: str = "w"):
+    with open(path, mode) as f:
+        for e in entries:
+            f.write(json.dumps(e) + "\n")
+
+
+FIXTURE_TRADES = [
+    trade("A", YESTERDAY, status="won"),
+    trade("B", YESTERDAY, status="lost", price=70),
+    trade("C", TODAY, action="SKIP", status="skipped", contracts=0),
+    trade("D", TODAY, status="won", contracts=5, price=20),
+    trade("E", TODAY, action="BUY_NO", status="lost", price=55),
+    trade("F", TODAY, status="pending", dry_run=False),
+    trade("G", TODAY, action="BUY_NO", status="lost"),
+    trade("H", TODAY, status="pending"),
+]
+
+FIXTURE_DECISIONS = [
+    decision(NOW - timedelta(hours=3), 0.30),
+    decision(NOW - timedelta(minutes=50), 0.20),
+    decision(NOW - timedelta(minutes=40), -0.25),
+    decision(NOW - timedelta(minutes=30), 0.40, outcome="executed"),
+    decision(NOW - timedelta(minutes=20), 0.05),
+    decision(NOW - timedelta(minutes=10), 0.18),
+]
+
+
+def assert_matches_scans(ledger: TradeLedger, trade_log: Path, decision_log: Path = None):
+    assert ledger.consecutive_losses() == scan_consecutive_losses(trade_log)
+    day = ledger.day(TODAY.date().isoformat())
+    assert (day["trades"], day["spent"], day["won"]) == scan_daily_loss(trade_log, TODAY.date())
+    assert day["cost"] == scan_daily_trades_cost(trade_log, TODAY.strftime("%Y-%m-%d"))
+    assert ledger.paper_tickers == scan_paper_tickers(trade_log)
+    if decision_log is not None:
+        assert ledger.high_edge_skips() == scan_high_edge_skips(decision_log, datetime.now(timezone.utc))
+
+
+def make_logs(tmp_path: Path):
+    trade_log, decision_log = tmp_path / "trades.jsonl", tmp_path / "decisions.jsonl"
+    write_jsonl(trade_log, FIXTURE_TRADES)
+    write_jsonl(decision_log, FIXTURE_DECISIONS)
+    return trade_log, decision_log
+
+
+# ---------------------------------------------------------------------------
+# Tests
+# ---------------------------------------------------------------------------
+
+class TestTradeLedger:
+    def test_aggregates_match_full_scans(self, tmp_path):
+        trade_log, decision_log = make_logs(tmp_path)
+        ledger = TradeLedger(trade_log, decision_log, checkpoint=tmp_path / "cp.json").refresh()
+        assert_matches_scans(ledger, trade_log, decision_log)
+        assert ledger.consecutive_losses() == 2 and ledger.high_edge_skips() == 3
+
+        # Appends are folded in incrementally
+        write_jsonl(trade_log, [trade("I", TODAY, status="won"), trade("J", TODAY, status="lost")], "a")
+        write_jsonl(decision_log, [decision(NOW, 0.5)], "a")
+        ledger.refresh()
+        assert_matches_scans(ledger, trade_log, decision_log)
+        assert ledger.consecutive_losses() == 1
+
+    def test_checkpoint_resume_reads_only_new_complete_lines(self, tmp_path):
+        trade_log, decision_log = make_logs(tmp_path)
+        TradeLedger(trade_log, decision_log, checkpoint=tmp_path / "cp.json").refresh()
+
+        resumed = TradeLedger(trade_log, decision_log, checkpoint=tmp_path / "cp.json")
+        assert resumed._trade_pos["offset"] == trade_log.stat().st_size  # nothing to re-read
+        assert_matches_scans(resumed.refresh(), trade_log, decision_log)
+
+        # A half-written line waits until it is complete
+        line = json.dumps(trade("K", TODAY, status="lost"))
+        with open(trade_log, "a") as f:
+            f.write(line[:20])
+        before = resumed.consecutive_losses()
+        assert resumed.refresh().consecutive_losses() == before
+        with open(trade_log, "a") as f:
+            f.write(line[20:] + "\n")
+        assert resumed.refresh().consecutive_losses() == before + 1
+        assert_matches_scans(resumed, trade_log, decision_log)
+
+    def test_rotated_or_truncated_log_is_rebuilt(self, tmp_path):
+        trade_log, decision_log = make_logs(tmp_path)
+        ledger = TradeLedger(trade_log, decision_log, checkpoint=tmp_path / "cp.json").refresh()
+
+        # Rotation: a new file (new inode) with different history
+        rotated = tmp_path / "rotated.jsonl"
+        write_jsonl(rotated, [trade("R1", TODAY, status="lost"), trade("R2", TODAY, status="lost")])
+        os.replace(rotated, trade_log)
+        ledger.refresh()
+        assert ledger.consecutive_losses() == 2 and ledger.paper_tickers == {"R1", "R2"}
+        assert_matches_scans(ledger, trade_log, decision_log)
+
+        # In-place truncation (same inode, smaller than the saved offset)
+        with open(trade_log, "w") as f:
+            f.write(json.dumps(trade("T1", TODAY, status="won")) + "\n")
+        ledger.refresh()
+        assert ledger.consecutive_losses() == 0 and ledger.paper_tickers == {"T1"}
+        assert_matches_scans(ledger, trade_log, decision_log)
+
+    def test_settle_and_adopt_rewrite_match_rescan(self, tmp_path):
+        trade_log, decision_log = make_logs(tmp_path)
+        ledger = TradeLedger(trade_log, decision_log, checkpoint=tmp_path / "cp.json").refresh()
+        assert set(ledger.pending_tickers()) == {"F", "H"}
+
+        # What update_trade_results does: rewrite the file, then tell the ledger
+        entries = [json.loads(line) for line in trade_log.read_text().splitlines()]
+        for e in entries:
+            if e["ticker"] == "H":
+                e["result_status"] = "won"
+            if e["ticker"] == "F":
+                e["result_status"] = "lost"
+        write_jsonl(trade_log, entries)
+        assert ledger.settle("H", "yes") == 1 and ledger.settle("F", "no") == 1
+        assert ledger.settle("H", "yes") == 0
+        ledger.adopt_rewrite()
+        assert ledger.pending_tickers() == []
+        assert_matches_scans(ledger, trade_log, decision_log)
+
+        # The adopted file is not rebuilt; a fresh rebuild agrees anyway
+        offset = ledger._trade_pos["offset"]
+        assert ledger.refresh()._trade_pos["offset"] == offset
+        rebuilt = TradeLedger(trade_log, decision_log).refresh()
+        assert rebuilt.consecutive_losses() == ledger.consecutive_losses()
+        assert rebuilt.day(TODAY.date().isoformat()) == ledger.day(TODAY.date().isoformat())
+
+    def test_state_is_pruned_before_checkpointing(self, tmp_path):
+        trade_log, decision_log = tmp_path / "trades.jsonl", tmp_path / "decisions.jsonl"
+        stale = NOW - timedelta(days=trade_ledger.OPEN_DAYS_KEPT + 5)
+        write_jsonl(trade_log, [trade(f"OLD{i}", stale - timedelta(days=i)) for i in range(10)] +
+                    [trade("NEW", TODAY)])
+        write_jsonl(decision_log, [decision(NOW - timedelta(days=2, minutes=i), 0.5) for i in range(200)] +
+                    [decision(NOW - timedelta(minutes=5), 0.5)])
+        TradeLedger(trade_log, decision_log, checkpoint=tmp_path / "cp.json").refresh()
+
+        cp = json.loads((tmp_path / "cp.json").read_text())
+        assert len(cp["high_edge"]) == 1
+        assert list(cp["pending"]) == ["NEW"] and list(cp["paper"]) == ["NEW"]
+        assert len(cp["days"]) <= trade_ledger.DAYS_KEPT
+
+        # The high-edge window keeps sliding on later refreshes too
+        ledger = TradeLedger(trade_log, decision_log, checkpoint=tmp_path / "cp.json")
+        assert ledger.high_edge_skips(now=time.time() + trade_ledger.HIGH_EDGE_WINDOW_SEC) == 0
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Tests for trade_log.py — the SQLite index over every Kalshi trade log,
+refreshed incrementally and settled from the unified trader's journal.
+
+Run:
+    python -m pytest scripts/tests/test_trade_log.py -v
+"""
+
+import json
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+from settlement_journal import SettlementJournal  # noqa: E402
+from trade_log import TradeLog  # noqa: E402
+
+
+def append_unified_trade(path, ticker="KXBTC-24JUN-90000", price_cents=55, contracts=2):
+    """One BUY_YES line as the unified trader's log_trade() writes it."""
+    with open(path, "a") as f:
+        f.write(json.dumps({"timestamp": datetime.now(timezone.utc).isoformat(), "dry_run": True,
+                            "ticker": ticker, "action": "BUY_YES", "edge": 0.08,
+                            "contracts": contracts, "price_cents": price_cents,
+                            "cost_cents": contracts * price_cents,
+                            "result_status": "pending"}) + "\n")
+
+
+class TestTradeLog:
+    def test_refreshes_incrementally(self, tmp_path):
+        trade_log = tmp_path / "trades.jsonl"
+        legacy = tmp_path / "legacy.jsonl"
+        journal_file = tmp_path / "settlements.jsonl"
+        legacy.write_text(json.dumps({"timestamp": "2026-01-28 07:39:28", "type": "trade",
+                                      "ticker": "KXETHD-X", "side": "no", "price": 40,
+                                      "contracts": 2, "result_status": "win"}) + "\n")
+        log = TradeLog(tmp_path / "index.db", sources={"unified": trade_log, "legacy": legacy},
+                       journal=journal_file)
+        append_unified_trade(trade_log)
+        assert log.refresh() == {"unified": 1, "legacy": 1, "_settlements": 0}
+        append_unified_trade(trade_log)
+        assert log.refresh()["unified"] == 1  # only the appended line
+
+        # Legacy spellings (price / "win" / naive timestamp) normalize to the same columns
+        eth = log.group_by("asset", where="asset = 'ETH'")[0]
+        assert (eth["won"], eth["pnl_cents"]) == (1, 120)
+        assert log.group_by("hour", sources=["legacy"])[0]["key"] == 7
+
+        # Journal settlements apply before the trade log is compacted
+        journal = SettlementJournal(journal_file)
+        journal.record({"KXBTC-24JUN-90000": "yes"})
+        log.refresh()
+        btc = log.summary(sources=["unified"])
+        assert (btc["total"], btc["won"], btc["win_rate"]) == (2, 2, 1.0)
+        assert btc["pnl_cents"] == 2 * (100 - 55) * 2
+        assert [e["result_status"] for e in log.entries(sources=["unified"])] == ["won", "won"]
+
+        # A rewritten file (compaction) is re-ingested rather than double counted
+        journal.compact_trade_log(trade_log)
+        log.refresh()
+        assert log.summary(sources=["unified"])["total"] == 2
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Tests for translation_memory.py — the shared (source -> output) segment
+store used by the local translators and revision pipelines.
+
+Run:
+    python -m pytest scripts/tests/test_translation_memory.py -v
+"""
+
+import sys
+import time
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+from translation_memory import TranslationMemory  # noqa: E402
+
+
+class TestTranslationMemory:
+    def test_exact_fuzzy_scopes_and_eviction(self, tmp_path):
+        tm = TranslationMemory(tmp_path / "tm.db", max_entries=10, fuzzy_threshold=0.9)
+        calls = []
+
+        def model(text):
+            calls.append(text)
+            return "[TIMEOUT]" if "slow" in text else f"IT<{text}>"
+
+        refrain = "And the little fox ran home through the tall green grass."
+        assert tm.translate(refrain, model, "en", "it", "opus") == f"IT<{refrain}>"
+        # Exact (whitespace-normalized) segments come from memory; near-identical ones are only looked up
+        assert tm.translate(refrain.replace(" ", "  "), model, "en", "it", "opus") == f"IT<{refrain}>"
+        fuzzy = tm.get(refrain.replace("ran", "run"), "en", "it", "opus")
+        assert fuzzy.target == f"IT<{refrain}>" and 0.9 <= fuzzy.score < 1
+        assert tm.get("Chapter 2", "en", "it", "opus") is None
+        # Other models / stages / languages never share entries; failures are not stored
+        assert tm.get(refrain, "en", "it", "llama3:70b") is None
+        assert tm.get(refrain, "en", "it", "opus", stage="revise") is None
+        assert tm.translate("slow paragraph", model, "en", "it", "opus") == "[TIMEOUT]"
+        assert tm.get("slow paragraph", "en", "it", "opus") is None
+        assert len(calls) == 2
+
+        stats = tm.stats()["en|it|opus|translate"]
+        assert (stats["exact_hits"], stats["fuzzy_hits"], stats["segments"]) == (1, 1, 1)
+        assert stats["hit_rate"] == round(2 / stats["lookups"], 4)
+
+        # Over capacity the least recently used segments go first; the refrain was just used
+        for i in range(12):
+            tm.put(f"Front matter line number {i} of the book", f"riga {i}", "en", "it", "opus")
+            if i == 7:
+                time.sleep(0.01)
+                tm.get(refrain, "en", "it", "opus")
+        stats = tm.stats()["en|it|opus|translate"]
+        assert stats["segments"] <= 10 and stats["evictions"] > 0
+        assert tm.get(refrain, "en", "it", "opus").score == 1.0
+        assert tm.get("Front matter line number 0 of the book", "en", "it", "opus", fuzzy=False) is None
+
+        # Persisted: a new process (instance) reuses the stored pairs
+        tm.close()
+        again = TranslationMemory(tmp_path / "tm.db", max_entries=10)
+        assert again.get(refrain, "en", "it", "opus").target == f"IT<{refrain}>"
+
+    def test_near_duplicate_with_changed_number_is_not_served(self, tmp_path):
+        tm = TranslationMemory(tmp_path / "tm.db", fuzzy_threshold=0.95)
+        calls = []
+
+        def model(text):
+            calls.append(text)
+            return f"IT<{text}>"
+
+        score = ("In the spring of 1998 the little team from the valley won 3 of its 12 away games "
+                 "and then lost the final.")
+        changed = score.replace("won 3", "won 4")
+        assert tm.translate(score, model, "en", "it", "opus") == f"IT<{score}>"
+        # It passes the fuzzy threshold, but serving it would say "won 3"
+        assert tm.get(changed, "en", "it", "opus").target == f"IT<{score}>"
+        assert tm.translate(changed, model, "en", "it", "opus") == f"IT<{changed}>"
+        assert calls == [score, changed]
+        assert tm.translate(changed, model, "en", "it", "opus") == f"IT<{changed}>" and len(calls) == 2
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Trade Analytics - every trade-log breakdown in one pass over the shared index.
+
+Refreshes the normalized trade index (scripts/trade_log.py) once, then
+prints win rate / PnL grouped by hour, weekday, asset, regime, side and
+edge bucket. Replaces running the individual analyze-*.py scripts, each of
+which used to re-parse the full JSONL logs.
+
+Usage:
+    python3 scripts/trade-analytics.py
+    python3 scripts/trade-analytics.py --sources unified v3 --days 7
+    python3 scripts/trade-analytics.py --json > data/trading/trade-analytics.json
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+from trade_log import SOURCES, WEEKDAYS, TradeLog  # noqa: E402
+
+EDGE_BOUNDS = [0.0, 0.05, 0.10, 0.15, 0.20, 0.25, 0.30, 0.50, 1.0]
+BREAKDOWNS = ("hour", "weekday", "asset", "regime", "side", "edge")
+
+
+def run_analyses(log: TradeLog, sources=None, since=None) -> dict:
+    filters = {"sources": sources, "since": since}
+    report = {"summary": log.summary(**filters)}
+    for key in BREAKDOWNS:
+        report[key] = log.group_by(key, bounds=EDGE_BOUNDS if key == "edge" else None, **filters)
+    return report
+
+
+def label(key: str, value) -> str:
+    if value is None:
+        return "?"
+    if key == "hour":
+        return f"{value:02d}:00"
+    if key == "weekday":
+        return WEEKDAYS[value]
+    if key == "edge":
+        return f"{value * 100:.0f}%+"
+    return str(value)
+
+
+def print_table(key: str, rows: list):
+    print(f"\nBy {key}:")
+    print(f"  {'':<12} {'Trades':>7} {'W/L':>9} {'Win%':>7} {'PnL':>10} {'ROI':>7}")
+    for r in rows:
+        wr = f"{r['win_rate'] * 100:.1f}%" if r["win_rate"] is not None else "-"
+        roi = f"{r['roi'] * 100:.0f}%" if r["roi"] is not None else "-"
+        pnl = f"${r['pnl_cents'] / 100:+.2f}"
+        print(f"  {label(key, r['key']):<12} {r['total']:>7} {r['won']:>4}/{r['lost']:<4} {wr:>7} "
+              f"{pnl:>10} {roi:>7}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="All trade-log breakdowns from the shared index")
+    parser.add_argument("--sources", nargs="+", choices=sorted(SOURCES), help="Trade logs (default: all)")
+    parser.add_argument("--days", type=float, help="Only trades from the last N days")
+    parser.add_argument("--json", action="store_true", help="Print raw JSON result")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    log = TradeLog()
+    added = log.refresh()
+    since = time.time() - args.days * 86400 if args.days else None
+    report = run_analyses(log, args.sources, since)
+    report["refresh"] = added
+    report["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 1)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    s = report["summary"]
+    wr = f"{s['win_rate'] * 100:.1f}%" if s["win_rate"] is not None else "-"
+    print(f"📊 Trade analytics ({', '.join(args.sources or SOURCES)})")
+    print("=" * 60)
+    print(f"  Trades: {s['total']}  settled: {s['settled']}  pending: {s['pending']}")
+    print(f"  Win rate: {wr}  PnL: ${s['pnl_cents'] / 100:+.2f}")
+    for key in BREAKDOWNS:
+        print_table(key, report[key])
+    print("=" * 60)
+    print(f"  {sum(added.values())} new log lines ingested, {report['elapsed_ms']} ms total")
+
+
+if __name__ == "__main__":
+    main()
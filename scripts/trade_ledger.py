@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+Trade Ledger
+Incremental aggregates over the trade and decision JSONL logs, so the
+trader's risk checks don't re-parse the whole history every cycle.
+
+The ledger tails both logs from a saved byte offset and keeps:
+  - consecutive-loss streak (circuit breaker)
+  - per-day trade count, spend, winnings and non-SKIP cost (daily loss / exposure)
+  - tickers already paper-traded (run_cycle dedup)
+  - timestamps of high-edge skipped/vetoed decisions in the last hour
+
+State is persisted to a JSON checkpoint together with each file's inode and
+offset. If a log is rewritten (settlement, compaction) or truncated, that
+log's aggregates are rebuilt from scratch once. Every refresh prunes the
+state to bounded horizons: DAYS_KEPT days of aggregates, the high-edge
+window, and OPEN_DAYS_KEPT days of pending / paper-traded tickers (entries
+for markets that never settle expire instead of piling up).
+
+Usage:
+    from trade_ledger import TradeLedger
+
+    ledger = TradeLedger(TRADE_LOG_FILE, DECISION_LOG_FILE, checkpoint=LEDGER_CHECKPOINT_FILE)
+    ledger.refresh()                         # read only what was appended
+    ledger.consecutive_losses()
+    ledger.day()                             # {"trades", "spent", "won", "cost"} for today (UTC)
+    ledger.high_edge_skips()
+    ledger.settle("KXBTC-...", "yes")        # apply a settlement without re-reading
+"""
+
+import json
+import os
+import time
+from bisect import bisect_right, insort
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+CHECKPOINT_VERSION = 2
+DAYS_KEPT = 7
+OPEN_DAYS_KEPT = 45  # pending / paper tickers; the trader buys markets at most 30 days out
+HIGH_EDGE_WINDOW_SEC = 3600
+
+
+def _empty_day() -> dict:
+    return {"trades": 0, "spent": 0, "won": 0, "cost": 0}
+
+
+def _parse_ts(ts: str):
+    dt = datetime.fromisoformat(ts.replace("Z", "+00:00"))
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt
+
+
+class TradeLedger:
+    """Running risk aggregates over append-only trade/decision logs."""
+
+    def __init__(self, trade_log: Path, decision_log: Path = None, checkpoint: Path = None,
+                 journal=None, high_edge_threshold: float = 0.15):
+        self.trade_log = Path(trade_log)
+        self.decision_log = Path(decision_log) if decision_log else None
+        self.checkpoint = Path(checkpoint) if checkpoint else None
+        # Optional SettlementJournal: pending entries it already settled count as won/lost
+        self.journal = journal
+        self.high_edge_threshold = high_edge_threshold
+        self._reset_trades()
+        self._reset_decisions()
+        self._dirty = False
+        self._load_checkpoint()
+
+    # ── state ──
+
+    def _reset_trades(self):
+        self._trade_pos = {"ino": None, "offset": 0}
+        self._entries = 0
+        self._last_won = -1
+        self._lost = []        # entry indices of losses after the last win
+        self._days = {}
+        self._pending = {}     # ticker -> [[index, action, day, payout_cents], ...]
+        self._paper = {}       # ticker -> last day it was paper-traded
+
+    def _reset_decisions(self):
+        self._decision_pos = {"ino": None, "offset": 0}
+        self._high_edge = deque()
+
+    def _load_checkpoint(self):
+        if not self.checkpoint or not self.checkpoint.exists():
+            return
+        try:
+            with open(self.checkpoint) as f:
+                cp = json.load(f)
+            if cp.get("version") != CHECKPOINT_VERSION or cp.get("trade_log") != str(self.trade_log):
+                return
+            self._trade_pos = cp["trade_pos"]
+            self._entries = cp["entries"]
+            self._last_won = cp["last_won"]
+            self._lost = cp["lost"]
+            self._days = cp["days"]
+            self._pending = cp["pending"]
+            self._paper = cp["paper"]
+            if cp.get("decision_log") == (str(self.decision_log) if self.decision_log else None):
+                self._decision_pos = cp["decision_pos"]
+                self._high_edge = deque(cp["high_edge"])
+        except Exception:
+            self._reset_trades()
+            self._reset_decisions()
+
+    def save(self):
+        """Write the checkpoint (atomic replace) if anything changed."""
+        if not self.checkpoint or not self._dirty:
+            return
+        cp = {
+            "version": CHECKPOINT_VERSION,
+            "saved_at": datetime.now(timezone.utc).isoformat(),
+            "trade_log": str(self.trade_log),
+            "decision_log": str(self.decision_log) if self.decision_log else None,
+            "trade_pos": self._trade_pos,
+            "entries": self._entries,
+            "last_won": self._last_won,
+            "lost": self._lost,
+            "days": self._days,
+            "pending": self._pending,
+            "paper": self._paper,
+            "decision_pos": self._decision_pos,
+            "high_edge": list(self._high_edge),
+        }
+        self.checkpoint.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.checkpoint.with_suffix(self.checkpoint.suffix + ".tmp")
+        with open(tmp, "w") as f:
+            json.dump(cp, f)
+        os.replace(tmp, self.checkpoint)
+        self._dirty = False
+
+    # ── tailing ──
+
+    def _read_new_lines(self, path: Path, pos: dict):
+        """
+        Complete lines appended since `pos`; None if the file was replaced
+        or truncated (caller rebuilds). Advances pos in place.
+        """
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return None if pos["offset"] else []
+        if pos["ino"] is not None and (st.st_ino != pos["ino"] or st.st_size < pos["offset"]):
+            return None
+        pos["ino"] = st.st_ino
+        if st.st_size == pos["offset"]:
+            return []
+        with open(path, "rb") as f:
+            f.seek(pos["offset"])
+            data = f.read()
+        end = data.rfind(b"\n") + 1  # leave a partially written last line for next time
+        pos["offset"] += end
+        return data[:end].splitlines()
+
+    def refresh(self):
+        """Fold newly appended log lines into the aggregates and checkpoint."""
+        lines = self._read_new_lines(self.trade_log, self._trade_pos)
+        if lines is None:
+            self._reset_trades()
+            lines = self._read_new_lines(self.trade_log, self._trade_pos) or []
+        for raw in lines:
+            try:
+                self._add_trade(json.loads(raw))
+            except Exception:
+                continue
+        self._dirty |= bool(lines)
+
+        if self.decision_log:
+            lines = self._read_new_lines(self.decision_log, self._decision_pos)
+            if lines is None:
+                self._reset_decisions()
+                lines = self._read_new_lines(self.decision_log, self._decision_pos) or []
+            for raw in lines:
+                try:
+                    self._add_decision(json.loads(raw))
+                except Exception:
+                    continue
+            self._dirty |= bool(lines)
+
+        self._prune()
+        self.save()
+        return self
+
+    def adopt_rewrite(self):
+        """
+        Accept the trade log's new identity after an in-process rewrite whose
+        changes were already applied via settle(). Call only when the ledger
+        was refreshed right before the rewrite.
+        """
+        try:
+            st = os.stat(self.trade_log)
+        except FileNotFoundError:
+            return
+        self._trade_pos = {"ino": st.st_ino, "offset": st.st_size}
+        self._dirty = True
+        self.save()
+
+    def _add_trade(self, entry: dict):
+        index = self._entries
+        self._entries += 1
+
+        status = entry.get("result_status", "pending")
+        if self.journal is not None:
+            status = self.journal.status_for(entry)
+        if status == "won":
+            self._record_won(index)
+        elif status == "lost":
+            self._record_lost(index)
+
+        day = None
+        ts = entry.get("timestamp", "")
+        if ts:
+            try:
+                day = _parse_ts(ts).date().isoformat()
+            except ValueError:
+                day = None
+        contracts = entry.get("contracts", 0) or 0
+        price = entry.get("price_cents", 0) or 0
+        payout = contracts * (100 - price)
+        if day:
+            d = self._days.setdefault(day, _empty_day())
+            d["trades"] += 1
+            d["spent"] += entry.get("cost_cents", contracts * price)
+            if entry.get("action") != "SKIP":
+                d["cost"] += entry.get("cost_cents", 0)
+            if status == "won":
+                d["won"] += payout
+
+        ticker = entry.get("ticker", "")
+        if status == "pending" and entry.get("result_status") == "pending" and ticker:
+            self._pending.setdefault(ticker, []).append([index, entry.get("action", ""), day, payout])
+        if entry.get("action") in ("BUY_YES", "BUY_NO") and entry.get("dry_run"):
+            self._paper[ticker] = max(day or "", self._paper.get(ticker, ""))
+
+    def _add_decision(self, entry: dict):
+        if entry.get("outcome") == "executed":
+            return
+        if abs(entry.get("edge", 0) or 0) <= self.high_edge_threshold:
+            return
+        self._high_edge.append(_parse_ts(entry["timestamp"]).timestamp())
+
+    def _record_won(self, index: int):
+        if index > self._last_won:
+            self._last_won = index
+            # losses before the latest win can never count toward the streak again
+            self._lost = self._lost[bisect_right(self._lost, index):]
+
+    def _record_lost(self, index: int):
+        if index > self._last_won:
+            insort(self._lost, index)
+
+    def _prune(self, now: float = None):
+        now = now if now is not None else time.time()
+        if len(self._days) > DAYS_KEPT:
+            for day in sorted(self._days)[:-DAYS_KEPT]:
+                del self._days[day]
+        self.high_edge_skips(now=now)
+        horizon = (datetime.fromtimestamp(now, timezone.utc) - timedelta(days=OPEN_DAYS_KEPT)).date().isoformat()
+        for ticker in [t for t, day in self._paper.items() if day and day < horizon]:
+            del self._paper[ticker]
+            self._dirty = True
+        for ticker in list(self._pending):
+            kept = [e for e in self._pending[ticker] if not (e[2] and e[2] < horizon)]
+            if len(kept) != len(self._pending[ticker]):
+                self._dirty = True
+                if kept:
+                    self._pending[ticker] = kept
+                else:
+                    del self._pending[ticker]
+
+    # ── updates ──
+
+    def settle(self, ticker: str, market_result: str) -> int:
+        """Resolve every pending entry for `ticker`. Returns the number settled."""
+        entries = self._pending.pop(ticker, None)
+        if not entries or not market_result:
+            return 0
+        for index, action, day, payout in entries:
+            side = "yes" if action == "BUY_YES" else "no"
+            if side == market_result:
+                self._record_won(index)
+                if day in self._days:
+                    self._days[day]["won"] += payout
+            else:
+                self._record_lost(index)
+        self._dirty = True
+        return len(entries)
+
+    # ── queries (all O(1) / O(log n)) ──
+
+    def consecutive_losses(self) -> int:
+        """Losses logged after the most recent win."""
+        return len(self._lost)
+
+    def day(self, date: str = None) -> dict:
+        """Aggregates for a UTC date (YYYY-MM-DD), today by default."""
+        date = date or datetime.now(timezone.utc).date().isoformat()
+        return dict(self._days.get(date, _empty_day()))
+
+    def pending_tickers(self) -> list:
+        return list(self._pending)
+
+    @property
+    def paper_tickers(self) -> set:
+        """Tickers paper-traded within the last OPEN_DAYS_KEPT days."""
+        return set(self._paper)
+
+    def already_traded(self, ticker: str) -> bool:
+        return ticker in self._paper
+
+    def high_edge_skips(self, window_sec: float = HIGH_EDGE_WINDOW_SEC, now: float = None) -> int:
+        """High-edge skipped/vetoed decisions within the last `window_sec`."""
+        cutoff = (now if now is not None else time.time()) - window_sec
+        while self._high_edge and self._high_edge[0] < cutoff:
+            self._high_edge.popleft()
+            self._dirty = True
+        return len(self._high_edge)
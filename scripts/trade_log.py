@@ -0,0 +1,469 @@
+#!/usr/bin/env python3
+"""
+Trade Log Analytics
+One normalized SQLite table over every Kalshi trade log, shared by the
+analyze-*.py scripts, the hourly report and the stats pushers.
+
+Each JSONL source (legacy kalshi-trades.jsonl, v2, unified, v3) is
+ingested once and then refreshed incrementally from the last byte offset
+read; a file that was rewritten in place (settlement compaction, archiving)
+is detected by inode / size / first line and re-ingested. Field spellings
+are normalized on the way in:
+
+  - kind:   the entry's type, else trade / skip / exit from action BUY_* / SKIP / EXIT
+  - side:   side, or the BUY_YES / BUY_NO action
+  - price:  price_cents / price / avg_price / entry_price
+  - status: won / lost / pending / skipped  (result_status, won/win, lost/loss)
+  - asset:  BTC / ETH / SOL from the ticker, else the entry's asset field
+
+Settlements from the unified trader's journal are applied at query time,
+so pending trades resolve before the journal is folded into the log.
+The original line is kept in `raw` for ad-hoc json_extract() queries.
+
+Every refresh stamps the (source, date) pairs it changed with a new
+generation number in `day_versions`, so per-day rollups built on top of
+the index (scripts/stats_rollup.py) only recompute the days that moved.
+
+Usage:
+    from trade_log import TradeLog
+
+    log = TradeLog()                                   # data/trading/trade-analytics.db
+    log.refresh()                                      # new lines only
+    log.summary(sources=["v2"])                        # {"total", "won", "win_rate", "pnl_cents", ...}
+    log.group_by("hour")                               # [{"key": 0, "total": .., "win_rate": ..}, ...]
+    log.group_by("edge", bounds=[0, 0.1, 0.2, 0.3])    # edge buckets keyed by lower bound
+    log.entries(since=time.time() - 86400)             # full trade dicts, settlements applied
+    log.day_versions(["v2"])                           # {"2026-01-29": 3, ...} change stamps
+
+    from trade_log import load_entries
+    trades = load_entries(Path("scripts/kalshi-trades-v2.jsonl"))   # replaces a json.loads loop
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).parent
+DATA_DIR = SCRIPT_DIR.parent / "data" / "trading"
+DEFAULT_DB = DATA_DIR / "trade-analytics.db"
+
+SOURCES = {
+    "legacy": SCRIPT_DIR / "kalshi-trades.jsonl",
+    "v2": SCRIPT_DIR / "kalshi-trades-v2.jsonl",
+    "unified": DATA_DIR / "kalshi-unified-trades.jsonl",
+    "v3": DATA_DIR / "kalshi-v3-trades.jsonl",
+}
+SETTLEMENT_JOURNAL = DATA_DIR / "kalshi-unified-settlements.jsonl"
+JOURNAL_SOURCE = "_settlements"
+HEAD_BYTES = 256  # first bytes hashed to detect a rewritten file
+
+COLUMNS = ("ts", "date", "hour", "weekday", "kind", "ticker", "asset", "side", "price_cents",
+           "contracts", "cost_cents", "status", "edge", "our_prob", "market_prob", "regime",
+           "dry_run", "order_status")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    source  TEXT PRIMARY KEY,
+    path    TEXT,
+    inode   INTEGER,
+    offset  INTEGER,
+    head    TEXT
+);
+CREATE TABLE IF NOT EXISTS entries (
+    source       TEXT,
+    offset       INTEGER,
+    ts           REAL,
+    date         TEXT,
+    hour         INTEGER,
+    weekday      INTEGER,
+    kind         TEXT,
+    ticker       TEXT,
+    asset        TEXT,
+    side         TEXT,
+    price_cents  REAL,
+    contracts    INTEGER,
+    cost_cents   REAL,
+    status       TEXT,
+    edge         REAL,
+    our_prob     REAL,
+    market_prob  REAL,
+    regime       TEXT,
+    dry_run      INTEGER,
+    order_status TEXT,
+    raw          TEXT,
+    PRIMARY KEY (source, offset)
+);
+CREATE INDEX IF NOT EXISTS idx_entries_kind_ts ON entries(kind, ts);
+CREATE INDEX IF NOT EXISTS idx_entries_date ON entries(date);
+CREATE INDEX IF NOT EXISTS idx_entries_ticker ON entries(ticker);
+CREATE TABLE IF NOT EXISTS day_versions (
+    source  TEXT,
+    date    TEXT,
+    gen     INTEGER,
+    PRIMARY KEY (source, date)
+);
+CREATE TABLE IF NOT EXISTS settlements (
+    ticker        TEXT PRIMARY KEY,
+    market_result TEXT
+);
+CREATE VIEW IF NOT EXISTS trades AS
+SELECT *,
+       CASE result WHEN 'won' THEN 1 WHEN 'lost' THEN 0 END AS won,
+       CASE result WHEN 'won' THEN (100 - price_cents) * contracts
+                   WHEN 'lost' THEN -cost_cents ELSE 0 END AS pnl_cents
+FROM (
+    SELECT e.*,
+           CASE WHEN e.status = 'pending' AND s.market_result IS NOT NULL
+                THEN CASE WHEN e.side = s.market_result THEN 'won' ELSE 'lost' END
+                ELSE e.status END AS result
+    FROM entries e LEFT JOIN settlements s ON s.ticker = e.ticker
+);
+"""
+
+GROUP_KEYS = {
+    "hour": "hour", "weekday": "weekday", "date": "date", "asset": "asset",
+    "regime": "regime", "side": "side", "source": "source", "ticker": "ticker",
+    "kind": "kind",
+}
+WEEKDAYS = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+
+STATUS_ALIASES = {"won": "won", "win": "won", "lost": "lost", "loss": "lost",
+                  "pending": "pending", "skipped": "skipped"}
+
+
+def parse_ts(value) -> float:
+    """ISO string / 'YYYY-MM-DD HH:MM:SS' / epoch (s or ms) -> epoch seconds (None if unparseable)."""
+    if isinstance(value, (int, float)):
+        return value / 1000 if value > 1e11 else float(value)
+    if not value or not isinstance(value, str):
+        return None
+    try:
+        dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        try:
+            dt = datetime.strptime(value, "%Y-%m-%d %H:%M:%S")
+        except ValueError:
+            return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+def asset_of(ticker: str, entry: dict = None) -> str:
+    t = (ticker or "").upper()
+    for asset in ("BTC", "ETH", "SOL"):
+        if t.startswith(f"KX{asset}") or t.startswith(asset):
+            return asset
+    fallback = (entry or {}).get("asset")
+    return str(fallback).upper() if fallback else "OTHER"
+
+
+def _num(value):
+    return value if isinstance(value, (int, float)) and not isinstance(value, bool) else None
+
+
+def normalize(entry: dict) -> tuple:
+    """One parsed log line -> values for COLUMNS (same order)."""
+    action = str(entry.get("action") or "").upper()
+    etype = entry.get("type")
+    status = STATUS_ALIASES.get(str(entry.get("result_status") or entry.get("result") or "").lower())
+
+    if etype:
+        kind = etype
+    elif action.startswith("BUY"):
+        kind = "trade"
+    elif action == "SKIP" or status == "skipped":
+        kind = "skip"
+    elif action == "EXIT":
+        kind = "exit"
+    elif "opportunities_found" in entry:
+        kind = "cycle"
+    else:
+        kind = "trade" if entry.get("contracts") else "other"
+    if kind == "trade" and status is None:
+        status = "pending"
+
+    side = entry.get("side")
+    if not side and action in ("BUY_YES", "BUY_NO"):
+        side = action[4:]
+    side = str(side).lower() if side else None
+
+    price = next((_num(entry.get(k)) for k in ("price_cents", "price", "avg_price", "entry_price")
+                  if _num(entry.get(k)) is not None), None)
+    contracts = next((_num(entry.get(k)) for k in ("contracts", "count", "quantity")
+                      if _num(entry.get(k)) is not None), None)
+    cost = _num(entry.get("cost_cents"))
+    if cost is None and price is not None and contracts is not None:
+        cost = price * contracts
+
+    our_prob = next((_num(entry.get(k)) for k in ("our_prob", "forecast_prob", "critic_adj_prob")
+                     if _num(entry.get(k)) is not None), None)
+    market_prob = _num(entry.get("market_prob"))
+    if market_prob is None and _num(entry.get("market_price_yes")) is not None:
+        market_prob = entry["market_price_yes"] / 100
+    edge = _num(entry.get("edge"))
+    if edge is None:
+        edge = _num(entry.get("edge_with_bonus"))
+
+    ts = parse_ts(entry.get("timestamp") or entry.get("time"))
+    dt = datetime.fromtimestamp(ts, tz=timezone.utc) if ts is not None else None
+    ticker = entry.get("ticker") or ""
+    regime = entry.get("regime")
+    if isinstance(regime, dict):
+        regime = regime.get("regime")
+
+    return (ts, dt.strftime("%Y-%m-%d") if dt else None, dt.hour if dt else None,
+            dt.weekday() if dt else None, kind, ticker, asset_of(ticker, entry), side, price,
+            contracts, cost, status, edge, our_prob, market_prob, regime or "unknown",
+            int(bool(entry.get("dry_run"))), entry.get("order_status"))
+
+
+def source_name(path: Path) -> str:
+    """Known log paths keep their short name; any other file is keyed by its absolute path."""
+    path = Path(path).resolve()
+    for name, known in SOURCES.items():
+        if known.resolve() == path:
+            return name
+    return str(path)
+
+
+def load_entries(*paths, db_path: Path = DEFAULT_DB, **filters) -> list:
+    """Drop-in for the per-script JSONL loaders: refresh only `paths`, return their entries."""
+    sources = {source_name(p): Path(p) for p in paths}
+    log = TradeLog(db_path, sources=sources)
+    try:
+        log.refresh()
+        return log.entries(sources=list(sources), **filters)
+    finally:
+        log.close()
+
+
+class TradeLog:
+    """Incrementally refreshed, normalized view over the Kalshi trade logs."""
+
+    def __init__(self, db_path: Path = DEFAULT_DB, sources: dict = None,
+                 journal: Path = SETTLEMENT_JOURNAL):
+        self.db_path = Path(db_path)
+        self.sources = {name: Path(p) for name, p in (sources if sources is not None else SOURCES).items()}
+        self.journal = Path(journal) if journal else None
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False,
+                                     isolation_level=None, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._gen = None
+
+    def close(self):
+        self._conn.close()
+
+    @contextmanager
+    def transaction(self):
+        """Write transaction on the index DB for tables layered on top of it (e.g. rollups)."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    # ── ingest ──
+
+    @staticmethod
+    def _head(path: Path) -> str:
+        with open(path, "rb") as f:
+            return hashlib.sha1(f.read(HEAD_BYTES)).hexdigest()
+
+    def _touch(self, where: str, params=()):
+        """Stamp the (source, date) pairs of the matching entries with this refresh's generation."""
+        self._conn.execute(
+            "INSERT OR REPLACE INTO day_versions (source, date, gen) "
+            f"SELECT DISTINCT source, date, ? FROM entries WHERE date IS NOT NULL AND {where}",
+            (self._gen, *params))
+
+    def _drop(self, source: str):
+        self._touch("source = ?", (source,))
+        self._conn.execute("DELETE FROM entries WHERE source = ?", (source,))
+
+    def _new_lines(self, source: str, path: Path):
+        """(start offsets, lines) appended since the last refresh; resets on rewrite."""
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            self._drop(source)
+            self._conn.execute("DELETE FROM files WHERE source = ?", (source,))
+            return []
+        head = self._head(path)
+        row = self._conn.execute("SELECT inode, offset, head FROM files WHERE source = ?",
+                                 (source,)).fetchone()
+        offset = 0
+        if row and row["inode"] == st.st_ino and row["offset"] <= st.st_size and \
+                (row["head"] == head or row["offset"] < HEAD_BYTES):
+            offset = row["offset"]
+        elif row:
+            self._drop(source)
+        if offset == st.st_size:
+            return []
+        with open(path, "rb") as f:
+            f.seek(offset)
+            chunk = f.read(st.st_size - offset)
+        end = chunk.rfind(b"\n") + 1  # a partially written last line waits for the next refresh
+        lines = []
+        pos = offset
+        for raw in chunk[:end].splitlines(keepends=True):
+            lines.append((pos, raw))
+            pos += len(raw)
+        self._conn.execute(
+            "INSERT OR REPLACE INTO files (source, path, inode, offset, head) VALUES (?, ?, ?, ?, ?)",
+            (source, str(path), st.st_ino, offset + end, head))
+        return lines
+
+    def refresh(self) -> dict:
+        """Ingest lines appended since the last call. Returns {source: new entries}."""
+        added = {}
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._gen = self._conn.execute("SELECT COALESCE(MAX(gen), 0) + 1 FROM day_versions").fetchone()[0]
+                for source, path in self.sources.items():
+                    rows = []
+                    for pos, raw in self._new_lines(source, path):
+                        try:
+                            entry = json.loads(raw)
+                        except ValueError:
+                            continue
+                        if isinstance(entry, dict):
+                            rows.append((source, pos, *normalize(entry), raw.decode("utf-8", "replace").strip()))
+                    self._conn.executemany(
+                        f"INSERT OR REPLACE INTO entries (source, offset, {', '.join(COLUMNS)}, raw) "
+                        f"VALUES ({', '.join('?' * (len(COLUMNS) + 3))})", rows)
+                    if rows:
+                        self._touch("source = ? AND offset >= ?", (source, rows[0][1]))
+                    added[source] = len(rows)
+                if self.journal is not None:
+                    settled = []
+                    for _, raw in self._new_lines(JOURNAL_SOURCE, self.journal):
+                        try:
+                            rec = json.loads(raw)
+                        except ValueError:
+                            continue
+                        if isinstance(rec, dict) and rec.get("ticker") and rec.get("market_result"):
+                            settled.append((rec["ticker"], rec["market_result"]))
+                    self._conn.executemany(
+                        "INSERT OR REPLACE INTO settlements (ticker, market_result) VALUES (?, ?)", settled)
+                    for ticker, _ in settled:
+                        self._touch("ticker = ?", (ticker,))
+                    added[JOURNAL_SOURCE] = len(settled)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return added
+
+    # ── queries ──
+
+    def day_versions(self, sources=None) -> dict:
+        """{date: generation of the last refresh that changed it} across `sources`."""
+        filt, args = self._filters(None, sources, None, None, None, None, ())
+        return {r["date"]: r["gen"] for r in
+                self.query(f"SELECT date, MAX(gen) AS gen FROM day_versions{filt} GROUP BY date", args)}
+
+    def query(self, sql: str, params=()) -> list:
+        """Ad-hoc SQL over the `trades` view / `entries` table -> list of dicts."""
+        with self._lock:
+            return [dict(r) for r in self._conn.execute(sql, params)]
+
+    @staticmethod
+    def _filters(kind, sources, since, until, dry_run, where, params) -> tuple:
+        clauses, args = [], []
+        if kind:
+            clauses.append("kind = ?")
+            args.append(kind)
+        if sources:
+            clauses.append(f"source IN ({', '.join('?' * len(sources))})")
+            args.extend(sources)
+        if since is not None:
+            clauses.append("ts >= ?")
+            args.append(since)
+        if until is not None:
+            clauses.append("ts < ?")
+            args.append(until)
+        if dry_run is not None:
+            clauses.append("dry_run = ?")
+            args.append(int(dry_run))
+        if where:
+            clauses.append(f"({where})")
+            args.extend(params)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", args
+
+    @staticmethod
+    def _bucket_expr(bounds) -> tuple:
+        """CASE expression mapping edge to the lower bound of its [lo, hi) bucket."""
+        whens = " ".join("WHEN edge >= ? AND edge < ? THEN ?" for _ in bounds[:-1])
+        args = []
+        for lo, hi in zip(bounds, bounds[1:]):
+            args.extend((lo, hi, lo))
+        return f"CASE {whens} END", args
+
+    def group_by(self, key: str = None, kind: str = "trade", sources=None, since=None, until=None,
+                 dry_run=None, where: str = None, params=(), bounds=None) -> list:
+        """
+        Win rate / PnL aggregates per group. `key` is one of GROUP_KEYS, or
+        "edge" with `bounds` (sorted bucket edges). None aggregates everything.
+        """
+        key_args = []
+        if key is None:
+            key_sql = "NULL"
+        elif key == "edge":
+            if not bounds or len(bounds) < 2:
+                raise ValueError("edge grouping needs at least two bounds")
+            key_sql, key_args = self._bucket_expr(bounds)
+        elif key in GROUP_KEYS:
+            key_sql = GROUP_KEYS[key]
+        else:
+            raise ValueError(f"unknown group key {key!r}")
+        filt, args = self._filters(kind, sources, since, until, dry_run, where, params)
+        sql = (f"SELECT {key_sql} AS key, COUNT(*) AS total, "
+               "COALESCE(SUM(result = 'won'), 0) AS won, COALESCE(SUM(result = 'lost'), 0) AS lost, "
+               "COALESCE(SUM(result = 'pending'), 0) AS pending, "
+               "COALESCE(SUM(pnl_cents), 0) AS pnl_cents, COALESCE(SUM(cost_cents), 0) AS cost_cents, "
+               "COALESCE(SUM(CASE WHEN result IN ('won', 'lost') THEN cost_cents END), 0) AS settled_cost_cents, "
+               "AVG(edge) AS avg_edge "
+               f"FROM trades{filt} GROUP BY 1 ORDER BY 1")
+        rows = self.query(sql, key_args + args)
+        if key == "edge":
+            rows = [r for r in rows if r["key"] is not None]
+        for r in rows:
+            r["settled"] = r["won"] + r["lost"]
+            r["win_rate"] = r["won"] / r["settled"] if r["settled"] else None
+            r["roi"] = r["pnl_cents"] / r["settled_cost_cents"] if r["settled_cost_cents"] else None
+        return rows
+
+    def summary(self, **filters) -> dict:
+        """Single aggregate row (same fields as group_by) for the filtered trades."""
+        rows = self.group_by(None, **filters)
+        if rows:
+            return rows[0]
+        return {"key": None, "total": 0, "won": 0, "lost": 0, "pending": 0, "pnl_cents": 0,
+                "cost_cents": 0, "settled_cost_cents": 0, "avg_edge": None, "settled": 0,
+                "win_rate": None, "roi": None}
+
+    def entries(self, kind: str = "trade", sources=None, since=None, until=None, dry_run=None,
+                where: str = None, params=()) -> list:
+        """Original log entries (dicts) in log order, result_status updated from settlements."""
+        filt, args = self._filters(kind, sources, since, until, dry_run, where, params)
+        out = []
+        for r in self.query(f"SELECT raw, result FROM trades{filt} ORDER BY ts, source, offset", args):
+            entry = json.loads(r["raw"])
+            if r["result"] and entry.get("result_status") in (None, "pending"):
+                entry["result_status"] = r["result"]
+            out.append(entry)
+        return out
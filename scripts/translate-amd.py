@@ -2,13 +2,18 @@
 """
 Traduzione EN→IT usando Helsinki-NLP - OTTIMIZZATO
 Carica il modello UNA volta, poi traduce tutto
+I paragrafi già tradotti arrivano dalla translation memory (solo i nuovi vanno al modello)
 """
 
 import sys
 import os
 import warnings
+from pathlib import Path
 warnings.filterwarnings("ignore")
 
+sys.path.insert(0, str(Path(__file__).parent))
+from translation_memory import get_memory  # noqa: E402
+
 try:
     from transformers import MarianMTModel, MarianTokenizer
     import torch
@@ -49,7 +54,27 @@ def load_model():
     return _model, _tokenizer, _device
 
 def translate_batch(texts: list, max_length: int = 512) -> list:
-    """Traduce un batch di testi - molto più veloce"""
+    """Traduce un batch di testi - molto più veloce. Solo i testi non in memoria vanno al modello."""
+    memory = get_memory()
+    results = [None] * len(texts)
+    missing = []
+    for i, text in enumerate(texts):
+        hit = memory.get(text, "en", "it", MODEL_NAME, fuzzy=False) if text.strip() else None
+        if hit is not None:
+            results[i] = hit.target
+        else:
+            missing.append(i)
+    
+    if missing:
+        translated = _translate_batch([texts[i] for i in missing], max_length)
+        for i, out in zip(missing, translated):
+            results[i] = out
+            if out.strip():
+                memory.put(texts[i], out, "en", "it", MODEL_NAME)
+    return results
+
+def _translate_batch(texts: list, max_length: int = 512) -> list:
+    """Traduce un batch di testi con il modello"""
     model, tokenizer, device = load_model()
     
     results = []
@@ -110,6 +135,7 @@ def translate_file(input_path: str, output_path: str, batch_size: int = 10):
             f.write('\n\n'.join(translated))
     
     print(f"✅ Done! Saved to {output_path}")
+    print(f"🧠 {get_memory().summary()}")
 
 if __name__ == "__main__":
     if len(sys.argv) < 2:
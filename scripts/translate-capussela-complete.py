@@ -16,6 +16,9 @@ import re
 from pathlib import Path
 from datetime import datetime
 
+sys.path.insert(0, str(Path(__file__).parent))
+from translation_memory import get_memory  # noqa: E402
+
 # Configuration
 INPUT_FILE = "traduzioni/capussela-spirito-EN.txt"
 OUTPUT_DIR = Path("traduzioni/capussela-completa")
@@ -73,6 +76,10 @@ def wait_for_cpu(threshold=CPU_THRESHOLD):
     log(f"✅ CPU at {cpu:.1f}% - proceeding")
 
 def ollama_translate(text, timeout=TIMEOUT_SECONDS):
+    """Translate text using Ollama (paragraphs already in the translation memory are reused)"""
+    return get_memory().translate(text, lambda t: _ollama_translate(t, timeout), "en", "it", MODEL)
+
+def _ollama_translate(text, timeout=TIMEOUT_SECONDS):
     """Translate text using Ollama"""
     prompt = f"""Translate the following English text to Italian. 
 Keep the same formatting (paragraphs, quotes, etc).
@@ -196,6 +203,7 @@ def translate_chapter(name, text, chapter_num):
     chapter_file.write_text(final_text, encoding="utf-8")
     
     log(f"✅ {name} complete: {len(translated)} paragraphs, {errors} errors")
+    log(f"🧠 {get_memory().summary()}")
     return final_text, errors
 
 def validate_output(original, translated):
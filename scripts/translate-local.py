@@ -2,12 +2,16 @@
 """
 Local Translation Agent - Usa LLaMA 3 8B locale (Radeon/TinyGrad)
 Traduce testi riga per riga usando modelli LOCALI.
+Le righe già tradotte (anche in altri libri) arrivano dalla translation memory.
 """
 
 import sys
 import os
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).parent))
+from translation_memory import get_memory  # noqa: E402
+
 # TinyGrad per Radeon
 os.environ["GPU"] = "1"
 
@@ -33,6 +37,7 @@ class LocalTranslator:
         self.target_lang = target_lang
         self.model = None
         self.tokenizer = None
+        self.memory = get_memory()
         self._load_model()
     
     def _load_model(self):
@@ -61,10 +66,15 @@ class LocalTranslator:
         print("✅ Modello caricato!")
     
     def translate_line(self, text: str) -> str:
-        """Traduce una singola riga"""
+        """Traduce una singola riga (translation memory prima del modello)"""
         if not text.strip():
             return text  # Preserva righe vuote
-        
+        # Il fallback all'originale non è una traduzione: non va in memoria
+        return self.memory.translate(text.strip(), self._generate, self.source_lang, self.target_lang,
+                                     MODEL_NAME, accept=lambda t: t != text.strip())
+    
+    def _generate(self, text: str) -> str:
+        """Traduce una riga con il modello"""
         prompt = f"""Translate the following text from {self.source_lang} to {self.target_lang}.
 Translate ONLY the text, nothing else. Keep the same formatting.
 
@@ -115,6 +125,7 @@ Translate ONLY the text, nothing else. Keep the same formatting.
         # Salva output
         Path(output_path).write_text('\n'.join(translated), encoding='utf-8')
         print(f"\n✅ Traduzione completata!")
+        print(f"🧠 {self.memory.summary()}")
         print(f"💾 Salvato in: {output_path}")
         
         return output_path
@@ -1,11 +1,16 @@
 #!/usr/bin/env python3
 """Translate using Qwen 32B on AMD GPU via tinygrad"""
 import os
+import sys
+from pathlib import Path
 os.environ["AMD"] = "1"
 
 from transformers import AutoTokenizer, AutoModelForCausalLM
 import torch
 
+sys.path.insert(0, str(Path(__file__).parent))
+from translation_memory import get_memory  # noqa: E402
+
 print("Loading Qwen 32B model...")
 model_name = "Qwen/Qwen2.5-Coder-32B-Instruct"
 
@@ -30,8 +35,14 @@ chunks = [' '.join(words[i:i+chunk_size]) for i in range(0, len(words), chunk_si
 
 print(f"Splitting into {len(chunks)} chunks...")
 
+memory = get_memory()
 translated = []
 for i, chunk in enumerate(chunks):
+    hit = memory.get(chunk, "en", "it", model_name, fuzzy=False)
+    if hit is not None:
+        print(f"Chunk {i+1}/{len(chunks)} from translation memory")
+        translated.append(hit.target)
+        continue
     print(f"Translating chunk {i+1}/{len(chunks)}...")
     
     prompt = f"""Traduci il seguente testo dall'inglese all'italiano. Mantieni lo stile accademico e formale. Traduci SOLO il testo, senza commenti.
@@ -58,6 +69,8 @@ Traduzione italiana:"""
         translation = response[len(prompt):].strip()
     
     translated.append(translation)
+    if translation:
+        memory.put(chunk, translation, "en", "it", model_name)
 
 # Save result
 result = '\n\n'.join(translated)
@@ -67,3 +80,4 @@ with open('/Users/mattia/Projects/Onde/traduzioni/capussela-spirito-IT.md', 'w')
     f.write(result)
 
 print(f"Done! Saved to capussela-spirito-IT.md")
+print(memory.summary())
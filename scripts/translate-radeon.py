@@ -2,6 +2,7 @@
 """
 Traduzione EN→IT con Helsinki-NLP opus-mt su AMD Radeon via TinyGrad ONNX
 Modello caricato UNA volta, batch processing efficiente.
+I paragrafi già tradotti arrivano dalla translation memory.
 
 Usage: 
   python translate-radeon.py "English text"
@@ -12,6 +13,10 @@ import sys
 import os
 import argparse
 import numpy as np
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+from translation_memory import get_memory  # noqa: E402
 
 # TinyGrad AMD setup
 TINYGRAD_PATH = os.path.expanduser("~/conductor/workspaces/Onde/moscow/tinygrad-fix")
@@ -57,7 +62,11 @@ def load_model():
     return _encoder, _decoder, _tokenizer_src, _tokenizer_tgt
 
 def translate(text: str, max_length: int = 128) -> str:
-    """Translate English to Italian"""
+    """Translate English to Italian (translation memory first)"""
+    return get_memory().translate(text, lambda t: _translate(t, max_length), "en", "it", "opus-mt-en-it-onnx")
+
+def _translate(text: str, max_length: int = 128) -> str:
+    """Translate English to Italian with the ONNX model"""
     from tinygrad import Tensor
     
     encoder, decoder, tok_src, tok_tgt = load_model()
@@ -147,6 +156,7 @@ def translate_file(input_path: str, output_path: str, batch_size: int = 10):
         f.write('\n\n'.join(translated))
     
     print(f"✅ Done! Saved to {output_path}")
+    print(f"🧠 {get_memory().summary()}")
 
 def main():
     parser = argparse.ArgumentParser(description="Translate EN→IT on AMD Radeon")
@@ -16,22 +16,33 @@ Fix v2:
   - Processa PARAGRAFO PER PARAGRAFO (no timeout)
   - Traccia tempi per ogni ciclo
   - Output incrementale
+  - Cicli in streaming: il paragrafo k entra nel ciclo 2 mentre il ciclo 1
+    lavora sul k+1 (TRANSLATION_STAGE_WORKERS chiamate parallele per ciclo)
+  - Checkpoint append-only per paragrafo: se crasha, rilancia e riparte
+    da dove era rimasto. Report paragrafi/minuto per ciclo
+  - Translation memory condivisa: paragrafi già revisionati (anche in altri
+    libri: titoli, ritornelli, frontespizi) non tornano al modello
   
 Casa Editrice AI - FreeRiverHouse/Onde
 """
 
-import subprocess
 import json
 import sys
 import os
-import time
 import re
 from pathlib import Path
 from datetime import datetime
 
+sys.path.insert(0, str(Path(__file__).parent))
+from llm_client import get_client  # noqa: E402
+from staged_pipeline import ParagraphCheckpoint, Stage, StagedPipeline  # noqa: E402
+from translation_memory import get_memory  # noqa: E402
+
 # ⛔ CONFIGURAZIONE - SOLO MODELLI LOCALI ⛔
 OLLAMA_MODEL = "llama3:70b"
 MAX_PARAGRAPH_CHARS = 500  # Paragrafi piccoli = no timeout
+# Chiamate Ollama parallele per ciclo (alzare OLLAMA_NUM_PARALLEL sul server di conseguenza)
+STAGE_WORKERS = int(os.environ.get("TRANSLATION_STAGE_WORKERS", "2"))
 
 WARNING = """
 ╔═══════════════════════════════════════════════════════════════╗
@@ -45,20 +56,13 @@ def log(msg):
     print(f"[{ts}] {msg}", flush=True)
 
 def ollama_generate(prompt: str, timeout: int = 120) -> str:
-    """Chiama Ollama locale con timeout corto"""
-    try:
-        result = subprocess.run(
-            ["ollama", "run", OLLAMA_MODEL],
-            input=prompt,
-            capture_output=True,
-            text=True,
-            timeout=timeout
-        )
-        return result.stdout.strip()
-    except subprocess.TimeoutExpired:
+    """Chiama Ollama locale con timeout corto (client residente, modello tenuto in memoria)"""
+    result = get_client().generate(prompt, model=OLLAMA_MODEL, timeout=timeout)
+    if result["success"]:
+        return result["response"].strip()
+    if result["error"].startswith("Timeout"):
         return "[TIMEOUT]"
-    except Exception as e:
-        return f"[ERRORE: {e}]"
+    return f"[ERRORE: {result['error']}]"
 
 def split_paragraphs(text: str) -> list:
     """Divide testo in paragrafi gestibili"""
@@ -186,9 +190,35 @@ TESTO SISTEMATO:"""
 # PIPELINE PRINCIPALE
 # ═══════════════════════════════════════════════════════════════
 
-def run_pipeline(original_file: str, translation_file: str, output_dir: str):
+CYCLES = [
+    # (metrics key, agent, focus, stage fn(text, original))
+    ("1_riletttore", "RILETTTORE", "errori grossolani", lambda text, orig: ciclo_1_riletttore(text)),
+    ("2_revisore", "REVISORE", "fedeltà originale",
+     lambda text, orig: ciclo_2_revisore(orig, text) if orig else text),
+    ("3_grammatico", "GRAMMATICO", "grammatica italiana", lambda text, orig: ciclo_3_grammatico(text)),
+    ("4_antislop", "ANTI-SLOP", "naturalezza italiano", lambda text, orig: ciclo_4_antislop(text)),
+    ("5_formattatore", "FORMATTATORE", "encoding, punteggiatura",
+     lambda text, orig: ciclo_5_formattatore(text)),
+]
+
+
+def _remembered(stage: str, fn):
+    """Ciclo con translation memory: chiave = input del ciclo (+ originale per il revisore)"""
+    memory = get_memory()
+    
+    def run(text, orig):
+        source = f"{orig}\n\n{text}" if stage == "2_revisore" else text
+        return memory.translate(source, lambda _: fn(text, orig), "it", "it", OLLAMA_MODEL, stage)
+    return run
+
+
+def run_pipeline(original_file: str, translation_file: str, output_dir: str,
+                 workers: int = STAGE_WORKERS):
     """
-    Pipeline completa 5 cicli con tracking tempi
+    Pipeline completa 5 cicli in streaming: ogni paragrafo passa al ciclo
+    successivo appena finito, con `workers` chiamate parallele per ciclo.
+    Checkpoint append-only per paragrafo (checkpoint.jsonl): rilanciando
+    lo stesso comando i paragrafi già fatti non vengono rielaborati.
     """
     print(WARNING)
     
@@ -213,142 +243,43 @@ def run_pipeline(original_file: str, translation_file: str, output_dir: str):
     # ⚠️ BUG FIX 2026-01-30: Rimosso limite hardcoded!
     # Era: MAX_PARAGRAPHS = 100 che causava traduzione incompleta (~9%)
     # Ora: processa TUTTI i paragrafi del libro
-    # (opzionale: decommentare per test rapidi)
-    # MAX_PARAGRAPHS = 100
-    # orig_paragraphs = orig_paragraphs[:MAX_PARAGRAPHS]
-    # trans_paragraphs = trans_paragraphs[:MAX_PARAGRAPHS]
-    
-    # Tracking
-    metrics = {
-        "start_time": datetime.now().isoformat(),
-        "cycles": {},
-        "paragraphs_processed": len(trans_paragraphs)
-    }
-    
-    current_text = trans_paragraphs.copy()
-    
-    # ═══════════════════════════════════════════════════════════
-    # CICLO 1: RILETTTORE
-    # ═══════════════════════════════════════════════════════════
-    log("═" * 50)
-    log("📍 CICLO 1: RILETTTORE (errori grossolani)")
-    log("═" * 50)
-    
-    cycle_start = time.time()
-    for i, para in enumerate(current_text):
-        log(f"   [{i+1}/{len(current_text)}] {para[:30]}...")
-        result = ciclo_1_riletttore(para)
-        if not result.startswith("["):
-            current_text[i] = result
-    
-    metrics["cycles"]["1_riletttore"] = {
-        "duration_sec": round(time.time() - cycle_start, 1),
-        "agent": "RILETTTORE",
-        "focus": "errori grossolani"
-    }
-    
-    # Save checkpoint
-    with open(output_path / "checkpoint_ciclo1.txt", 'w', encoding='utf-8') as f:
-        f.write("\n\n".join(current_text))
-    log(f"   ✓ Checkpoint salvato ({metrics['cycles']['1_riletttore']['duration_sec']}s)")
-    
-    # ═══════════════════════════════════════════════════════════
-    # CICLO 2: REVISORE
-    # ═══════════════════════════════════════════════════════════
-    log("═" * 50)
-    log("📍 CICLO 2: REVISORE (fedeltà originale)")
-    log("═" * 50)
     
-    cycle_start = time.time()
-    for i, (orig, trans) in enumerate(zip(orig_paragraphs, current_text)):
-        log(f"   [{i+1}/{len(current_text)}] confronto...")
-        result = ciclo_2_revisore(orig, trans)
-        if not result.startswith("["):
-            current_text[i] = result
+    checkpoint = ParagraphCheckpoint(output_path / "checkpoint.jsonl", namespace=OLLAMA_MODEL)
+    log(f"   Checkpoint: {checkpoint.loaded} risultati già salvati")
+    log(f"   Cicli in streaming, {workers} chiamate parallele per ciclo")
     
-    metrics["cycles"]["2_revisore"] = {
-        "duration_sec": round(time.time() - cycle_start, 1),
-        "agent": "REVISORE", 
-        "focus": "fedeltà originale"
-    }
-    
-    with open(output_path / "checkpoint_ciclo2.txt", 'w', encoding='utf-8') as f:
-        f.write("\n\n".join(current_text))
-    log(f"   ✓ Checkpoint salvato ({metrics['cycles']['2_revisore']['duration_sec']}s)")
-    
-    # ═══════════════════════════════════════════════════════════
-    # CICLO 3: GRAMMATICO
-    # ═══════════════════════════════════════════════════════════
-    log("═" * 50)
-    log("📍 CICLO 3: GRAMMATICO (grammatica perfetta)")
-    log("═" * 50)
-    
-    cycle_start = time.time()
-    for i, para in enumerate(current_text):
-        log(f"   [{i+1}/{len(current_text)}]")
-        result = ciclo_3_grammatico(para)
-        if not result.startswith("["):
-            current_text[i] = result
-    
-    metrics["cycles"]["3_grammatico"] = {
-        "duration_sec": round(time.time() - cycle_start, 1),
-        "agent": "GRAMMATICO",
-        "focus": "grammatica italiana"
-    }
-    
-    with open(output_path / "checkpoint_ciclo3.txt", 'w', encoding='utf-8') as f:
-        f.write("\n\n".join(current_text))
-    log(f"   ✓ Checkpoint salvato ({metrics['cycles']['3_grammatico']['duration_sec']}s)")
-    
-    # ═══════════════════════════════════════════════════════════
-    # CICLO 4: ANTI-SLOP
-    # ═══════════════════════════════════════════════════════════
-    log("═" * 50)
-    log("📍 CICLO 4: ANTI-SLOP (naturalezza)")
-    log("═" * 50)
+    total = len(trans_paragraphs)
+    completed = [0]
     
-    cycle_start = time.time()
-    for i, para in enumerate(current_text):
-        log(f"   [{i+1}/{len(current_text)}]")
-        result = ciclo_4_antislop(para)
-        if not result.startswith("["):
-            current_text[i] = result
+    def on_done(i, text):
+        completed[0] += 1
+        log(f"   ✓ [{completed[0]}/{total}] paragrafo {i+1}: {text[:30]}...")
     
-    metrics["cycles"]["4_antislop"] = {
-        "duration_sec": round(time.time() - cycle_start, 1),
-        "agent": "ANTI-SLOP",
-        "focus": "naturalezza italiano"
+    pipe = StagedPipeline([Stage(key, _remembered(key, fn), workers) for key, _, _, fn in CYCLES],
+                          checkpoint=checkpoint, on_done=on_done)
+    metrics = {
+        "start_time": datetime.now().isoformat(),
+        "cycles": {},
+        "paragraphs_processed": total,
+        "workers_per_cycle": workers,
     }
+    try:
+        current_text = pipe.run(trans_paragraphs, sources=orig_paragraphs)
+    finally:
+        checkpoint.close()
     
-    with open(output_path / "checkpoint_ciclo4.txt", 'w', encoding='utf-8') as f:
-        f.write("\n\n".join(current_text))
-    log(f"   ✓ Checkpoint salvato ({metrics['cycles']['4_antislop']['duration_sec']}s)")
-    
-    # ═══════════════════════════════════════════════════════════
-    # CICLO 5: FORMATTATORE
-    # ═══════════════════════════════════════════════════════════
-    log("═" * 50)
-    log("📍 CICLO 5: FORMATTATORE (encoding UTF-8)")
-    log("═" * 50)
-    
-    cycle_start = time.time()
-    for i, para in enumerate(current_text):
-        log(f"   [{i+1}/{len(current_text)}]")
-        result = ciclo_5_formattatore(para)
-        if not result.startswith("["):
-            current_text[i] = result
-    
-    metrics["cycles"]["5_formattatore"] = {
-        "duration_sec": round(time.time() - cycle_start, 1),
-        "agent": "FORMATTATORE",
-        "focus": "encoding, punteggiatura"
-    }
+    for error in pipe.errors:
+        log(f"   ⚠️ {error}")
+    stats = pipe.stats()
+    for key, agent, focus, _ in CYCLES:
+        metrics["cycles"][key] = {"agent": agent, "focus": focus, **stats[key]}
     
     # ═══════════════════════════════════════════════════════════
     # OUTPUT FINALE
     # ═══════════════════════════════════════════════════════════
     metrics["end_time"] = datetime.now().isoformat()
-    metrics["total_duration_sec"] = sum(c["duration_sec"] for c in metrics["cycles"].values())
+    metrics["total_duration_sec"] = round(pipe.wall_sec, 1)
+    metrics["paragraphs_per_min"] = round(total * 60 / pipe.wall_sec, 2) if pipe.wall_sec > 0 else 0
     
     # Save final text
     final_text = "\n\n".join(current_text)
@@ -364,10 +295,12 @@ def run_pipeline(original_file: str, translation_file: str, output_dir: str):
     print("📊 SOMMARIO PIPELINE")
     print("═" * 50)
     print(f"Paragrafi processati: {metrics['paragraphs_processed']}")
-    print(f"Tempo totale: {metrics['total_duration_sec']:.1f}s")
-    print("\nTempi per ciclo:")
+    print(f"Tempo totale: {metrics['total_duration_sec']:.1f}s ({metrics['paragraphs_per_min']} paragrafi/min)")
+    print("\nCicli (paragrafi/min, da checkpoint, falliti):")
     for name, data in metrics["cycles"].items():
-        print(f"  {name}: {data['duration_sec']}s")
+        print(f"  {name}: {data['paragraphs_per_min']}/min, {data['cached']} da checkpoint, "
+              f"{data['failed']} falliti ({data['duration_sec']}s)")
+    print(f"\n🧠 {get_memory().summary()}")
     print(f"\nOutput: {output_path}/")
     print(WARNING)
     
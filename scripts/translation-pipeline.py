@@ -12,13 +12,16 @@ Pipeline:
 Confronta originale ↔ traduzione per ogni passaggio.
 """
 
-import subprocess
 import json
 import sys
 import os
 from pathlib import Path
 from datetime import datetime
 
+sys.path.insert(0, str(Path(__file__).parent))
+from llm_client import get_client  # noqa: E402
+from translation_memory import get_memory  # noqa: E402
+
 # ⛔ CONFIGURAZIONE - SOLO MODELLI LOCALI ⛔
 OLLAMA_MODEL = "llama3:70b"  # Modello locale su M4
 OLLAMA_HOST = "http://localhost:11434"
@@ -37,25 +40,21 @@ def log(msg):
     ts = datetime.now().strftime("%H:%M:%S")
     print(f"[{ts}] {msg}")
 
-def ollama_generate(prompt, system_prompt=""):
-    """Chiama Ollama locale - MAI API esterne"""
-    cmd = ["ollama", "run", OLLAMA_MODEL]
-    
-    full_prompt = f"{system_prompt}\n\n{prompt}" if system_prompt else prompt
-    
-    try:
-        result = subprocess.run(
-            cmd,
-            input=full_prompt,
-            capture_output=True,
-            text=True,
-            timeout=300  # 5 min timeout
-        )
-        return result.stdout.strip()
-    except subprocess.TimeoutExpired:
+def ollama_generate(prompt, system_prompt="", stage=None):
+    """
+    Chiama Ollama locale - MAI API esterne (client residente, modello tenuto in memoria).
+    Con `stage` la risposta passa dalla translation memory: stesso chunk, stesso ciclo = zero chiamate.
+    """
+    if stage:
+        return get_memory().translate(prompt, lambda p: ollama_generate(p, system_prompt),
+                                      "en", "it", OLLAMA_MODEL, stage)
+    result = get_client(OLLAMA_HOST).generate(prompt, model=OLLAMA_MODEL,
+                                              system=system_prompt or None, timeout=300)
+    if result["success"]:
+        return result["response"].strip()
+    if result["error"].startswith("Timeout"):
         return "[TIMEOUT - risposta troppo lunga]"
-    except Exception as e:
-        return f"[ERRORE: {e}]"
+    return f"[ERRORE: {result['error']}]"
 
 
 def riletttore(original: str, translation: str, cycle: int) -> dict:
@@ -89,7 +88,7 @@ TRADUZIONE (italiano):
 
 Analizza e correggi."""
 
-    response = ollama_generate(prompt, system)
+    response = ollama_generate(prompt, system, stage=f"v1-riletttore-{cycle}")
     
     # Parse response
     try:
@@ -141,7 +140,7 @@ TRADUZIONE (italiano):
 
 Rivedi e migliora."""
 
-    response = ollama_generate(prompt, system)
+    response = ollama_generate(prompt, system, stage=f"v1-revisore-{cycle}")
     
     # Parse response
     try:
@@ -233,6 +232,7 @@ def run_pipeline(original_file: str, translation_file: str, output_file: str):
     print(f"Cicli completati: 2")
     print(f"Chunk analizzati: {min(5, len(original_chunks))}")
     print(f"Report: {output_file}")
+    print(f"🧠 {get_memory().summary()}")
     print(WARNING)
     
     return results
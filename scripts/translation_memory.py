@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""
+Translation Memory
+SQLite store of accepted (source segment -> output) pairs shared by every
+local translator (translate-local / -amd / -radeon / -qwen-amd,
+translate-capussela-complete) and the revision pipelines, so chapter
+headers, refrains, front matter and reruns of a book are not re-sent to
+the model.
+
+Entries are scoped by (source language, target language, model, stage):
+a segment translated by opus-mt is never served to a llama3 revision
+stage. Lookup order:
+
+  1. exact: SHA-256 of the whitespace-normalized source
+  2. fuzzy: character-trigram Dice similarity >= fuzzy_threshold against
+     the scope's segments (inverted index built lazily per scope, length
+     pre-filter). Only segments up to FUZZY_MAX_CHARS take part.
+
+Only exact hits are ever served as output (translate(), and the
+translators that call get(..., fuzzy=False)). A fuzzy match is another
+segment's translation: "won 3 games" scores above 0.95 against "won 4
+games", and so do changed names or a dropped "not". Fuzzy matches are for
+inspection and suggestions only.
+
+The table is capped at max_entries; when it overflows, the least recently
+used tenth is evicted. Per-scope lookup / hit / miss / eviction counters
+back stats() and hit_rate().
+
+Usage:
+    from translation_memory import get_memory
+
+    tm = get_memory()                                  # data/translation-memory.db
+    text = tm.translate(segment, model_fn, "en", "it", model="opus-mt-en-it")
+    hit = tm.get(segment, "en", "it", "opus-mt-en-it")   # Match(target, score, source) or None
+                                                       # (fuzzy=False: exact hits only)
+    tm.put(segment, translation, "en", "it", "opus-mt-en-it")
+    print(tm.summary())
+
+Config (env):
+    TRANSLATION_MEMORY_DB       database path (default data/translation-memory.db)
+    TRANSLATION_MEMORY_FUZZY    fuzzy threshold, 1 disables fuzzy hits (default 0.95)
+    TRANSLATION_MEMORY_MAX      max stored segments (default 200000)
+"""
+
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+SCRIPT_DIR = Path(__file__).parent
+DEFAULT_DB = Path(os.environ.get("TRANSLATION_MEMORY_DB", SCRIPT_DIR.parent / "data" / "translation-memory.db"))
+FUZZY_THRESHOLD = float(os.environ.get("TRANSLATION_MEMORY_FUZZY", "0.95"))
+MAX_ENTRIES = int(os.environ.get("TRANSLATION_MEMORY_MAX", "200000"))
+FUZZY_MAX_CHARS = 2000
+EVICT_FRACTION = 0.1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS segments (
+    id         INTEGER PRIMARY KEY,
+    scope      TEXT,
+    src_hash   TEXT,
+    source     TEXT,
+    target     TEXT,
+    hits       INTEGER DEFAULT 0,
+    created    REAL,
+    last_used  REAL,
+    UNIQUE (scope, src_hash)
+);
+CREATE INDEX IF NOT EXISTS idx_segments_last_used ON segments(last_used);
+"""
+
+_WS = re.compile(r"\s+")
+
+
+def normalize(text: str) -> str:
+    """Collapse runs of whitespace; case and punctuation are significant for translation."""
+    return _WS.sub(" ", text).strip()
+
+
+def trigrams(text: str) -> set:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def accepted(result: str) -> bool:
+    """Translators report failures in-band ("[TIMEOUT]", "[ERROR: ...]"); those are never stored."""
+    return bool(result and result.strip()) and not result.lstrip().startswith("[")
+
+
+@dataclass
+class Match:
+    target: str
+    score: float
+    source: str
+
+
+class _ScopeIndex:
+    """In-memory trigram postings for one scope's fuzzy-eligible segments."""
+
+    def __init__(self):
+        self.grams: Dict[int, set] = {}
+        self.postings = defaultdict(set)
+
+    def add(self, seg_id: int, text: str):
+        grams = trigrams(text)
+        self.grams[seg_id] = grams
+        for g in grams:
+            self.postings[g].add(seg_id)
+
+    def best(self, text: str, threshold: float):
+        grams = trigrams(text)
+        n = len(grams)
+        lo, hi = n * threshold / (2 - threshold), n * (2 - threshold) / threshold
+        shared = Counter()
+        for g in grams:
+            shared.update(self.postings.get(g, ()))
+        best_id, best_score = None, threshold
+        for seg_id, common in shared.items():
+            m = len(self.grams[seg_id])
+            if not lo <= m <= hi:
+                continue
+            score = 2 * common / (n + m)
+            if score >= best_score:
+                best_id, best_score = seg_id, score
+        return best_id, best_score
+
+
+class TranslationMemory:
+    """Thread-safe; one SQLite connection shared by all threads under a lock."""
+
+    def __init__(self, db_path: Path = DEFAULT_DB, max_entries: int = MAX_ENTRIES,
+                 fuzzy_threshold: float = FUZZY_THRESHOLD):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.fuzzy_threshold = fuzzy_threshold
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False,
+                                     isolation_level=None, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._count = self._conn.execute("SELECT COUNT(*) FROM segments").fetchone()[0]
+        self._indexes: Dict[str, _ScopeIndex] = {}
+        self._stats = defaultdict(Counter)
+
+    @staticmethod
+    def scope(src_lang: str, tgt_lang: str, model: str, stage: str = "translate") -> str:
+        return "|".join((src_lang.lower(), tgt_lang.lower(), model, stage))
+
+    @staticmethod
+    def _hash(text: str) -> str:
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def _index(self, scope: str) -> _ScopeIndex:
+        index = self._indexes.get(scope)
+        if index is None:
+            index = _ScopeIndex()
+            rows = self._conn.execute("SELECT id, source FROM segments WHERE scope = ? AND length(source) <= ?",
+                                      (scope, FUZZY_MAX_CHARS))
+            for seg_id, source in rows:
+                index.add(seg_id, source)
+            self._indexes[scope] = index
+        return index
+
+    def get(self, source: str, src_lang: str, tgt_lang: str, model: str, stage: str = "translate",
+            fuzzy: bool = True) -> Optional[Match]:
+        """Exact match, else the best fuzzy match above fuzzy_threshold, else None."""
+        text = normalize(source)
+        scope = self.scope(src_lang, tgt_lang, model, stage)
+        now = time.time()
+        with self._lock:
+            stats = self._stats[scope]
+            stats["lookups"] += 1
+            row = self._conn.execute("SELECT id, source, target FROM segments WHERE scope = ? AND src_hash = ?",
+                                     (scope, self._hash(text))).fetchone()
+            score = 1.0
+            if row is None and fuzzy and self.fuzzy_threshold < 1 and len(text) <= FUZZY_MAX_CHARS:
+                seg_id, score = self._index(scope).best(text, self.fuzzy_threshold)
+                if seg_id is not None:
+                    row = self._conn.execute("SELECT id, source, target FROM segments WHERE id = ?",
+                                             (seg_id,)).fetchone()
+            if row is None:
+                stats["misses"] += 1
+                return None
+            stats["exact_hits" if score == 1.0 and row[1] == text else "fuzzy_hits"] += 1
+            self._conn.execute("UPDATE segments SET hits = hits + 1, last_used = ? WHERE id = ?", (now, row[0]))
+        return Match(target=row[2], score=score, source=row[1])
+
+    def put(self, source: str, target: str, src_lang: str, tgt_lang: str, model: str,
+            stage: str = "translate"):
+        """Store (or refresh) an accepted segment pair."""
+        text = normalize(source)
+        if not text:
+            return
+        scope = self.scope(src_lang, tgt_lang, model, stage)
+        now = time.time()
+        with self._lock:
+            self._stats[scope]["puts"] += 1
+            key = self._hash(text)
+            row = self._conn.execute("SELECT id FROM segments WHERE scope = ? AND src_hash = ?",
+                                     (scope, key)).fetchone()
+            if row is not None:
+                self._conn.execute("UPDATE segments SET target = ?, last_used = ? WHERE id = ?",
+                                   (target, now, row[0]))
+                return
+            cur = self._conn.execute(
+                "INSERT INTO segments (scope, src_hash, source, target, created, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?)", (scope, key, text, target, now, now))
+            self._count += 1
+            index = self._indexes.get(scope)
+            if index is not None and len(text) <= FUZZY_MAX_CHARS:
+                index.add(cur.lastrowid, text)
+            if self._count > self.max_entries:
+                self._evict_locked()
+
+    def _evict_locked(self):
+        excess = self._count - self.max_entries + max(1, int(self.max_entries * EVICT_FRACTION))
+        rows = self._conn.execute("SELECT id, scope FROM segments ORDER BY last_used, id LIMIT ?",
+                                  (excess,)).fetchall()
+        self._conn.execute("BEGIN")
+        self._conn.executemany("DELETE FROM segments WHERE id = ?", [(r[0],) for r in rows])
+        self._conn.execute("COMMIT")
+        self._count -= len(rows)
+        for scope, n in Counter(r[1] for r in rows).items():
+            self._stats[scope]["evictions"] += n
+            self._indexes.pop(scope, None)  # rebuilt lazily without the evicted ids
+
+    def translate(self, source: str, fn: Callable[[str], str], src_lang: str, tgt_lang: str, model: str,
+                  stage: str = "translate", accept: Callable[[str], bool] = accepted) -> str:
+        """Remembered output for `source` (exact hits only), else fn(source), stored when accept() says so."""
+        if not source.strip():
+            return fn(source)
+        hit = self.get(source, src_lang, tgt_lang, model, stage, fuzzy=False)
+        if hit is not None:
+            return hit.target
+        result = fn(source)
+        if accept(result):
+            self.put(source, result, src_lang, tgt_lang, model, stage)
+        return result
+
+    def stats(self) -> Dict[str, dict]:
+        """Per-scope counters plus stored segment counts; hit_rate = hits / lookups."""
+        with self._lock:
+            sizes = dict(self._conn.execute("SELECT scope, COUNT(*) FROM segments GROUP BY scope"))
+            out = {}
+            for scope in sorted(set(sizes) | set(self._stats)):
+                c = self._stats[scope]
+                hits = c["exact_hits"] + c["fuzzy_hits"]
+                out[scope] = {
+                    "segments": sizes.get(scope, 0),
+                    "lookups": c["lookups"],
+                    "exact_hits": c["exact_hits"],
+                    "fuzzy_hits": c["fuzzy_hits"],
+                    "misses": c["misses"],
+                    "puts": c["puts"],
+                    "evictions": c["evictions"],
+                    "hit_rate": round(hits / c["lookups"], 4) if c["lookups"] else 0.0,
+                }
+            return out
+
+    def hit_rate(self) -> float:
+        stats = self.stats().values()
+        lookups = sum(s["lookups"] for s in stats)
+        return sum(s["exact_hits"] + s["fuzzy_hits"] for s in stats) / lookups if lookups else 0.0
+
+    def summary(self) -> str:
+        stats = self.stats().values()
+        lookups = sum(s["lookups"] for s in stats)
+        exact = sum(s["exact_hits"] for s in stats)
+        fuzzy = sum(s["fuzzy_hits"] for s in stats)
+        return (f"TM: {lookups} lookups, {exact} exact + {fuzzy} fuzzy hits "
+                f"({self.hit_rate():.1%}), {sum(s['segments'] for s in stats)} segments stored")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_MEMORIES: Dict[str, TranslationMemory] = {}
+_MEMORIES_LOCK = threading.Lock()
+
+
+def get_memory(db_path: Path = None) -> TranslationMemory:
+    """Process-wide TranslationMemory for `db_path` (default DEFAULT_DB)."""
+    key = str(Path(db_path or DEFAULT_DB).resolve())
+    with _MEMORIES_LOCK:
+        memory = _MEMORIES.get(key)
+        if memory is None:
+            memory = _MEMORIES[key] = TranslationMemory(Path(key))
+    return memory
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Inspect the translation memory")
+    parser.add_argument("--db", default=str(DEFAULT_DB), help="Database path")
+    parser.add_argument("--lookup", help="Look up a segment (needs --scope)")
+    parser.add_argument("--scope", default="en|it|llama3:70b|translate", help="src|tgt|model|stage")
+    args = parser.parse_args()
+
+    tm = get_memory(Path(args.db))
+    if args.lookup:
+        src, tgt, model, stage = args.scope.split("|", 3)
+        print(tm.get(args.lookup, src, tgt, model, stage))
+    else:
+        print(json.dumps({scope: s["segments"] for scope, s in tm.stats().items()}, indent=2))
@@ -15,6 +15,9 @@ import glob
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).parent))
+import gist_publisher  # noqa: E402
+
 # Config
 PROJECT_ROOT = Path(__file__).parent.parent
 FINETUNING_DIR = PROJECT_ROOT / "data" / "finetuning"
@@ -114,31 +117,18 @@ def load_alerts_from_jsonl(hours: int = 24) -> list:
 
 def update_gist_with_alerts(alerts: list, webhook_alerts: list = None) -> bool:
     """Update the trading stats Gist with alerts section. (T454: added webhook alerts)"""
-    import subprocess
-    
     if webhook_alerts is None:
         webhook_alerts = []
     
-    # Check for gh CLI
-    result = subprocess.run(['which', 'gh'], capture_output=True)
-    if result.returncode != 0:
-        print("Error: gh CLI not found. Install with: brew install gh", file=sys.stderr)
+    # Fetch current Gist content (the stats pusher owns the rest of the file);
+    # if it can't be read, don't publish: a fresh file would wipe the stats
+    current = gist_publisher.fetch(GIST_ID, GIST_FILE)
+    if current is None:
+        print("Error fetching Gist: unreachable or file missing, not updating", file=sys.stderr)
         return False
-    
-    # Fetch current Gist content
     try:
-        result = subprocess.run(
-            ['gh', 'gist', 'view', GIST_ID, '-f', GIST_FILE, '--raw'],
-            capture_output=True,
-            text=True,
-            timeout=30
-        )
-        if result.returncode != 0:
-            print(f"Error fetching Gist: {result.stderr}", file=sys.stderr)
-            return False
-        
-        current_data = json.loads(result.stdout)
-    except Exception as e:
+        current_data = json.loads(current)
+    except ValueError as e:
         print(f"Error parsing Gist: {e}", file=sys.stderr)
         # Start fresh
         current_data = {}
@@ -157,58 +147,13 @@ def update_gist_with_alerts(alerts: list, webhook_alerts: list = None) -> bool:
         'items': webhook_alerts,
     }
     
-    # Update Gist via GitHub API (gh gist edit is interactive, not suitable for scripts)
-    import urllib.request
-    import urllib.error
-    
-    # Get GitHub token from gh CLI
-    token_result = subprocess.run(['gh', 'auth', 'token'], capture_output=True, text=True)
-    if token_result.returncode != 0:
-        print(f"Error getting GitHub token: {token_result.stderr}", file=sys.stderr)
-        return False
-    
-    token = token_result.stdout.strip()
-    
-    # Prepare API request
-    api_url = f"https://api.github.com/gists/{GIST_ID}"
-    payload = json.dumps({
-        "files": {
-            GIST_FILE: {
-                "content": json.dumps(current_data, indent=2)
-            }
-        }
-    })
-    
-    req = urllib.request.Request(
-        api_url,
-        data=payload.encode('utf-8'),
-        method='PATCH',
-        headers={
-            'Authorization': f'Bearer {token}',
-            'Accept': 'application/vnd.github+json',
-            'Content-Type': 'application/json',
-        }
-    )
-    
-    try:
-        with urllib.request.urlopen(req, timeout=30) as resp:
-            if resp.status == 200:
-                print(f"✅ Updated Gist with {len(alerts)} alerts")
-                return True
-            else:
-                print(f"Error: API returned status {resp.status}", file=sys.stderr)
-                return False
-    except urllib.error.HTTPError as e:
-        print(f"Error updating Gist via API: {e.code} {e.reason}", file=sys.stderr)
-        try:
-            error_body = e.read().decode('utf-8')
-            print(f"  Response: {error_body[:200]}", file=sys.stderr)
-        except:
-            pass
-        return False
-    except Exception as e:
-        print(f"Error updating Gist: {e}", file=sys.stderr)
-        return False
+    # One PATCH through the shared publisher (pooled session, retries with backoff)
+    result = gist_publisher.publish(GIST_ID, {GIST_FILE: json.dumps(current_data, indent=2)})
+    if result["ok"]:
+        print(f"✅ Updated Gist with {len(alerts)} alerts")
+        return True
+    print(f"Error updating Gist via API: {result.get('status', '')} {result.get('error', '')}", file=sys.stderr)
+    return False
 
 
 def load_webhook_alerts(days: int = 7) -> list:
@@ -7,18 +7,28 @@ Analyzes historical trades to:
 2. Identify optimal trading parameters
 3. Simulate different strategies
 
+Usage:
+    python3 scripts/weather-backtest.py
+    python3 scripts/weather-backtest.py --search halving --workers 0
+
 Author: Claude
 Date: 2026-02-08
 """
 
+import argparse
 import json
 import os
+import sys
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 from collections import defaultdict
+from functools import partial
 import math
 
+sys.path.insert(0, str(Path(__file__).parent))
+from param_search import ParamSearch, fingerprint  # noqa: E402
+
 # File paths
 TRADES_FILE = Path(__file__).parent / "kalshi-trades-v2.jsonl"
 FORECAST_ACCURACY_FILE = Path(__file__).parent.parent / "data/trading/weather-forecast-accuracy.json"
@@ -141,6 +151,7 @@ def simulate_strategy(trades: List[Dict], params: Dict) -> Dict:
         "losses": 0,
         "pending": 0,
         "pnl_cents": 0,
+        "max_drawdown_cents": 0,
         "win_rate": 0.0,
         "avg_win_cents": 0,
         "avg_loss_cents": 0,
@@ -153,6 +164,7 @@ def simulate_strategy(trades: List[Dict], params: Dict) -> Dict:
     
     win_amounts = []
     loss_amounts = []
+    peak_pnl = 0
     
     for trade in trades:
         passes, reason = would_trade_pass_filter(trade, params)
@@ -213,6 +225,9 @@ def simulate_strategy(trades: List[Dict], params: Dict) -> Dict:
                     "edge": trade.get("edge"),
                     "loss": profit,
                 })
+        
+        peak_pnl = max(peak_pnl, results["pnl_cents"])
+        results["max_drawdown_cents"] = max(results["max_drawdown_cents"], peak_pnl - results["pnl_cents"])
     
     # Calculate summary stats
     total_settled = results["wins"] + results["losses"]
@@ -232,42 +247,50 @@ def simulate_strategy(trades: List[Dict], params: Dict) -> Dict:
     return results
 
 
-def run_parameter_sweep(trades: List[Dict]) -> List[Dict]:
+# Parameter ranges for the sweep (every combination)
+SWEEP_SPACE = {
+    "min_edge": [0.05, 0.10, 0.15, 0.20, 0.25, 0.30],
+    "min_forecast_strike_gap": [0.0, 1.0, 2.0, 3.0, 4.0, 5.0],
+    "max_market_conviction": [0.70, 0.80, 0.85, 0.90, 0.95, 1.0],
+    "min_our_prob": [0.0, 0.01, 0.05, 0.10],
+}
+
+
+def evaluate_points(trades: List[Dict], param_sets: List[Dict], fraction: float = 1.0) -> List[Dict]:
+    """param_search evaluate callable: sweep metrics on the oldest `fraction` of trades."""
+    if fraction < 1.0:
+        trades = trades[:max(1, int(round(len(trades) * fraction)))]
+    rows = []
+    for params in param_sets:
+        result = simulate_strategy(trades, params)
+        rows.append({
+            "win_rate": result["win_rate"],
+            "wins": result["wins"],
+            "losses": result["losses"],
+            "trades": result["wins"] + result["losses"],
+            "pnl_cents": result["pnl_cents"],
+            "max_drawdown_cents": result["max_drawdown_cents"],
+            "filtered_in": result["filtered_in"],
+            "filtered_out": result["filtered_out"],
+        })
+    return rows
+
+
+def run_parameter_sweep(trades: List[Dict], strategy: str = "grid", workers: int = None) -> List[Dict]:
     """
     Run a sweep over parameter combinations to find optimal settings.
+
+    Evaluations are cached and parallelized by scripts/param_search.py, which
+    also saves the PnL / drawdown / trade-count Pareto front to
+    data/backtests/pareto-weather-backtest.json.
     """
-    results = []
-    
-    # Parameter ranges to test
-    min_edges = [0.05, 0.10, 0.15, 0.20, 0.25, 0.30]
-    min_gaps = [0.0, 1.0, 2.0, 3.0, 4.0, 5.0]
-    max_convictions = [0.70, 0.80, 0.85, 0.90, 0.95, 1.0]
-    min_probs = [0.0, 0.01, 0.05, 0.10]
-    
-    for min_edge in min_edges:
-        for min_gap in min_gaps:
-            for max_conviction in max_convictions:
-                for min_prob in min_probs:
-                    params = {
-                        "min_edge": min_edge,
-                        "min_forecast_strike_gap": min_gap,
-                        "max_market_conviction": max_conviction,
-                        "min_our_prob": min_prob,
-                    }
-                    
-                    result = simulate_strategy(trades, params)
-                    
-                    # Only include if we have enough trades
-                    if result["wins"] + result["losses"] >= 5:
-                        results.append({
-                            "params": params,
-                            "win_rate": result["win_rate"],
-                            "wins": result["wins"],
-                            "losses": result["losses"],
-                            "pnl_cents": result["pnl_cents"],
-                            "filtered_in": result["filtered_in"],
-                            "filtered_out": result["filtered_out"],
-                        })
+    search = ParamSearch("weather-backtest", SWEEP_SPACE, partial(evaluate_points, trades),
+                         data_key=fingerprint(trades), workers=workers)
+    rows = search.grid() if strategy == "grid" else search.halving()
+    search.save_front(rows, strategy)
+    
+    # Only include if we have enough trades
+    results = [r for r in rows if r["wins"] + r["losses"] >= 5]
     
     # Sort by win rate (primary), then PnL (secondary)
     results.sort(key=lambda x: (x["win_rate"], x["pnl_cents"]), reverse=True)
@@ -482,6 +505,12 @@ def save_results(default_results: Dict, improved_results: Dict, accuracy: Dict,
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Weather trading strategy backtest")
+    parser.add_argument("--search", choices=["grid", "halving"], default="grid",
+                        help="Parameter sweep strategy (default: every combination)")
+    parser.add_argument("--workers", type=int, help="Processes for the sweep (0 = all cores; default 1)")
+    args = parser.parse_args()
+    
     print("🔬 Weather Trading Strategy Backtest")
     print("=" * 50)
     
@@ -510,7 +539,7 @@ def main():
     sweep_results = []
     if len(settled) >= 20:
         print("⏳ Running parameter sweep...")
-        sweep_results = run_parameter_sweep(trades)
+        sweep_results = run_parameter_sweep(trades, args.search, args.workers)
     
     # Print and save results
     print_results(default_results, improved_results, accuracy, sweep_results)